@@ -24,81 +24,12 @@ a left-right inversion combination.
 """
 
 import os, sys
-import re
 
+scriptDir=os.path.abspath(os.path.dirname(__file__))
+pythonLibDir=os.path.abspath(os.path.join(scriptDir,"..","..","src","python","lib"))
+sys.path.append(pythonLibDir)
 
-
-def isInfoFlag(infoString,key) :
-    word=infoString.split(";")
-    for w in word :
-        if w == key : return True
-    return False
-
-def getKeyVal(infoString,key) :
-    match=re.search("%s=([^;\t]*);?" % (key) ,infoString)
-    if match is None : return None
-    return match.group(1);
-
-class VCFID :
-    CHROM = 0
-    POS = 1
-    REF = 3
-    ALT = 4
-    QUAL = 5
-    FILTER = 6
-    INFO = 7
-
-
-
-class VcfRecord :
-    def __init__(self, line) :
-        self.line = line
-        w=line.strip().split('\t')
-        self.chrom=w[VCFID.CHROM]
-        self.pos=int(w[VCFID.POS])
-        self.qual=w[VCFID.QUAL]
-        self.isPass=(w[VCFID.FILTER] == "PASS")
-        self.Filter=w[VCFID.FILTER]
-        self.endPos=self.pos+len(w[VCFID.REF])-1
-        val = getKeyVal(w[VCFID.INFO],"END")
-        if val is not None :
-            self.endPos = int(val)
-        else :
-            self.endPos = None
-        val = getKeyVal(w[VCFID.INFO],"SOMATICSCORE")
-        if val is not None :
-            self.ss = int(val)
-        else :
-            self.ss = None
-        self.svtype = getKeyVal(w[VCFID.INFO],"SVTYPE")
-        self.isInv3 = isInfoFlag(w[VCFID.INFO],"INV3")
-        self.isInv5 = isInfoFlag(w[VCFID.INFO],"INV5")
-
-
-
-class Constants :
-
-    import re
-
-    contigpat = re.compile("^##contig=<ID=([^,>]*)[,>]")
-
-
-
-def processStream(vcfFp, chromOrder, header, recList) :
-    """
-    read in a vcf stream
-    """
-
-    import re
-
-    for line in vcfFp :
-        if line[0] == "#" :
-            header.append(line)
-            match = re.match(Constants.contigpat,line)
-            if match is not None :
-                chromOrder.append(match.group(1))
-        else :
-            recList.append(VcfRecord(line))
+from vcfUtil import processVcfStream, getVcfRecSortKey
 
 
 
@@ -160,24 +91,9 @@ def main() :
     recList=[]
     chromOrder=[]
 
-    processStream(sys.stdin, chromOrder, header, recList)
-
-    def vcfRecSortKey(x) :
-        """
-        sort vcf records for final output
-
-        Fancy chromosome sort rules:
-        if contig records are found in the vcf header, then sort chroms in that order
-        for any chrom names not found in the header, sort them in lex order after the
-        found chrom names
-        """
-
-        try :
-            headerOrder = chromOrder.index(x.chrom)
-        except ValueError :
-            headerOrder = size(chromOrder)
+    processVcfStream(sys.stdin, chromOrder, header, recList)
 
-        return (headerOrder, x.chrom, x.pos, x.endPos)
+    vcfRecSortKey = getVcfRecSortKey(chromOrder)
 
     recList.sort(key = vcfRecSortKey)
 
@@ -188,7 +104,7 @@ def main() :
     recEqualSet = []
     lastRec = None
     for vcfrec in recList :
-        rec = (vcfrec.chrom, vcfrec.pos, vcfrec.endPos, vcfrec.svtype)
+        rec = (vcfrec.chrom, vcfrec.pos, vcfrec.endPos, vcfrec.svType)
         if ((lastRec is None) or
           (rec[0] != lastRec[0]) or
           (rec[3] != "INV") or
@@ -23,80 +23,12 @@ remove intrachomosomal events above a specified size
 """
 
 import os, sys
-import re
 
+scriptDir=os.path.abspath(os.path.dirname(__file__))
+pythonLibDir=os.path.abspath(os.path.join(scriptDir,"..","..","src","python","lib"))
+sys.path.append(pythonLibDir)
 
-
-def isInfoFlag(infoString,key) :
-    word=infoString.split(";")
-    for w in word :
-        if w == key : return True
-    return False
-
-
-def getKeyVal(infoString,key) :
-    match=re.search("%s=([^;\t]*);?" % (key) ,infoString)
-    if match is None : return None
-    return match.group(1);
-
-
-class VCFID :
-    CHROM = 0
-    POS = 1
-    REF = 3
-    ALT = 4
-    QUAL = 5
-    FILTER = 6
-    INFO = 7
-
-
-class VcfRecord :
-    def __init__(self, line) :
-        self.line = line
-        w=line.strip().split('\t')
-        self.chrom=w[VCFID.CHROM]
-        self.pos=int(w[VCFID.POS])
-        self.qual=w[VCFID.QUAL]
-        self.isPass=(w[VCFID.FILTER] == "PASS")
-        self.Filter=w[VCFID.FILTER]
-        self.endPos=self.pos+len(w[VCFID.REF])-1
-        val = getKeyVal(w[VCFID.INFO],"END")
-        if val is not None :
-            self.endPos = int(val)
-        val = getKeyVal(w[VCFID.INFO],"SOMATICSCORE")
-        if val is not None :
-            self.ss = int(val)
-        else :
-            self.ss = None
-        self.svtype = getKeyVal(w[VCFID.INFO],"SVTYPE")
-        self.isInv3 = isInfoFlag(w[VCFID.INFO],"INV3")
-        self.isInv5 = isInfoFlag(w[VCFID.INFO],"INV5")
-
-
-
-class Constants :
-
-    import re
-
-    contigpat = re.compile("^##contig=<ID=([^,>]*)[,>]")
-
-
-
-def processStream(vcfFp, chromOrder, header, recList) :
-    """
-    read in a vcf stream
-    """
-
-    import re
-
-    for line in vcfFp :
-        if line[0] == "#" :
-            header.append(line)
-            match = re.match(Constants.contigpat,line)
-            if match is not None :
-                chromOrder.append(match.group(1))
-        else :
-            recList.append(VcfRecord(line))
+from vcfUtil import processVcfStream
 
 
 
@@ -165,7 +97,7 @@ def main() :
     recList=[]
     chromOrder=[]
 
-    processStream(sys.stdin, chromOrder, header, recList)
+    processVcfStream(sys.stdin, chromOrder, header, recList)
 
     for line in header :
         outfp.write(line)
@@ -18,24 +18,13 @@
 #
 #
 
-import sys
-import re
+import os, sys
 
+scriptDir=os.path.abspath(os.path.dirname(__file__))
+pythonLibDir=os.path.abspath(os.path.join(scriptDir,"..","..","src","python","lib"))
+sys.path.append(pythonLibDir)
 
-def getKeyVal(string,key) :
-    match=re.search("%s=([^;\t]*);?" % (key) ,string)
-    if match is None : return None
-    return match.group(1);
-
-
-class VCFID :
-    CHROM = 0
-    POS = 1
-    REF = 3
-    ALT = 4
-    QUAL = 5
-    FILTER = 6
-    INFO = 7
+from vcfUtil import VCFID, getKeyVal
 
 
 
@@ -23,79 +23,12 @@ filter overlapping PASS SVs (except for BNDs)
 """
 
 import os, sys
-import re
-
-
-
-def isInfoFlag(infoString,key) :
-    word=infoString.split(";")
-    for w in word :
-        if w == key : return True
-    return False
-
-def getKeyVal(infoString,key) :
-    match=re.search("%s=([^;\t]*);?" % (key) ,infoString)
-    if match is None : return None
-    return match.group(1);
-
-class VCFID :
-    CHROM = 0
-    POS = 1
-    REF = 3
-    ALT = 4
-    QUAL = 5
-    FILTER = 6
-    INFO = 7
-
-
-
-class VcfRecord :
-    def __init__(self, line) :
-        self.line = line
-        w=line.strip().split('\t')
-        self.chrom=w[VCFID.CHROM]
-        self.pos=int(w[VCFID.POS])
-        self.qual=w[VCFID.QUAL]
-        self.isPass=(w[VCFID.FILTER] == "PASS")
-        self.Filter=w[VCFID.FILTER]
-        self.endPos=self.pos+len(w[VCFID.REF])-1
-        val = getKeyVal(w[VCFID.INFO],"END")
-        if val is not None :
-            self.endPos = int(val)
-        val = getKeyVal(w[VCFID.INFO],"SOMATICSCORE")
-        if val is not None :
-            self.ss = int(val)
-        else :
-            self.ss = None
-        self.svtype = getKeyVal(w[VCFID.INFO],"SVTYPE")
-        self.isInv3 = isInfoFlag(w[VCFID.INFO],"INV3")
-        self.isInv5 = isInfoFlag(w[VCFID.INFO],"INV5")
-
-
-
-class Constants :
 
-    import re
+scriptDir=os.path.abspath(os.path.dirname(__file__))
+pythonLibDir=os.path.abspath(os.path.join(scriptDir,"..","..","src","python","lib"))
+sys.path.append(pythonLibDir)
 
-    contigpat = re.compile("^##contig=<ID=([^,>]*)[,>]")
-
-
-
-def processStream(vcfFp, chromOrder, header, recList) :
-    """
-    read in a vcf stream
-    """
-
-    import re
-
-    for line in vcfFp :
-        if line[0] == "#" :
-            header.append(line)
-            match = re.match(Constants.contigpat,line)
-            if match is not None :
-                chromOrder.append(match.group(1))
-        else :
-            recList.append(VcfRecord(line))
+from vcfUtil import processVcfStream, getVcfRecSortKey
 
 
 
@@ -157,7 +90,7 @@ def listResolver(recListIn, recListOut) :
     lastRec = None
     for vcfrec in recListIn :
         # shortcut directly to non-filtered set:
-        if (not vcfrec.isPass) : # or (vcfrec.svtype == "BND") :
+        if (not vcfrec.isPass) : # or (vcfrec.svType == "BND") :
             recListOut.append(vcfrec)
             continue
 
@@ -194,24 +127,9 @@ def main() :
     recList=[]
     chromOrder=[]
 
-    processStream(sys.stdin, chromOrder, header, recList)
-
-    def vcfRecSortKey(x) :
-        """
-        sort vcf records for final output
-
-        Fancy chromosome sort rules:
-        if contig records are found in the vcf header, then sort chroms in that order
-        for any chrom names not found in the header, sort them in lex order after the
-        found chrom names
-        """
-
-        try :
-            headerOrder = chromOrder.index(x.chrom)
-        except ValueError :
-            headerOrder = size(chromOrder)
+    processVcfStream(sys.stdin, chromOrder, header, recList)
 
-        return (headerOrder, x.chrom, x.pos, x.endPos)
+    vcfRecSortKey = getVcfRecSortKey(chromOrder)
 
     recList.sort(key = vcfRecSortKey)
 
@@ -18,25 +18,13 @@
 #
 #
 
-import sys
-import re
+import os, sys
 
+scriptDir=os.path.abspath(os.path.dirname(__file__))
+pythonLibDir=os.path.abspath(os.path.join(scriptDir,"..","..","src","python","lib"))
+sys.path.append(pythonLibDir)
 
-def getKeyVal(string,key) :
-    match=re.search("%s=([^;\t]*);?" % (key) ,string)
-    if match is None : return None
-    return match.group(1);
-
-
-class VCFID :
-    CHROM = 0
-    POS = 1
-    REF = 3
-    ALT = 4
-    QUAL = 5
-    FILTER = 6
-    INFO = 7
-    SAMPLE = 8
+from vcfUtil import VCFID, getKeyVal
 
 
 
@@ -51,9 +39,9 @@ def main() :
             continue
 
         w=line.strip().split('\t')
-        assert(len(w) > VCFID.SAMPLE+1)
+        assert(len(w) > VCFID.SAMPLE)
 
-        x=w[VCFID.SAMPLE+1].split(':')
+        x=w[VCFID.SAMPLE].split(':')
         normalAltPairs=int(x[0].split(',')[1])
 
         val = getKeyVal(w[VCFID.INFO],"SOMATICSCORE")
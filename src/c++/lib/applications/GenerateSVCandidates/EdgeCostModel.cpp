@@ -0,0 +1,182 @@
+// -*- mode: c++; indent-tabs-mode: nil; -*-
+//
+// Manta - Structural Variant and Indel Caller
+// Copyright (c) 2013-2016 Illumina, Inc.
+//
+// This program is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// at your option) any later version.
+//
+// This program is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with this program.  If not, see <http://www.gnu.org/licenses/>.
+//
+//
+
+#include "EdgeCostModel.hh"
+
+#include "blt_util/istream_line_splitter.hh"
+#include "blt_util/parse_util.hh"
+#include "common/Exceptions.hh"
+#include "manta/ChromDepthFilterUtil.hh"
+
+#include <cstring>
+
+#include <algorithm>
+#include <fstream>
+#include <sstream>
+
+
+
+unsigned
+getEdgeObservationCount(
+    const SVLocus& locus,
+    const EdgeInfo& edge)
+{
+    unsigned count(locus.getEdge(edge.nodeIndex1,edge.nodeIndex2).getCount());
+    if (edge.nodeIndex1 != edge.nodeIndex2)
+    {
+        count += locus.getEdge(edge.nodeIndex2,edge.nodeIndex1).getCount();
+    }
+    return count;
+}
+
+
+
+const char*
+EdgeCostModel::
+label(const feature_t id)
+{
+    switch (id)
+    {
+    case INTERCEPT:
+        return "intercept";
+    case OBSERVATION_COUNT:
+        return "observationCount";
+    case REGION_SIZE:
+        return "regionSize";
+    case REGION_DEPTH_SIZE:
+        return "regionDepthSize";
+    case SELF_EDGE:
+        return "selfEdge";
+    default:
+        assert(false && "Unknown edge cost feature");
+        return nullptr;
+    }
+}
+
+
+
+EdgeCostModel::
+EdgeCostModel(
+    const std::string& modelFilename,
+    const std::string& chromDepthFilename,
+    const bam_header_info& header) :
+    _coefficients(SIZE,0.)
+{
+    using namespace illumina::common;
+
+    std::ifstream modelIs(modelFilename.c_str());
+    if (! modelIs)
+    {
+        std::ostringstream oss;
+        oss << "ERROR: Can't open edge cost model file: " << modelFilename << '\n';
+        BOOST_THROW_EXCEPTION(LogicException(oss.str()));
+    }
+
+    istream_line_splitter modelLine(modelIs);
+    while (modelLine.parse_line())
+    {
+        if ((modelLine.n_word() == 0) || (modelLine.word[0][0] == '#') || (modelLine.word[0][0] == '\0')) continue;
+
+        if (modelLine.n_word() != 2)
+        {
+            std::ostringstream oss;
+            oss << "ERROR: Unexpected line format in edge cost model file: " << modelFilename << '\n';
+            BOOST_THROW_EXCEPTION(LogicException(oss.str()));
+        }
+
+        bool isFound(false);
+        for (unsigned featureIndex(0); featureIndex<SIZE; ++featureIndex)
+        {
+            if (0 != strcmp(modelLine.word[0],label(static_cast<feature_t>(featureIndex)))) continue;
+            const char* coefficientStr(modelLine.word[1]);
+            _coefficients[featureIndex] = illumina::blt_util::parse_double(coefficientStr);
+            isFound=true;
+            break;
+        }
+
+        if (! isFound)
+        {
+            std::ostringstream oss;
+            oss << "ERROR: Unknown feature '" << modelLine.word[0] << "' in edge cost model file: " << modelFilename << '\n';
+            BOOST_THROW_EXCEPTION(LogicException(oss.str()));
+        }
+    }
+
+    if (! chromDepthFilename.empty())
+    {
+        const ChromDepthFilterUtil chromDepth(chromDepthFilename, 1., header);
+        for (unsigned tid(0); tid<header.chrom_data.size(); ++tid)
+        {
+            _chromDepth.push_back(chromDepth.maxDepth(tid));
+        }
+    }
+}
+
+
+
+void
+EdgeCostModel::
+getEdgeFeatures(
+    const SVLocusSet& set,
+    const EdgeInfo& edge,
+    std::vector<double>& features) const
+{
+    const SVLocus& locus(set.getLocus(edge.locusIndex));
+    const bool isSelfEdge(edge.nodeIndex1 == edge.nodeIndex2);
+
+    features.assign(SIZE,0.);
+    features[INTERCEPT] = 1.;
+    features[OBSERVATION_COUNT] = getEdgeObservationCount(locus, edge);
+    features[SELF_EDGE] = (isSelfEdge ? 1. : 0.);
+
+    const unsigned nodeCount(isSelfEdge ? 1 : 2);
+    for (unsigned nodeIndex(0); nodeIndex<nodeCount; ++nodeIndex)
+    {
+        const GenomeInterval& interval(locus.getNode((nodeIndex==0) ? edge.nodeIndex1 : edge.nodeIndex2).getInterval());
+        const double regionSize(interval.range.size());
+        features[REGION_SIZE] += regionSize;
+        if (! _chromDepth.empty())
+        {
+            features[REGION_DEPTH_SIZE] += (regionSize * _chromDepth[interval.tid]);
+        }
+    }
+}
+
+
+
+double
+EdgeCostModel::
+getEdgeCost(
+    const SVLocusSet& set,
+    const EdgeInfo& edge) const
+{
+    std::vector<double> features;
+    getEdgeFeatures(set, edge, features);
+
+    double cost(0.);
+    for (unsigned featureIndex(0); featureIndex<SIZE; ++featureIndex)
+    {
+        cost += (_coefficients[featureIndex] * features[featureIndex]);
+    }
+
+    // every edge has some cost, so that bins are never filled by zero-cost edges alone:
+    static const double minCost(1e-9);
+    return std::max(cost, minCost);
+}
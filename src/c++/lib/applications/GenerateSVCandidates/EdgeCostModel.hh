@@ -0,0 +1,85 @@
+// -*- mode: c++; indent-tabs-mode: nil; -*-
+//
+// Manta - Structural Variant and Indel Caller
+// Copyright (c) 2013-2016 Illumina, Inc.
+//
+// This program is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// at your option) any later version.
+//
+// This program is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with this program.  If not, see <http://www.gnu.org/licenses/>.
+//
+//
+
+#pragma once
+
+#include "svgraph/EdgeInfo.hh"
+#include "svgraph/SVLocusSet.hh"
+
+#include <string>
+#include <vector>
+
+
+/// total observation count of an edge in both directions
+unsigned
+getEdgeObservationCount(
+    const SVLocus& locus,
+    const EdgeInfo& edge);
+
+
+/// linear model of the time required to generate and score SV candidates for one SV locus graph edge
+///
+/// the cost is estimated from edge features available when the graph is loaded, the model file
+/// provides one coefficient per feature, as lines of 'featureLabel<tab>coefficient'. The coefficients
+/// of features missing from the file are zero. Lines starting with '#' are ignored.
+///
+/// Model files can be fit to existing edge runtime logs with calibrateEdgeCostModel.py, which must
+/// compute features exactly as they are computed here.
+///
+struct EdgeCostModel
+{
+    enum feature_t
+    {
+        INTERCEPT, ///< 1 for all edges
+        OBSERVATION_COUNT, ///< total edge observation count in both directions
+        REGION_SIZE, ///< total size of the edge node regions (counted once for a self-edge)
+        REGION_DEPTH_SIZE, ///< total size of the edge node regions, each multiplied by the depth of its chromosome
+        SELF_EDGE, ///< 1 if both edge nodes are the same node
+        SIZE
+    };
+
+    static
+    const char*
+    label(const feature_t id);
+
+    /// \param[in] modelFilename cost model file
+    /// \param[in] chromDepthFilename optional chromosome depth file, if empty the REGION_DEPTH_SIZE feature is zero
+    EdgeCostModel(
+        const std::string& modelFilename,
+        const std::string& chromDepthFilename,
+        const bam_header_info& header);
+
+    /// get the feature values of an edge
+    void
+    getEdgeFeatures(
+        const SVLocusSet& set,
+        const EdgeInfo& edge,
+        std::vector<double>& features) const;
+
+    /// get the estimated cost of an edge, which is always positive
+    double
+    getEdgeCost(
+        const SVLocusSet& set,
+        const EdgeInfo& edge) const;
+
+private:
+    std::vector<double> _coefficients;
+    std::vector<double> _chromDepth;
+};
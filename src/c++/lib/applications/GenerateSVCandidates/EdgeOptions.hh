@@ -24,6 +24,8 @@
 
 #pragma once
 
+#include <string>
+
 
 /// options for SVLocusGraph edge iteration and noise edge filtration
 struct LocusEdgeOptions
@@ -42,6 +44,13 @@ struct EdgeOptions
     unsigned binCount = 1; ///< divide all edges in the graph into binCount bins of approx equal complexity
     unsigned binIndex = 0; ///< out of binCount bins, iterate through the edges in this bin only
 
+    std::string workQueueDir; ///< if non-empty, claim edge chunks from the work queue in this directory instead of iterating through one bin, binCount and binIndex give the total worker count and this worker's index
+    unsigned workChunkCount = 0; ///< total number of edge chunks in the work queue
+
+    std::string binCostModelFilename; ///< if non-empty, balance bins by the total edge cost estimated from this cost model file instead of by total edge observation count
+
+    bool isLocalityOrder = false; ///< if true, iterate through the edges of the bin (or locus) in order of the genomic position of their nodes, instead of graph order
+
     bool isLocusIndex = false; ///< if true, generate candidates for a specific SVgraph locus only, and ignore binCount/binIndex
     LocusEdgeOptions locusOpt;
 
@@ -47,6 +47,20 @@ getOptionsDescription(
      "Specify how many bins the SV candidate problem should be divided into, where bin-index can be used to specify which bin to solve")
     ("bin-index", po::value(&opt.binIndex)->default_value(opt.binIndex),
      "specify which bin to solve when the SV candidate problem is subdivided into bins. Value must bin in [0,bin-count)")
+    ("bin-cost-model", po::value(&opt.binCostModelFilename),
+     "Balance bins by the total edge cost estimated from this cost model file, instead of by the total edge"
+     " observation count. The chrom-depth file is used by the cost model if provided.")
+    ("work-queue-dir", po::value(&opt.workQueueDir),
+     "Instead of solving for the SV candidates of one bin, claim chunks of the SV candidate problem from the"
+     " work queue in this directory until the queue is empty. The work queue is shared by bin-count workers,"
+     " where bin-index specifies this worker. The directory must hold one token file named 'chunk.NNNNNN' for"
+     " each chunk in [0,work-chunk-count).")
+    ("work-chunk-count", po::value(&opt.workChunkCount)->default_value(opt.workChunkCount),
+     "Specify how many chunks the SV candidate problem is divided into in the work queue")
+    ("locality-edge-order", po::value(&opt.isLocalityOrder)->zero_tokens(),
+     "Solve for the SV candidates of the bin in order of the genomic position of each edge's nodes, instead of"
+     " the SV locus graph order, so that consecutive edges read alignments from nearby regions. This option"
+     " cannot be used with work-queue-dir.")
     (locusIndexKey, po::value<std::string>(),
      "Instead of solving for all SV candidates in a bin, solve for candidates of a particular locus or edge."
      " If this argument is specified then bin-index is ignored."
@@ -108,6 +122,14 @@ parseOptions(
         {
             errorMsg="bin-index must be in range [0,bin-count)";
         }
+        else if ((! opt.workQueueDir.empty()) && (opt.workChunkCount < 1))
+        {
+            errorMsg="work-chunk-count must be 1 or greater when work-queue-dir is specified";
+        }
+        else if ((! opt.workQueueDir.empty()) && opt.isLocalityOrder)
+        {
+            errorMsg="locality-edge-order cannot be used with work-queue-dir";
+        }
     }
 
     return (! errorMsg.empty());
@@ -24,6 +24,7 @@
 
 #include "EdgeRetrieverBin.hh"
 
+#include <algorithm>
 #include <cassert>
 
 
@@ -48,6 +49,58 @@ getBoundaryCount(
 
 
 
+void
+getLocusBeginObservationCounts(
+    const SVLocusSet& set,
+    std::vector<unsigned long>& locusBeginCounts)
+{
+    locusBeginCounts.clear();
+    locusBeginCounts.reserve(set.size()+1);
+
+    unsigned long headCount(0);
+    for (const SVLocus& locus : set)
+    {
+        locusBeginCounts.push_back(headCount);
+        headCount += locus.totalObservationCount();
+    }
+    locusBeginCounts.push_back(headCount);
+}
+
+
+
+void
+getBinLocusRange(
+    const std::vector<unsigned long>& locusBeginCounts,
+    const unsigned binCount,
+    const unsigned binIndex,
+    unsigned& beginLocusIndex,
+    unsigned& endLocusIndex)
+{
+    assert(! locusBeginCounts.empty());
+    assert(binCount > 0);
+    assert(binIndex < binCount);
+
+    const unsigned long totalCount(locusBeginCounts.back());
+    const unsigned long beginCount(getBoundaryCount(binCount,binIndex,totalCount));
+    const unsigned long endCount(getBoundaryCount(binCount,binIndex+1,totalCount));
+
+    // the bin starts from the last locus beginning before beginCount, as in the EdgeRetrieverBin ctor:
+    beginLocusIndex = 0;
+    if (beginCount > 0)
+    {
+        const auto locusIter(std::lower_bound(locusBeginCounts.begin(), locusBeginCounts.end(), beginCount));
+        assert(locusIter != locusBeginCounts.begin());
+        beginLocusIndex = ((locusIter - locusBeginCounts.begin()) - 1);
+    }
+
+    // loci beginning after endCount are only reached when searching past a filtered edge, and then
+    // any edge found ends the bin, the same as reaching the end of the set:
+    const auto locusEnd(locusBeginCounts.end()-1);
+    endLocusIndex = (std::upper_bound(locusBeginCounts.begin(), locusEnd, endCount) - locusBeginCounts.begin());
+}
+
+
+
 EdgeRetrieverBin::
 EdgeRetrieverBin(
     const SVLocusSet& set,
@@ -56,11 +109,49 @@ EdgeRetrieverBin(
     const unsigned binIndex) :
     EdgeRetriever(set,graphNodeMaxEdgeCount),
     _headCount(0)
+{
+    setBinRange(binCount, binIndex, _set.totalObservationCount());
+}
+
+
+
+EdgeRetrieverBin::
+EdgeRetrieverBin(
+    const SVLocusSet& set,
+    const unsigned graphNodeMaxEdgeCount,
+    const unsigned binCount,
+    const unsigned binIndex,
+    const std::vector<unsigned long>& locusBeginCounts) :
+    EdgeRetriever(set,graphNodeMaxEdgeCount),
+    _headCount(0)
+{
+    assert(locusBeginCounts.size() == (_set.size()+1));
+
+    setBinRange(binCount, binIndex, locusBeginCounts.back());
+
+    // start from the last locus beginning before the bin, so that jumpToFirstEdge
+    // proceeds exactly as it would have after skipping all preceding loci:
+    if (_beginCount > 0)
+    {
+        const auto locusIter(std::lower_bound(locusBeginCounts.begin(), locusBeginCounts.end(), _beginCount));
+        assert(locusIter != locusBeginCounts.begin());
+        _edge.locusIndex = ((locusIter - locusBeginCounts.begin()) - 1);
+        _headCount = locusBeginCounts[_edge.locusIndex];
+    }
+}
+
+
+
+void
+EdgeRetrieverBin::
+setBinRange(
+    const unsigned binCount,
+    const unsigned binIndex,
+    const unsigned long totalObservationCount)
 {
     assert(binCount > 0);
     assert(binIndex < binCount);
 
-    const unsigned long totalObservationCount(_set.totalObservationCount());
     _beginCount=(getBoundaryCount(binCount,binIndex,totalObservationCount));
     _endCount=(getBoundaryCount(binCount,binIndex+1,totalObservationCount));
 
@@ -26,6 +26,33 @@
 
 #include "EdgeRetriever.hh"
 
+#include <vector>
+
+
+/// get the cumulative observation count at the start of each locus in set
+///
+/// \param[out] locusBeginCounts cumulative observation count preceding each locus, followed by the total
+///                               observation count of the set
+void
+getLocusBeginObservationCounts(
+    const SVLocusSet& set,
+    std::vector<unsigned long>& locusBeginCounts);
+
+
+/// get the range of loci which EdgeRetrieverBin may visit while iterating through one bin
+///
+/// \param[in] locusBeginCounts cumulative observation count at the start of each locus from
+///            getLocusBeginObservationCounts
+/// \param[out] beginLocusIndex first locus visited by the bin
+/// \param[out] endLocusIndex one past the last locus visited by the bin
+void
+getBinLocusRange(
+    const std::vector<unsigned long>& locusBeginCounts,
+    const unsigned binCount,
+    const unsigned binIndex,
+    unsigned& beginLocusIndex,
+    unsigned& endLocusIndex);
+
 
 /// provide an iterator over edges in a set of SV locus graphs
 ///
@@ -45,10 +72,26 @@ struct EdgeRetrieverBin final : public EdgeRetriever
         const unsigned binCount,
         const unsigned binIndex);
 
+    /// \param[in] locusBeginCounts cumulative observation count at the start of each locus from
+    ///            getLocusBeginObservationCounts, used to start iteration at the first locus of
+    ///            the bin without scanning all preceding loci
+    EdgeRetrieverBin(
+        const SVLocusSet& set,
+        const unsigned graphNodeMaxEdgeCount,
+        const unsigned binCount,
+        const unsigned binIndex,
+        const std::vector<unsigned long>& locusBeginCounts);
+
     bool
     next() override;
 
 private:
+    void
+    setBinRange(
+        const unsigned binCount,
+        const unsigned binIndex,
+        const unsigned long totalObservationCount);
+
     void
     jumpToFirstEdge();
 
@@ -0,0 +1,119 @@
+// -*- mode: c++; indent-tabs-mode: nil; -*-
+//
+// Manta - Structural Variant and Indel Caller
+// Copyright (c) 2013-2016 Illumina, Inc.
+//
+// This program is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// at your option) any later version.
+//
+// This program is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with this program.  If not, see <http://www.gnu.org/licenses/>.
+//
+//
+
+#include "EdgeRetrieverCostBin.hh"
+
+#include <cassert>
+
+
+
+/// call edgeFunc on every edge of set which is not filtered, in graph order
+template <typename EdgeFunc>
+static
+void
+forEachEdge(
+    const SVLocusSet& set,
+    const unsigned graphNodeMaxEdgeCount,
+    EdgeFunc& edgeFunc)
+{
+    const bool isFilterNodes(graphNodeMaxEdgeCount>0);
+
+    EdgeInfo edge;
+    const unsigned setSize(set.size());
+    for (edge.locusIndex=0; edge.locusIndex<setSize; ++edge.locusIndex)
+    {
+        const SVLocus& locus(set.getLocus(edge.locusIndex));
+        const unsigned locusSize(locus.size());
+        for (edge.nodeIndex1=0; edge.nodeIndex1<locusSize; ++edge.nodeIndex1)
+        {
+            const SVLocusNode& node1(locus.getNode(edge.nodeIndex1));
+            const bool isEdgeFilterNode1(isFilterNodes && (node1.size()>graphNodeMaxEdgeCount));
+
+            const SVLocusEdgeManager node1Manager(node1.getEdgeManager());
+            auto edgeIter(node1Manager.getMap().lower_bound(edge.nodeIndex1));
+            const auto edgeIterEnd(node1Manager.getMap().cend());
+            for (; edgeIter != edgeIterEnd; ++edgeIter)
+            {
+                edge.nodeIndex2 = edgeIter->first;
+
+                // if both nodes have high edge counts we filter out the edge:
+                if (isEdgeFilterNode1)
+                {
+                    const SVLocusNode& node2(locus.getNode(edge.nodeIndex2));
+                    if (node2.size()>graphNodeMaxEdgeCount) continue;
+                }
+
+                edgeFunc(edge);
+            }
+        }
+    }
+}
+
+
+
+EdgeRetrieverCostBin::
+EdgeRetrieverCostBin(
+    const SVLocusSet& set,
+    const unsigned graphNodeMaxEdgeCount,
+    const unsigned binCount,
+    const unsigned binIndex,
+    const EdgeCostModel& costModel) :
+    EdgeRetriever(set,graphNodeMaxEdgeCount),
+    _headIndex(0)
+{
+    assert(binCount > 0);
+    assert(binIndex < binCount);
+
+    double totalCost(0.);
+    auto addCost = [&](const EdgeInfo& edge)
+    {
+        totalCost += costModel.getEdgeCost(_set, edge);
+    };
+    forEachEdge(_set, _graphNodeMaxEdgeCount, addCost);
+
+    // the same bin boundaries are computed by all bins, so every edge is assigned to exactly one bin:
+    const double beginCost((totalCost*binIndex)/binCount);
+    const double endCost((totalCost*(binIndex+1))/binCount);
+    const bool isLastBin((binIndex+1) == binCount);
+
+    double headCost(0.);
+    auto addBinEdge = [&](const EdgeInfo& edge)
+    {
+        const double edgeCost(costModel.getEdgeCost(_set, edge));
+        const double midCost(headCost + (edgeCost/2));
+        if ((midCost >= beginCost) && (isLastBin || (midCost < endCost)))
+        {
+            _binEdges.push_back(edge);
+        }
+        headCost += edgeCost;
+    };
+    forEachEdge(_set, _graphNodeMaxEdgeCount, addBinEdge);
+}
+
+
+
+bool
+EdgeRetrieverCostBin::
+next()
+{
+    if (_headIndex >= _binEdges.size()) return false;
+    _edge = _binEdges[_headIndex++];
+    return true;
+}
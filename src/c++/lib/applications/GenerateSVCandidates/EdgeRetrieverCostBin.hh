@@ -0,0 +1,60 @@
+// -*- mode: c++; indent-tabs-mode: nil; -*-
+//
+// Manta - Structural Variant and Indel Caller
+// Copyright (c) 2013-2016 Illumina, Inc.
+//
+// This program is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// at your option) any later version.
+//
+// This program is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with this program.  If not, see <http://www.gnu.org/licenses/>.
+//
+//
+
+#pragma once
+
+#include "EdgeCostModel.hh"
+#include "EdgeRetriever.hh"
+
+#include <vector>
+
+
+/// provide an iterator over edges in a set of SV locus graphs
+///
+/// designed to allow parallelization of the graph processing by
+/// dividing iteration into a set of bins with similar total estimated
+/// edge cost
+///
+/// edges are visited in the same order and with the same filtration as
+/// EdgeRetrieverBin, each edge is assigned to the bin containing the
+/// cumulative cost at the midpoint of the edge
+///
+struct EdgeRetrieverCostBin final : public EdgeRetriever
+{
+    /// \param[in] graphNodeMaxEdgeCount filtration parameter for skipping edges
+    ///            from highly connected nodes (set to zero to disable)
+    /// \param[in] binCount total number of parallel bins, must be 1 or greater
+    /// \param[in] binIndex parallel bin id, must be less than binCount
+    /// \param[in] costModel model used to estimate the cost of each edge
+    EdgeRetrieverCostBin(
+        const SVLocusSet& set,
+        const unsigned graphNodeMaxEdgeCount,
+        const unsigned binCount,
+        const unsigned binIndex,
+        const EdgeCostModel& costModel);
+
+    bool
+    next() override;
+
+private:
+    /// all edges in the bin, in iteration order:
+    std::vector<EdgeInfo> _binEdges;
+    unsigned long _headIndex;
+};
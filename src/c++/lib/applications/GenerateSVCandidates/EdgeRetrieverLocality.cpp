@@ -0,0 +1,100 @@
+// -*- mode: c++; indent-tabs-mode: nil; -*-
+//
+// Manta - Structural Variant and Indel Caller
+// Copyright (c) 2013-2016 Illumina, Inc.
+//
+// This program is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// at your option) any later version.
+//
+// This program is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with this program.  If not, see <http://www.gnu.org/licenses/>.
+//
+//
+
+#include "EdgeRetrieverLocality.hh"
+
+#include <algorithm>
+#include <tuple>
+
+
+
+namespace
+{
+
+/// sort key of an edge: both node intervals, leftmost first, followed by the edge
+/// indices to provide a complete order
+struct EdgeLocalityKey
+{
+    EdgeLocalityKey(
+        const SVLocusSet& set,
+        const EdgeInfo& initEdge) :
+        edge(initEdge)
+    {
+        const SVLocus& locus(set.getLocus(edge.locusIndex));
+        interval1 = locus.getNode(edge.nodeIndex1).getInterval();
+        interval2 = locus.getNode(edge.nodeIndex2).getInterval();
+        if (interval2 < interval1) std::swap(interval1, interval2);
+    }
+
+    bool
+    operator<(const EdgeLocalityKey& rhs) const
+    {
+        if (interval1 < rhs.interval1) return true;
+        if (rhs.interval1 < interval1) return false;
+        if (interval2 < rhs.interval2) return true;
+        if (rhs.interval2 < interval2) return false;
+        return (std::tie(edge.locusIndex, edge.nodeIndex1, edge.nodeIndex2) <
+                std::tie(rhs.edge.locusIndex, rhs.edge.nodeIndex1, rhs.edge.nodeIndex2));
+    }
+
+    GenomeInterval interval1;
+    GenomeInterval interval2;
+    EdgeInfo edge;
+};
+
+}
+
+
+
+EdgeRetrieverLocality::
+EdgeRetrieverLocality(
+    const SVLocusSet& set,
+    const unsigned graphNodeMaxEdgeCount,
+    EdgeRetriever& edgeSource) :
+    EdgeRetriever(set, graphNodeMaxEdgeCount),
+    _edgeIndex(0)
+{
+    std::vector<EdgeLocalityKey> keys;
+    while (edgeSource.next())
+    {
+        keys.emplace_back(_set, edgeSource.getEdge());
+    }
+
+    std::sort(keys.begin(), keys.end());
+
+    _edges.reserve(keys.size());
+    for (const EdgeLocalityKey& key : keys)
+    {
+        _edges.push_back(key.edge);
+    }
+}
+
+
+
+bool
+EdgeRetrieverLocality::
+next()
+{
+    if (_edgeIndex >= _edges.size()) return false;
+
+    _edge = _edges[_edgeIndex];
+    _edgeIndex++;
+    return true;
+}
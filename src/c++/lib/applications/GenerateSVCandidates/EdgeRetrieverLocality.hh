@@ -0,0 +1,51 @@
+// -*- mode: c++; indent-tabs-mode: nil; -*-
+//
+// Manta - Structural Variant and Indel Caller
+// Copyright (c) 2013-2016 Illumina, Inc.
+//
+// This program is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// at your option) any later version.
+//
+// This program is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with this program.  If not, see <http://www.gnu.org/licenses/>.
+//
+//
+
+#pragma once
+
+#include "EdgeRetriever.hh"
+
+#include <vector>
+
+
+/// provide an iterator over all edges retrieved by another edge retriever, ordered by the
+/// genomic position of the edge nodes
+///
+/// edges are sorted by the interval of their leftmost node, then by the interval of the
+/// other node, so that consecutive edges read alignments and reference sequence from
+/// nearby regions. All edges of the source retriever are retrieved on construction, so
+/// the source should be restricted to a single bin or locus.
+///
+struct EdgeRetrieverLocality final : public EdgeRetriever
+{
+    /// \param[in] graphNodeMaxEdgeCount filtration parameter used by edgeSource
+    /// \param[in] edgeSource edge retriever providing all edges to iterate over
+    EdgeRetrieverLocality(
+        const SVLocusSet& set,
+        const unsigned graphNodeMaxEdgeCount,
+        EdgeRetriever& edgeSource);
+
+    bool
+    next() override;
+
+private:
+    std::vector<EdgeInfo> _edges;
+    unsigned long _edgeIndex;
+};
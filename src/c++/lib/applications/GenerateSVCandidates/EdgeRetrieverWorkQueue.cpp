@@ -0,0 +1,200 @@
+// -*- mode: c++; indent-tabs-mode: nil; -*-
+//
+// Manta - Structural Variant and Indel Caller
+// Copyright (c) 2013-2016 Illumina, Inc.
+//
+// This program is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// at your option) any later version.
+//
+// This program is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with this program.  If not, see <http://www.gnu.org/licenses/>.
+//
+//
+
+#include "EdgeRetrieverWorkQueue.hh"
+
+#include "blt_util/parse_util.hh"
+#include "common/Exceptions.hh"
+
+#include "boost/filesystem.hpp"
+
+#include <algorithm>
+#include <cassert>
+#include <iomanip>
+#include <sstream>
+
+
+
+static const char chunkPrefix[] = "chunk.";
+static const char workerInfix[] = ".worker.";
+
+
+
+static
+std::string
+getChunkTokenName(
+    const unsigned chunkIndex)
+{
+    std::ostringstream oss;
+    oss << chunkPrefix << std::setfill('0') << std::setw(6) << chunkIndex;
+    return oss.str();
+}
+
+
+
+static
+std::string
+getChunkClaimName(
+    const unsigned chunkIndex,
+    const unsigned workerIndex)
+{
+    std::ostringstream oss;
+    oss << getChunkTokenName(chunkIndex) << workerInfix << std::setfill('0') << std::setw(4) << workerIndex;
+    return oss.str();
+}
+
+
+
+EdgeRetrieverWorkQueue::
+EdgeRetrieverWorkQueue(
+    const SVLocusSet& set,
+    const unsigned graphNodeMaxEdgeCount,
+    const unsigned chunkCount,
+    const unsigned workerCount,
+    const unsigned workerIndex,
+    const std::string& queueDir) :
+    EdgeRetriever(set,graphNodeMaxEdgeCount),
+    _chunkCount(chunkCount),
+    _workerIndex(workerIndex),
+    _queueDir(queueDir),
+    _scanCount(0)
+{
+    assert(chunkCount > 0);
+    assert(workerCount > 0);
+    assert(workerIndex < workerCount);
+
+    if (! boost::filesystem::is_directory(_queueDir))
+    {
+        std::ostringstream oss;
+        oss << "ERROR: Can't find edge work queue directory: " << _queueDir << '\n';
+        BOOST_THROW_EXCEPTION(illumina::common::LogicException(oss.str()));
+    }
+
+    _firstScanChunk = ((static_cast<unsigned long>(chunkCount)*workerIndex)/workerCount);
+
+    getLocusBeginObservationCounts(_set, _locusBeginCounts);
+    findPreviousClaims();
+}
+
+
+
+void
+EdgeRetrieverWorkQueue::
+findPreviousClaims()
+{
+    using namespace boost::filesystem;
+
+    std::ostringstream oss;
+    oss << workerInfix << std::setfill('0') << std::setw(4) << _workerIndex;
+    const std::string workerSuffix(oss.str());
+
+    const directory_iterator dirEnd;
+    for (directory_iterator dirIter(_queueDir); dirIter != dirEnd; ++dirIter)
+    {
+        const std::string name(dirIter->path().filename().string());
+        if (name.size() <= workerSuffix.size()) continue;
+        const size_t suffixPos(name.size()-workerSuffix.size());
+        if (name.compare(suffixPos, std::string::npos, workerSuffix) != 0) continue;
+        if (name.compare(0, sizeof(chunkPrefix)-1, chunkPrefix) != 0) continue;
+
+        const std::string chunkStr(name.substr(sizeof(chunkPrefix)-1, suffixPos-(sizeof(chunkPrefix)-1)));
+        _previousClaims.push_back(illumina::blt_util::parse_unsigned_str(chunkStr));
+    }
+
+    // process previous claims in descending order from the back of the vector:
+    std::sort(_previousClaims.rbegin(), _previousClaims.rend());
+}
+
+
+
+void
+EdgeRetrieverWorkQueue::
+startChunk(
+    const unsigned chunkIndex)
+{
+    if (chunkIndex >= _chunkCount)
+    {
+        std::ostringstream oss;
+        oss << "ERROR: Edge work queue chunk index " << chunkIndex << " exceeds chunk count " << _chunkCount
+            << " in work queue directory: " << _queueDir << '\n';
+        BOOST_THROW_EXCEPTION(illumina::common::LogicException(oss.str()));
+    }
+
+    _chunkEdger.reset(new EdgeRetrieverBin(_set, _graphNodeMaxEdgeCount, _chunkCount, chunkIndex, _locusBeginCounts));
+}
+
+
+
+bool
+EdgeRetrieverWorkQueue::
+claimNextChunk()
+{
+    using namespace boost::filesystem;
+
+    if (! _previousClaims.empty())
+    {
+        startChunk(_previousClaims.back());
+        _previousClaims.pop_back();
+        return true;
+    }
+
+    const path queuePath(_queueDir);
+    while (_scanCount < _chunkCount)
+    {
+        const unsigned chunkIndex((_firstScanChunk + _scanCount) % _chunkCount);
+        _scanCount++;
+
+        // rename is atomic, so at most one worker can claim each token:
+        boost::system::error_code ec;
+        rename(queuePath / getChunkTokenName(chunkIndex), queuePath / getChunkClaimName(chunkIndex, _workerIndex), ec);
+        if (ec)
+        {
+            // the token is already claimed by another worker:
+            if (ec == boost::system::errc::no_such_file_or_directory) continue;
+
+            std::ostringstream oss;
+            oss << "ERROR: Can't claim edge work queue chunk " << chunkIndex << " in directory: " << _queueDir
+                << " : " << ec.message() << '\n';
+            BOOST_THROW_EXCEPTION(illumina::common::LogicException(oss.str()));
+        }
+
+        startChunk(chunkIndex);
+        return true;
+    }
+    return false;
+}
+
+
+
+bool
+EdgeRetrieverWorkQueue::
+next()
+{
+    while (true)
+    {
+        if (_chunkEdger && _chunkEdger->next())
+        {
+            _edge = _chunkEdger->getEdge();
+            return true;
+        }
+
+        if (! claimNextChunk()) return false;
+    }
+}
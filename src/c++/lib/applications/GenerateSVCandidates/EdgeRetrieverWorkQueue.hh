@@ -0,0 +1,91 @@
+// -*- mode: c++; indent-tabs-mode: nil; -*-
+//
+// Manta - Structural Variant and Indel Caller
+// Copyright (c) 2013-2016 Illumina, Inc.
+//
+// This program is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// at your option) any later version.
+//
+// This program is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with this program.  If not, see <http://www.gnu.org/licenses/>.
+//
+//
+
+#pragma once
+
+#include "EdgeRetrieverBin.hh"
+
+#include <memory>
+#include <string>
+#include <vector>
+
+
+/// provide an iterator over edges in a set of SV locus graphs
+///
+/// designed to allow dynamic load balancing of the graph processing across
+/// a set of workers: edges are divided into many chunks with similar total
+/// edge observation counts, and each worker claims chunks from a work queue
+/// shared by all workers until the queue is empty
+///
+/// the work queue is a directory holding one token file per unclaimed chunk,
+/// named 'chunk.NNNNNN'. A worker claims a chunk by renaming its token to
+/// 'chunk.NNNNNN.worker.NNNN', which only one worker can do. Chunks claimed by
+/// this worker index in a previous run are processed again before any new
+/// chunk is claimed, so that a restarted worker reproduces all of its output.
+///
+struct EdgeRetrieverWorkQueue final : public EdgeRetriever
+{
+    /// \param[in] graphNodeMaxEdgeCount filtration parameter for skipping edges
+    ///            from highly connected nodes (set to zero to disable)
+    /// \param[in] chunkCount total number of edge chunks in the work queue, must be 1 or greater
+    /// \param[in] workerCount total number of workers sharing the work queue, must be 1 or greater
+    /// \param[in] workerIndex worker id, must be less than workerCount
+    /// \param[in] queueDir work queue directory, holding tokens for all unclaimed chunks
+    EdgeRetrieverWorkQueue(
+        const SVLocusSet& set,
+        const unsigned graphNodeMaxEdgeCount,
+        const unsigned chunkCount,
+        const unsigned workerCount,
+        const unsigned workerIndex,
+        const std::string& queueDir);
+
+    bool
+    next() override;
+
+private:
+    /// find chunks claimed by this worker in a previous run
+    void
+    findPreviousClaims();
+
+    /// claim the next chunk from the queue and setup edge iteration over it
+    ///
+    /// \return false if no chunk could be claimed
+    bool
+    claimNextChunk();
+
+    void
+    startChunk(
+        const unsigned chunkIndex);
+
+    const unsigned _chunkCount;
+    const unsigned _workerIndex;
+    const std::string _queueDir;
+
+    /// chunks to process before claiming chunks from the queue
+    std::vector<unsigned> _previousClaims;
+
+    /// workers scan the queue for tokens from a different starting chunk, so that each worker
+    /// claims a contiguous range of edges when the workload is balanced
+    unsigned _firstScanChunk;
+    unsigned _scanCount;
+
+    std::vector<unsigned long> _locusBeginCounts;
+    std::unique_ptr<EdgeRetrieverBin> _chunkEdger;
+};
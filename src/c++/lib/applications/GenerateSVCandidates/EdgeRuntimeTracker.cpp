@@ -23,6 +23,7 @@
 ///
 
 #include "EdgeRuntimeTracker.hh"
+#include "EdgeCostModel.hh"
 
 #include "common/Exceptions.hh"
 
@@ -35,45 +36,82 @@
 
 EdgeRuntimeTracker::
 EdgeRuntimeTracker(
-    const std::string& outputFile) :
+    const std::string& outputFile,
+    const double minLogSeconds) :
     _osPtr(nullptr),
+    _minLogSeconds(minLogSeconds),
     _cand(0),
     _compCand(0),
     _assmCand(0),
-    _assmCompCand(0)
+    _assmCompCand(0),
+    _startDecompressedBytes(0)
 {
     if (outputFile.empty()) return;
-    _osPtr = new std::ofstream(outputFile.c_str());
-    if (! *_osPtr)
+    _ofsPtr.reset(new std::ofstream(outputFile.c_str()));
+    if (! *_ofsPtr)
     {
         std::ostringstream oss;
         oss << "ERROR: Can't open output file: " << outputFile << '\n';
         BOOST_THROW_EXCEPTION(illumina::common::LogicException(oss.str()));
     }
 
+    _osPtr = _ofsPtr.get();
     *_osPtr << std::setprecision(4);
 }
 
 
 
+EdgeRuntimeTracker::
+EdgeRuntimeTracker(
+    std::ostream* osPtr,
+    const double minLogSeconds) :
+    _osPtr(osPtr),
+    _minLogSeconds(minLogSeconds),
+    _cand(0),
+    _compCand(0),
+    _assmCand(0),
+    _assmCompCand(0),
+    _startDecompressedBytes(0)
+{
+    if (nullptr != _osPtr) *_osPtr << std::setprecision(4);
+}
+
+
+
+// making the dtor explicit and in the cpp allows unique_ptr to work reliably:
 EdgeRuntimeTracker::
 ~EdgeRuntimeTracker()
+{}
+
+
+
+/// write node region in 1-indexed samtools region format
+static
+void
+writeNodeRegion(
+    const SVLocusSet& set,
+    const LocusIndexType locusIndex,
+    const NodeIndexType nodeIndex,
+    std::ostream& os)
 {
-    if (nullptr != _osPtr) delete _osPtr;
+    const GenomeInterval& interval(set.getLocus(locusIndex).getNode(nodeIndex).getInterval());
+    os << set.header.chrom_data[interval.tid].label << ':'
+       << (interval.range.begin_pos()+1) << '-' << interval.range.end_pos();
 }
 
 
 
 void
 EdgeRuntimeTracker::
-stop(const EdgeInfo& edge)
+stop(
+    const EdgeInfo& edge,
+    const SVLocusSet& set)
 {
     edgeTime.stop();
     const double lastTime(edgeTime.getWallSeconds());
 
     /// the purpose of the log is to identify the most troublesome cases only, so cutoff the output at a minimum time:
-    static const double minLogTime(0.5);
-    if (lastTime >= minLogTime)
+    if (lastTime >= _minLogSeconds)
     {
         if (nullptr != _osPtr)
         {
@@ -87,6 +125,12 @@ stop(const EdgeInfo& edge)
                     << '\t' << assmTime.getWallSeconds()
                     << '\t' << remoteTime.getWallSeconds()
                     << '\t' << scoreTime.getWallSeconds()
+                    << '\t';
+            writeNodeRegion(set, edge.locusIndex, edge.nodeIndex1, *_osPtr);
+            *_osPtr << '\t';
+            writeNodeRegion(set, edge.locusIndex, edge.nodeIndex2, *_osPtr);
+            *_osPtr << '\t' << getEdgeObservationCount(set.getLocus(edge.locusIndex), edge)
+                    << '\t' << (bam_streamer::getThreadDecompressedBytes() - _startDecompressedBytes)
                     << '\n';
         }
     }
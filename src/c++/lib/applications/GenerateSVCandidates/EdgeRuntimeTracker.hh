@@ -25,20 +25,33 @@
 #pragma once
 
 #include "blt_util/time_util.hh"
+#include "htsapi/bam_streamer.hh"
+#include "manta/RemoteMateReadUtil.hh"
 #include "svgraph/EdgeInfo.hh"
+#include "svgraph/SVLocusSet.hh"
 
 #include "boost/utility.hpp"
 
 
 #include <iosfwd>
+#include <memory>
 
 
 
 /// simple edge time tracker and reporter
 struct EdgeRuntimeTracker : private boost::noncopyable
 {
-    explicit
-    EdgeRuntimeTracker(const std::string& outputFile);
+    /// \param[in] minLogSeconds only edges taking at least this time are logged
+    EdgeRuntimeTracker(
+        const std::string& outputFile,
+        const double minLogSeconds);
+
+    /// log edges to an existing stream instead of a file
+    ///
+    /// \param[in] osPtr if null, no edges are logged
+    EdgeRuntimeTracker(
+        std::ostream* osPtr,
+        const double minLogSeconds);
 
     ~EdgeRuntimeTracker();
 
@@ -50,16 +63,22 @@ struct EdgeRuntimeTracker : private boost::noncopyable
         assmTime.clear();
         scoreTime.clear();
         remoteTime.clear();
+        remoteCacheCounts.clear();
 
         edgeTime.resume();
         _cand = 0;
         _compCand = 0;
         _assmCand = 0;
         _assmCompCand = 0;
+        _startDecompressedBytes = bam_streamer::getThreadDecompressedBytes();
     }
 
+    /// stop timing the edge, and log the edge's time, node regions, observation count and decompressed
+    /// BAM bytes if it exceeds the minimum log time
     void
-    stop(const EdgeInfo& edge);
+    stop(
+        const EdgeInfo& edge,
+        const SVLocusSet& set);
 
     CpuTimes
     getLastEdgeTime() const
@@ -67,6 +86,13 @@ struct EdgeRuntimeTracker : private boost::noncopyable
         return edgeTime.getTimes();
     }
 
+    /// wall time spent on the current edge so far
+    double
+    getEdgeWallSeconds() const
+    {
+        return edgeTime.getTimes().wall;
+    }
+
     void
     addCand(const bool isComplex)
     {
@@ -85,12 +111,18 @@ struct EdgeRuntimeTracker : private boost::noncopyable
     TimeTracker assmTime;
     TimeTracker scoreTime;
     TimeTracker remoteTime;
+    RemoteMateReadCacheCounts remoteCacheCounts;
 private:
+    std::unique_ptr<std::ostream> _ofsPtr;
     std::ostream* _osPtr;
+    const double _minLogSeconds;
     TimeTracker edgeTime;
 
     unsigned _cand;
     unsigned _compCand;
     unsigned _assmCand;
     unsigned _assmCompCand;
+
+    /// decompressed BAM bytes read by this thread at the start of the edge
+    unsigned long _startDecompressedBytes;
 };
@@ -34,9 +34,11 @@
 GSCEdgeStatsManager::
 GSCEdgeStatsManager(
     const std::string& outputFile)
-    : _osPtr(nullptr)
+    : _isTrackStats(false),
+      _osPtr(nullptr)
 {
     if (outputFile.empty()) return;
+    _isTrackStats = true;
     _osPtr = new std::ofstream(outputFile.c_str());
     if (! *_osPtr)
     {
@@ -50,6 +52,14 @@ GSCEdgeStatsManager(
 
 
 
+GSCEdgeStatsManager::
+GSCEdgeStatsManager()
+    : _isTrackStats(true),
+      _osPtr(nullptr)
+{}
+
+
+
 GSCEdgeStatsManager::
 ~GSCEdgeStatsManager()
 {
@@ -44,15 +44,28 @@ struct GSCEdgeStatsManager : private boost::noncopyable
     GSCEdgeStatsManager(
         const std::string& outputFile);
 
+    /// accumulate stats in memory only, so that they can be merged into another manager
+    GSCEdgeStatsManager();
+
     ~GSCEdgeStatsManager();
 
+    /// add all edge stats accumulated by rhs
+    void
+    merge(
+        const GSCEdgeStatsManager& rhs)
+    {
+        if (! _isTrackStats) return;
+
+        edgeStats.merge(rhs.edgeStats);
+    }
+
     void
     updateEdgeCandidates(
         const EdgeInfo& edge,
         const unsigned candCount,
         const SVFinderStats& finderStats)
     {
-        if (_osPtr == nullptr) return;
+        if (! _isTrackStats) return;
 
         GSCEdgeGroupStats& gStats(getStatsGroup(edge));
         gStats.totalInputEdgeCount++;
@@ -67,7 +80,7 @@ struct GSCEdgeStatsManager : private boost::noncopyable
         const unsigned mjComplexCount,
         const unsigned mjSpanningFilterCount)
     {
-        if (_osPtr == nullptr) return;
+        if (! _isTrackStats) return;
 
         GSCEdgeGroupStats& gStats(getStatsGroup(edge));
         gStats.totalComplexCandidate += mjComplexCount;
@@ -80,7 +93,7 @@ struct GSCEdgeStatsManager : private boost::noncopyable
         const unsigned junctionCount,
         const bool isComplex)
     {
-        if (_osPtr == nullptr) return;
+        if (! _isTrackStats) return;
 
         GSCEdgeGroupStats& gStats(getStatsGroup(edge));
         gStats.totalJunctionCount+=junctionCount;
@@ -95,7 +108,7 @@ struct GSCEdgeStatsManager : private boost::noncopyable
         const bool isSpanning,
         const bool isOverlapSkip = false)
     {
-        if (_osPtr == nullptr) return;
+        if (! _isTrackStats) return;
 
         GSCEdgeGroupStats& gStats(getStatsGroup(edge));
         gStats.totalAssemblyCandidates += assemblyCount;
@@ -110,18 +123,43 @@ struct GSCEdgeStatsManager : private boost::noncopyable
         }
     }
 
+    /// count junctions whose assembly was skipped because their edge exceeded the assembly budget
+    void
+    updateAssemblyBudgetSkip(
+        const EdgeInfo& edge,
+        const unsigned junctionCount)
+    {
+        if (! _isTrackStats) return;
+
+        GSCEdgeGroupStats& gStats(getStatsGroup(edge));
+        gStats.totalJunctionAssemblyBudgetSkips += junctionCount;
+    }
+
+    /// count junctions assembled from reads downsampled to the maximum assembly read count
+    void
+    updateAssemblyDownsample(
+        const EdgeInfo& edge)
+    {
+        if (! _isTrackStats) return;
+
+        GSCEdgeGroupStats& gStats(getStatsGroup(edge));
+        gStats.totalJunctionAssemblyDownsamples++;
+    }
+
     void
     updateScoredEdgeTime(
         const EdgeInfo& edge,
         const EdgeRuntimeTracker& edgeTracker)
     {
-        if (_osPtr == nullptr) return;
+        if (! _isTrackStats) return;
 
         GSCEdgeGroupStats& gStats(getStatsGroup(edge));
         gStats.totalTime.merge(edgeTracker.getLastEdgeTime());
         gStats.candTime.merge(edgeTracker.candTime.getTimes());
         gStats.assemblyTime.merge(edgeTracker.assmTime.getTimes());
         gStats.scoringTime.merge(edgeTracker.scoreTime.getTimes());
+        gStats.remoteReadCacheHitCount += edgeTracker.remoteCacheCounts.hitCount;
+        gStats.remoteReadCacheMissCount += edgeTracker.remoteCacheCounts.missCount;
     }
 
 private:
@@ -132,6 +170,7 @@ private:
         return (edge.isSelfEdge() ? edgeStats.edgeData.selfEdges : edgeStats.edgeData.remoteEdges);
     }
 
+    bool _isTrackStats;
     std::ostream* _osPtr;
     TimeTracker lifeTime;
     GSCEdgeStats edgeStats;
@@ -0,0 +1,145 @@
+// -*- mode: c++; indent-tabs-mode: nil; -*-
+//
+// Manta - Structural Variant and Indel Caller
+// Copyright (c) 2013-2016 Illumina, Inc.
+//
+// This program is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// at your option) any later version.
+//
+// This program is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with this program.  If not, see <http://www.gnu.org/licenses/>.
+//
+//
+
+#include "GSCEdgeWorker.hh"
+
+#include "common/Exceptions.hh"
+
+
+
+/// provide additional edge details, intended for attachment to an in-flight exception:
+static
+void
+dumpEdgeInfo(
+    const EdgeInfo& edge,
+    const SVLocusSet& set,
+    std::ostream& os)
+{
+    os << edge;
+    os << "\tnode1:" << set.getLocus(edge.locusIndex).getNode(edge.nodeIndex1);
+    os << "\tnode2:" << set.getLocus(edge.locusIndex).getNode(edge.nodeIndex2);
+}
+
+
+
+/// move the contents of oss to the end of str
+static
+void
+moveStreamText(
+    std::ostringstream& oss,
+    std::string& str)
+{
+    str += oss.str();
+    oss.str("");
+}
+
+
+
+GSCEdgeWorker::
+GSCEdgeWorker(
+    const GSCOptions& opt,
+    const SVLocusSet& set,
+    const char* progName,
+    const char* progVersion,
+    const bool isWriteHeader) :
+    _opt(opt),
+    _set(set),
+    _readScanner(opt.scanOpt, opt.statsFilename, opt.alignFileOpt.alignmentFilename, opt.isRNA, !opt.isUnstrandedRNA),
+    _edgeTracker((opt.edgeRuntimeFilename.empty() ? nullptr : &_edgeRuntimeOs), opt.edgeRuntimeLogMinSeconds),
+    _svFind(opt, _readScanner, set, _edgeTracker, _edgeStatMan),
+    _svMJFilter(opt, _edgeStatMan),
+    _svProcessor(opt, _readScanner, progName, progVersion, set,
+                 SVWriterStreams(_candOs, _dipOs, _somOs, _tumOs), isWriteHeader,
+                 _edgeTracker, _edgeStatMan)
+{}
+
+
+
+void
+GSCEdgeWorker::
+processEdge(
+    const EdgeInfo& edge,
+    GSCEdgeOutput& output)
+{
+    const unsigned sampleSize(_opt.alignFileOpt.alignmentFilename.size());
+
+    output.clear();
+    output.svSupports.supportSamples.resize(sampleSize);
+
+    try
+    {
+        _edgeTracker.start();
+
+        if (_opt.isVerbose)
+        {
+            log_os << __FUNCTION__ << ": starting analysis of edge: ";
+            dumpEdgeInfo(edge,_set,log_os);
+        }
+
+        // find number, type and breakend range (or better: breakend distro) of SVs on this edge:
+        _svFind.findCandidateSV(edge, _svData, _svs);
+
+        // filter long-range junctions outside of the candidate finder so that we can evaluate
+        // junctions which are part of a larger event (like a reciprocal translocation)
+        _svMJFilter.filterGroupCandidateSV(edge, _svs, _mjSVs);
+
+        // determine if this is the only edge for this node:
+        _svProcessor.evaluateCandidates(edge, _mjSVs, _svData, output.svSupports);
+    }
+    catch (illumina::common::ExceptionData& e)
+    {
+        std::ostringstream oss;
+        dumpEdgeInfo(edge,_set,oss);
+        e << illumina::common::ExceptionMsg(oss.str());
+        throw;
+    }
+    catch (...)
+    {
+        log_os << "Exception caught while processing graph component: ";
+        dumpEdgeInfo(edge,_set,log_os);
+        throw;
+    }
+
+    _edgeTracker.stop(edge, _set);
+    if (_opt.isVerbose)
+    {
+        log_os << __FUNCTION__ << ": Time to process last edge: ";
+        _edgeTracker.getLastEdgeTime().reportSec(log_os);
+        log_os << "\n";
+    }
+
+    _edgeStatMan.updateScoredEdgeTime(edge, _edgeTracker);
+
+    getOutput(output);
+}
+
+
+
+void
+GSCEdgeWorker::
+getOutput(
+    GSCEdgeOutput& output)
+{
+    moveStreamText(_candOs, output.candidateVcf);
+    moveStreamText(_dipOs, output.diploidVcf);
+    moveStreamText(_somOs, output.somaticVcf);
+    moveStreamText(_tumOs, output.tumorVcf);
+    moveStreamText(_edgeRuntimeOs, output.edgeRuntimeLog);
+}
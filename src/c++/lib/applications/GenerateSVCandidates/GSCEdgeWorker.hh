@@ -0,0 +1,180 @@
+// -*- mode: c++; indent-tabs-mode: nil; -*-
+//
+// Manta - Structural Variant and Indel Caller
+// Copyright (c) 2013-2016 Illumina, Inc.
+//
+// This program is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// at your option) any later version.
+//
+// This program is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with this program.  If not, see <http://www.gnu.org/licenses/>.
+//
+//
+
+#pragma once
+
+#include "EdgeRuntimeTracker.hh"
+#include "GSCEdgeStatsManager.hh"
+#include "GSCOptions.hh"
+#include "SVCandidateProcessor.hh"
+#include "SVFinder.hh"
+#include "SVSupports.hh"
+
+#include "blt_util/log.hh"
+#include "manta/MultiJunctionUtil.hh"
+#include "manta/SVLocusScanner.hh"
+#include "manta/SVMultiJunctionCandidate.hh"
+
+#include "boost/utility.hpp"
+
+#include <iostream>
+#include <sstream>
+#include <string>
+#include <vector>
+
+
+/// TODO temporarily shoved here, needs a better home:
+struct MultiJunctionFilter
+{
+    MultiJunctionFilter(
+        const GSCOptions& opt,
+        GSCEdgeStatsManager& edgeStatMan)
+        : _opt(opt),
+          _edgeStatMan(edgeStatMan)
+    {}
+
+    void
+    filterGroupCandidateSV(
+        const EdgeInfo& edge,
+        const std::vector<SVCandidate>& svs,
+        std::vector<SVMultiJunctionCandidate>& mjSVs)
+    {
+        unsigned mjComplexCount(0);
+        unsigned mjSpanningFilterCount(0);
+        findMultiJunctionCandidates(svs, _opt.minCandidateSpanningCount, mjComplexCount, mjSpanningFilterCount, mjSVs);
+        _edgeStatMan.updateMJFilter(edge, mjComplexCount, mjSpanningFilterCount);
+
+        if (_opt.isVerbose)
+        {
+            unsigned junctionCount(mjSVs.size());
+            unsigned candidateCount(0);
+            for (const SVMultiJunctionCandidate& mj : mjSVs)
+            {
+                candidateCount += mj.junction.size();
+            }
+            log_os << __FUNCTION__ << ": Low-resolution candidate filtration complete. "
+                   << "candidates: " << candidateCount << " "
+                   << "junctions: " << junctionCount << " "
+                   << "complex: " << mjComplexCount << " "
+                   << "spanningfilt: " << mjSpanningFilterCount << "\n";
+        }
+#ifdef DEBUG_GSV
+        log_os << __FUNCTION__ << ": final candidate list";
+        const unsigned junctionCount(mjSVs.size());
+        for (unsigned junctionIndex(0); junctionIndex< junctionCount; ++junctionIndex)
+        {
+            const auto& mj(mjSVs[junctionIndex]);
+            const unsigned junctionCandCount(mj.junction.size());
+            log_os << __FUNCTION__ << ": JUNCTION " << junctionIndex << " with " << junctionCandCount << " candidates\n";
+            for (unsigned junctionCandIndex(0); junctionCandIndex< junctionCandCount; ++junctionCandIndex)
+            {
+                log_os << __FUNCTION__ << ":  JUNCTION " << junctionIndex << " Candidate "
+                       << junctionCandIndex << " " << mj.junction[junctionCandIndex] << "\n";
+            }
+        }
+#endif
+    }
+
+private:
+    const GSCOptions& _opt;
+    GSCEdgeStatsManager& _edgeStatMan;
+};
+
+
+/// all output produced by a GSCEdgeWorker while processing one edge
+///
+/// the output of each edge is held until the output of all preceding edges has been
+/// written, so that output is identical for any number of worker threads
+struct GSCEdgeOutput
+{
+    void
+    clear()
+    {
+        candidateVcf.clear();
+        diploidVcf.clear();
+        somaticVcf.clear();
+        tumorVcf.clear();
+        edgeRuntimeLog.clear();
+        svSupports.supportSamples.clear();
+    }
+
+    std::string candidateVcf;
+    std::string diploidVcf;
+    std::string somaticVcf;
+    std::string tumorVcf;
+    std::string edgeRuntimeLog;
+    SupportSamples svSupports;
+};
+
+
+/// candidate generation state of a single worker thread
+///
+/// each worker has its own alignment file streams, read scanner, assembler, scorer and
+/// edge statistics, so that workers can process edges on separate threads while sharing
+/// a single copy of the SV locus graph
+///
+struct GSCEdgeWorker : private boost::noncopyable
+{
+    /// \param[in] isWriteHeader if true, the VCF headers are included in the first output
+    GSCEdgeWorker(
+        const GSCOptions& opt,
+        const SVLocusSet& set,
+        const char* progName,
+        const char* progVersion,
+        const bool isWriteHeader);
+
+    /// find, assemble and score all SV candidates of one edge
+    void
+    processEdge(
+        const EdgeInfo& edge,
+        GSCEdgeOutput& output);
+
+    /// move all output produced since the last call into output
+    void
+    getOutput(
+        GSCEdgeOutput& output);
+
+    const GSCEdgeStatsManager&
+    getEdgeStatsManager() const
+    {
+        return _edgeStatMan;
+    }
+
+private:
+    const GSCOptions& _opt;
+    const SVLocusSet& _set;
+
+    std::ostringstream _candOs;
+    std::ostringstream _dipOs;
+    std::ostringstream _somOs;
+    std::ostringstream _tumOs;
+    std::ostringstream _edgeRuntimeOs;
+
+    const SVLocusScanner _readScanner;
+    EdgeRuntimeTracker _edgeTracker;
+    GSCEdgeStatsManager _edgeStatMan;
+    SVFinder _svFind;
+    MultiJunctionFilter _svMJFilter;
+    SVCandidateProcessor _svProcessor;
+
+    SVCandidateSetData _svData;
+    std::vector<SVCandidate> _svs;
+    std::vector<SVMultiJunctionCandidate> _mjSVs;
+};
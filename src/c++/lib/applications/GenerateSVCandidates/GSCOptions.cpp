@@ -75,7 +75,7 @@ parseGSCOptions(
     po::options_description req("configuration");
     req.add_options()
     ("graph-file", po::value(&opt.graphFilename),
-     "sv locus graph file (required)")
+     "sv locus graph file, in the regular or locus-indexed format (required)")
     ("align-stats", po::value(&opt.statsFilename),
      "pre-computed alignment statistics for the input alignment files (required)")
     ("chrom-depth", po::value(&opt.chromDepthFilename),
@@ -86,6 +86,8 @@ parseGSCOptions(
      "optional truth VCF file (for testing)")
     ("edge-runtime-log", po::value(&opt.edgeRuntimeFilename),
      "optionally log time for long-running edges to this file")
+    ("edge-runtime-log-min-seconds", po::value(&opt.edgeRuntimeLogMinSeconds)->default_value(opt.edgeRuntimeLogMinSeconds),
+     "only log edges taking at least this many seconds to the edge runtime log")
     ("edge-stats-log", po::value(&opt.edgeStatsFilename),
      "optionally log aggregate edge statistics to this file")
     ("candidate-output-file", po::value(&opt.candidateOutputFilename),
@@ -96,6 +98,8 @@ parseGSCOptions(
      "Write somatic SVs to file (at least one tumor and non-tumor alignment file must be specified)")
     ("tumor-output-file", po::value(&opt.tumorOutputFilename),
      "Write tumor SVs to file (at least one tumor alignment file must be specified)")
+    ("threads", po::value(&opt.workerThreadCount)->default_value(opt.workerThreadCount),
+     "number of threads processing the edges of this bin in parallel, output is identical for any thread count")
     ("verbose", po::value(&opt.isVerbose)->zero_tokens(),
      "Turn on low-detail INFO logging.")
     ("skip-assembly", po::value(&opt.isSkipAssembly)->zero_tokens(),
@@ -104,6 +108,19 @@ parseGSCOptions(
      "Turn off all scoring models and output candidates only.")
     ("skip-remote-reads", po::value(&opt.isSkipRemoteReads)->zero_tokens(),
      "Turn off remote mapq0 read search for assembly (reduces assembly success for insertions/mobile elements).")
+    ("remote-read-cache-mb", po::value(&opt.remoteReadCacheMegabytes)->default_value(opt.remoteReadCacheMegabytes),
+     "Approximate memory limit in megabytes for the cache of remote mapq0 mate reads kept by each thread, so that"
+     " edges sharing a remote locus don't read it again. Set to 0 to disable the cache.")
+    ("edge-max-assembly-reads", po::value(&opt.edgeMaxAssemblyReads)->default_value(opt.edgeMaxAssemblyReads),
+     "Deterministically downsample the reads collected for each breakend assembly to this count."
+     " Set to 0 for no limit.")
+    ("edge-max-assembly-candidates", po::value(&opt.edgeMaxAssemblyCandidates)->default_value(opt.edgeMaxAssemblyCandidates),
+     "Skip assembly for all SV candidates of an edge with more candidates than this, these candidates are scored"
+     " from paired read evidence only. Set to 0 for no limit.")
+    ("edge-max-assembly-seconds", po::value(&opt.edgeMaxAssemblySeconds)->default_value(opt.edgeMaxAssemblySeconds),
+     "Skip assembly for the remaining SV candidates of an edge once the edge has run for this many wall seconds,"
+     " these candidates are scored from paired read evidence only. Output depends on run time when this is set."
+     " Set to 0 for no limit.")
     ("rna", po::value(&opt.isRNA)->zero_tokens(),
      "For RNA input. Skip small deletions and modify diploid scoring.")
     ("unstranded", po::value(&opt.isUnstrandedRNA)->zero_tokens(),
@@ -164,6 +181,14 @@ parseGSCOptions(
     {
         errorMsg="Need the FASTA reference file";
     }
+    else if (opt.workerThreadCount < 1)
+    {
+        errorMsg="Thread count must be at least 1";
+    }
+    else if (opt.edgeMaxAssemblySeconds < 0)
+    {
+        errorMsg="Edge assembly time budget can't be negative";
+    }
 
     if (! errorMsg.empty()) usage(log_os,prog,visible,errorMsg.c_str());
 
@@ -175,6 +200,10 @@ parseGSCOptions(
     {
         checkStandardizeUsageFile(log_os,prog,visible,opt.chromDepthFilename,"chromosome depth");
     }
+    if (! opt.edgeOpt.binCostModelFilename.empty())
+    {
+        checkStandardizeUsageFile(log_os,prog,visible,opt.edgeOpt.binCostModelFilename,"edge cost model");
+    }
     if (opt.candidateOutputFilename.empty())
     {
         usage(log_os,prog,visible,"Must specify candidate output file");
@@ -56,6 +56,7 @@ struct GSCOptions
     std::string truthVcfFilename;
     std::string edgeRuntimeFilename;
     std::string edgeStatsFilename;
+    double edgeRuntimeLogMinSeconds = 0.5; ///< only log edges taking at least this time to the edge runtime log
 
     std::string candidateOutputFilename;
     std::string diploidOutputFilename;
@@ -63,6 +64,8 @@ struct GSCOptions
     std::string tumorOutputFilename;
     std::string supportBamStub;
 
+    unsigned workerThreadCount = 1; ///< number of threads processing edges in parallel, all threads share one copy of the SV locus graph
+
     bool isVerbose = false; ///< provide some high-level log info to assist in debugging
 
     bool isSkipAssembly = false; ///< if true, skip assembly and run a low-resolution, breakdancer-like subset of the workflow
@@ -71,6 +74,13 @@ struct GSCOptions
 
     bool isSkipRemoteReads = false; ///< if true, don't search for non-local mapq0 mate pairs for assembly
 
+    unsigned remoteReadCacheMegabytes = 64; ///< approximate memory limit of the remote mate read cache of each thread, 0 disables the cache
+
+    /// per-edge assembly budget, a value of 0 leaves the corresponding budget unlimited:
+    unsigned edgeMaxAssemblyReads = 0; ///< reads collected for each assembly are deterministically downsampled to this count
+    unsigned edgeMaxAssemblyCandidates = 0; ///< assembly is skipped for all candidates of edges with more candidates than this
+    double edgeMaxAssemblySeconds = 0; ///< assembly is skipped for the remaining candidates of an edge after this many wall seconds
+
     bool isRNA = false; ///< if true, RNA specific filtering on candidates and diploid scoring is used
 
     bool isUnstrandedRNA = false; /// For unstranded RNA data, the direction of fusion transcripts is unknown
@@ -24,54 +24,85 @@
 
 #include "GenerateSVCandidates.hh"
 #include "EdgeRetrieverBin.hh"
+#include "EdgeRetrieverCostBin.hh"
+#include "EdgeRetrieverLocality.hh"
 #include "EdgeRetrieverLocus.hh"
+#include "EdgeRetrieverWorkQueue.hh"
+#include "GSCEdgeWorker.hh"
 #include "GSCOptions.hh"
-#include "SVCandidateProcessor.hh"
-#include "SVFinder.hh"
 #include "SVSupports.hh"
 
 #include "blt_util/log.hh"
 #include "common/Exceptions.hh"
-#include "manta/MultiJunctionUtil.hh"
+#include "common/OutStream.hh"
 #include "manta/SVCandidateUtil.hh"
+#include "svgraph/MappedSVLocusGraph.hh"
 
+#include "boost/utility.hpp"
+
+#include <cassert>
+#include <condition_variable>
+#include <exception>
 #include <iostream>
+#include <map>
+#include <memory>
+#include <mutex>
 #include <string>
+#include <thread>
+#include <vector>
 
 //#define DEBUG_GSV
 
 
-/// provide additional edge details, intended for attachment to an in-flight exception:
-static
-void
-dumpEdgeInfo(
-    const EdgeInfo& edge,
-    const SVLocusSet& set,
-    std::ostream& os)
-{
-    os << edge;
-    os << "\tnode1:" << set.getLocus(edge.locusIndex).getNode(edge.nodeIndex1);
-    os << "\tnode2:" << set.getLocus(edge.locusIndex).getNode(edge.nodeIndex2);
-}
-
-
-
 /// we can either traverse all edges in a single locus (disjoint subgraph) of the graph
 /// OR
 /// traverse all edges in one "bin" -- that is, one out of binCount subsets of the total
 /// graph edges. Each bin is designed to be of roughly equal size in terms of total
 /// anticipated workload, so that we have good parallel processing performance.
+/// OR
+/// traverse all edges in chunks claimed from a work queue shared with other workers,
+/// so that the workload is balanced dynamically
+///
+/// bins are balanced by total edge observation count, or by total estimated edge cost if a
+/// cost model is provided
+///
+/// the edges of a bin or locus can optionally be reordered by the genomic position of their nodes
+///
+/// locusBeginCounts must be provided when set only contains the loci of the selected bin
 ///
 static
 EdgeRetriever*
 edgeRFactory(
     const SVLocusSet& set,
-    const EdgeOptions& opt)
+    const EdgeOptions& opt,
+    const std::string& chromDepthFilename,
+    const std::vector<unsigned long>& locusBeginCounts)
 {
-    if (opt.isLocusIndex)
+    if (opt.isLocalityOrder)
+    {
+        EdgeOptions sourceOpt(opt);
+        sourceOpt.isLocalityOrder = false;
+        std::unique_ptr<EdgeRetriever> sourcePtr(edgeRFactory(set, sourceOpt, chromDepthFilename, locusBeginCounts));
+        return (new EdgeRetrieverLocality(set, opt.graphNodeMaxEdgeCount, *sourcePtr));
+    }
+    else if (opt.isLocusIndex)
     {
         return (new EdgeRetrieverLocus(set, opt.graphNodeMaxEdgeCount, opt.locusOpt));
     }
+    else if (! opt.workQueueDir.empty())
+    {
+        return (new EdgeRetrieverWorkQueue(set, opt.graphNodeMaxEdgeCount, opt.workChunkCount, opt.binCount,
+                                           opt.binIndex, opt.workQueueDir));
+    }
+    else if (! opt.binCostModelFilename.empty())
+    {
+        const EdgeCostModel costModel(opt.binCostModelFilename, chromDepthFilename, set.header);
+        return (new EdgeRetrieverCostBin(set, opt.graphNodeMaxEdgeCount, opt.binCount, opt.binIndex, costModel));
+    }
+    else if (! locusBeginCounts.empty())
+    {
+        return (new EdgeRetrieverBin(set, opt.graphNodeMaxEdgeCount, opt.binCount, opt.binIndex, locusBeginCounts));
+    }
     else
     {
         return (new EdgeRetrieverBin(set, opt.graphNodeMaxEdgeCount, opt.binCount, opt.binIndex));
@@ -79,64 +110,6 @@ edgeRFactory(
 }
 
 
-/// TODO temporarily shoved here, needs a better home:
-struct MultiJunctionFilter
-{
-    MultiJunctionFilter(
-        const GSCOptions& opt,
-        GSCEdgeStatsManager& edgeStatMan)
-        : _opt(opt),
-          _edgeStatMan(edgeStatMan)
-    {}
-
-    void
-    filterGroupCandidateSV(
-        const EdgeInfo& edge,
-        const std::vector<SVCandidate>& svs,
-        std::vector<SVMultiJunctionCandidate>& mjSVs)
-    {
-        unsigned mjComplexCount(0);
-        unsigned mjSpanningFilterCount(0);
-        findMultiJunctionCandidates(svs, _opt.minCandidateSpanningCount, mjComplexCount, mjSpanningFilterCount, mjSVs);
-        _edgeStatMan.updateMJFilter(edge, mjComplexCount, mjSpanningFilterCount);
-
-        if (_opt.isVerbose)
-        {
-            unsigned junctionCount(mjSVs.size());
-            unsigned candidateCount(0);
-            for (const SVMultiJunctionCandidate& mj : mjSVs)
-            {
-                candidateCount += mj.junction.size();
-            }
-            log_os << __FUNCTION__ << ": Low-resolution candidate filtration complete. "
-                   << "candidates: " << candidateCount << " "
-                   << "junctions: " << junctionCount << " "
-                   << "complex: " << mjComplexCount << " "
-                   << "spanningfilt: " << mjSpanningFilterCount << "\n";
-        }
-#ifdef DEBUG_GSV
-        log_os << __FUNCTION__ << ": final candidate list";
-        const unsigned junctionCount(mjSVs.size());
-        for (unsigned junctionIndex(0); junctionIndex< junctionCount; ++junctionIndex)
-        {
-            const auto& mj(mjSVs[junctionIndex]);
-            const unsigned junctionCandCount(mj.junction.size());
-            log_os << __FUNCTION__ << ": JUNCTION " << junctionIndex << " with " << junctionCandCount << " candidates\n";
-            for (unsigned junctionCandIndex(0); junctionCandIndex< junctionCandCount; ++junctionCandIndex)
-            {
-                log_os << __FUNCTION__ << ":  JUNCTION " << junctionIndex << " Candidate "
-                       << junctionCandIndex << " " << mj.junction[junctionCandIndex] << "\n";
-            }
-        }
-#endif
-    }
-
-private:
-    const GSCOptions& _opt;
-    GSCEdgeStatsManager& _edgeStatMan;
-};
-
-
 #if 0
 /// edge indices+graph evidence counts and regions:
 ///
@@ -159,125 +132,366 @@ struct ReducedGraphInfo
 
 
 
+/// load the SV locus graph
+///
+/// when the graph file is in the locus-indexed format, only the loci which can be visited by
+/// the edge iteration options are loaded, and locusBeginCounts is set to the cumulative
+/// observation counts of the full graph (see getLocusBeginObservationCounts), otherwise the
+/// full graph is loaded and locusBeginCounts is empty
+///
 static
 void
-runGSC(
+loadGraph(
     const GSCOptions& opt,
-    const char* progName,
-    const char* progVersion)
+    SVLocusSet& set,
+    std::vector<unsigned long>& locusBeginCounts)
 {
-#if 0
+    locusBeginCounts.clear();
+    if (MappedSVLocusGraph::isMappedGraphFile(opt.graphFilename))
     {
-        // to save memory, load the graph and process/store only the information we need from it:
-    }
-#endif
+        // load only the loci visited by this process, directly from the shared read-only file mapping:
+        const MappedSVLocusGraph graph(opt.graphFilename);
+        graph.getLocusBeginObservationCounts(locusBeginCounts);
 
-    EdgeRuntimeTracker edgeTracker(opt.edgeRuntimeFilename);
-    GSCEdgeStatsManager edgeStatMan(opt.edgeStatsFilename);
-
-    const SVLocusScanner readScanner(opt.scanOpt, opt.statsFilename, opt.alignFileOpt.alignmentFilename, opt.isRNA, !opt.isUnstrandedRNA);
+        std::vector<bool> isLoadLocus;
+        const EdgeOptions& edgeOpt(opt.edgeOpt);
+        if (edgeOpt.isLocusIndex)
+        {
+            isLoadLocus.resize(graph.size(),false);
+            if (edgeOpt.locusOpt.locusIndex < graph.size()) isLoadLocus[edgeOpt.locusOpt.locusIndex] = true;
+        }
+        else if (edgeOpt.workQueueDir.empty() && edgeOpt.binCostModelFilename.empty())
+        {
+            unsigned beginLocusIndex(0);
+            unsigned endLocusIndex(0);
+            getBinLocusRange(locusBeginCounts, edgeOpt.binCount, edgeOpt.binIndex, beginLocusIndex, endLocusIndex);
+            isLoadLocus.resize(graph.size(),false);
+            std::fill(isLoadLocus.begin()+beginLocusIndex, isLoadLocus.begin()+endLocusIndex, true);
+        }
 
-    SVFinder svFind(opt, readScanner, edgeTracker,edgeStatMan);
-    MultiJunctionFilter svMJFilter(opt,edgeStatMan);
-    const SVLocusSet& cset(svFind.getSet());
+        set.loadLocusIndexed(graph, isLoadLocus);
+    }
+    else
+    {
+        set.load(opt.graphFilename.c_str(),true);
+    }
+}
 
-    SVCandidateProcessor svProcessor(opt, readScanner, progName, progVersion, cset, edgeTracker, edgeStatMan);
 
-    std::unique_ptr<EdgeRetriever> edgerPtr(edgeRFactory(cset, opt.edgeOpt));
-    EdgeRetriever& edger(*edgerPtr);
 
-    SVCandidateSetData svData;
-    std::vector<SVCandidate> svs;
-    std::vector<SVMultiJunctionCandidate> mjSVs;
+/// hands out edges to all worker threads, and writes the output of each edge in the order
+/// the edges were retrieved
+///
+/// the output of edges which finish ahead of an earlier edge is held until the earlier edge
+/// finishes, so edges are only handed out while the number of edges retrieved ahead of the
+/// next edge to be written stays within a small multiple of the worker count. This bounds the
+/// held output when a single edge is much slower than the rest.
+///
+struct GSCEdgeDispatcher : private boost::noncopyable
+{
+    GSCEdgeDispatcher(
+        const GSCOptions& opt,
+        EdgeRetriever& edger) :
+        _edger(edger),
+        _maxEdgeLookahead(maxEdgeLookaheadPerWorker * opt.workerThreadCount),
+        _isStopped(false),
+        _nextEdgeIndex(0),
+        _nextWriteIndex(0),
+        _isWriting(false),
+        _candfs(opt.candidateOutputFilename),
+        _dipfs(opt.diploidOutputFilename),
+        _somfs(opt.somaticOutputFilename),
+        _tumfs(opt.tumorOutputFilename),
+        _edgeRuntimefs(opt.edgeRuntimeFilename)
+    {
+        if (! opt.supportBamStub.empty())
+        {
+            const unsigned sampleSize(opt.alignFileOpt.alignmentFilename.size());
+            for (unsigned idx(0); idx<sampleSize; ++idx)
+            {
+                std::string alignmentFile(opt.alignFileOpt.alignmentFilename[idx]);
+                bam_streamer_ptr bamStreamPtr(new bam_streamer(alignmentFile.c_str()));
+                _origBamStreamPtrs.push_back(bamStreamPtr);
+
+                std::string supportBamName(opt.supportBamStub
+                                           + ".bam_" + std::to_string(idx)
+                                           + ".bam");
+                const bam_hdr_t& header(bamStreamPtr->get_header());
+                bam_dumper_ptr bamDumperPtr(new bam_dumper(supportBamName.c_str(), header));
+                _supportBamDumperPtrs.push_back(bamDumperPtr);
+            }
+        }
+    }
 
-    const unsigned sampleSize(opt.alignFileOpt.alignmentFilename.size());
-    std::vector<bam_streamer_ptr> origBamStreamPtrs;
-    std::vector<bam_dumper_ptr> supportBamDumperPtrs;
+    /// get the next edge to process, waiting while too many edges are ahead of the next edge
+    /// to be written
+    ///
+    /// \return false when all edges have been retrieved, or processing has been stopped
+    bool
+    nextEdge(
+        unsigned& edgeIndex,
+        EdgeInfo& edge)
+    {
+        std::unique_lock<std::mutex> lock(_dispatchMutex);
+        _lookaheadCondition.wait(lock, [this]
+        {
+            return (_isStopped || ((_nextEdgeIndex - _nextWriteIndex) < _maxEdgeLookahead));
+        });
+        if (_isStopped) return false;
+        if (! _edger.next()) return false;
+        edgeIndex = _nextEdgeIndex++;
+        edge = _edger.getEdge();
+        return true;
+    }
 
-    const bool isGenerateSupportBam(opt.supportBamStub.size() > 0);
-    if (isGenerateSupportBam)
+    /// stop handing out edges, so that all workers finish after their current edge
+    void
+    stop()
     {
-        for (unsigned idx(0); idx<sampleSize; ++idx)
         {
-            std::string alignmentFile(opt.alignFileOpt.alignmentFilename[idx]);
-            bam_streamer_ptr bamStreamPtr(new bam_streamer(alignmentFile.c_str()));
-            origBamStreamPtrs.push_back(bamStreamPtr);
-
-            std::string supportBamName(opt.supportBamStub
-                                       + ".bam_" + std::to_string(idx)
-                                       + ".bam");
-            const bam_hdr_t& header(bamStreamPtr->get_header());
-            bam_dumper_ptr bamDumperPtr(new bam_dumper(supportBamName.c_str(), header));
-            supportBamDumperPtrs.push_back(bamDumperPtr);
+            std::lock_guard<std::mutex> lock(_dispatchMutex);
+            _isStopped = true;
         }
+        _lookaheadCondition.notify_all();
     }
 
-    if (opt.isVerbose)
+    /// write output which does not belong to any edge, such as VCF headers, before any edge output
+    void
+    writeInitialOutput(
+        GSCEdgeOutput& output)
     {
-        log_os << __FUNCTION__ << ": " << cset.header << "\n";
+        std::lock_guard<std::mutex> writeLock(_writeMutex);
+        assert(_nextWriteIndex == 0);
+        write(output);
     }
 
-    while (edger.next())
+    /// write the output of edge edgeIndex once the output of all preceding edges is written,
+    /// the contents of output are moved
+    ///
+    /// output is written outside of the dispatch lock, so that other workers can hand over
+    /// output or get new edges during the write. Only one worker writes at a time: it
+    /// keeps writing until no more output is ready, while other workers only queue their output.
+    void
+    writeEdgeOutput(
+        const unsigned edgeIndex,
+        GSCEdgeOutput& output)
     {
-        const EdgeInfo& edge(edger.getEdge());
-
-        try
+        std::vector<GSCEdgeOutput> readyOutput;
         {
-            edgeTracker.start();
+            std::lock_guard<std::mutex> lock(_dispatchMutex);
+            std::swap(_pendingOutput[edgeIndex], output);
+            if (_isWriting) return;
+            if (! takeReadyOutput(readyOutput)) return;
+        }
 
-            if (opt.isVerbose)
+        while (true)
+        {
             {
-                log_os << __FUNCTION__ << ": starting analysis of edge: ";
-                dumpEdgeInfo(edge,cset,log_os);
+                std::lock_guard<std::mutex> writeLock(_writeMutex);
+                for (GSCEdgeOutput& edgeOutput : readyOutput)
+                {
+                    write(edgeOutput);
+                }
             }
+            readyOutput.clear();
 
-            // find number, type and breakend range (or better: breakend distro) of SVs on this edge:
-            svFind.findCandidateSV(edge, svData, svs);
+            std::lock_guard<std::mutex> lock(_dispatchMutex);
+            if (! takeReadyOutput(readyOutput)) return;
+        }
+    }
 
-            // filter long-range junctions outside of the candidate finder so that we can evaluate
-            // junctions which are part of a larger event (like a reciprocal translocation)
-            svMJFilter.filterGroupCandidateSV(edge, svs, mjSVs);
+private:
+    /// move all pending output which is next in edge order into readyOutput, and update the
+    /// writing state accordingly. Must be called with the dispatch lock held.
+    ///
+    /// \return true if any output was moved, in which case the caller becomes the writer
+    bool
+    takeReadyOutput(
+        std::vector<GSCEdgeOutput>& readyOutput)
+    {
+        while (true)
+        {
+            const auto pendingIter(_pendingOutput.find(_nextWriteIndex));
+            if (pendingIter == _pendingOutput.end()) break;
+            readyOutput.emplace_back();
+            std::swap(readyOutput.back(), pendingIter->second);
+            _pendingOutput.erase(pendingIter);
+            _nextWriteIndex++;
+        }
 
+        _isWriting = (! readyOutput.empty());
+        if (_isWriting) _lookaheadCondition.notify_all();
+        return _isWriting;
+    }
 
-            SupportSamples svSupports;
-            svSupports.supportSamples.resize(sampleSize);
-            // determine if this is the only edge for this node:
-            svProcessor.evaluateCandidates(edge, mjSVs, svData, svSupports);
+    static
+    void
+    writeText(
+        const std::string& text,
+        OutStream& outs)
+    {
+        if (text.empty()) return;
+        outs.getStream() << text;
+    }
 
-            // write supporting reads into bam files
-            if (isGenerateSupportBam)
-            {
-                for (unsigned idx(0); idx<sampleSize; ++idx)
-                {
-                    writeSupportBam(origBamStreamPtrs[idx],
-                                    svSupports.supportSamples[idx],
-                                    supportBamDumperPtrs[idx]);
-                }
-            }
+    void
+    write(
+        GSCEdgeOutput& output)
+    {
+        writeText(output.candidateVcf, _candfs);
+        writeText(output.diploidVcf, _dipfs);
+        writeText(output.somaticVcf, _somfs);
+        writeText(output.tumorVcf, _tumfs);
+        writeText(output.edgeRuntimeLog, _edgeRuntimefs);
+
+        // write supporting reads into bam files
+        const unsigned sampleSize(_origBamStreamPtrs.size());
+        if (output.svSupports.supportSamples.size() < sampleSize) return;
+        for (unsigned idx(0); idx<sampleSize; ++idx)
+        {
+            writeSupportBam(_origBamStreamPtrs[idx],
+                            output.svSupports.supportSamples[idx],
+                            _supportBamDumperPtrs[idx]);
         }
-        catch (illumina::common::ExceptionData& e)
+    }
+
+    /// number of edges which can be retrieved ahead of the next edge to be written, per worker
+    static const unsigned maxEdgeLookaheadPerWorker = 4;
+
+    EdgeRetriever& _edger;
+    const unsigned _maxEdgeLookahead;
+
+    /// guards edge retrieval, the pending output and the writing state
+    std::mutex _dispatchMutex;
+    std::condition_variable _lookaheadCondition;
+    bool _isStopped;
+    unsigned _nextEdgeIndex;
+    unsigned _nextWriteIndex;
+    bool _isWriting;
+    std::map<unsigned, GSCEdgeOutput> _pendingOutput;
+
+    /// guards the output streams
+    std::mutex _writeMutex;
+    OutStream _candfs;
+    OutStream _dipfs;
+    OutStream _somfs;
+    OutStream _tumfs;
+    OutStream _edgeRuntimefs;
+    std::vector<bam_streamer_ptr> _origBamStreamPtrs;
+    std::vector<bam_dumper_ptr> _supportBamDumperPtrs;
+};
+
+
+
+/// process edges from dispatcher until none remain
+static
+void
+runEdgeWorker(
+    GSCEdgeWorker& worker,
+    GSCEdgeDispatcher& dispatcher)
+{
+    unsigned edgeIndex(0);
+    EdgeInfo edge;
+    GSCEdgeOutput output;
+    while (dispatcher.nextEdge(edgeIndex, edge))
+    {
+        worker.processEdge(edge, output);
+        dispatcher.writeEdgeOutput(edgeIndex, output);
+    }
+}
+
+
+
+/// run a worker on its own thread, any exception is stored in errorPtr and stops all other workers
+static
+void
+runEdgeWorkerThread(
+    GSCEdgeWorker& worker,
+    GSCEdgeDispatcher& dispatcher,
+    std::exception_ptr& errorPtr)
+{
+    try
+    {
+        runEdgeWorker(worker, dispatcher);
+    }
+    catch (...)
+    {
+        errorPtr = std::current_exception();
+        dispatcher.stop();
+    }
+}
+
+
+
+static
+void
+runGSC(
+    const GSCOptions& opt,
+    const char* progName,
+    const char* progVersion)
+{
+#if 0
+    {
+        // to save memory, load the graph and process/store only the information we need from it:
+    }
+#endif
+
+    GSCEdgeStatsManager edgeStatMan(opt.edgeStatsFilename);
+
+    // the graph is loaded once and shared by all workers:
+    SVLocusSet set;
+    std::vector<unsigned long> locusBeginCounts;
+    loadGraph(opt, set, locusBeginCounts);
+    const SVLocusSet& cset(set);
+
+    std::unique_ptr<EdgeRetriever> edgerPtr(edgeRFactory(cset, opt.edgeOpt, opt.chromDepthFilename, locusBeginCounts));
+    GSCEdgeDispatcher dispatcher(opt, *edgerPtr);
+
+    const unsigned workerCount(opt.workerThreadCount);
+    std::vector<std::unique_ptr<GSCEdgeWorker>> workers;
+    for (unsigned workerIndex(0); workerIndex<workerCount; ++workerIndex)
+    {
+        const bool isWriteHeader((0 == opt.edgeOpt.binIndex) && (0 == workerIndex));
+        workers.emplace_back(new GSCEdgeWorker(opt, cset, progName, progVersion, isWriteHeader));
+
+        GSCEdgeOutput headerOutput;
+        workers.back()->getOutput(headerOutput);
+        dispatcher.writeInitialOutput(headerOutput);
+    }
+
+    if (opt.isVerbose)
+    {
+        log_os << __FUNCTION__ << ": " << cset.header << "\n";
+    }
+
+    if (workerCount == 1)
+    {
+        runEdgeWorker(*workers.front(), dispatcher);
+    }
+    else
+    {
+        std::vector<std::exception_ptr> workerErrors(workerCount);
+        std::vector<std::thread> workerThreads;
+        for (unsigned workerIndex(0); workerIndex<workerCount; ++workerIndex)
         {
-            std::ostringstream oss;
-            dumpEdgeInfo(edge,cset,oss);
-            e << illumina::common::ExceptionMsg(oss.str());
-            throw;
+            workerThreads.emplace_back(runEdgeWorkerThread, std::ref(*workers[workerIndex]),
+                                       std::ref(dispatcher), std::ref(workerErrors[workerIndex]));
         }
-        catch (...)
+
+        for (std::thread& workerThread : workerThreads)
         {
-            log_os << "Exception caught while processing graph component: ";
-            dumpEdgeInfo(edge,cset,log_os);
-            throw;
+            workerThread.join();
         }
 
-        edgeTracker.stop(edge);
-        if (opt.isVerbose)
+        for (const std::exception_ptr& errorPtr : workerErrors)
         {
-            log_os << __FUNCTION__ << ": Time to process last edge: ";
-            edgeTracker.getLastEdgeTime().reportSec(log_os);
-            log_os << "\n";
+            if (errorPtr) std::rethrow_exception(errorPtr);
         }
+    }
 
-        edgeStatMan.updateScoredEdgeTime(edge, edgeTracker);
+    for (const auto& worker : workers)
+    {
+        edgeStatMan.merge(worker->getEdgeStatsManager());
     }
 }
 
@@ -1060,10 +1060,12 @@ SVCandidateAssemblyRefiner(
     _opt(opt),
     _header(header),
     _smallSVAssembler(opt.scanOpt, opt.refineOpt.smallSVAssembleOpt, opt.alignFileOpt,
-                      opt.statsFilename, opt.chromDepthFilename, header, counts, opt.isRNA, edgeTracker.remoteTime),
+                      opt.statsFilename, opt.chromDepthFilename, header, counts, opt.isRNA,
+                      opt.remoteReadCacheMegabytes, opt.edgeMaxAssemblyReads, edgeTracker.remoteTime, edgeTracker.remoteCacheCounts),
     _spanningAssembler(opt.scanOpt,
                        !opt.isRNA ? opt.refineOpt.spanningAssembleOpt : opt.refineOpt.RNAspanningAssembleOpt,
-                       opt.alignFileOpt, opt.statsFilename, opt.chromDepthFilename, header, counts, opt.isRNA, edgeTracker.remoteTime),
+                       opt.alignFileOpt, opt.statsFilename, opt.chromDepthFilename, header, counts, opt.isRNA,
+                       opt.remoteReadCacheMegabytes, opt.edgeMaxAssemblyReads, edgeTracker.remoteTime, edgeTracker.remoteCacheCounts),
     _smallSVAligner(opt.refineOpt.smallSVAlignScores),
     _largeSVAligner(opt.refineOpt.largeSVAlignScores,opt.refineOpt.largeGapOpenScore),
     _largeInsertEdgeAligner(opt.refineOpt.largeInsertEdgeAlignScores),
@@ -1473,7 +1475,7 @@ getJumpAssembly(
         sv.bp1, sv.bp2,
         bporient.isBp1Reversed, bporient.isBp2Reversed,
         assemblyData.bp1ref, assemblyData.bp2ref,
-        assemblyData.contigs);
+        assemblyData.contigs, assemblyData.isReadsDownsampled);
 
     std::string bp1refSeq = assemblyData.bp1ref.seq();
     std::string bp2refSeq = assemblyData.bp2ref.seq();
@@ -1792,7 +1794,7 @@ getSmallSVAssembly(
     const bool isSearchRemoteInsertionReads((! _opt.isSkipRemoteReads) && isFindLargeInsertions);
 
     // assemble contigs in the breakend region
-    _smallSVAssembler.assembleSingleSVBreakend(sv.bp1, assemblyData.bp1ref, isSearchRemoteInsertionReads, assemblyData.remoteReads, assemblyData.contigs);
+    _smallSVAssembler.assembleSingleSVBreakend(sv.bp1, assemblyData.bp1ref, isSearchRemoteInsertionReads, assemblyData.remoteReads, assemblyData.contigs, assemblyData.isReadsDownsampled);
 
 #ifdef DEBUG_REFINER
     log_os << __FUNCTION__ << ": align1RefSize/Seq: " << align1RefStr.size() << '\n';
@@ -23,6 +23,7 @@
 ///
 
 #include "SVCandidateProcessor.hh"
+#include "manta/SVCandidateUtil.hh"
 #include "manta/SVMultiJunctionCandidateUtil.hh"
 #include "svgraph/EdgeInfoUtil.hh"
 
@@ -41,24 +42,22 @@ SVWriter(
     const SVLocusScanner& readScanner,
     const SVLocusSet& cset,
     const char* progName,
-    const char* progVersion) :
+    const char* progVersion,
+    const SVWriterStreams& streams,
+    const bool isWriteHeader) :
     opt(initOpt),
     isSomatic(! opt.somaticOutputFilename.empty()),
     isTumorOnly(! opt.tumorOutputFilename.empty()),
     svScore(opt, readScanner, cset.header),
-    candfs(opt.candidateOutputFilename),
-    dipfs(opt.diploidOutputFilename),
-    somfs(opt.somaticOutputFilename),
-    tumfs(opt.tumorOutputFilename),
-    candWriter(opt.referenceFilename, opt.isRNA, cset,candfs.getStream()),
+    candWriter(opt.referenceFilename, opt.isRNA, cset,streams.candOs),
     diploidWriter(opt.diploidOpt, (! opt.chromDepthFilename.empty()),
-                  opt.referenceFilename,  opt.isRNA, cset,dipfs.getStream()),
+                  opt.referenceFilename,  opt.isRNA, cset,streams.dipOs),
     somWriter(opt.somaticOpt, (! opt.chromDepthFilename.empty()),
-              opt.referenceFilename, cset,somfs.getStream()),
+              opt.referenceFilename, cset,streams.somOs),
     tumorWriter(opt.tumorOpt, (! opt.chromDepthFilename.empty()),
-                opt.referenceFilename, cset,tumfs.getStream())
+                opt.referenceFilename, cset,streams.tumOs)
 {
-    if (0 == opt.edgeOpt.binIndex)
+    if (isWriteHeader)
     {
         std::vector<std::string> noSampleNames;
         candWriter.writeHeader(progName, progVersion,noSampleNames);
@@ -389,6 +388,8 @@ SVCandidateProcessor(
     const char* progName,
     const char* progVersion,
     const SVLocusSet& cset,
+    const SVWriterStreams& streams,
+    const bool isWriteHeader,
     EdgeRuntimeTracker& edgeTracker,
     GSCEdgeStatsManager& edgeStatMan) :
     _opt(opt),
@@ -396,7 +397,7 @@ SVCandidateProcessor(
     _edgeTracker(edgeTracker),
     _edgeStatMan(edgeStatMan),
     _svRefine(opt, cset.header, cset.getCounts(), _edgeTracker),
-    _svWriter(opt, readScanner, cset, progName, progVersion)
+    _svWriter(opt, readScanner, cset, progName, progVersion, streams, isWriteHeader)
 {}
 
 
@@ -423,10 +424,14 @@ evaluateCandidates(
         }
     }
 
+    // skip assembly for every candidate of an edge exceeding the candidate count budget:
+    const bool isCandidateBudgetSkip((_opt.edgeMaxAssemblyCandidates > 0) &&
+                                     (mjSVs.size() > _opt.edgeMaxAssemblyCandidates));
+
     _svRefine.clearEdgeData();
     for (const auto& cand : mjSVs)
     {
-        evaluateCandidate(edge,cand,svData,isFindLargeInsertions, svSupports);
+        evaluateCandidate(edge,cand,svData,isFindLargeInsertions, isCandidateBudgetSkip, svSupports);
     }
 }
 
@@ -439,6 +444,7 @@ evaluateCandidate(
     const SVMultiJunctionCandidate& mjCandidateSV,
     const SVCandidateSetData& svData,
     const bool isFindLargeInsertions,
+    const bool isCandidateBudgetSkip,
     SupportSamples& svSupports)
 {
     assert(! mjCandidateSV.junction.empty());
@@ -468,7 +474,30 @@ evaluateCandidate(
     bool isAnySmallAssembler(false);
     std::vector<SVCandidateAssemblyData> mjAssemblyData(junctionCount);
 
+    // skip assembly once the edge exceeds its assembly budget, candidates are then scored from paired read
+    // evidence only:
+    bool isBudgetSkip(false);
     if (! _opt.isSkipAssembly)
+    {
+        isBudgetSkip = (isCandidateBudgetSkip ||
+                        ((_opt.edgeMaxAssemblySeconds > 0) &&
+                         (_edgeTracker.getEdgeWallSeconds() >= _opt.edgeMaxAssemblySeconds)));
+    }
+
+    if (isBudgetSkip)
+    {
+        for (unsigned junctionIndex(0); junctionIndex<junctionCount; ++junctionIndex)
+        {
+            SVCandidateAssemblyData& assemblyData(mjAssemblyData[junctionIndex]);
+            assemblyData.isBudgetSkip = true;
+
+            // record the spanning status of the original low-resolution candidate, so that spanning candidates
+            // can still be scored:
+            assemblyData.isCandidateSpanning = isSpanningSV(mjCandidateSV.junction[junctionIndex]);
+        }
+        _edgeStatMan.updateAssemblyBudgetSkip(edge, junctionCount);
+    }
+    else if (! _opt.isSkipAssembly)
     {
         const TimeScoper assmTime(_edgeTracker.assmTime);
         for (unsigned junctionIndex(0); junctionIndex<junctionCount; ++junctionIndex)
@@ -482,6 +511,11 @@ evaluateCandidate(
                 log_os << __FUNCTION__ << ": Candidate assembly complete for junction " << junctionIndex << "/" << junctionCount << ". Assembled candidate count: " << assemblyData.svs.size() << "\n";
             }
 
+            if (assemblyData.isReadsDownsampled)
+            {
+                _edgeStatMan.updateAssemblyDownsample(edge);
+            }
+
             if (! assemblyData.svs.empty())
             {
                 const unsigned assemblyCount(assemblyData.svs.size());
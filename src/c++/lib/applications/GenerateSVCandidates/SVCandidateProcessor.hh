@@ -30,7 +30,6 @@
 #include "SVCandidateAssemblyRefiner.hh"
 #include "SVScorer.hh"
 
-#include "common/OutStream.hh"
 #include "manta/JunctionIdGenerator.hh"
 #include "manta/SVCandidateAssemblyData.hh"
 #include "manta/SVMultiJunctionCandidate.hh"
@@ -40,20 +39,45 @@
 #include "format/VcfWriterTumorSV.hh"
 
 
+#include <iosfwd>
 #include <memory>
 
 //#define DEBUG_GSV
 
 
 
+/// destination streams of each VCF output type
+struct SVWriterStreams
+{
+    SVWriterStreams(
+        std::ostream& initCandOs,
+        std::ostream& initDipOs,
+        std::ostream& initSomOs,
+        std::ostream& initTumOs) :
+        candOs(initCandOs),
+        dipOs(initDipOs),
+        somOs(initSomOs),
+        tumOs(initTumOs)
+    {}
+
+    std::ostream& candOs;
+    std::ostream& dipOs;
+    std::ostream& somOs;
+    std::ostream& tumOs;
+};
+
+
 struct SVWriter
 {
+    /// \param[in] isWriteHeader if true, write the VCF headers to all output streams
     SVWriter(
         const GSCOptions& initOpt,
         const SVLocusScanner& readScanner,
         const SVLocusSet& cset,
         const char* progName,
-        const char* progVersion);
+        const char* progVersion,
+        const SVWriterStreams& streams,
+        const bool isWriteHeader);
 
     void
     writeSV(
@@ -73,11 +97,6 @@ struct SVWriter
 
     std::vector<SVModelScoreInfo> mjModelScoreInfo;
 
-    OutStream candfs;
-    OutStream dipfs;
-    OutStream somfs;
-    OutStream tumfs;
-
     VcfWriterCandidateSV candWriter;
     VcfWriterDiploidSV diploidWriter;
     VcfWriterSomaticSV somWriter;
@@ -95,6 +114,8 @@ struct SVCandidateProcessor
         const char* progName,
         const char* progVersion,
         const SVLocusSet& cset,
+        const SVWriterStreams& streams,
+        const bool isWriteHeader,
         EdgeRuntimeTracker& edgeTracker,
         GSCEdgeStatsManager& _edgeStatMan);
 
@@ -113,6 +134,7 @@ private:
         const SVMultiJunctionCandidate& mjCandidateSV,
         const SVCandidateSetData& svData,
         const bool isFindLargeInsertions,
+        const bool isCandidateBudgetSkip,
         SupportSamples& svSupports);
 
     const GSCOptions& _opt;
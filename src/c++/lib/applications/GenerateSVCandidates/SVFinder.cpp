@@ -78,10 +78,12 @@ SVFinder::
 SVFinder(
     const GSCOptions& opt,
     const SVLocusScanner& readScanner,
+    const SVLocusSet& set,
     EdgeRuntimeTracker& edgeTracker,
     GSCEdgeStatsManager& edgeStatMan) :
     _scanOpt(opt.scanOpt),
     _isAlignmentTumor(opt.alignFileOpt.isAlignmentTumor),
+    _set(set),
     _readScanner(readScanner),
     _referenceFilename(opt.referenceFilename),
     _isRNA(opt.isRNA),
@@ -90,9 +92,6 @@ SVFinder(
     _edgeTracker(edgeTracker),
     _edgeStatMan(edgeStatMan)
 {
-    // load in set:
-    _set.load(opt.graphFilename.c_str(),true);
-
     _dFilterPtr.reset(new ChromDepthFilterUtil(opt.chromDepthFilename,_scanOpt.maxDepthFactor,_set.header));
 
     // setup regionless bam_streams:
@@ -41,9 +41,11 @@
 
 struct SVFinder
 {
+    /// \param[in] set the SV locus graph, which can be shared by SVFinder objects on several threads
     SVFinder(
         const GSCOptions& opt,
         const SVLocusScanner& readScanner,
+        const SVLocusSet& set,
         EdgeRuntimeTracker& edgeTracker,
         GSCEdgeStatsManager& edgeStatMan);
 
@@ -130,7 +132,7 @@ private:
 
     const ReadScannerOptions _scanOpt;
     const std::vector<bool> _isAlignmentTumor;
-    SVLocusSet _set;
+    const SVLocusSet& _set;
     std::unique_ptr<ChromDepthFilterUtil> _dFilterPtr;
     const SVLocusScanner& _readScanner;
 
@@ -281,5 +281,57 @@ BOOST_AUTO_TEST_CASE( test_EdgeRetrieverOddBinSelfEdge )
 }
 
 
+
+BOOST_AUTO_TEST_CASE( test_EdgeRetrieverLocusBeginCounts )
+{
+    // check that bins started from precomputed locus observation counts match bins found by scanning the graph:
+    SVLocus locus1;
+    locusAddPair(locus1,1,10,20,2,30,40,false,3);
+    SVLocus locus2;
+    locusAddPair(locus2,3,10,20,3,10,20,true,2);
+    SVLocus locus3;
+    locusAddPair(locus3,5,10,20,6,30,40);
+    SVLocus locus4;
+    locusAddPair(locus4,7,10,20,8,30,40,false,5);
+
+    locus2.mergeSelfOverlap();
+
+    SVLocusSetOptions sopt;
+    sopt.minMergeEdgeObservations = 1;
+    SVLocusSet set1(sopt);
+    set1.merge(locus1);
+    set1.merge(locus2);
+    set1.merge(locus3);
+    set1.merge(locus4);
+    set1.checkState(true,true);
+
+    std::vector<unsigned long> locusBeginCounts;
+    getLocusBeginObservationCounts(set1, locusBeginCounts);
+    BOOST_REQUIRE_EQUAL(locusBeginCounts.size(), set1.size()+1);
+    BOOST_REQUIRE_EQUAL(locusBeginCounts.front(), 0u);
+    BOOST_REQUIRE_EQUAL(locusBeginCounts.back(), set1.totalObservationCount());
+
+    for (unsigned binCount(1); binCount<12; ++binCount)
+    {
+        for (unsigned binIndex(0); binIndex<binCount; ++binIndex)
+        {
+            EdgeRetrieverBin edger(set1, 0, binCount, binIndex);
+            EdgeRetrieverBin edgerFromCounts(set1, 0, binCount, binIndex, locusBeginCounts);
+
+            while (edger.next())
+            {
+                BOOST_REQUIRE( edgerFromCounts.next() );
+                const EdgeInfo& edge(edger.getEdge());
+                const EdgeInfo& edgeFromCounts(edgerFromCounts.getEdge());
+                BOOST_REQUIRE_EQUAL(edge.locusIndex, edgeFromCounts.locusIndex);
+                BOOST_REQUIRE_EQUAL(edge.nodeIndex1, edgeFromCounts.nodeIndex1);
+                BOOST_REQUIRE_EQUAL(edge.nodeIndex2, edgeFromCounts.nodeIndex2);
+            }
+            BOOST_REQUIRE( ! edgerFromCounts.next() );
+        }
+    }
+}
+
+
 BOOST_AUTO_TEST_SUITE_END()
 
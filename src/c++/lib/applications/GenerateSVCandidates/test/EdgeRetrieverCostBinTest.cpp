@@ -0,0 +1,191 @@
+// -*- mode: c++; indent-tabs-mode: nil; -*-
+//
+// Manta - Structural Variant and Indel Caller
+// Copyright (c) 2013-2016 Illumina, Inc.
+//
+// This program is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// at your option) any later version.
+//
+// This program is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with this program.  If not, see <http://www.gnu.org/licenses/>.
+//
+//
+
+#include "boost/test/unit_test.hpp"
+
+#include "applications/GenerateSVCandidates/EdgeRetrieverBin.hh"
+#include "applications/GenerateSVCandidates/EdgeRetrieverCostBin.hh"
+#include "svgraph/SVLocusSet.hh"
+
+#include "svgraph/test/SVLocusTestUtil.hh"
+
+#include "boost/filesystem.hpp"
+
+#include <fstream>
+
+
+/// write a cost model file, and remove it on destruction
+struct TestCostModelFile
+{
+    explicit
+    TestCostModelFile(const char* modelText)
+    {
+        using namespace boost::filesystem;
+
+        filename = (temp_directory_path() / unique_path("EdgeRetrieverCostBinTest.%%%%-%%%%-%%%%.txt")).string();
+        std::ofstream os(filename.c_str());
+        os << modelText;
+    }
+
+    ~TestCostModelFile()
+    {
+        boost::filesystem::remove(filename);
+    }
+
+    std::string filename;
+};
+
+
+
+static
+void
+getTestSet(SVLocusSet& set1)
+{
+    SVLocus locus1;
+    locusAddPair(locus1,1,10,20,2,30,40,false,3);
+    SVLocus locus2;
+    locusAddPair(locus2,3,10,110,3,10,110,true,2);
+    SVLocus locus3;
+    locusAddPair(locus3,5,10,20,6,30,40);
+    SVLocus locus4;
+    locusAddPair(locus4,7,10,20,8,30,40,false,5);
+
+    locus2.mergeSelfOverlap();
+
+    set1.merge(locus1);
+    set1.merge(locus2);
+    set1.merge(locus3);
+    set1.merge(locus4);
+    set1.checkState(true,true);
+}
+
+
+
+BOOST_AUTO_TEST_SUITE( test_EdgeRetrieverCostBin )
+
+
+BOOST_AUTO_TEST_CASE( test_EdgeCostModelFeatures )
+{
+    SVLocusSetOptions sopt;
+    sopt.minMergeEdgeObservations = 1;
+    SVLocusSet set1(sopt);
+    getTestSet(set1);
+
+    const TestCostModelFile modelFile("# test model\nintercept\t1\nobservationCount\t2\nregionSize\t0.5\nselfEdge\t100\n");
+    const EdgeCostModel costModel(modelFile.filename, "", set1.header);
+
+    EdgeInfo edge;
+    edge.locusIndex = 0;
+    edge.nodeIndex1 = 0;
+    edge.nodeIndex2 = 1;
+
+    std::vector<double> features;
+    costModel.getEdgeFeatures(set1, edge, features);
+    BOOST_REQUIRE_EQUAL(features.size(), static_cast<unsigned>(EdgeCostModel::SIZE));
+    BOOST_REQUIRE_EQUAL(features[EdgeCostModel::INTERCEPT], 1.);
+    BOOST_REQUIRE_EQUAL(features[EdgeCostModel::OBSERVATION_COUNT], 3.);
+    BOOST_REQUIRE_EQUAL(features[EdgeCostModel::REGION_SIZE], 20.);
+    BOOST_REQUIRE_EQUAL(features[EdgeCostModel::REGION_DEPTH_SIZE], 0.);
+    BOOST_REQUIRE_EQUAL(features[EdgeCostModel::SELF_EDGE], 0.);
+    BOOST_REQUIRE_CLOSE(costModel.getEdgeCost(set1, edge), 17., 0.0001);
+
+    // the self-edge locus:
+    edge.locusIndex = 1;
+    edge.nodeIndex1 = 0;
+    edge.nodeIndex2 = 0;
+    costModel.getEdgeFeatures(set1, edge, features);
+    BOOST_REQUIRE_EQUAL(features[EdgeCostModel::OBSERVATION_COUNT], 2.);
+    BOOST_REQUIRE_EQUAL(features[EdgeCostModel::REGION_SIZE], 100.);
+    BOOST_REQUIRE_EQUAL(features[EdgeCostModel::SELF_EDGE], 1.);
+    BOOST_REQUIRE_CLOSE(costModel.getEdgeCost(set1, edge), 155., 0.0001);
+}
+
+
+
+BOOST_AUTO_TEST_CASE( test_EdgeRetrieverCostBinAllEdges )
+{
+    // check that cost bins cover all edges exactly once, in graph order
+    SVLocusSetOptions sopt;
+    sopt.minMergeEdgeObservations = 1;
+    SVLocusSet set1(sopt);
+    getTestSet(set1);
+
+    std::vector<EdgeInfo> expectedEdges;
+    {
+        EdgeRetrieverBin edger(set1, 0, 1, 0);
+        while (edger.next()) expectedEdges.push_back(edger.getEdge());
+    }
+    BOOST_REQUIRE_EQUAL(expectedEdges.size(), 4u);
+
+    const TestCostModelFile modelFile("observationCount\t1\nregionSize\t0.1\n");
+    const EdgeCostModel costModel(modelFile.filename, "", set1.header);
+
+    for (unsigned binCount(1); binCount<8; ++binCount)
+    {
+        std::vector<EdgeInfo> edges;
+        for (unsigned binIndex(0); binIndex<binCount; ++binIndex)
+        {
+            EdgeRetrieverCostBin edger(set1, 0, binCount, binIndex, costModel);
+            while (edger.next()) edges.push_back(edger.getEdge());
+        }
+
+        BOOST_REQUIRE_EQUAL(edges.size(), expectedEdges.size());
+        for (unsigned edgeIndex(0); edgeIndex<edges.size(); ++edgeIndex)
+        {
+            BOOST_REQUIRE_EQUAL(edges[edgeIndex].locusIndex, expectedEdges[edgeIndex].locusIndex);
+            BOOST_REQUIRE_EQUAL(edges[edgeIndex].nodeIndex1, expectedEdges[edgeIndex].nodeIndex1);
+            BOOST_REQUIRE_EQUAL(edges[edgeIndex].nodeIndex2, expectedEdges[edgeIndex].nodeIndex2);
+        }
+    }
+}
+
+
+
+BOOST_AUTO_TEST_CASE( test_EdgeRetrieverCostBinBalance )
+{
+    // check that an expensive edge is given its own bin
+    SVLocusSetOptions sopt;
+    sopt.minMergeEdgeObservations = 1;
+    SVLocusSet set1(sopt);
+    getTestSet(set1);
+
+    const TestCostModelFile modelFile("intercept\t1\nselfEdge\t30\n");
+    const EdgeCostModel costModel(modelFile.filename, "", set1.header);
+
+    EdgeRetrieverCostBin edger0(set1, 0, 3, 0, costModel);
+    BOOST_REQUIRE( edger0.next() );
+    BOOST_REQUIRE_EQUAL(edger0.getEdge().locusIndex, 0u);
+    BOOST_REQUIRE( ! edger0.next() );
+
+    EdgeRetrieverCostBin edger1(set1, 0, 3, 1, costModel);
+    BOOST_REQUIRE( edger1.next() );
+    BOOST_REQUIRE_EQUAL(edger1.getEdge().locusIndex, 1u);
+    BOOST_REQUIRE( ! edger1.next() );
+
+    EdgeRetrieverCostBin edger2(set1, 0, 3, 2, costModel);
+    BOOST_REQUIRE( edger2.next() );
+    BOOST_REQUIRE_EQUAL(edger2.getEdge().locusIndex, 2u);
+    BOOST_REQUIRE( edger2.next() );
+    BOOST_REQUIRE_EQUAL(edger2.getEdge().locusIndex, 3u);
+    BOOST_REQUIRE( ! edger2.next() );
+}
+
+
+BOOST_AUTO_TEST_SUITE_END()
@@ -0,0 +1,194 @@
+// -*- mode: c++; indent-tabs-mode: nil; -*-
+//
+// Manta - Structural Variant and Indel Caller
+// Copyright (c) 2013-2016 Illumina, Inc.
+//
+// This program is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// at your option) any later version.
+//
+// This program is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with this program.  If not, see <http://www.gnu.org/licenses/>.
+//
+//
+
+#include "boost/test/unit_test.hpp"
+
+#include "applications/GenerateSVCandidates/EdgeRetrieverWorkQueue.hh"
+#include "svgraph/SVLocusSet.hh"
+
+#include "svgraph/test/SVLocusTestUtil.hh"
+
+#include "boost/filesystem.hpp"
+
+#include <fstream>
+#include <iomanip>
+#include <set>
+#include <sstream>
+#include <tuple>
+
+
+typedef std::tuple<unsigned,unsigned,unsigned> EdgeKey;
+
+
+static
+EdgeKey
+getEdgeKey(const EdgeInfo& edge)
+{
+    return std::make_tuple(edge.locusIndex, edge.nodeIndex1, edge.nodeIndex2);
+}
+
+
+
+/// create a work queue directory with tokens for all chunks, and remove it on destruction
+struct TestWorkQueue
+{
+    explicit
+    TestWorkQueue(const unsigned chunkCount)
+    {
+        using namespace boost::filesystem;
+
+        dir = temp_directory_path() / unique_path("EdgeRetrieverWorkQueueTest.%%%%-%%%%-%%%%");
+        create_directory(dir);
+        for (unsigned chunkIndex(0); chunkIndex<chunkCount; ++chunkIndex)
+        {
+            std::ostringstream oss;
+            oss << "chunk." << std::setfill('0') << std::setw(6) << chunkIndex;
+            std::ofstream((dir / oss.str()).string().c_str());
+        }
+    }
+
+    ~TestWorkQueue()
+    {
+        boost::filesystem::remove_all(dir);
+    }
+
+    std::string
+    getDir() const
+    {
+        return dir.string();
+    }
+
+    boost::filesystem::path dir;
+};
+
+
+
+static
+void
+getTestSet(SVLocusSet& set1)
+{
+    SVLocus locus1;
+    locusAddPair(locus1,1,10,20,2,30,40,false,3);
+    SVLocus locus2;
+    locusAddPair(locus2,3,10,20,3,10,20,true,2);
+    SVLocus locus3;
+    locusAddPair(locus3,5,10,20,6,30,40);
+    SVLocus locus4;
+    locusAddPair(locus4,7,10,20,8,30,40,false,5);
+    SVLocus locus5;
+    locusAddPair(locus5,9,10,20,10,30,40);
+    SVLocus locus6;
+    locusAddPair(locus6,11,10,20,12,30,40,false,2);
+
+    locus2.mergeSelfOverlap();
+
+    set1.merge(locus1);
+    set1.merge(locus2);
+    set1.merge(locus3);
+    set1.merge(locus4);
+    set1.merge(locus5);
+    set1.merge(locus6);
+    set1.checkState(true,true);
+}
+
+
+
+BOOST_AUTO_TEST_SUITE( test_EdgeRetrieverWorkQueue )
+
+
+BOOST_AUTO_TEST_CASE( test_EdgeRetrieverWorkQueueWorkers )
+{
+    // check that interleaved workers retrieve every edge of the graph exactly once
+    SVLocusSetOptions sopt;
+    sopt.minMergeEdgeObservations = 1;
+    SVLocusSet set1(sopt);
+    getTestSet(set1);
+
+    std::set<EdgeKey> expectedEdges;
+    {
+        EdgeRetrieverBin edger(set1, 0, 1, 0);
+        while (edger.next()) expectedEdges.insert(getEdgeKey(edger.getEdge()));
+    }
+    BOOST_REQUIRE_EQUAL(expectedEdges.size(), 6u);
+
+    static const unsigned chunkCount(9);
+    TestWorkQueue queue(chunkCount);
+
+    EdgeRetrieverWorkQueue edger0(set1, 0, chunkCount, 2, 0, queue.getDir());
+    EdgeRetrieverWorkQueue edger1(set1, 0, chunkCount, 2, 1, queue.getDir());
+
+    std::set<EdgeKey> edges;
+    bool isMore0(true);
+    bool isMore1(true);
+    while (isMore0 || isMore1)
+    {
+        if (isMore0) isMore0 = edger0.next();
+        if (isMore0)
+        {
+            BOOST_REQUIRE(edges.insert(getEdgeKey(edger0.getEdge())).second);
+        }
+        if (isMore1) isMore1 = edger1.next();
+        if (isMore1)
+        {
+            BOOST_REQUIRE(edges.insert(getEdgeKey(edger1.getEdge())).second);
+        }
+    }
+
+    BOOST_REQUIRE(edges == expectedEdges);
+}
+
+
+
+BOOST_AUTO_TEST_CASE( test_EdgeRetrieverWorkQueueRestart )
+{
+    // check that a restarted worker retrieves the edges of all chunks it claimed before
+    SVLocusSetOptions sopt;
+    sopt.minMergeEdgeObservations = 1;
+    SVLocusSet set1(sopt);
+    getTestSet(set1);
+
+    static const unsigned chunkCount(4);
+    TestWorkQueue queue(chunkCount);
+
+    std::set<EdgeKey> firstEdges;
+    {
+        EdgeRetrieverWorkQueue edger(set1, 0, chunkCount, 2, 1, queue.getDir());
+        while (edger.next()) firstEdges.insert(getEdgeKey(edger.getEdge()));
+    }
+
+    std::set<EdgeKey> restartEdges;
+    {
+        EdgeRetrieverWorkQueue edger(set1, 0, chunkCount, 2, 1, queue.getDir());
+        while (edger.next()) restartEdges.insert(getEdgeKey(edger.getEdge()));
+    }
+
+    std::set<EdgeKey> otherWorkerEdges;
+    {
+        EdgeRetrieverWorkQueue edger(set1, 0, chunkCount, 2, 0, queue.getDir());
+        while (edger.next()) otherWorkerEdges.insert(getEdgeKey(edger.getEdge()));
+    }
+
+    BOOST_REQUIRE_EQUAL(firstEdges.size(), 6u);
+    BOOST_REQUIRE(restartEdges == firstEdges);
+    BOOST_REQUIRE(otherWorkerEdges.empty());
+}
+
+
+BOOST_AUTO_TEST_SUITE_END()
@@ -64,6 +64,15 @@ parseMSLOptions(const illumina::Program& prog,
      "file listing all input sv locus graph files, one filename per line (specified only once)")
     ("output-file", po::value(&opt.outputFilename),
      "merged output sv locus graph file")
+    ("intermediate-output", po::value(&opt.isIntermediateOutput)->zero_tokens(),
+     "write an unfinalized graph, intended as input to a later merge, this skips the final edge cleaning step")
+    ("check-state", po::value(&opt.isCheckState)->zero_tokens(),
+     "rigorously check the consistency of the merged graph before it is written")
+    ("stats-output-file", po::value(&opt.statsFilename),
+     "write global statistics of the merged graph to this file (optional)")
+    ("locus-indexed-output-file", po::value(&opt.locusIndexedOutputFilename),
+     "also write the merged graph to this file in the locus-indexed format, which candidate generation can memory map "
+     "and load partially (optional)")
     ("verbose", po::value(&opt.isVerbose)->zero_tokens(),
      "provide additional progress logging");
 
@@ -147,5 +156,9 @@ parseMSLOptions(const illumina::Program& prog,
     {
         usage(log_os,prog,visible, "Must specify a graph output file");
     }
+    if (opt.isIntermediateOutput && (! opt.statsFilename.empty()))
+    {
+        usage(log_os,prog,visible, "Can't write graph statistics for an intermediate graph");
+    }
 }
 
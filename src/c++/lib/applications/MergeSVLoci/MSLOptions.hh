@@ -33,13 +33,27 @@
 struct MSLOptions
 {
     MSLOptions() :
-        isVerbose(false)
+        isVerbose(false),
+        isIntermediateOutput(false),
+        isCheckState(false)
     {}
 
     std::vector<std::string> graphFilename;
     std::string graphFilenameList;
     std::string outputFilename;
     bool isVerbose;
+
+    /// if true, the output graph is an intermediate result which will be merged again, so graph cleaning is skipped
+    bool isIntermediateOutput;
+
+    /// if true, check the consistency of the merged graph before it is written
+    bool isCheckState;
+
+    /// if not empty, write global stats of the merged graph to this file
+    std::string statsFilename;
+
+    /// if not empty, also write the merged graph to this file in the locus-indexed format
+    std::string locusIndexedOutputFilename;
 };
 
 
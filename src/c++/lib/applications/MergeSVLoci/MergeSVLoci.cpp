@@ -38,8 +38,16 @@ runMSL(const MSLOptions& opt)
     TimeTracker timer;
     timer.resume();
     {
-        // early test that we have permission to write to output file
+        // early test that we have permission to write to output files
         OutStream outs(opt.outputFilename);
+        if (! opt.statsFilename.empty())
+        {
+            OutStream statsOuts(opt.statsFilename);
+        }
+        if (! opt.locusIndexedOutputFilename.empty())
+        {
+            OutStream indexedOuts(opt.locusIndexedOutputFilename);
+        }
     }
 
     SVLocusSet mergedSet;
@@ -68,14 +76,41 @@ runMSL(const MSLOptions& opt)
         }
     }
 
-    mergedSet.finalize();
-    if (opt.isVerbose)
+    if (! opt.isIntermediateOutput)
     {
-        log_os << "INFO: Finished cleaning merged graph.\n";
+        mergedSet.finalize();
+        if (opt.isVerbose)
+        {
+            log_os << "INFO: Finished cleaning merged graph.\n";
+        }
     }
     timer.stop();
-    mergedSet.setMergeTime(timer.getTimes());
+
+    // input graphs from earlier merges contribute their merge time to the total:
+    mergedSet.addMergeTime(timer.getTimes());
+
+    // the check and stats are run on the in-memory graph, to avoid reloading the output graph in separate processes:
+    if (opt.isCheckState)
+    {
+        mergedSet.checkState(true,true);
+        if (opt.isVerbose)
+        {
+            log_os << "INFO: Finished checking merged graph.\n";
+        }
+    }
+
+    if (! opt.statsFilename.empty())
+    {
+        OutStream statsOuts(opt.statsFilename);
+        mergedSet.dumpStats(statsOuts.getStream());
+    }
+
     mergedSet.save(opt.outputFilename.c_str());
+
+    if (! opt.locusIndexedOutputFilename.empty())
+    {
+        mergedSet.saveLocusIndexed(opt.locusIndexedOutputFilename.c_str());
+    }
 }
 
 
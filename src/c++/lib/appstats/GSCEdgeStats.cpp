@@ -105,12 +105,16 @@ report(std::ostream& os) const
     finderStats.report(os);
     os << "SpanningComplexCandidateFiltered\t" << totalSpanningCandidateFilter << "\n";
     os << "JunctionAssemblyOverlapSkipped\t" << totalJunctionAssemblyOverlapSkips << "\n";
+    os << "JunctionAssemblyBudgetSkipped\t" << totalJunctionAssemblyBudgetSkips << "\n";
+    os << "JunctionAssemblyReadsDownsampled\t" << totalJunctionAssemblyDownsamples << "\n";
     os << "JunctionCount\t" << totalJunctionCount << "\n";
     os << "ComplexJunctionCount\t" << totalComplexJunctionCount << "\n";
     os << "BreaksPerJunction:\n";
     breaksPerJunction.report(os);
     os << "TotalAssemblyCandidates\t" << totalAssemblyCandidates << "\n";
     os << "TotalSpanningAssemblyCandidates\t" << totalSpanningAssemblyCandidates << "\n";
+    os << "RemoteReadCacheHits\t" << remoteReadCacheHitCount << "\n";
+    os << "RemoteReadCacheMisses\t" << remoteReadCacheMissCount << "\n";
     os << "AssemblyCandidatesPerJunction:\n";
     assemblyCandidatesPerJunction.report(os);
     reportTime("total",totalTime,totalInputEdgeCount,totalCandidateCount, os);
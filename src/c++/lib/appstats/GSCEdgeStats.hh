@@ -104,11 +104,15 @@ struct GSCEdgeGroupStats
         totalCandidateCount += rhs.totalCandidateCount;
         totalComplexCandidate += rhs.totalComplexCandidate;
         totalSpanningCandidateFilter += rhs.totalSpanningCandidateFilter;
-        totalSpanningCandidateFilter += rhs.totalJunctionAssemblyOverlapSkips;
+        totalJunctionAssemblyOverlapSkips += rhs.totalJunctionAssemblyOverlapSkips;
+        totalJunctionAssemblyBudgetSkips += rhs.totalJunctionAssemblyBudgetSkips;
+        totalJunctionAssemblyDownsamples += rhs.totalJunctionAssemblyDownsamples;
         totalJunctionCount += rhs.totalJunctionCount;
         totalComplexJunctionCount += rhs.totalComplexJunctionCount;
         totalAssemblyCandidates += rhs.totalAssemblyCandidates;
         totalSpanningAssemblyCandidates += rhs.totalSpanningAssemblyCandidates;
+        remoteReadCacheHitCount += rhs.remoteReadCacheHitCount;
+        remoteReadCacheMissCount += rhs.remoteReadCacheMissCount;
         candidatesPerEdge.merge(rhs.candidatesPerEdge);
         assemblyCandidatesPerJunction.merge(rhs.assemblyCandidatesPerJunction);
         breaksPerJunction.merge(rhs.breaksPerJunction);
@@ -130,10 +134,14 @@ struct GSCEdgeGroupStats
         & BOOST_SERIALIZATION_NVP(totalComplexCandidate)
         & BOOST_SERIALIZATION_NVP(totalSpanningCandidateFilter)
         & BOOST_SERIALIZATION_NVP(totalJunctionAssemblyOverlapSkips)
+        & BOOST_SERIALIZATION_NVP(totalJunctionAssemblyBudgetSkips)
+        & BOOST_SERIALIZATION_NVP(totalJunctionAssemblyDownsamples)
         & BOOST_SERIALIZATION_NVP(totalJunctionCount)
         & BOOST_SERIALIZATION_NVP(totalComplexJunctionCount)
         & BOOST_SERIALIZATION_NVP(totalAssemblyCandidates)
         & BOOST_SERIALIZATION_NVP(totalSpanningAssemblyCandidates)
+        & BOOST_SERIALIZATION_NVP(remoteReadCacheHitCount)
+        & BOOST_SERIALIZATION_NVP(remoteReadCacheMissCount)
         & BOOST_SERIALIZATION_NVP(candidatesPerEdge)
         & BOOST_SERIALIZATION_NVP(assemblyCandidatesPerJunction)
         & BOOST_SERIALIZATION_NVP(breaksPerJunction)
@@ -150,10 +158,14 @@ struct GSCEdgeGroupStats
     uint64_t totalComplexCandidate = 0;
     uint64_t totalSpanningCandidateFilter = 0;
     uint64_t totalJunctionAssemblyOverlapSkips = 0;
+    uint64_t totalJunctionAssemblyBudgetSkips = 0; ///< junctions not assembled because their edge exceeded the assembly budget
+    uint64_t totalJunctionAssemblyDownsamples = 0; ///< junctions assembled from downsampled reads
     uint64_t totalJunctionCount = 0;
     uint64_t totalComplexJunctionCount = 0;
     uint64_t totalAssemblyCandidates = 0;
     uint64_t totalSpanningAssemblyCandidates = 0;
+    uint64_t remoteReadCacheHitCount = 0; ///< remote mate read searches in target loci served entirely from the remote read cache
+    uint64_t remoteReadCacheMissCount = 0;
 
     SimpleHist candidatesPerEdge;
     SimpleHist assemblyCandidatesPerJunction;
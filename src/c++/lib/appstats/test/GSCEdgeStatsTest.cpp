@@ -0,0 +1,104 @@
+// -*- mode: c++; indent-tabs-mode: nil; -*-
+//
+// Manta - Structural Variant and Indel Caller
+// Copyright (c) 2013-2016 Illumina, Inc.
+//
+// This program is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// at your option) any later version.
+//
+// This program is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with this program.  If not, see <http://www.gnu.org/licenses/>.
+//
+//
+
+#include "boost/test/unit_test.hpp"
+
+#include "appstats/GSCEdgeStats.hh"
+
+
+BOOST_AUTO_TEST_SUITE( test_GSCEdgeStats )
+
+
+/// set every counter of a GSCEdgeGroupStats to a distinct value starting from base
+static
+void
+setTestCounts(
+    const uint64_t base,
+    GSCEdgeGroupStats& stats)
+{
+    stats.totalInputEdgeCount = base;
+    stats.totalCandidateCount = base+1;
+    stats.totalComplexCandidate = base+2;
+    stats.totalSpanningCandidateFilter = base+3;
+    stats.totalJunctionAssemblyOverlapSkips = base+4;
+    stats.totalJunctionAssemblyBudgetSkips = base+5;
+    stats.totalJunctionAssemblyDownsamples = base+6;
+    stats.totalJunctionCount = base+7;
+    stats.totalComplexJunctionCount = base+8;
+    stats.totalAssemblyCandidates = base+9;
+    stats.totalSpanningAssemblyCandidates = base+10;
+    stats.remoteReadCacheHitCount = base+11;
+    stats.remoteReadCacheMissCount = base+12;
+    stats.finderStats.edgeFilter = base+13;
+    stats.finderStats.semiMappedFilter = base+14;
+    stats.finderStats.ComplexLowCountFilter = base+15;
+    stats.finderStats.ComplexLowSignalFilter = base+16;
+    stats.finderStats.unmatchedReadPairFilter = base+17;
+    stats.totalTime.wall = base+18;
+    stats.candTime.wall = base+19;
+    stats.assemblyTime.wall = base+20;
+    stats.scoringTime.wall = base+21;
+    stats.candidatesPerEdge.increment(1);
+    stats.assemblyCandidatesPerJunction.increment(2);
+    stats.breaksPerJunction.increment(3);
+}
+
+
+
+BOOST_AUTO_TEST_CASE( test_GSCEdgeGroupStatsMerge )
+{
+    GSCEdgeGroupStats stats1;
+    setTestCounts(100, stats1);
+
+    GSCEdgeGroupStats stats2;
+    setTestCounts(1000, stats2);
+
+    stats1.merge(stats2);
+
+    BOOST_REQUIRE_EQUAL(stats1.totalInputEdgeCount, 1100u);
+    BOOST_REQUIRE_EQUAL(stats1.totalCandidateCount, 1102u);
+    BOOST_REQUIRE_EQUAL(stats1.totalComplexCandidate, 1104u);
+    BOOST_REQUIRE_EQUAL(stats1.totalSpanningCandidateFilter, 1106u);
+    BOOST_REQUIRE_EQUAL(stats1.totalJunctionAssemblyOverlapSkips, 1108u);
+    BOOST_REQUIRE_EQUAL(stats1.totalJunctionAssemblyBudgetSkips, 1110u);
+    BOOST_REQUIRE_EQUAL(stats1.totalJunctionAssemblyDownsamples, 1112u);
+    BOOST_REQUIRE_EQUAL(stats1.totalJunctionCount, 1114u);
+    BOOST_REQUIRE_EQUAL(stats1.totalComplexJunctionCount, 1116u);
+    BOOST_REQUIRE_EQUAL(stats1.totalAssemblyCandidates, 1118u);
+    BOOST_REQUIRE_EQUAL(stats1.totalSpanningAssemblyCandidates, 1120u);
+    BOOST_REQUIRE_EQUAL(stats1.remoteReadCacheHitCount, 1122u);
+    BOOST_REQUIRE_EQUAL(stats1.remoteReadCacheMissCount, 1124u);
+    BOOST_REQUIRE_EQUAL(stats1.finderStats.edgeFilter, 1126u);
+    BOOST_REQUIRE_EQUAL(stats1.finderStats.semiMappedFilter, 1128u);
+    BOOST_REQUIRE_EQUAL(stats1.finderStats.ComplexLowCountFilter, 1130u);
+    BOOST_REQUIRE_EQUAL(stats1.finderStats.ComplexLowSignalFilter, 1132u);
+    BOOST_REQUIRE_EQUAL(stats1.finderStats.unmatchedReadPairFilter, 1134u);
+    BOOST_REQUIRE_EQUAL(stats1.totalTime.wall, 1136.);
+    BOOST_REQUIRE_EQUAL(stats1.candTime.wall, 1138.);
+    BOOST_REQUIRE_EQUAL(stats1.assemblyTime.wall, 1140.);
+    BOOST_REQUIRE_EQUAL(stats1.scoringTime.wall, 1142.);
+    BOOST_REQUIRE_EQUAL(stats1.candidatesPerEdge.histdata[1], 2u);
+    BOOST_REQUIRE_EQUAL(stats1.assemblyCandidatesPerJunction.histdata[2], 2u);
+    BOOST_REQUIRE_EQUAL(stats1.breaksPerJunction.histdata[3], 2u);
+}
+
+
+BOOST_AUTO_TEST_SUITE_END()
+
@@ -0,0 +1,88 @@
+// -*- mode: c++; indent-tabs-mode: nil; -*-
+//
+// Manta - Structural Variant and Indel Caller
+// Copyright (c) 2013-2016 Illumina, Inc.
+//
+// This program is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// at your option) any later version.
+//
+// This program is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with this program.  If not, see <http://www.gnu.org/licenses/>.
+//
+//
+
+#include "assembly/AssemblyReadDownsample.hh"
+
+#include <algorithm>
+#include <cassert>
+#include <cstdint>
+
+
+
+/// 64 bit FNV-1a hash, used instead of std::hash so that the downsampled read set is the same on
+/// every platform
+static
+uint64_t
+getReadKeyHash(
+    const std::string& readKey)
+{
+    uint64_t hash(14695981039346656037ull);
+    for (const char c : readKey)
+    {
+        hash ^= static_cast<uint8_t>(c);
+        hash *= 1099511628211ull;
+    }
+    return hash;
+}
+
+
+
+bool
+downsampleAssemblyReads(
+    const unsigned maxReadCount,
+    const std::vector<std::string>& readKeys,
+    AssemblyReadInput& reads,
+    AssemblyReadReversal& readRev)
+{
+    const unsigned readCount(reads.size());
+    assert(readKeys.size() == readCount);
+    assert(readRev.empty() || (readRev.size() == readCount));
+
+    if ((maxReadCount == 0) || (readCount <= maxReadCount)) return false;
+
+    std::vector<std::pair<uint64_t,unsigned>> readRank;
+    readRank.reserve(readCount);
+    for (unsigned readIndex(0); readIndex<readCount; ++readIndex)
+    {
+        readRank.emplace_back(getReadKeyHash(readKeys[readIndex]), readIndex);
+    }
+    std::nth_element(readRank.begin(), readRank.begin()+maxReadCount, readRank.end());
+
+    std::vector<bool> isKeep(readCount,false);
+    for (unsigned rankIndex(0); rankIndex<maxReadCount; ++rankIndex)
+    {
+        isKeep[readRank[rankIndex].second] = true;
+    }
+
+    unsigned keepIndex(0);
+    for (unsigned readIndex(0); readIndex<readCount; ++readIndex)
+    {
+        if (! isKeep[readIndex]) continue;
+        if (keepIndex != readIndex)
+        {
+            reads[keepIndex] = std::move(reads[readIndex]);
+            if (! readRev.empty()) readRev[keepIndex] = readRev[readIndex];
+        }
+        keepIndex++;
+    }
+    reads.resize(maxReadCount);
+    if (! readRev.empty()) readRev.resize(maxReadCount);
+    return true;
+}
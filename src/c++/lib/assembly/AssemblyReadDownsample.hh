@@ -0,0 +1,45 @@
+// -*- mode: c++; indent-tabs-mode: nil; -*-
+//
+// Manta - Structural Variant and Indel Caller
+// Copyright (c) 2013-2016 Illumina, Inc.
+//
+// This program is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// at your option) any later version.
+//
+// This program is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with this program.  If not, see <http://www.gnu.org/licenses/>.
+//
+//
+
+#pragma once
+
+#include "assembly/AssemblyReadInfo.hh"
+
+#include <string>
+#include <vector>
+
+
+/// Deterministically downsample assembly reads to at most maxReadCount reads
+///
+/// Reads are ranked by a hash of their read key, so the subset of reads kept for a locus does not
+/// depend on the order in which the reads were found. The input order of the kept reads is preserved.
+///
+/// \param[in] maxReadCount maximum number of reads to keep, 0 disables downsampling
+/// \param[in] readKeys unique key of each read, in the same order as reads
+/// \param[in,out] reads assembly reads to downsample
+/// \param[in,out] readRev if not empty, read reversal flags downsampled together with reads
+///
+/// \return true if any reads were removed
+bool
+downsampleAssemblyReads(
+    const unsigned maxReadCount,
+    const std::vector<std::string>& readKeys,
+    AssemblyReadInput& reads,
+    AssemblyReadReversal& readRev);
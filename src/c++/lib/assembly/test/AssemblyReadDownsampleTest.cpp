@@ -0,0 +1,100 @@
+// -*- mode: c++; indent-tabs-mode: nil; -*-
+//
+// Manta - Structural Variant and Indel Caller
+// Copyright (c) 2013-2016 Illumina, Inc.
+//
+// This program is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// at your option) any later version.
+//
+// This program is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with this program.  If not, see <http://www.gnu.org/licenses/>.
+//
+//
+
+#include "boost/test/unit_test.hpp"
+
+#include "AssemblyReadDownsample.hh"
+
+#include "boost/lexical_cast.hpp"
+
+
+BOOST_AUTO_TEST_SUITE( test_AssemblyReadDownsample )
+
+
+static
+void
+getTestReads(
+    const unsigned readCount,
+    std::vector<std::string>& readKeys,
+    AssemblyReadInput& reads,
+    AssemblyReadReversal& readRev)
+{
+    for (unsigned readIndex(0); readIndex<readCount; ++readIndex)
+    {
+        const std::string label(boost::lexical_cast<std::string>(readIndex));
+        readKeys.push_back("read" + label + "_1_0");
+        reads.push_back("ACGT" + label);
+        readRev.push_back((readIndex%2) == 0);
+    }
+}
+
+
+
+BOOST_AUTO_TEST_CASE( test_AssemblyReadDownsampleNoop )
+{
+    std::vector<std::string> readKeys;
+    AssemblyReadInput reads;
+    AssemblyReadReversal readRev;
+    getTestReads(10, readKeys, reads, readRev);
+
+    BOOST_REQUIRE(! downsampleAssemblyReads(0, readKeys, reads, readRev));
+    BOOST_REQUIRE_EQUAL(reads.size(), 10u);
+    BOOST_REQUIRE(! downsampleAssemblyReads(10, readKeys, reads, readRev));
+    BOOST_REQUIRE_EQUAL(reads.size(), 10u);
+}
+
+
+
+BOOST_AUTO_TEST_CASE( test_AssemblyReadDownsample )
+{
+    std::vector<std::string> readKeys;
+    AssemblyReadInput reads;
+    AssemblyReadReversal readRev;
+    getTestReads(100, readKeys, reads, readRev);
+    const AssemblyReadInput allReads(reads);
+
+    BOOST_REQUIRE(downsampleAssemblyReads(20, readKeys, reads, readRev));
+    BOOST_REQUIRE_EQUAL(reads.size(), 20u);
+    BOOST_REQUIRE_EQUAL(readRev.size(), 20u);
+
+    // kept reads are in input order, and keep their reversal flag:
+    unsigned lastIndex(0);
+    for (unsigned keepIndex(0); keepIndex<reads.size(); ++keepIndex)
+    {
+        const auto iter(std::find(allReads.begin(), allReads.end(), reads[keepIndex]));
+        BOOST_REQUIRE(iter != allReads.end());
+        const unsigned readIndex(iter - allReads.begin());
+        if (keepIndex > 0) BOOST_REQUIRE(readIndex > lastIndex);
+        BOOST_REQUIRE_EQUAL(readRev[keepIndex], ((readIndex%2) == 0));
+        lastIndex = readIndex;
+    }
+
+    // the same reads are kept when the input order changes:
+    std::vector<std::string> revReadKeys(readKeys.rbegin(), readKeys.rend());
+    AssemblyReadInput revReads(allReads.rbegin(), allReads.rend());
+    AssemblyReadReversal revReadRev;
+    BOOST_REQUIRE(downsampleAssemblyReads(20, revReadKeys, revReads, revReadRev));
+    std::sort(reads.begin(), reads.end());
+    std::sort(revReads.begin(), revReads.end());
+    BOOST_REQUIRE(reads == revReads);
+}
+
+
+BOOST_AUTO_TEST_SUITE_END()
@@ -97,6 +97,8 @@ writeHeaderPrefix(
     _os << "##INFO=<ID=RIGHT_SVINSSEQ,Number=.,Type=String,Description=\"Known right side of insertion for an insertion of unknown length\">\n";
     _os << "##INFO=<ID=INV3,Number=0,Type=Flag,Description=\"Inversion breakends open 3' of reported location\">\n";
     _os << "##INFO=<ID=INV5,Number=0,Type=Flag,Description=\"Inversion breakends open 5' of reported location\">\n";
+    _os << "##INFO=<ID=ASSEMBLY_BUDGET_SKIP,Number=0,Type=Flag,Description=\"Breakend assembly was skipped because the locus exceeded the assembly budget, the variant is scored from paired read evidence only\">\n";
+    _os << "##INFO=<ID=ASSEMBLY_DOWNSAMPLED,Number=0,Type=Flag,Description=\"Reads used to assemble the variant were downsampled because the locus exceeded the assembly read budget\">\n";
 
     if (_isRNA)
     {
@@ -353,12 +355,21 @@ static
 void
 addSharedInfo(
     const EventInfo& event,
+    const SVCandidateAssemblyData& adata,
     VcfWriterSV::InfoTag_t& infoTags)
 {
     if (event.isEvent())
     {
         infoTags.push_back( str(boost::format("EVENT=%i") % event.label));
     }
+    if (adata.isBudgetSkip)
+    {
+        infoTags.push_back("ASSEMBLY_BUDGET_SKIP");
+    }
+    if (adata.isReadsDownsampled)
+    {
+        infoTags.push_back("ASSEMBLY_DOWNSAMPLED");
+    }
 }
 
 
@@ -499,7 +510,7 @@ writeTransloc(
         infotags.push_back( str( boost::format("SVINSSEQ=%s") % (insertSeq) ));
     }
 
-    addSharedInfo(event, infotags);
+    addSharedInfo(event, adata, infotags);
 
     modifyInfo(event, infotags);
     modifyTranslocInfo(sv, isFirstBreakend, infotags);
@@ -556,6 +567,7 @@ writeInvdel(
     const SVCandidate& sv,
     const SVId& svId,
     const bool isIndel,
+    const SVCandidateAssemblyData& adata,
     const EventInfo& event)
 {
     const bool isImprecise(sv.isImprecise());
@@ -785,7 +797,7 @@ writeInvdel(
         }
     }
 
-    addSharedInfo(event, infoTags);
+    addSharedInfo(event, adata, infoTags);
 
     modifyInfo(event, infoTags);
     modifyInvdelInfo(sv, isBp1First, infoTags);
@@ -867,7 +879,7 @@ writeSVCore(
         else
         {
             const bool isIndel(isSVIndel(svType));
-            writeInvdel(sv, svId, isIndel, event);
+            writeInvdel(sv, svId, isIndel, adata, event);
         }
     }
     catch (...)
@@ -173,6 +173,7 @@ private:
         const SVCandidate& sv,
         const SVId& svId,
         const bool isIndel,
+        const SVCandidateAssemblyData& adata,
         const EventInfo& event);
 
 protected:
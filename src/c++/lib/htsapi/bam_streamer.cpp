@@ -36,6 +36,10 @@
 
 
 
+thread_local unsigned long bam_streamer::_threadDecompressedBytes(0);
+
+
+
 bam_streamer::
 bam_streamer(
     const char* filename,
@@ -47,7 +51,10 @@ bam_streamer(
       _hitr(nullptr),
       _record_no(0),
       _stream_name(filename),
-      _is_region(false)
+      _is_region(false),
+      _is_block_reset(true),
+      _last_block_address(0),
+      _last_block_offset(0)
 {
     assert(nullptr != filename);
     if ('\0' == *filename)
@@ -222,6 +229,9 @@ resetRegion(
 
     _is_record_set = false;
     _record_no = 0;
+
+    // the iterator always seeks (and reloads a block) before reading the first record of a new region:
+    _is_block_reset = true;
 }
 
 
@@ -245,11 +255,39 @@ next()
     _is_record_set=(ret >= 0);
     if (_is_record_set) _record_no++;
 
+    _update_decompressed_bytes();
+
     return _is_record_set;
 }
 
 
 
+void
+bam_streamer::
+_update_decompressed_bytes()
+{
+    if (_hfp->is_cram || (! _hfp->is_bin)) return;
+
+    const BGZF* bgzf(_hfp->fp.bgzf);
+    if (! bgzf->is_compressed) return;
+
+    // htslib does not report block loads, so a load is inferred from a change of the
+    // current block, or from the offset moving backwards in the same block after a seek:
+    const bool isBlockLoad(_is_block_reset ||
+                           (bgzf->block_address != _last_block_address) ||
+                           (bgzf->block_offset < _last_block_offset));
+    if (isBlockLoad && (bgzf->block_length > 0))
+    {
+        _threadDecompressedBytes += bgzf->block_length;
+    }
+
+    _is_block_reset = false;
+    _last_block_address = bgzf->block_address;
+    _last_block_offset = bgzf->block_offset;
+}
+
+
+
 const char*
 bam_streamer::
 target_id_to_name(const int32_t tid) const
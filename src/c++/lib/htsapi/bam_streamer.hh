@@ -103,9 +103,25 @@ struct bam_streamer : public boost::noncopyable
         return *(_hdr);
     }
 
+    /// \brief total decompressed size of the BGZF blocks loaded by all bam_streamer objects in the calling thread
+    ///
+    /// A block is counted each time it is loaded from a BAM file while streaming records,
+    /// this includes repeated loads of the same block following a seek. The count is an
+    /// estimate: CRAM/SAM input is not counted, and a record spanning a block boundary
+    /// only counts the last block loaded for it.
+    static
+    unsigned long
+    getThreadDecompressedBytes()
+    {
+        return _threadDecompressedBytes;
+    }
+
 private:
     void _load_index();
 
+    /// update the thread decompressed byte count following a read from a BAM file
+    void _update_decompressed_bytes();
+
     bool _is_record_set;
     htsFile* _hfp;
     bam_hdr_t* _hdr;
@@ -118,4 +134,11 @@ private:
     std::string _stream_name;
     bool _is_region;
     std::string _region;
+
+    // BGZF block state following the last record read, used to detect block loads:
+    bool _is_block_reset;
+    int64_t _last_block_address;
+    int _last_block_offset;
+
+    static thread_local unsigned long _threadDecompressedBytes;
 };
@@ -62,3 +62,133 @@ isMateInsertionEvidenceCandidate2(
     if ((! isSearchForRightOpen) && bamRead.is_fwd_strand()) return false;
     return true;
 }
+
+
+
+/// approximate memory overhead of each cache entry beyond the key and read data
+static const unsigned long cacheEntryOverhead(128);
+
+
+
+static
+std::string
+getRemoteMateKey(
+    const unsigned bamIndex,
+    const RemoteReadInfo& remote)
+{
+    std::string key(remote.qname);
+    key += '\t';
+    key += std::to_string(remote.readNo);
+    key += '\t';
+    key += std::to_string(bamIndex);
+    key += '\t';
+    key += std::to_string(remote.tid);
+    key += '\t';
+    key += std::to_string(remote.pos);
+    return key;
+}
+
+
+
+RemoteMateReadCache::
+RemoteMateReadCache(
+    const unsigned long maxByteCount,
+    RemoteMateReadCacheCounts& counts)
+    : _maxByteCount(maxByteCount),
+      _byteCount(0),
+      _counts(counts)
+{}
+
+
+
+bool
+RemoteMateReadCache::
+find(
+    const unsigned bamIndex,
+    const RemoteReadInfo& remote,
+    const bam_record*& mateReadPtr)
+{
+    mateReadPtr = nullptr;
+    if (0 == _maxByteCount) return false;
+
+    const auto indexIter(_entryIndex.find(getRemoteMateKey(bamIndex, remote)));
+    if (indexIter == _entryIndex.end()) return false;
+
+    // move the entry to the front of the LRU list:
+    _entries.splice(_entries.begin(), _entries, indexIter->second);
+
+    mateReadPtr = indexIter->second->mateReadPtr.get();
+    return true;
+}
+
+
+
+void
+RemoteMateReadCache::
+countLocusLookups(
+    const unsigned searchCount,
+    const bool isCached)
+{
+    if (0 == _maxByteCount) return;
+
+    if (isCached)
+    {
+        _counts.hitCount += searchCount;
+    }
+    else
+    {
+        _counts.missCount += searchCount;
+    }
+}
+
+
+
+void
+RemoteMateReadCache::
+insert(
+    const unsigned bamIndex,
+    const RemoteReadInfo& remote,
+    const bam_record* mateReadPtr)
+{
+    if (0 == _maxByteCount) return;
+
+    std::string key(getRemoteMateKey(bamIndex, remote));
+
+    const auto indexIter(_entryIndex.find(key));
+    if (indexIter != _entryIndex.end())
+    {
+        _byteCount -= indexIter->second->byteCount;
+        _entries.erase(indexIter->second);
+        _entryIndex.erase(indexIter);
+    }
+
+    _entries.emplace_front();
+    CacheEntry& entry(_entries.front());
+    entry.byteCount = (cacheEntryOverhead + (2 * key.size()));
+    if (nullptr != mateReadPtr)
+    {
+        entry.mateReadPtr.reset(new bam_record(*mateReadPtr));
+        entry.byteCount += (sizeof(bam_record) + sizeof(bam1_t) + mateReadPtr->get_data()->l_data);
+    }
+    entry.key = std::move(key);
+
+    _byteCount += entry.byteCount;
+    _entryIndex.insert(std::make_pair(entry.key, _entries.begin()));
+
+    evict();
+}
+
+
+
+void
+RemoteMateReadCache::
+evict()
+{
+    while ((_byteCount > _maxByteCount) && (! _entries.empty()))
+    {
+        const CacheEntry& entry(_entries.back());
+        _byteCount -= entry.byteCount;
+        _entryIndex.erase(entry.key);
+        _entries.pop_back();
+    }
+}
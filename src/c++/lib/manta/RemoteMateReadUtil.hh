@@ -22,7 +22,13 @@
 
 #include "htsapi/bam_record.hh"
 
+#include "boost/utility.hpp"
+
+#include <cstdint>
+#include <list>
+#include <memory>
 #include <string>
+#include <unordered_map>
 
 /// this is the first of 2 components to determine mate
 /// insert candidacy. Note that we assume base filtration
@@ -83,3 +89,96 @@ struct RemoteReadInfo
     bool isFound;
     bool isUsed;
 };
+
+
+
+/// lookup counts of a RemoteMateReadCache
+struct RemoteMateReadCacheCounts
+{
+    void
+    clear()
+    {
+        hitCount = 0;
+        missCount = 0;
+    }
+
+    uint64_t hitCount = 0;
+    uint64_t missCount = 0;
+};
+
+
+/// memory bounded LRU cache of the remote mate reads found for each remote read search
+///
+/// Each entry records the result of searching one bam file for the remote mate of one read:
+/// either the mate read if it can be used for assembly (mapq0), or no read if the mate was not
+/// found or is not usable. Entries are keyed by read name, read number and the remote mate
+/// position, so that edges sharing a remote locus don't need to seek to it again.
+///
+struct RemoteMateReadCache : private boost::noncopyable
+{
+    /// \param[in] maxByteCount approximate memory limit of the cache, set to zero to disable the cache
+    /// \param[in] counts lookup counts are added to this object
+    RemoteMateReadCache(
+        const unsigned long maxByteCount,
+        RemoteMateReadCacheCounts& counts);
+
+    /// look up the search result for a remote mate read, lookups are not added to the cache counts
+    ///
+    /// \param[out] mateReadPtr the cached mate read, or nullptr if the mate read can't be used. The
+    ///                         pointer is only valid until the next call to insert
+    /// \return true if the search result is cached
+    bool
+    find(
+        const unsigned bamIndex,
+        const RemoteReadInfo& remote,
+        const bam_record*& mateReadPtr);
+
+    /// add the lookups of all remote mate read searches in one target locus to the cache counts
+    ///
+    /// The searches are counted as hits only if the whole locus was served from the cache, because
+    /// any search missing from the cache requires the locus to be read from the bam again.
+    ///
+    /// \param[in] searchCount number of remote mate read searches in the target locus
+    /// \param[in] isCached true if the search results for all remote mate reads in the locus were cached
+    void
+    countLocusLookups(
+        const unsigned searchCount,
+        const bool isCached);
+
+    /// add the search result for a remote mate read, the least recently used entries are removed
+    /// as required to stay within the cache memory limit
+    ///
+    /// \param[in] mateReadPtr the mate read, or nullptr if the mate was not found or can't be used
+    void
+    insert(
+        const unsigned bamIndex,
+        const RemoteReadInfo& remote,
+        const bam_record* mateReadPtr);
+
+    unsigned
+    size() const
+    {
+        return _entryIndex.size();
+    }
+
+private:
+    struct CacheEntry
+    {
+        std::string key;
+        std::unique_ptr<bam_record> mateReadPtr;
+        unsigned long byteCount = 0;
+    };
+
+    typedef std::list<CacheEntry> EntryList;
+
+    void
+    evict();
+
+    const unsigned long _maxByteCount;
+    unsigned long _byteCount;
+    RemoteMateReadCacheCounts& _counts;
+
+    /// entries from most to least recently used
+    EntryList _entries;
+    std::unordered_map<std::string, EntryList::iterator> _entryIndex;
+};
@@ -24,6 +24,7 @@
 ///
 
 
+#include "assembly/AssemblyReadDownsample.hh"
 #include "blt_util/CircularCounter.hh"
 #include "blt_util/log.hh"
 #include "blt_util/seq_util.hh"
@@ -65,14 +66,19 @@ SVCandidateAssembler(
     const bam_header_info& bamHeader,
     const AllCounts& counts,
     const bool isRNA,
-    TimeTracker& remoteTime) :
+    const unsigned remoteReadCacheMegabytes,
+    const unsigned maxAssemblyReadCount,
+    TimeTracker& remoteTime,
+    RemoteMateReadCacheCounts& remoteCacheCounts) :
     _scanOpt(scanOpt),
     _assembleOpt(assembleOpt),
     _isAlignmentTumor(alignFileOpt.isAlignmentTumor),
     _dFilter(chromDepthFilename, scanOpt.maxDepthFactor, bamHeader),
     _dFilterRemoteReads(chromDepthFilename, scanOpt.maxDepthFactorRemoteReads, bamHeader),
     _readScanner(_scanOpt, statsFilename, alignFileOpt.alignmentFilename, isRNA),
-    _remoteTime(remoteTime)
+    _remoteTime(remoteTime),
+    _maxAssemblyReadCount(maxAssemblyReadCount),
+    _remoteMateCache((remoteReadCacheMegabytes*1024ul*1024ul), remoteCacheCounts)
 {
     // setup regionless bam_streams:
     // setup all data for main analysis loop:
@@ -162,20 +168,56 @@ insertAssemblyRead(
 
 
 
+/// order remote mate reads by position, then name and read number
+struct RemoteMateReadOrder
+{
+    explicit
+    RemoteMateReadOrder(
+        const std::vector<bam_record>& mateReads) :
+        _mateReads(mateReads)
+    {}
+
+    bool
+    operator()(
+        const unsigned lhs,
+        const unsigned rhs) const
+    {
+        const bam_record& lhsRead(_mateReads[lhs]);
+        const bam_record& rhsRead(_mateReads[rhs]);
+        if (lhsRead.pos() != rhsRead.pos()) return (lhsRead.pos() < rhsRead.pos());
+        const int nameCompare(strcmp(lhsRead.qname(), rhsRead.qname()));
+        if (nameCompare != 0) return (nameCompare < 0);
+        return (lhsRead.read_no() < rhsRead.read_no());
+    }
+
+private:
+    const std::vector<bam_record>& _mateReads;
+};
+
+
+
 /// retrieve remote reads from a list of target loci in the bam
+///
+/// remote mate reads are taken from remoteMateCache when the mates of all remote reads in a
+/// target locus are cached, otherwise the locus is read from the bam and the mates found are
+/// added to the cache. Mate reads of each locus are added to the assembly in a fixed order, so
+/// that the assembly doesn't depend on the cache contents.
 static
 void
 recoverRemoteReads(
     const AssemblerOptions& assembleOpt,
     const unsigned maxNumReads,
     const bool isLocusReversed,
-    const std::string& bamIndexStr,
+    const unsigned bamIndex,
     bam_streamer& bamStream,
     std::vector<RemoteReadInfo>& bamRemotes,
     SVCandidateAssembler::ReadIndexType& readIndex,
     AssemblyReadInput& reads,
-    RemoteReadCache& remoteReadsCache)
+    RemoteReadCache& remoteReadsCache,
+    RemoteMateReadCache& remoteMateCache)
 {
+    const std::string bamIndexStr(boost::lexical_cast<std::string>(bamIndex));
+
     // figure out what we can handle in a single region query:
     std::sort(bamRemotes.begin(),bamRemotes.end());
 
@@ -231,66 +273,116 @@ recoverRemoteReads(
         unsigned readCount(0);
 #endif
 
-        // set bam stream to new search interval:
-        bamStream.resetRegion(
-            interval.tid,
-            interval.range.begin_pos(),
-            interval.range.end_pos()+1);
+        // usable mate reads and the index of the remote read each mate was found for:
+        std::vector<bam_record> mateReads;
+        std::vector<unsigned> mateRemoteIndex;
 
-        while (bamStream.next())
+        bool isCached(true);
+        for (unsigned remoteIndex(0); remoteIndex<remotes.size(); ++remoteIndex)
         {
-            if (reads.size() >= maxNumReads)
+            const bam_record* mateReadPtr(nullptr);
+            if (! remoteMateCache.find(bamIndex, remotes[remoteIndex], mateReadPtr))
             {
-#ifdef DEBUG_ASBL
-                log_os << __FUNCTION__ << ": WARNING: assembly read buffer full, skipping further input\n";
-#endif
-                break;
+                isCached = false;
+                continue;
             }
+            if (nullptr == mateReadPtr) continue;
+            mateReads.push_back(*mateReadPtr);
+            mateRemoteIndex.push_back(remoteIndex);
+        }
 
-            const bam_record& bamRead(*(bamStream.get_record_ptr()));
+        remoteMateCache.countLocusLookups(remotes.size(), isCached);
 
-            // we've gone past the last case:
-            if (bamRead.pos() > (remotes.back().pos+1)) break;
+        if (! isCached)
+        {
+            mateReads.clear();
+            mateRemoteIndex.clear();
 
-            if (bamRead.isNonStrictSupplement()) continue;
+            // set bam stream to new search interval:
+            bamStream.resetRegion(
+                interval.tid,
+                interval.range.begin_pos(),
+                interval.range.end_pos()+1);
 
-            for (RemoteReadInfo& remote : remotes)
+            while (bamStream.next())
             {
+                const bam_record& bamRead(*(bamStream.get_record_ptr()));
+
+                // we've gone past the last case:
+                if (bamRead.pos() > (remotes.back().pos+1)) break;
+
+                if (bamRead.isNonStrictSupplement()) continue;
+
+                for (unsigned remoteIndex(0); remoteIndex<remotes.size(); ++remoteIndex)
+                {
+                    RemoteReadInfo& remote(remotes[remoteIndex]);
 #ifdef DEBUG_REMOTES
-                readCount++;
-                if ((readCount%1000000) == 0) log_os << " counts: " << readCount << "\n";
+                    readCount++;
+                    if ((readCount%1000000) == 0) log_os << " counts: " << readCount << "\n";
 #endif
-                if (remote.isFound) continue;
-                if (bamRead.read_no() != remote.readNo) continue;
-                if (strcmp(bamRead.qname(),remote.qname.c_str()) != 0) continue;
+                    if (remote.isFound) continue;
+                    if (bamRead.read_no() != remote.readNo) continue;
+                    if (strcmp(bamRead.qname(),remote.qname.c_str()) != 0) continue;
 
 #ifdef DEBUG_REMOTES
-                log_os << __FUNCTION__ << ": found remote: " << remote.tid << " " << remote.pos << "\n";
+                    log_os << __FUNCTION__ << ": found remote: " << remote.tid << " " << remote.pos << "\n";
 #endif
-                remote.isFound = true;
-
-                if (bamRead.map_qual() != 0) break;
+                    remote.isFound = true;
 
-                // determine if we need to reverse:
-                bool isReversed(isLocusReversed);
-                if (bamRead.is_fwd_strand() == bamRead.is_mate_fwd_strand())
-                {
-                    isReversed = (! isReversed);
+                    // only mapq0 mates are used for assembly:
+                    const bool isUsable(bamRead.map_qual() == 0);
+                    remoteMateCache.insert(bamIndex, remote, (isUsable ? &bamRead : nullptr));
+                    if (isUsable)
+                    {
+                        mateReads.push_back(bamRead);
+                        mateRemoteIndex.push_back(remoteIndex);
+                    }
+                    break;
                 }
+            }
 
-                const bool isInserted = insertAssemblyRead(assembleOpt.minQval, bamIndexStr, bamRead, isReversed, readIndex, reads);
-                if (! isInserted) break;
-
-                /// add to the remote read cache used during PE scoring:
-                remoteReadsCache[remote.qname] = RemoteReadPayload(bamRead.read_no(), reads.back());
-
-                remote.isUsed = true;
-                break;
+            for (const RemoteReadInfo& remote : remotes)
+            {
+                if (! remote.isFound) remoteMateCache.insert(bamIndex, remote, nullptr);
             }
         }
 #ifdef DEBUG_REMOTES
         log_os << __FUNCTION__ << ": total reads traversed in region: " << readCount << "\n";
 #endif
+
+        std::vector<unsigned> mateOrder(mateReads.size());
+        for (unsigned mateIndex(0); mateIndex<mateReads.size(); ++mateIndex) mateOrder[mateIndex] = mateIndex;
+        std::stable_sort(mateOrder.begin(), mateOrder.end(), RemoteMateReadOrder(mateReads));
+
+        for (const unsigned mateIndex : mateOrder)
+        {
+            if (reads.size() >= maxNumReads)
+            {
+#ifdef DEBUG_ASBL
+                log_os << __FUNCTION__ << ": WARNING: assembly read buffer full, skipping further input\n";
+#endif
+                break;
+            }
+
+            const bam_record& bamRead(mateReads[mateIndex]);
+
+            // determine if we need to reverse:
+            bool isReversed(isLocusReversed);
+            if (bamRead.is_fwd_strand() == bamRead.is_mate_fwd_strand())
+            {
+                isReversed = (! isReversed);
+            }
+
+            const bool isInserted = insertAssemblyRead(assembleOpt.minQval, bamIndexStr, bamRead, isReversed, readIndex, reads);
+            if (! isInserted) continue;
+
+            RemoteReadInfo& remote(remotes[mateRemoteIndex[mateIndex]]);
+
+            /// add to the remote read cache used during PE scoring:
+            remoteReadsCache[remote.qname] = RemoteReadPayload(bamRead.read_no(), reads.back());
+
+            remote.isUsed = true;
+        }
     }
 }
 
@@ -740,21 +832,39 @@ getBreakendReads(
 #ifdef DEBUG_REMOTES
             log_os << __FUNCTION__ << ": starting remotes for bamindex: " << bamIndex << "\n";
 #endif
-            const std::string bamIndexStr(boost::lexical_cast<std::string>(bamIndex));
-
             bam_streamer& bamStream(*_bamStreams[bamIndex]);
 
             std::vector<RemoteReadInfo>& bamRemotes(remoteReads[bamIndex]);
             recoverRemoteReads(
                 getAssembleOpt(),
-                maxNumReads, isLocusReversed, bamIndexStr, bamStream,
-                bamRemotes, readIndex, reads, remoteReadsCache);
+                maxNumReads, isLocusReversed, bamIndex, bamStream,
+                bamRemotes, readIndex, reads, remoteReadsCache, _remoteMateCache);
         }
     }
 }
 
 
 
+bool
+SVCandidateAssembler::
+downsampleReads(
+    const ReadIndexType& readIndex,
+    AssemblyReadInput& reads,
+    AssemblyReadReversal& readRev) const
+{
+    if ((_maxAssemblyReadCount == 0) || (reads.size() <= _maxAssemblyReadCount)) return false;
+
+    assert(readIndex.size() == reads.size());
+    std::vector<std::string> readKeys(reads.size());
+    for (const auto& val : readIndex)
+    {
+        readKeys[val.second] = val.first;
+    }
+    return downsampleAssemblyReads(_maxAssemblyReadCount, readKeys, reads, readRev);
+}
+
+
+
 void
 SVCandidateAssembler::
 assembleSingleSVBreakend(
@@ -762,12 +872,15 @@ assembleSingleSVBreakend(
     const reference_contig_segment& refSeq,
     const bool isSearchRemoteInsertionReads,
     RemoteReadCache& remoteReads,
-    Assembly& as) const
+    Assembly& as,
+    bool& isReadsDownsampled) const
 {
     static const bool isBpReversed(false);
     ReadIndexType readIndex;
     AssemblyReadInput reads;
     getBreakendReads(bp, isBpReversed, refSeq, isSearchRemoteInsertionReads, remoteReads, readIndex, reads);
+    AssemblyReadReversal readRev;
+    isReadsDownsampled = downsampleReads(readIndex, reads, readRev);
     AssemblyReadOutput readInfo;
 
 #ifdef ITERATIVE_ASSEMBLER
@@ -789,7 +902,8 @@ assembleSVBreakends(
     const bool isBp2Reversed,
     const reference_contig_segment& refSeq1,
     const reference_contig_segment& refSeq2,
-    Assembly& as) const
+    Assembly& as,
+    bool& isReadsDownsampled) const
 {
     static const bool isSearchRemoteInsertionReads(false);
     RemoteReadCache remoteReads;
@@ -800,6 +914,7 @@ assembleSVBreakends(
     readRev.resize(reads.size(),isBp1Reversed);
     getBreakendReads(bp2, isBp2Reversed, refSeq2, isSearchRemoteInsertionReads, remoteReads, readIndex, reads);
     readRev.resize(reads.size(),isBp2Reversed);
+    isReadsDownsampled = downsampleReads(readIndex, reads, readRev);
     AssemblyReadOutput readInfo;
 
 #ifdef ITERATIVE_ASSEMBLER
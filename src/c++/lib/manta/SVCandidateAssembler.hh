@@ -30,6 +30,7 @@
 #include "blt_util/time_util.hh"
 #include "htsapi/bam_streamer.hh"
 #include "manta/ChromDepthFilterUtil.hh"
+#include "manta/RemoteMateReadUtil.hh"
 #include "manta/SVCandidate.hh"
 #include "manta/SVCandidateAssemblyData.hh"
 #include "manta/SVCandidateSetData.hh"
@@ -58,7 +59,10 @@ struct SVCandidateAssembler
         const bam_header_info& bamHeader,
         const AllCounts& counts,
         const bool isRNA,
-        TimeTracker& remoteTIme);
+        const unsigned remoteReadCacheMegabytes,
+        const unsigned maxAssemblyReadCount,
+        TimeTracker& remoteTIme,
+        RemoteMateReadCacheCounts& remoteCacheCounts);
 
     /**
      * @brief Performs a de-novo assembly of a set of reads crossing a breakpoint.
@@ -66,6 +70,8 @@ struct SVCandidateAssembler
      * Iterates over a range of word lengths until the first successful assembly.
      *
      * If unused reads remain, the assembly is re-started using this subset.
+     *
+     * @param[out] isReadsDownsampled set to true if the breakend reads were downsampled to the maximum assembly read count
      */
     void
     assembleSingleSVBreakend(
@@ -73,8 +79,10 @@ struct SVCandidateAssembler
         const reference_contig_segment& refSeq,
         const bool isSearchRemoteInsertionReads,
         RemoteReadCache& remoteReads,
-        Assembly& as) const;
+        Assembly& as,
+        bool& isReadsDownsampled) const;
 
+    /// \param[out] isReadsDownsampled set to true if the breakend reads were downsampled to the maximum assembly read count
     void
     assembleSVBreakends(
         const SVBreakend& bp1,
@@ -83,7 +91,8 @@ struct SVCandidateAssembler
         const bool isBp2Reversed,
         const reference_contig_segment& refSeq1,
         const reference_contig_segment& refSeq2,
-        Assembly& as) const;
+        Assembly& as,
+        bool& isReadsDownsampled) const;
 
     const AssemblerOptions&
     getAssembleOpt() const
@@ -114,6 +123,16 @@ private:
         ReadIndexType& readIndex,
         AssemblyReadInput& reads) const;
 
+    /// deterministically downsample the reads collected for one assembly to the maximum assembly read count
+    ///
+    /// \param[in,out] readRev if not empty, read reversal flags downsampled together with reads
+    /// \return true if any reads were removed
+    bool
+    downsampleReads(
+        const ReadIndexType& readIndex,
+        AssemblyReadInput& reads,
+        AssemblyReadReversal& readRev) const;
+
     const ReadScannerOptions _scanOpt;
     const AssemblerOptions _assembleOpt;
     const std::vector<bool> _isAlignmentTumor;
@@ -125,5 +144,11 @@ private:
     std::vector<streamPtr> _bamStreams;
     TimeTracker& _remoteTime;
 
+    /// reads collected for each assembly are deterministically downsampled to this count, 0 is unlimited
+    const unsigned _maxAssemblyReadCount;
+
+    /// remote mate reads found by previous remote read searches
+    mutable RemoteMateReadCache _remoteMateCache;
+
     std::vector<double> _sampleBackgroundRemoteRate;
 };
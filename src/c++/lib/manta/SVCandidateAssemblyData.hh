@@ -141,6 +141,8 @@ struct SVCandidateAssemblyData
         bp2ref.clear();
         svs.clear();
         isOverlapSkip=false;
+        isBudgetSkip=false;
+        isReadsDownsampled=false;
     }
 
     typedef AlignmentResult<int> SmallAlignmentResultType;
@@ -178,4 +180,10 @@ struct SVCandidateAssemblyData
 
     /// if true, assembly was skipped for this case because of an overlapping assembly
     bool isOverlapSkip = false;
+
+    /// if true, assembly was skipped for this case because its edge exceeded the edge assembly budget
+    bool isBudgetSkip = false;
+
+    /// if true, the reads assembled for this case were downsampled to the maximum assembly read count
+    bool isReadsDownsampled = false;
 };
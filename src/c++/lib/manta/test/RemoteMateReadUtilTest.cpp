@@ -0,0 +1,159 @@
+// -*- mode: c++; indent-tabs-mode: nil; -*-
+//
+// Manta - Structural Variant and Indel Caller
+// Copyright (c) 2013-2016 Illumina, Inc.
+//
+// This program is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// at your option) any later version.
+//
+// This program is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with this program.  If not, see <http://www.gnu.org/licenses/>.
+//
+//
+
+#include "boost/test/unit_test.hpp"
+
+#include "manta/RemoteMateReadUtil.hh"
+
+
+BOOST_AUTO_TEST_SUITE( test_RemoteMateReadUtil )
+
+
+/// get a remote read search for the mate of a read with name qname, mapped to a different chromosome
+static
+RemoteReadInfo
+getTestRemote(
+    const char* qname,
+    const int matePos)
+{
+    bam_record bamRead;
+    bamRead.set_qname(qname);
+    bamRead.toggle_is_paired();
+    bamRead.toggle_is_first();
+    bam1_t& bamData(*bamRead.get_data());
+    bamData.core.tid = 0;
+    bamData.core.pos = 10;
+    bamData.core.mtid = 1;
+    bamData.core.mpos = matePos;
+    return RemoteReadInfo(bamRead);
+}
+
+
+
+BOOST_AUTO_TEST_CASE( test_RemoteMateReadCacheFind )
+{
+    RemoteMateReadCacheCounts counts;
+    RemoteMateReadCache cache(1024*1024, counts);
+
+    const RemoteReadInfo remoteA(getTestRemote("A", 100));
+    const RemoteReadInfo remoteB(getTestRemote("B", 100));
+
+    const bam_record* mateReadPtr(nullptr);
+    BOOST_REQUIRE(! cache.find(0, remoteA, mateReadPtr));
+
+    bam_record mateRead;
+    mateRead.set_qname("A");
+    cache.insert(0, remoteA, &mateRead);
+    cache.insert(0, remoteB, nullptr);
+    BOOST_REQUIRE_EQUAL(cache.size(), 2u);
+
+    BOOST_REQUIRE(cache.find(0, remoteA, mateReadPtr));
+    BOOST_REQUIRE(nullptr != mateReadPtr);
+    BOOST_REQUIRE_EQUAL(std::string(mateReadPtr->qname()), "A");
+
+    // a mate which was not found is cached without a read:
+    BOOST_REQUIRE(cache.find(0, remoteB, mateReadPtr));
+    BOOST_REQUIRE(nullptr == mateReadPtr);
+
+    // the same read in a different bam or at a different position is not cached:
+    BOOST_REQUIRE(! cache.find(1, remoteA, mateReadPtr));
+    BOOST_REQUIRE(! cache.find(0, getTestRemote("A", 200), mateReadPtr));
+
+    // lookups are only counted per target locus:
+    BOOST_REQUIRE_EQUAL(counts.hitCount, 0u);
+    BOOST_REQUIRE_EQUAL(counts.missCount, 0u);
+}
+
+
+
+BOOST_AUTO_TEST_CASE( test_RemoteMateReadCacheCountLocusLookups )
+{
+    RemoteMateReadCacheCounts counts;
+    RemoteMateReadCache cache(1024*1024, counts);
+
+    // a locus served from the cache counts a hit for each search:
+    cache.countLocusLookups(3, true);
+    BOOST_REQUIRE_EQUAL(counts.hitCount, 3u);
+    BOOST_REQUIRE_EQUAL(counts.missCount, 0u);
+
+    // a locus with any search missing from the cache counts a miss for each search:
+    cache.countLocusLookups(2, false);
+    BOOST_REQUIRE_EQUAL(counts.hitCount, 3u);
+    BOOST_REQUIRE_EQUAL(counts.missCount, 2u);
+}
+
+
+
+BOOST_AUTO_TEST_CASE( test_RemoteMateReadCacheEvict )
+{
+    const RemoteReadInfo remoteA(getTestRemote("A", 100));
+    const RemoteReadInfo remoteB(getTestRemote("B", 100));
+    const RemoteReadInfo remoteC(getTestRemote("C", 100));
+
+    // find the size of a cache entry without a read:
+    unsigned long entryByteCount(1);
+    {
+        RemoteMateReadCacheCounts counts;
+        while (true)
+        {
+            RemoteMateReadCache cache(entryByteCount, counts);
+            cache.insert(0, remoteA, nullptr);
+            if (cache.size() == 1) break;
+            entryByteCount++;
+        }
+    }
+
+    RemoteMateReadCacheCounts counts;
+    RemoteMateReadCache cache(((2*entryByteCount)+1), counts);
+    cache.insert(0, remoteA, nullptr);
+    cache.insert(0, remoteB, nullptr);
+    BOOST_REQUIRE_EQUAL(cache.size(), 2u);
+
+    // use A so that B is the least recently used entry:
+    const bam_record* mateReadPtr(nullptr);
+    BOOST_REQUIRE(cache.find(0, remoteA, mateReadPtr));
+
+    cache.insert(0, remoteC, nullptr);
+    BOOST_REQUIRE_EQUAL(cache.size(), 2u);
+    BOOST_REQUIRE(cache.find(0, remoteA, mateReadPtr));
+    BOOST_REQUIRE(! cache.find(0, remoteB, mateReadPtr));
+    BOOST_REQUIRE(cache.find(0, remoteC, mateReadPtr));
+}
+
+
+
+BOOST_AUTO_TEST_CASE( test_RemoteMateReadCacheDisabled )
+{
+    RemoteMateReadCacheCounts counts;
+    RemoteMateReadCache cache(0, counts);
+
+    const RemoteReadInfo remoteA(getTestRemote("A", 100));
+    cache.insert(0, remoteA, nullptr);
+
+    const bam_record* mateReadPtr(nullptr);
+    BOOST_REQUIRE(! cache.find(0, remoteA, mateReadPtr));
+    cache.countLocusLookups(1, false);
+    BOOST_REQUIRE_EQUAL(cache.size(), 0u);
+    BOOST_REQUIRE_EQUAL(counts.hitCount, 0u);
+    BOOST_REQUIRE_EQUAL(counts.missCount, 0u);
+}
+
+
+BOOST_AUTO_TEST_SUITE_END()
@@ -0,0 +1,230 @@
+// -*- mode: c++; indent-tabs-mode: nil; -*-
+//
+// Manta - Structural Variant and Indel Caller
+// Copyright (c) 2013-2016 Illumina, Inc.
+//
+// This program is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// at your option) any later version.
+//
+// This program is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with this program.  If not, see <http://www.gnu.org/licenses/>.
+//
+//
+
+#include "svgraph/MappedSVLocusGraph.hh"
+
+#include "common/Exceptions.hh"
+
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+
+#include <cassert>
+#include <cerrno>
+#include <cstring>
+#include <fstream>
+#include <sstream>
+
+
+
+MappedSVLocusGraph::
+MappedSVLocusGraph(const std::string& filename) :
+    _filename(filename),
+    _data(nullptr),
+    _dataSize(0),
+    _header(nullptr),
+    _table(nullptr)
+{
+    using namespace illumina::common;
+
+    const int fd(open(filename.c_str(), O_RDONLY));
+    if (fd < 0)
+    {
+        std::ostringstream oss;
+        oss << "Can't open SV locus graph file: '" << filename << "'";
+        BOOST_THROW_EXCEPTION(IoException(errno, oss.str()));
+    }
+
+    struct stat fileStat;
+    if (fstat(fd, &fileStat) != 0)
+    {
+        const int statErrno(errno);
+        close(fd);
+        std::ostringstream oss;
+        oss << "Can't read size of SV locus graph file: '" << filename << "'";
+        BOOST_THROW_EXCEPTION(IoException(statErrno, oss.str()));
+    }
+    _dataSize = fileStat.st_size;
+
+    if (_dataSize < sizeof(MappedSVLocusGraphHeader))
+    {
+        close(fd);
+        std::ostringstream oss;
+        oss << "Unexpected size of locus-indexed SV locus graph file: '" << filename << "'";
+        BOOST_THROW_EXCEPTION(LogicException(oss.str()));
+    }
+
+    void* data(mmap(nullptr, _dataSize, PROT_READ, MAP_SHARED, fd, 0));
+    const int mapErrno(errno);
+
+    // the mapping remains valid after the file is closed:
+    close(fd);
+
+    if (data == MAP_FAILED)
+    {
+        std::ostringstream oss;
+        oss << "Can't memory map SV locus graph file: '" << filename << "'";
+        BOOST_THROW_EXCEPTION(IoException(mapErrno, oss.str()));
+    }
+    _data = static_cast<const char*>(data);
+
+    // the destructor doesn't run if the constructor throws, so release the mapping here:
+    try
+    {
+        checkMappedData();
+    }
+    catch (...)
+    {
+        unmap();
+        throw;
+    }
+}
+
+
+
+MappedSVLocusGraph::
+~MappedSVLocusGraph()
+{
+    unmap();
+}
+
+
+
+void
+MappedSVLocusGraph::
+checkMappedData()
+{
+    using namespace illumina::common;
+
+    _header = reinterpret_cast<const MappedSVLocusGraphHeader*>(_data);
+    if (0 != std::memcmp(_header->magic, getMagic(), sizeof(_header->magic)))
+    {
+        std::ostringstream oss;
+        oss << "File is not a locus-indexed SV locus graph: '" << _filename << "'";
+        BOOST_THROW_EXCEPTION(LogicException(oss.str()));
+    }
+
+    // check that all locations are within the file:
+    getData(_header->setInfoOffset, _header->setInfoSize);
+    _table = reinterpret_cast<const MappedSVLocusGraphTableEntry*>(
+                 getData(_header->tableOffset, (_header->locusCount*sizeof(MappedSVLocusGraphTableEntry))));
+    for (unsigned locusIndex(0); locusIndex<size(); ++locusIndex)
+    {
+        getData(_table[locusIndex].offset, _table[locusIndex].size);
+    }
+}
+
+
+
+void
+MappedSVLocusGraph::
+unmap()
+{
+    if (nullptr == _data) return;
+    munmap(const_cast<char*>(_data), _dataSize);
+    _data = nullptr;
+    _header = nullptr;
+    _table = nullptr;
+}
+
+
+
+bool
+MappedSVLocusGraph::
+isMappedGraphFile(const std::string& filename)
+{
+    MappedSVLocusGraphHeader header;
+    std::ifstream ifs(filename.c_str(), std::ios::binary);
+    if (! ifs.read(reinterpret_cast<char*>(&header), sizeof(header))) return false;
+    return (0 == std::memcmp(header.magic, getMagic(), sizeof(header.magic)));
+}
+
+
+
+unsigned long
+MappedSVLocusGraph::
+getLocusObservationCount(const unsigned locusIndex) const
+{
+    assert(locusIndex < size());
+    return _table[locusIndex].observationCount;
+}
+
+
+
+void
+MappedSVLocusGraph::
+getLocusBeginObservationCounts(
+    std::vector<unsigned long>& locusBeginCounts) const
+{
+    locusBeginCounts.clear();
+    locusBeginCounts.reserve(size()+1);
+
+    unsigned long headCount(0);
+    for (unsigned locusIndex(0); locusIndex<size(); ++locusIndex)
+    {
+        locusBeginCounts.push_back(headCount);
+        headCount += _table[locusIndex].observationCount;
+    }
+    locusBeginCounts.push_back(headCount);
+}
+
+
+
+const char*
+MappedSVLocusGraph::
+getSetInfoData(
+    unsigned long& dataSize) const
+{
+    dataSize = _header->setInfoSize;
+    return _data + _header->setInfoOffset;
+}
+
+
+
+const char*
+MappedSVLocusGraph::
+getLocusData(
+    const unsigned locusIndex,
+    unsigned long& dataSize) const
+{
+    assert(locusIndex < size());
+    dataSize = _table[locusIndex].size;
+    return _data + _table[locusIndex].offset;
+}
+
+
+
+const char*
+MappedSVLocusGraph::
+getData(
+    const uint64_t offset,
+    const uint64_t dataSize) const
+{
+    if ((offset > _dataSize) || (dataSize > (_dataSize - offset)))
+    {
+        using namespace illumina::common;
+
+        std::ostringstream oss;
+        oss << "Locus-indexed SV locus graph file is truncated or corrupt: '" << _filename << "'";
+        BOOST_THROW_EXCEPTION(LogicException(oss.str()));
+    }
+    return _data + offset;
+}
@@ -0,0 +1,137 @@
+// -*- mode: c++; indent-tabs-mode: nil; -*-
+//
+// Manta - Structural Variant and Indel Caller
+// Copyright (c) 2013-2016 Illumina, Inc.
+//
+// This program is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// at your option) any later version.
+//
+// This program is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with this program.  If not, see <http://www.gnu.org/licenses/>.
+//
+//
+
+#pragma once
+
+#include <cstdint>
+#include <string>
+#include <vector>
+
+
+/// fixed size header at the start of a locus-indexed graph file
+struct MappedSVLocusGraphHeader
+{
+    char magic[8];
+    uint64_t setInfoOffset;
+    uint64_t setInfoSize;
+    uint64_t locusCount;
+    uint64_t tableOffset;
+};
+
+
+/// locus table entry of a locus-indexed graph file
+struct MappedSVLocusGraphTableEntry
+{
+    uint64_t offset;
+    uint64_t size;
+    uint64_t observationCount;
+};
+
+
+/// read-only memory mapping of a locus-indexed SV locus graph file
+///
+/// A locus-indexed graph file contains the same graph as the file written by SVLocusSet::save,
+/// but each locus is serialized independently and a table records the byte range and evidence
+/// observation count of every locus, so that any subset of loci can be loaded without reading
+/// the rest of the file. All positions are stored as offsets from the start of the file, so the
+/// file can be mapped at any address, allowing many processes to share one read-only copy of the
+/// graph through the page cache.
+///
+/// file layout:
+/// 1. MappedSVLocusGraphHeader
+/// 2. set information: one boost binary archive with the set header, options and statistics
+/// 3. locus data: one boost binary archive for each locus, in locus index order
+/// 4. locus table: one MappedSVLocusGraphTableEntry for each locus
+///
+struct MappedSVLocusGraph
+{
+    explicit
+    MappedSVLocusGraph(const std::string& filename);
+
+    ~MappedSVLocusGraph();
+
+    /// return true if filename starts with the locus-indexed graph file magic string
+    static
+    bool
+    isMappedGraphFile(const std::string& filename);
+
+    static
+    const char*
+    getMagic()
+    {
+        return "MSVLIDX1";
+    }
+
+    const std::string&
+    getFilename() const
+    {
+        return _filename;
+    }
+
+    /// total number of loci
+    unsigned
+    size() const
+    {
+        return _header->locusCount;
+    }
+
+    unsigned long
+    getLocusObservationCount(const unsigned locusIndex) const;
+
+    /// get the total observation count of all loci preceding each locus, followed by the total
+    /// observation count of all loci (as getLocusBeginObservationCounts in GenerateSVCandidates)
+    void
+    getLocusBeginObservationCounts(
+        std::vector<unsigned long>& locusBeginCounts) const;
+
+    /// get the serialized set information
+    const char*
+    getSetInfoData(
+        unsigned long& dataSize) const;
+
+    /// get the serialized locus locusIndex
+    const char*
+    getLocusData(
+        const unsigned locusIndex,
+        unsigned long& dataSize) const;
+
+private:
+    MappedSVLocusGraph(const MappedSVLocusGraph&) = delete;
+    MappedSVLocusGraph& operator=(const MappedSVLocusGraph&) = delete;
+
+    const char*
+    getData(
+        const uint64_t offset,
+        const uint64_t dataSize) const;
+
+    /// check the mapped file header and that all data locations are within the file
+    void
+    checkMappedData();
+
+    /// release the file mapping, if any
+    void
+    unmap();
+
+    std::string _filename;
+    const char* _data;
+    unsigned long _dataSize;
+    const MappedSVLocusGraphHeader* _header;
+    const MappedSVLocusGraphTableEntry* _table;
+};
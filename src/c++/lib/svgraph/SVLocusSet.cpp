@@ -25,6 +25,7 @@
 #include "blt_util/log.hh"
 #include "blt_util/SizeDistribution.hh"
 #include "common/Exceptions.hh"
+#include "svgraph/MappedSVLocusGraph.hh"
 #include "svgraph/SVLocusSet.hh"
 
 #include "blt_util/thirdparty_push.h"
@@ -36,6 +37,7 @@
 #include "blt_util/thirdparty_pop.h"
 
 #include <algorithm>
+#include <cstring>
 #include <fstream>
 #include <iostream>
 #include <sstream>
@@ -1268,6 +1270,181 @@ load(
 
 
 
+namespace
+{
+
+/// stream buffer reading directly from a block of memory, such as part of a memory mapped file
+struct MemoryInputBuffer : public std::streambuf
+{
+    MemoryInputBuffer(
+        const char* data,
+        const unsigned long dataSize)
+    {
+        char* begin(const_cast<char*>(data));
+        setg(begin, begin, begin+dataSize);
+    }
+};
+
+// each part of a locus-indexed graph file is an independent archive, so the archive header is
+// left out to save space:
+const unsigned locusIndexedArchiveFlags(boost::archive::no_header);
+
+
+/// append the contents of oss to the file, and return the offset of the appended data
+uint64_t
+appendData(
+    std::ofstream& ofs,
+    const std::ostringstream& oss)
+{
+    const uint64_t offset(ofs.tellp());
+    const std::string data(oss.str());
+    ofs.write(data.data(), data.size());
+    return offset;
+}
+
+}
+
+
+
+void
+SVLocusSet::
+saveLocusIndexed(const char* filename) const
+{
+    using namespace boost::archive;
+
+    assert(NULL != filename);
+    std::ofstream ofs(filename, std::ios::binary);
+
+    MappedSVLocusGraphHeader fileHeader;
+    std::memset(&fileHeader, 0, sizeof(fileHeader));
+    ofs.write(reinterpret_cast<const char*>(&fileHeader), sizeof(fileHeader));
+
+    {
+        std::ostringstream oss;
+        binary_oarchive oa(oss, locusIndexedArchiveFlags);
+
+        oa << header;
+        oa << _opt;
+        oa << _isFinalized;
+        oa << _totalCleaned;
+        oa << _counts;
+        oa << _highestSearchCount;
+        oa << _highestSearchDensity;
+        oa << _isMaxSearchCount;
+        oa << _isMaxSearchDensity;
+        oa << _buildTime;
+        oa << _mergeTime;
+
+        fileHeader.setInfoSize = oss.str().size();
+        fileHeader.setInfoOffset = appendData(ofs, oss);
+    }
+
+    // empty loci are skipped, as in save(), so that locus indices are the same as those following load():
+    std::vector<MappedSVLocusGraphTableEntry> table;
+    for (const SVLocus& locus : _loci)
+    {
+        if (locus.empty()) continue;
+
+        std::ostringstream oss;
+        {
+            binary_oarchive oa(oss, locusIndexedArchiveFlags);
+            oa << locus;
+        }
+
+        MappedSVLocusGraphTableEntry entry;
+        entry.size = oss.str().size();
+        entry.offset = appendData(ofs, oss);
+        entry.observationCount = locus.totalObservationCount();
+        table.push_back(entry);
+    }
+
+    // align the table so that it can be accessed directly from the mapped file:
+    const uint64_t tableAlign(sizeof(uint64_t));
+    const uint64_t padSize((tableAlign - (static_cast<uint64_t>(ofs.tellp()) % tableAlign)) % tableAlign);
+    const char pad[tableAlign] = {};
+    ofs.write(pad, padSize);
+
+    std::memcpy(fileHeader.magic, MappedSVLocusGraph::getMagic(), sizeof(fileHeader.magic));
+    fileHeader.locusCount = table.size();
+    fileHeader.tableOffset = ofs.tellp();
+    if (! table.empty())
+    {
+        ofs.write(reinterpret_cast<const char*>(table.data()), (table.size()*sizeof(MappedSVLocusGraphTableEntry)));
+    }
+
+    // the header is written last, so that an incomplete file is never recognized as a locus-indexed graph:
+    ofs.seekp(0);
+    ofs.write(reinterpret_cast<const char*>(&fileHeader), sizeof(fileHeader));
+
+    if (! ofs)
+    {
+        using namespace illumina::common;
+
+        std::ostringstream oss;
+        oss << "Failed to write locus-indexed SV locus graph file: '" << filename << "'";
+        BOOST_THROW_EXCEPTION(LogicException(oss.str()));
+    }
+}
+
+
+
+void
+SVLocusSet::
+loadLocusIndexed(
+    const MappedSVLocusGraph& graph,
+    const std::vector<bool>& isLoadLocus)
+{
+    using namespace boost::archive;
+
+    clear();
+
+    _source=graph.getFilename();
+
+    {
+        unsigned long dataSize(0);
+        const char* data(graph.getSetInfoData(dataSize));
+        MemoryInputBuffer buffer(data, dataSize);
+        std::istream is(&buffer);
+        binary_iarchive ia(is, locusIndexedArchiveFlags);
+
+        ia >> header;
+        ia >> _opt;
+        ia >> _isFinalized;
+        ia >> _totalCleaned;
+        ia >> _counts;
+        ia >> _highestSearchCount;
+        ia >> _highestSearchDensity;
+        ia >> _isMaxSearchCount;
+        ia >> _isMaxSearchDensity;
+        ia >> _buildTime;
+        ia >> _mergeTime;
+    }
+
+    const bool isLoadAll(isLoadLocus.empty());
+    assert(isLoadAll || (isLoadLocus.size() == graph.size()));
+
+    _loci.resize(graph.size());
+    for (unsigned locusIndex(0); locusIndex<graph.size(); ++locusIndex)
+    {
+        SVLocus& locus(_loci[locusIndex]);
+        if (isLoadAll || isLoadLocus[locusIndex])
+        {
+            unsigned long dataSize(0);
+            const char* data(graph.getLocusData(locusIndex, dataSize));
+            MemoryInputBuffer buffer(data, dataSize);
+            std::istream is(&buffer);
+            binary_iarchive ia(is, locusIndexedArchiveFlags);
+            ia >> locus;
+        }
+        locus.updateIndex(locusIndex);
+        if (locus.empty()) _emptyLoci.insert(locusIndex);
+    }
+
+    _isIndexed = false;
+}
+
+
+
 void
 SVLocusSet::
 reconstructIndex()
@@ -44,6 +44,9 @@
 #endif
 
 
+struct MappedSVLocusGraph;
+
+
 /// A set of SVLocus objects comprising a full locus graph
 ///
 /// When finalized, the SVLocusSet contains non-overlapping SVLoci
@@ -175,6 +178,24 @@ struct SVLocusSet : public flyweight_observer<SVLocusNodeMoveMessage>
         const char* filename,
         const bool isSkipIndex = false);
 
+    /// binary serialization to a locus-indexed graph file, see MappedSVLocusGraph
+    void
+    saveLocusIndexed(const char* filename) const;
+
+    /// restore from a memory mapped locus-indexed graph file
+    ///
+    /// the graph index is not built, so only the limited set of operations allowed after
+    /// load() with isSkipIndex are supported
+    ///
+    /// \param[in] isLoadLocus if not empty, only loci with a true value in this vector are
+    ///            loaded, all other loci are left empty. Set-level statistics which are computed
+    ///            from the loci, such as totalObservationCount(), only reflect the loaded loci.
+    ///
+    void
+    loadLocusIndexed(
+        const MappedSVLocusGraph& graph,
+        const std::vector<bool>& isLoadLocus = std::vector<bool>());
+
     // debug output
     void
     dump(std::ostream& os) const;
@@ -307,6 +328,13 @@ struct SVLocusSet : public flyweight_observer<SVLocusNodeMoveMessage>
         _mergeTime = t;
     }
 
+    void
+    addMergeTime(
+        const CpuTimes& t)
+    {
+        _mergeTime.merge(t);
+    }
+
     typedef std::pair<LocusIndexType,NodeIndexType> NodeAddressType;
 
     /// get all nodes in this object which intersect with
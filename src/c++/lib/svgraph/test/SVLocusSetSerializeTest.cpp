@@ -25,10 +25,15 @@
 #include "boost/archive/tmpdir.hpp"
 #include "boost/test/unit_test.hpp"
 
+#include "common/Exceptions.hh"
+#include "svgraph/MappedSVLocusGraph.hh"
 #include "svgraph/SVLocusSet.hh"
 
 #include "SVLocusTestUtil.hh"
 
+#include <fstream>
+#include <iterator>
+
 using namespace boost::archive;
 
 
@@ -139,5 +144,111 @@ BOOST_AUTO_TEST_CASE( test_SVLocusSetSerialze2 )
 
 
 
+BOOST_AUTO_TEST_CASE( test_SVLocusSetSerializeLocusIndexed )
+{
+    SVLocusSet set1;
+    {
+        SVLocus locus1;
+        locusAddPair(locus1,1,10,20,2,30,40,false,3);
+
+        SVLocus locus2;
+        locusAddPair(locus2,3,10,20,4,30,40);
+
+        SVLocus locus3;
+        locusAddPair(locus3,5,10,20,6,30,40,false,2);
+
+        set1.merge(locus1);
+        set1.merge(locus2);
+        set1.merge(locus3);
+    }
+
+    std::string filename(tmpdir());
+    filename += "/testfile.indexed.bin";
+
+    set1.saveLocusIndexed(filename.c_str());
+    const SVLocusSet& cset1(set1);
+    BOOST_REQUIRE(MappedSVLocusGraph::isMappedGraphFile(filename));
+
+    const MappedSVLocusGraph graph(filename);
+    BOOST_REQUIRE_EQUAL(graph.size(),set1.size());
+
+    std::vector<unsigned long> locusBeginCounts;
+    graph.getLocusBeginObservationCounts(locusBeginCounts);
+    BOOST_REQUIRE_EQUAL(locusBeginCounts.size(),(set1.size()+1));
+    BOOST_REQUIRE_EQUAL(locusBeginCounts.back(),set1.totalObservationCount());
+
+    // load all loci:
+    {
+        SVLocusSet set1_copy;
+        set1_copy.loadLocusIndexed(graph);
+        const SVLocusSet& cset1_copy(set1_copy);
+        BOOST_REQUIRE_EQUAL(set1_copy.size(),set1.size());
+        BOOST_REQUIRE_EQUAL(set1_copy.totalObservationCount(),set1.totalObservationCount());
+        for (unsigned locusIndex(0); locusIndex<set1.size(); ++locusIndex)
+        {
+            const SVLocus& locus(cset1.getLocus(locusIndex));
+            const SVLocus& locus_copy(cset1_copy.getLocus(locusIndex));
+            BOOST_REQUIRE_EQUAL(locus_copy.getIndex(),locusIndex);
+            BOOST_REQUIRE_EQUAL(locus_copy.size(),locus.size());
+            BOOST_REQUIRE_EQUAL(locus_copy.totalObservationCount(),locus.totalObservationCount());
+            BOOST_REQUIRE_EQUAL(graph.getLocusObservationCount(locusIndex),locus.totalObservationCount());
+        }
+    }
+
+    // load the middle locus only:
+    {
+        std::vector<bool> isLoadLocus(set1.size(),false);
+        isLoadLocus[1] = true;
+
+        SVLocusSet set1_copy;
+        set1_copy.loadLocusIndexed(graph, isLoadLocus);
+        const SVLocusSet& cset1_copy(set1_copy);
+        BOOST_REQUIRE_EQUAL(set1_copy.size(),set1.size());
+        BOOST_REQUIRE(cset1_copy.getLocus(0).empty());
+        BOOST_REQUIRE_EQUAL(cset1_copy.getLocus(1).size(),cset1.getLocus(1).size());
+        BOOST_REQUIRE(cset1_copy.getLocus(2).empty());
+        BOOST_REQUIRE_EQUAL(set1_copy.totalObservationCount(),cset1.getLocus(1).totalObservationCount());
+    }
+
+    // a regular graph file is not recognized as locus-indexed:
+    std::string filename2(tmpdir());
+    filename2 += "/testfile.bin";
+    set1.save(filename2.c_str());
+    BOOST_REQUIRE(! MappedSVLocusGraph::isMappedGraphFile(filename2));
+}
+
+
+
+BOOST_AUTO_TEST_CASE( test_SVLocusSetLocusIndexedCorrupt )
+{
+    SVLocusSet set1;
+    {
+        SVLocus locus1;
+        locusAddPair(locus1,1,10,20,2,30,40);
+        set1.merge(locus1);
+    }
+
+    // a regular graph file is rejected after it is mapped:
+    std::string filename(tmpdir());
+    filename += "/testfile.bin";
+    set1.save(filename.c_str());
+    BOOST_REQUIRE_THROW(MappedSVLocusGraph graph(filename), illumina::common::LogicException);
+
+    // a truncated locus-indexed graph file is rejected:
+    std::string filename2(tmpdir());
+    filename2 += "/testfile.indexed.bin";
+    set1.saveLocusIndexed(filename2.c_str());
+    {
+        std::ifstream ifs(filename2.c_str(), std::ios::binary);
+        std::string data((std::istreambuf_iterator<char>(ifs)), std::istreambuf_iterator<char>());
+        ifs.close();
+        std::ofstream ofs(filename2.c_str(), std::ios::binary | std::ios::trunc);
+        ofs.write(data.c_str(), (data.size()-1));
+    }
+    BOOST_REQUIRE_THROW(MappedSVLocusGraph graph(filename2), illumina::common::LogicException);
+}
+
+
+
 BOOST_AUTO_TEST_SUITE_END()
 
@@ -32,7 +32,8 @@ sys.path.append(workflowDir)
 
 from configBuildTimeInfo import workflowVersion
 from mantaOptions import MantaWorkflowOptionsBase
-from configureUtil import BamSetChecker, groomBamList, OptParseException
+from configureUtil import BamSetChecker, groomBamList, OptParseException, validateFixExistingDirArg, \
+                          validateFixExistingFileArg
 from makeRunScript import makeRunScript
 from mantaWorkflow import MantaWorkflow
 from workflowUtil import ensureDir
@@ -72,10 +73,41 @@ You must specify a BAM or CRAM file for at least one sample.
         group.add_option("--useExistingChromDepths",
                          dest="useExistingChromDepths", action="store_true",
                          help="Use pre-calculated chromosome depths.")
+        group.add_option("--artifactCacheDir",
+                         dest="artifactCacheDir", metavar="DIR",
+                         help="Existing directory used to cache the alignment statistics and chromosome depths of each "
+                              "input BAM/CRAM file. Runs sharing this directory reuse the results computed for the same "
+                              "unchanged file by any previous run. Use libexec/pruneArtifactCache.py to limit the size "
+                              "of the cache.")
+        group.add_option("--indexChromDepth",
+                         dest="isIndexChromDepth", action="store_true",
+                         help="Estimate chromosome depths from the mapped read counts in the BAM index files instead of "
+                              "scanning alignments. Alignment scanning is still used for CRAM files and BAM indexes "
+                              "without mapped read counts.")
         group.add_option("--candidateBins",type="int",
                          dest="nonlocalWorkBins", metavar="candidateBins",
                          help="Provide the total number of tasks which candidate generation "
                             " will be sub-divided into. (default: %default)")
+        group.add_option("--candidateThreads",type="int",
+                         dest="hyGenThreadCount", metavar="N",
+                         help="Number of threads used by each candidate generation task. The candidate generation "
+                              "tasks are combined into tasks N times larger, each of which loads the SV locus graph "
+                              "and alignment statistics once for all of its threads. (default: %default)")
+        group.add_option("--candidateWorkQueue",
+                         dest="isCandidateWorkQueue", action="store_true",
+                         help="Balance candidate generation dynamically: run one candidate generation task per "
+                              "available core, where tasks claim small chunks of the total workload from a shared "
+                              "queue until all work is complete. Only used when the workflow is run in local mode.")
+        group.add_option("--candidateCostModel",
+                         dest="candidateCostModel", metavar="FILE",
+                         help="Divide candidate generation into bins of similar estimated runtime using this edge "
+                              "cost model, as produced by libexec/calibrateEdgeCostModel.py. Not used with "
+                              "--candidateWorkQueue.")
+        group.add_option("--candidateLocalityOrder",
+                         dest="isCandidateLocalityOrder", action="store_true",
+                         help="Process the edges of each candidate generation bin in order of their genomic position "
+                              "instead of SV locus graph order, so that consecutive edges read alignments from nearby "
+                              "regions. Not used with --candidateWorkQueue.")
         group.add_option("--retainTempFiles",
                          dest="isRetainTempFiles", action="store_true",
                          help="Keep all temporary files (for workflow debugging)")
@@ -97,8 +129,12 @@ You must specify a BAM or CRAM file for at least one sample.
             'isUnstrandedRNA' : False,
             'useExistingAlignStats' : False,
             'useExistingChromDepths' : False,
+            'isIndexChromDepth' : False,
             'isRetainTempFiles' : False,
             'isGenerateSupportBam' : False,
+            'isCandidateWorkQueue' : False,
+            'isCandidateLocalityOrder' : False,
+            'hyGenThreadCount' : 1,
             'nonlocalWorkBins' : 256
                           })
         return defaults
@@ -110,6 +146,12 @@ You must specify a BAM or CRAM file for at least one sample.
         groomBamList(options.normalBamList,"normal sample")
         groomBamList(options.tumorBamList, "tumor sample")
 
+        options.candidateCostModel=validateFixExistingFileArg(options.candidateCostModel,"edge cost model")
+        options.artifactCacheDir=validateFixExistingDirArg(options.artifactCacheDir,"artifact cache")
+
+        if options.hyGenThreadCount < 1 :
+            raise OptParseException("Candidate generation thread count must be at least 1")
+
         MantaWorkflowOptionsBase.validateAndSanitizeExistingOptions(self,options)
 
 
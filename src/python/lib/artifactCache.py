@@ -0,0 +1,175 @@
+#
+# Manta - Structural Variant and Indel Caller
+# Copyright (c) 2013-2016 Illumina, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+
+"""
+cache of per alignment file preprocessing results, which can be shared by many workflow runs
+
+Each cache entry is a single file, named by a key computed from the identity of the
+alignment file (path, size, modification time and header text), the workflow version,
+the type of result and any other values the result depends on. Entries are written
+to a temporary file and renamed into place, so that runs sharing a cache never read
+a partial entry. The modification time of an entry is updated each time it is used,
+so that the cache can be pruned to a maximum size by removing the least recently
+used entries first.
+"""
+
+import os
+
+
+# prefix of temporary files which have not yet been renamed into a cache entry:
+tmpEntryPrefix = ".tmp."
+
+
+
+def getAlignmentHeaderDigest(htsfileBin, alignmentFile) :
+    """
+    return the sha1 hex digest of the BAM/CRAM header text of alignmentFile
+    """
+    import hashlib, subprocess
+
+    digest = hashlib.sha1()
+    proc = subprocess.Popen([htsfileBin, "-h", alignmentFile], stdout=subprocess.PIPE)
+    for line in proc.stdout :
+        digest.update(line)
+    if proc.wait() != 0 :
+        raise Exception("Can't read header of BAM/CRAM file: '%s'" % (alignmentFile))
+    return digest.hexdigest()
+
+
+
+class ArtifactCache :
+    """
+    find, fetch and store cache entries in a cache directory
+    """
+
+    def __init__(self, cacheDir, htsfileBin, version) :
+        self.cacheDir = os.path.abspath(cacheDir)
+        self.htsfileBin = htsfileBin
+        self.version = version
+
+    def getAlignmentFileIdentity(self, alignmentFile) :
+        """
+        return a string which changes whenever alignmentFile is moved, modified or replaced
+        """
+        # the path is included as given (not resolved through links) because results such
+        # as the alignment stats record the alignment file path:
+        path = os.path.abspath(alignmentFile)
+        st = os.stat(path)
+        headerDigest = getAlignmentHeaderDigest(self.htsfileBin, path)
+        return "\t".join([path, str(st.st_size), repr(st.st_mtime), headerDigest])
+
+    def getEntryPath(self, entryLabel, alignmentFile, keyItems=None, entryExt="") :
+        """
+        return the cache entry filename for result type entryLabel of alignmentFile
+
+        \param keyItems list of any other strings the result depends on
+        """
+        import hashlib
+
+        if keyItems is None : keyItems = []
+        keyText = "\n".join([entryLabel, self.version, self.getAlignmentFileIdentity(alignmentFile)] + keyItems)
+        key = hashlib.sha1(keyText).hexdigest()
+        return os.path.join(self.cacheDir, entryLabel + "." + key + entryExt)
+
+    def fetchEntry(self, entryPath, outFile) :
+        """
+        copy a cache entry to outFile and mark the entry as recently used
+
+        return False if the entry is not in the cache
+        """
+        import errno, shutil
+
+        try :
+            shutil.copyfile(entryPath, outFile)
+        except IOError, e :
+            if e.errno == errno.ENOENT : return False
+            raise
+
+        try :
+            os.utime(entryPath, None)
+        except OSError :
+            # the entry may have just been pruned by another process, which does not affect this copy
+            pass
+        return True
+
+    def storeEntry(self, inFile, entryPath) :
+        """
+        atomically store a copy of inFile as a cache entry, replacing any existing entry
+        """
+        import shutil, tempfile
+
+        (fd, tmpPath) = tempfile.mkstemp(prefix=tmpEntryPrefix, dir=self.cacheDir)
+        os.close(fd)
+        try :
+            # mkstemp creates files readable only by the owner, apply the usual permissions so the cache can be shared:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(tmpPath, 0666 & ~umask)
+            shutil.copyfile(inFile, tmpPath)
+            os.rename(tmpPath, entryPath)
+        except :
+            if os.path.exists(tmpPath) : os.remove(tmpPath)
+            raise
+
+
+
+def pruneArtifactCache(cacheDir, maxBytes, isDryRun=False, tmpEntryMaxAge=86400) :
+    """
+    remove the least recently used cache entries until the total size of all entries is no more than maxBytes
+
+    Temporary entry files older than tmpEntryMaxAge seconds are left from interrupted runs, these are always removed.
+
+    return a tuple of (removed entry count, removed entry bytes, remaining entry count, remaining entry bytes)
+    """
+    import time
+
+    entries = []
+    staleTmpFiles = []
+    minTmpTime = time.time() - tmpEntryMaxAge
+    for fileName in os.listdir(cacheDir) :
+        path = os.path.join(cacheDir, fileName)
+        if not os.path.isfile(path) : continue
+        st = os.stat(path)
+        if fileName.startswith(tmpEntryPrefix) :
+            if st.st_mtime < minTmpTime : staleTmpFiles.append(path)
+            continue
+        entries.append((st.st_mtime, st.st_size, path))
+
+    if not isDryRun :
+        for path in staleTmpFiles :
+            os.remove(path)
+
+    # oldest first:
+    entries.sort()
+
+    totalBytes = sum([size for (mtime, size, path) in entries])
+    removedCount = 0
+    removedBytes = 0
+    for (mtime, size, path) in entries :
+        if totalBytes - removedBytes <= maxBytes : break
+        if not isDryRun :
+            try :
+                os.remove(path)
+            except OSError :
+                # another process may be pruning the same cache:
+                if os.path.exists(path) : raise
+        removedCount += 1
+        removedBytes += size
+
+    return (removedCount, removedBytes, len(entries)-removedCount, totalBytes-removedBytes)
@@ -0,0 +1,440 @@
+#
+# Manta - Structural Variant and Indel Caller
+# Copyright (c) 2013-2016 Illumina, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+
+"""
+BAM record reader and writer, and BAM index builder
+
+Records are handled in their binary BAM encoding, excluding the leading
+block_size field, so that records can be filtered, sorted and copied without
+converting through SAM text. Only the fields required to locate auxiliary
+tags and sort or index records are decoded.
+"""
+
+import struct
+
+from bgzfUtil import BgzfConstants, BgzfReader, BgzfWriter, TabixIndexBuilder
+
+
+
+class BamConstants :
+
+    magic = "BAM\1"
+
+    # size of the fixed-length fields at the start of each record:
+    coreSize = 32
+
+    # value sizes of the fixed size auxiliary tag types:
+    auxTypeSizes = { "A" : 1, "c" : 1, "C" : 1, "s" : 2, "S" : 2, "i" : 4, "I" : 4, "f" : 4 }
+
+    flagUnmapped = 0x4
+    flagReverse = 0x10
+
+    # CIGAR operations consuming reference positions (M, D, N, =, X):
+    refCigarOps = frozenset([0, 2, 3, 7, 8])
+
+
+
+class BamHeader :
+    """
+    BAM header text and reference sequence list
+    """
+
+    def __init__(self, text, refs) :
+        """
+        refs is a list of (name, length) tuples
+        """
+        self.text = text
+        self.refs = refs
+
+    def getBinary(self) :
+        data = [BamConstants.magic, struct.pack("<i", len(self.text)), self.text, struct.pack("<i", len(self.refs))]
+        for (name, length) in self.refs :
+            data.append(struct.pack("<i", len(name)+1))
+            data.append(name + "\0")
+            data.append(struct.pack("<i", length))
+        return "".join(data)
+
+
+
+class BamReader :
+    """
+    read the header and binary records of a BAM file
+    """
+
+    def __init__(self, filename) :
+        self.filename = filename
+        self.bgzf = BgzfReader(filename)
+        self.header = self._readHeader()
+
+    def _readExact(self, size) :
+        data = self.bgzf.read(size)
+        if len(data) != size :
+            raise Exception("Unexpected end of BAM file: '%s'" % (self.filename))
+        return data
+
+    def _readHeader(self) :
+        if self.bgzf.read(4) != BamConstants.magic :
+            raise Exception("Unexpected BAM file format: '%s'" % (self.filename))
+
+        (textSize,) = struct.unpack("<i", self._readExact(4))
+        text = self._readExact(textSize)
+
+        refs = []
+        (refCount,) = struct.unpack("<i", self._readExact(4))
+        for _ in range(refCount) :
+            (nameSize,) = struct.unpack("<i", self._readExact(4))
+            name = self._readExact(nameSize).rstrip("\0")
+            (length,) = struct.unpack("<i", self._readExact(4))
+            refs.append((name, length))
+
+        return BamHeader(text, refs)
+
+    def __iter__(self) :
+        """
+        iterate through the binary data of each record
+        """
+        while True :
+            blockSizeData = self.bgzf.read(4)
+            if len(blockSizeData) == 0 : return
+            if len(blockSizeData) != 4 :
+                raise Exception("Unexpected end of BAM file: '%s'" % (self.filename))
+            (blockSize,) = struct.unpack("<i", blockSizeData)
+            yield self._readExact(blockSize)
+
+    def close(self) :
+        self.bgzf.close()
+
+
+
+class BamIndexBuilder(TabixIndexBuilder) :
+    """
+    build a BAM index for a coordinate sorted BAM file from the virtual offsets of its records
+
+    Records must be added in file order, where each record's virtual offset
+    is the offset just past the end of the record.
+    """
+
+    def __init__(self, startOffset, header) :
+        TabixIndexBuilder.__init__(self, startOffset)
+        for (name, length) in header.refs :
+            self._addTid(name)
+
+        # virtual offset at the end of the coordinate sorted records, once known:
+        self.coordEndOffset = None
+        self.noCoordCount = 0
+
+    def addRecord(self, record, offset) :
+        (tid, pos) = struct.unpack_from("<ii", record, 0)
+        if tid < 0 :
+            # unplaced reads follow all placed reads, and are only counted:
+            if self.coordEndOffset is None :
+                self.coordEndOffset = self.lastOff
+            self.noCoordCount += 1
+            return
+
+        if self.coordEndOffset is not None :
+            raise Exception("Placed reads follow unplaced reads in indexed BAM file")
+
+        (flag,) = struct.unpack_from("<H", record, 14)
+        isMapped = ((flag & BamConstants.flagUnmapped) == 0)
+        self._addTidInterval(tid, pos, getRecordEndPos(record, pos, isMapped), offset, isMapped)
+
+    def finish(self, finalOffset, getVirtualOffset=None) :
+        if self.coordEndOffset is not None :
+            finalOffset = self.coordEndOffset
+        TabixIndexBuilder.finish(self, finalOffset, getVirtualOffset)
+
+    def write(self, indexPath) :
+        """
+        write the index as an uncompressed .bai file
+        """
+        if not self.isFinished :
+            raise Exception("BAM index must be finished before it is written: '%s'" % (indexPath))
+
+        data = ["BAI\1", struct.pack("<i", len(self.names))]
+
+        for tid in range(len(self.names)) :
+            if self.meta[tid] is None :
+                data.append(struct.pack("<ii", 0, 0))
+                continue
+
+            bins = self.bins[tid]
+            data.append(struct.pack("<i", len(bins) + 1))
+            for bin in sorted(bins.keys()) :
+                chunks = bins[bin]
+                data.append(struct.pack("<Ii", bin, len(chunks)))
+                for (chunkBeg, chunkEnd) in chunks :
+                    data.append(struct.pack("<QQ", chunkBeg, chunkEnd))
+            data.append(struct.pack("<Ii", self.metaBin, 2))
+            for (metaVal1, metaVal2) in self.meta[tid] :
+                data.append(struct.pack("<QQ", metaVal1, metaVal2))
+
+            linear = self.linear[tid]
+            data.append(struct.pack("<i", len(linear)))
+            data.append(struct.pack("<%iQ" % (len(linear)), *linear))
+
+        data.append(struct.pack("<Q", self.noCoordCount))
+
+        indexfp = open(indexPath, "wb")
+        indexfp.write("".join(data))
+        indexfp.close()
+
+
+
+class BamIndexRefSummary :
+    """
+    summary of the index data for one reference sequence in a BAM index
+    """
+
+    # size of the linear index windows:
+    windowSize = 16384
+
+    def __init__(self) :
+        # mapped and unmapped read counts and the virtual offset range of the reference's
+        # records, from the index meta bin, these are None when the index has no meta bin:
+        self.mappedCount = None
+        self.unmappedCount = None
+        self.beginOffset = None
+        self.endOffset = None
+
+        # linear index virtual offsets:
+        self.linear = []
+
+    def isEmpty(self) :
+        return (len(self.linear) == 0)
+
+    def getCoveredWindowCount(self) :
+        """
+        get the number of linear index windows overlapped by any reads
+
+        Each window overlapped by reads has the distinct virtual offset of its first read, while windows
+        without reads repeat the offset of a neighboring window.
+        """
+        count = 0
+        lastOffset = 0
+        for windowOffset in self.linear :
+            if windowOffset != lastOffset : count += 1
+            lastOffset = windowOffset
+        return count
+
+
+
+def readBamIndexSummary(indexPath) :
+    """
+    read the meta data and linear index of each reference in a .bai file
+
+    return a list of BamIndexRefSummary objects in reference order
+    """
+    indexfp = open(indexPath, "rb")
+    data = indexfp.read()
+    indexfp.close()
+
+    if data[:4] != "BAI\1" :
+        raise Exception("Unexpected BAM index format: '%s'" % (indexPath))
+
+    class State :
+        offset = 4
+
+    def unpack(fmt) :
+        val = struct.unpack_from(fmt, data, State.offset)
+        State.offset += struct.calcsize(fmt)
+        return val
+
+    refs = []
+    (refCount,) = unpack("<i")
+    for _ in range(refCount) :
+        ref = BamIndexRefSummary()
+        (binCount,) = unpack("<i")
+        for _ in range(binCount) :
+            (bin, chunkCount) = unpack("<Ii")
+            if bin == TabixIndexBuilder.metaBin :
+                (ref.beginOffset, ref.endOffset, ref.mappedCount, ref.unmappedCount) = unpack("<QQQQ")
+            else :
+                State.offset += 16 * chunkCount
+
+        (linearCount,) = unpack("<i")
+        ref.linear = unpack("<%iQ" % (linearCount))
+        refs.append(ref)
+
+    return refs
+
+
+
+def getBamMeanReadLength(bamFile, maxReadCount=10000) :
+    """
+    estimate the mean read length of a BAM file from the mapped reads at the start of the file
+
+    return None if no mapped reads with sequence are found
+    """
+    reader = BamReader(bamFile)
+    readCount = 0
+    totalLength = 0
+    for record in reader :
+        (flag,) = struct.unpack_from("<H", record, 14)
+        if flag & BamConstants.flagUnmapped : continue
+        (seqSize,) = struct.unpack_from("<i", record, 16)
+        if seqSize <= 0 : continue
+        readCount += 1
+        totalLength += seqSize
+        if readCount >= maxReadCount : break
+    reader.close()
+
+    if readCount == 0 : return None
+    return float(totalLength) / readCount
+
+
+
+class BamWriter :
+    """
+    write a BAM file from binary records
+
+    If isIndex is set, records must be coordinate sorted, and the BAM index
+    is built as records are written.
+    """
+
+    def __init__(self, filename, header, compressLevel=BgzfConstants.defaultCompressLevel, threadCount=1, isIndex=False) :
+        self.filename = filename
+        self.bgzf = BgzfWriter(filename, compressLevel, threadCount)
+        self.bgzf.write(header.getBinary())
+
+        # records start in a new block, as in BAM files written by htslib:
+        self.bgzf.flush()
+
+        self.index = None
+        if isIndex :
+            self.index = BamIndexBuilder(self.bgzf.tell(), header)
+
+    def writeRecord(self, record) :
+        self.bgzf.write(struct.pack("<i", len(record)) + record)
+        if self.index is not None :
+            self.index.addRecord(record, self.bgzf.tell())
+
+    def close(self) :
+        """
+        close the BAM file, and write its index to filename + '.bai' if indexed
+        """
+        self.bgzf.close()
+        if self.index is not None :
+            # as for htslib, the index ends at the end of the file when all reads are placed:
+            self.index.finish(self.bgzf.tell(), self.bgzf.getVirtualOffset)
+            self.index.write(self.filename + ".bai")
+
+
+
+def getAuxOffset(record) :
+    """
+    return the offset of the auxiliary tag data in a binary BAM record
+    """
+    readNameSize = ord(record[8])
+    (cigarCount,) = struct.unpack_from("<H", record, 12)
+    (seqSize,) = struct.unpack_from("<i", record, 16)
+    return BamConstants.coreSize + readNameSize + 4*cigarCount + (seqSize+1)/2 + seqSize
+
+
+
+def getRecordEndPos(record, pos, isMapped) :
+    """
+    return the zero-indexed end position of a binary BAM record's alignment, following htslib's bam_endpos
+    """
+    (cigarCount,) = struct.unpack_from("<H", record, 12)
+    if (not isMapped) or (cigarCount == 0) : return pos + 1
+
+    cigarOffset = BamConstants.coreSize + ord(record[8])
+    endPos = pos
+    for cigar in struct.unpack_from("<%iI" % (cigarCount), record, cigarOffset) :
+        if (cigar & 0xf) in BamConstants.refCigarOps :
+            endPos += cigar >> 4
+    return endPos
+
+
+
+def getRecordSortKey(record) :
+    """
+    return the coordinate sort key of a binary BAM record, as used by samtools sort
+
+    Records are sorted by reference index with unplaced reads last, then by
+    position, then with forward strand reads first.
+    """
+    (tid, pos) = struct.unpack_from("<ii", record, 0)
+    (flag,) = struct.unpack_from("<H", record, 14)
+    return ((((tid & 0xffffffff) << 32) | ((pos+1) & 0xffffffff)) << 1) | ((flag & BamConstants.flagReverse) >> 4)
+
+
+
+def findAuxTag(record, tag) :
+    """
+    find an auxiliary tag in a binary BAM record
+
+    return a tuple of (tag type, tag offset, value offset, value end offset), or None if
+    the tag is not found, for string types the value end offset excludes the terminating null
+    """
+    offset = getAuxOffset(record)
+    recordSize = len(record)
+    while offset + 3 <= recordSize :
+        tagName = record[offset:offset+2]
+        tagType = record[offset+2]
+        valueOffset = offset + 3
+
+        if tagType in BamConstants.auxTypeSizes :
+            valueEnd = valueOffset + BamConstants.auxTypeSizes[tagType]
+            nextOffset = valueEnd
+        elif (tagType == "Z") or (tagType == "H") :
+            valueEnd = record.find("\0", valueOffset)
+            if valueEnd < 0 :
+                raise Exception("Unterminated string in BAM auxiliary tag: '%s'" % (tagName))
+            nextOffset = valueEnd + 1
+        elif tagType == "B" :
+            subType = record[valueOffset]
+            if subType not in BamConstants.auxTypeSizes :
+                raise Exception("Unknown BAM auxiliary array type '%s' for tag: '%s'" % (subType, tagName))
+            (count,) = struct.unpack_from("<i", record, valueOffset+1)
+            valueEnd = valueOffset + 5 + count*BamConstants.auxTypeSizes[subType]
+            nextOffset = valueEnd
+        else :
+            raise Exception("Unknown BAM auxiliary type '%s' for tag: '%s'" % (tagType, tagName))
+
+        if tagName == tag :
+            return (tagType, offset, valueOffset, valueEnd)
+        offset = nextOffset
+
+    return None
+
+
+
+def filterEvidenceRecord(record, svIdSet) :
+    """
+    filter the SV evidence tag of an evidence BAM record to the SV IDs in svIdSet
+
+    The ZM tag lists the SVs supported by the read as a comma-separated list of
+    entries, each starting with the SV ID followed by '|'.
+
+    return the record with entries for other SV IDs removed from its ZM tag, or
+    None if the read doesn't support any SV in svIdSet
+    """
+    tagInfo = findAuxTag(record, "ZM")
+    if tagInfo is None : return None
+    (tagType, tagOffset, valueOffset, valueEnd) = tagInfo
+    if tagType != "Z" : return None
+
+    svItems = record[valueOffset:valueEnd].split(",")
+    keptItems = [sv for sv in svItems if sv.split("|")[0] in svIdSet]
+    if len(keptItems) == 0 : return None
+    if len(keptItems) == len(svItems) : return record
+
+    return record[:valueOffset] + ",".join(keptItems) + record[valueEnd:]
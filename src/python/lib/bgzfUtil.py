@@ -0,0 +1,763 @@
+#
+# Manta - Structural Variant and Indel Caller
+# Copyright (c) 2013-2016 Illumina, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+
+"""
+BGZF file reader and writer, and tabix index builder
+
+The index is built from the BGZF virtual offsets of each record as it is
+written, so that compressed output doesn't need to be read back to be indexed.
+The binning and linear index follow the same rules as htslib's tabix.
+"""
+
+import struct
+import zlib
+
+from vcfUtil import VcfRecord
+
+
+
+class BgzfConstants :
+
+    # maximum uncompressed data size per block, as used by htslib:
+    blockSize = 0xff00
+    maxBlockSize = 0x10000
+
+    blockHeaderSize = 18
+    blockFooterSize = 8
+
+    eofBlock = "\x1f\x8b\x08\x04\x00\x00\x00\x00\x00\xff\x06\x00\x42\x43\x02\x00\x1b\x00\x03\x00\x00\x00\x00\x00\x00\x00\x00\x00"
+
+    defaultCompressLevel = zlib.Z_DEFAULT_COMPRESSION
+
+
+
+def compressBgzfBlock(data, compressLevel=BgzfConstants.defaultCompressLevel) :
+    """
+    return data compressed into a single BGZF block, or None if the compressed
+    block would exceed the maximum BGZF block size
+    """
+
+    compressor = zlib.compressobj(compressLevel, zlib.DEFLATED, -15)
+    cdata = compressor.compress(data) + compressor.flush()
+
+    blockSize = BgzfConstants.blockHeaderSize + len(cdata) + BgzfConstants.blockFooterSize
+    if blockSize > BgzfConstants.maxBlockSize : return None
+
+    header = struct.pack("<4BI2BH2BHH", 31, 139, 8, 4, 0, 0, 255, 6, 66, 67, 2, blockSize-1)
+    footer = struct.pack("<II", zlib.crc32(data) & 0xffffffff, len(data))
+    return header + cdata + footer
+
+
+
+def compressBgzfBlocks(data, compressLevel=BgzfConstants.defaultCompressLevel) :
+    """
+    return a list of one or more BGZF blocks holding data, data is split in
+    the rare case that it is incompressible enough to overflow one block
+    """
+
+    block = compressBgzfBlock(data, compressLevel)
+    if block is not None : return [block]
+    half = len(data)/2
+    return compressBgzfBlocks(data[:half], compressLevel) + compressBgzfBlocks(data[half:], compressLevel)
+
+
+
+class BgzfCompressJob :
+    """
+    a block of data queued for compression on a BgzfCompressorPool
+    """
+
+    __slots__ = ("data", "blocks", "error", "isDone")
+
+    def __init__(self, data) :
+        import threading
+
+        self.data = data
+        self.blocks = None
+        self.error = None
+        self.isDone = threading.Event()
+
+    def getBlocks(self) :
+        """
+        wait for compression to complete and return the list of compressed blocks
+        """
+        self.isDone.wait()
+        if self.error is not None : raise self.error
+        return self.blocks
+
+
+
+class BgzfCompressorPool :
+    """
+    a pool of threads compressing independent BGZF blocks
+
+    zlib releases the interpreter lock while compressing, so blocks are
+    compressed in parallel. Jobs are returned to the caller to be collected
+    in submission order.
+    """
+
+    def __init__(self, threadCount, compressLevel) :
+        import threading
+        from Queue import Queue
+
+        self.compressLevel = compressLevel
+        self.jobQueue = Queue()
+        self.threads = []
+        for _ in range(threadCount) :
+            thread = threading.Thread(target=self._compressJobs)
+            thread.daemon = True
+            thread.start()
+            self.threads.append(thread)
+
+    def _compressJobs(self) :
+        while True :
+            job = self.jobQueue.get()
+            if job is None : return
+            try :
+                job.blocks = compressBgzfBlocks(job.data, self.compressLevel)
+            except Exception, e :
+                job.error = e
+            job.data = None
+            job.isDone.set()
+
+    def submit(self, data) :
+        job = BgzfCompressJob(data)
+        self.jobQueue.put(job)
+        return job
+
+    def close(self) :
+        for _ in self.threads :
+            self.jobQueue.put(None)
+        for thread in self.threads :
+            thread.join()
+        self.threads = []
+
+
+
+class BgzfWriter :
+    """
+    write a BGZF compressed file
+
+    Data is buffered and compressed one full block at a time, optionally on a
+    pool of compression threads, in which case compressed blocks are written
+    in order as they complete.
+
+    Because compressed block sizes may not be known when data is written,
+    tell() returns a logical offset in place of the virtual offset, holding the
+    index of the uncompressed block in place of its compressed file address.
+    Logical offsets are translated to virtual offsets with getVirtualOffset()
+    once the corresponding block has been written, and are then in the same
+    normalized form reported by htslib when the file is read back.
+    """
+
+    # maximum number of blocks held in memory per compression thread:
+    maxQueuedBlocksPerThread = 4
+
+    def __init__(self, filename, compressLevel=BgzfConstants.defaultCompressLevel, threadCount=1) :
+        self.filename = filename
+        self.compressLevel = compressLevel
+        self.outfp = open(filename, "wb")
+
+        self.buffer = []
+        self.bufferSize = 0
+        self.blockIndex = 0
+
+        # compressed file address of each written block, followed by the file size:
+        self.blockAddresses = [0]
+
+        # for the rare blocks which were split on compression, the address and size of each part:
+        self.splitBlocks = {}
+
+        self.pool = None
+        self.jobs = None
+        if threadCount > 1 :
+            from collections import deque
+
+            self.pool = BgzfCompressorPool(threadCount, compressLevel)
+            self.jobs = deque()
+            self.maxQueuedBlocks = threadCount * self.maxQueuedBlocksPerThread
+
+    def write(self, data) :
+        while True :
+            space = BgzfConstants.blockSize - self.bufferSize
+            if len(data) < space :
+                if len(data) == 0 : return
+                self.buffer.append(data)
+                self.bufferSize += len(data)
+                return
+            self.buffer.append(data[:space])
+            self.bufferSize += space
+            data = data[space:]
+            self.flush()
+
+    def tell(self) :
+        """
+        return the logical offset of the next byte written
+        """
+        return (self.blockIndex << 16) | self.bufferSize
+
+    def getVirtualOffset(self, logicalOffset) :
+        """
+        translate a logical offset from tell() into a BGZF virtual offset
+        """
+        blockIndex = logicalOffset >> 16
+        blockOffset = logicalOffset & 0xffff
+        if blockIndex >= len(self.blockAddresses) :
+            raise Exception("BGZF offset requested for a block which has not been written to '%s'" % (self.filename))
+
+        parts = self.splitBlocks.get(blockIndex)
+        if parts is not None :
+            for (address, size) in parts :
+                if blockOffset < size :
+                    return (address << 16) | blockOffset
+                blockOffset -= size
+            return (self.blockAddresses[blockIndex+1] << 16)
+
+        return (self.blockAddresses[blockIndex] << 16) | blockOffset
+
+    def flush(self) :
+        """
+        compress all buffered data into a new block
+        """
+        if self.bufferSize == 0 : return
+        data = "".join(self.buffer)
+        self.buffer = []
+        self.bufferSize = 0
+        self.blockIndex += 1
+
+        if self.pool is None :
+            self._writeBlocks(compressBgzfBlocks(data, self.compressLevel))
+            return
+
+        self.jobs.append(self.pool.submit(data))
+        while self.jobs and ((len(self.jobs) > self.maxQueuedBlocks) or self.jobs[0].isDone.is_set()) :
+            self._writeBlocks(self.jobs.popleft().getBlocks())
+
+    def _writeBlocks(self, blocks) :
+        address = self.blockAddresses[-1]
+        if len(blocks) > 1 :
+            parts = []
+            for block in blocks :
+                parts.append((address, struct.unpack("<I", block[-4:])[0]))
+                address += len(block)
+            self.splitBlocks[len(self.blockAddresses)-1] = parts
+        for block in blocks :
+            self.outfp.write(block)
+        self.blockAddresses.append(self.blockAddresses[-1] + sum([len(block) for block in blocks]))
+
+    def close(self) :
+        """
+        write all remaining blocks and the BGZF EOF marker, after which all
+        logical offsets can be translated, and tell() gives the offset past
+        the EOF marker
+        """
+        self.flush()
+        if self.pool is not None :
+            while self.jobs :
+                self._writeBlocks(self.jobs.popleft().getBlocks())
+            self.pool.close()
+            self.pool = None
+        self._writeBlocks([BgzfConstants.eofBlock])
+        self.blockIndex += 1
+        self.outfp.close()
+
+
+
+class BgzfReader :
+    """
+    sequentially read the uncompressed contents of a BGZF compressed file
+    """
+
+    # size of the fixed gzip header up to the extra field length:
+    gzipHeaderSize = 12
+
+    def __init__(self, filename) :
+        self.filename = filename
+        self.infp = open(filename, "rb")
+        self.buffer = ""
+        self.bufferOffset = 0
+
+    def _readBlock(self) :
+        """
+        return the uncompressed data of the next BGZF block, or None at the end of the file
+        """
+        header = self.infp.read(self.gzipHeaderSize)
+        if len(header) == 0 : return None
+        if (len(header) != self.gzipHeaderSize) or (header[:4] != "\x1f\x8b\x08\x04") :
+            raise Exception("Invalid BGZF block header in file: '%s'" % (self.filename))
+
+        (extraSize,) = struct.unpack("<H", header[10:12])
+        extra = self.infp.read(extraSize)
+
+        # find the BGZF block size in the extra subfields:
+        blockSize = None
+        extraOffset = 0
+        while extraOffset + 4 <= len(extra) :
+            (subfieldId, subfieldSize) = struct.unpack_from("<2sH", extra, extraOffset)
+            if (subfieldId == "BC") and (subfieldSize == 2) :
+                blockSize = struct.unpack_from("<H", extra, extraOffset+4)[0] + 1
+            extraOffset += 4 + subfieldSize
+        if blockSize is None :
+            raise Exception("No BGZF block size in gzip header of file: '%s'" % (self.filename))
+
+        remainingSize = blockSize - self.gzipHeaderSize - extraSize
+        remaining = self.infp.read(remainingSize)
+        if len(remaining) != remainingSize :
+            raise Exception("Unexpected end of BGZF block in file: '%s'" % (self.filename))
+
+        data = zlib.decompress(remaining[:-BgzfConstants.blockFooterSize], -15)
+        (crc, dataSize) = struct.unpack("<II", remaining[-BgzfConstants.blockFooterSize:])
+        if (dataSize != len(data)) or (crc != (zlib.crc32(data) & 0xffffffff)) :
+            raise Exception("BGZF block checksum mismatch in file: '%s'" % (self.filename))
+        return data
+
+    def read(self, size) :
+        """
+        return the next size bytes of uncompressed data, or fewer at the end of the file
+        """
+        while len(self.buffer) - self.bufferOffset < size :
+            data = self._readBlock()
+            if data is None : break
+            if len(data) == 0 : continue
+            self.buffer = self.buffer[self.bufferOffset:] + data
+            self.bufferOffset = 0
+
+        val = self.buffer[self.bufferOffset:self.bufferOffset+size]
+        self.bufferOffset += len(val)
+        return val
+
+    def close(self) :
+        self.infp.close()
+
+
+
+def reg2bin(beg, end) :
+    """
+    return the smallest tabix bin containing the zero-indexed half-open interval [beg,end)
+    """
+    end -= 1
+    if (beg >> 14) == (end >> 14) : return 4681 + (beg >> 14)
+    if (beg >> 17) == (end >> 17) : return 585 + (beg >> 17)
+    if (beg >> 20) == (end >> 20) : return 73 + (beg >> 20)
+    if (beg >> 23) == (end >> 23) : return 9 + (beg >> 23)
+    if (beg >> 26) == (end >> 26) : return 1 + (beg >> 26)
+    return 0
+
+
+
+class TabixIndexBuilder :
+    """
+    build a tabix index for a sorted vcf file from the virtual offsets of its records
+
+    Intervals must be added in file order, where each record's virtual offset
+    is the offset just past the end of the record.
+    """
+
+    minShift = 14
+    levelCount = 5
+    metaBin = 37450
+
+    # bins spanning less than this compressed distance are merged into their parent:
+    minMarkerDist = 0x10000
+
+    def __init__(self, startOffset) :
+        """
+        startOffset is the virtual offset of the first record, just past the vcf header
+        """
+        self.names = []
+        self.tidMap = {}
+        self.bins = []
+        self.linear = []
+        self.meta = []
+
+        self.isFinished = False
+
+        self.lastTid = None
+        self.lastBin = None
+        self.lastCoord = None
+        self.lastOff = startOffset
+
+        self.saveTid = None
+        self.saveBin = None
+        self.saveOff = startOffset
+
+        self.offBeg = startOffset
+        self.mappedCount = 0
+        self.unmappedCount = 0
+        self.indexedTids = set()
+
+    def addInterval(self, chrom, beg, end, offset) :
+        """
+        add the zero-indexed half-open interval [beg,end) of the record ending at virtual offset
+        """
+        tid = self.tidMap.get(chrom)
+        if tid is None :
+            tid = self._addTid(chrom)
+        self._addTidInterval(tid, beg, end, offset)
+
+    def _addTid(self, chrom) :
+        tid = len(self.names)
+        self.tidMap[chrom] = tid
+        self.names.append(chrom)
+        self.bins.append({})
+        self.linear.append([])
+        self.meta.append(None)
+        return tid
+
+    def _addTidInterval(self, tid, beg, end, offset, isMapped=True) :
+        """
+        add an interval by chromosome index, unmapped records are binned but
+        excluded from the linear index
+        """
+
+        if tid != self.lastTid :
+            if tid in self.indexedTids :
+                raise Exception("Chromosome blocks are not continuous in indexed file at chromosome: '%s'" % (self.names[tid]))
+            self.indexedTids.add(tid)
+            self.lastTid = tid
+            self.lastBin = None
+        elif self.lastCoord > beg :
+            raise Exception("Unsorted positions in indexed file at: '%s:%i'" % (self.names[tid], beg+1))
+
+        if isMapped :
+            self._addLinear(self.linear[tid], beg, end, self.lastOff)
+
+        bin = reg2bin(beg, end)
+        if bin != self.lastBin :
+            if self.saveBin is not None :
+                self.bins[self.saveTid].setdefault(self.saveBin, []).append([self.saveOff, self.lastOff])
+                if self.lastBin is None :
+                    # change of chromosome, record the previous chromosome's offset range and record counts:
+                    self.meta[self.saveTid] = ((self.offBeg, self.lastOff), (self.mappedCount, self.unmappedCount))
+                    self.mappedCount = 0
+                    self.unmappedCount = 0
+                    self.offBeg = self.lastOff
+            self.saveOff = self.lastOff
+            self.saveBin = self.lastBin = bin
+            self.saveTid = tid
+
+        if isMapped :
+            self.mappedCount += 1
+        else :
+            self.unmappedCount += 1
+        self.lastOff = offset
+        self.lastCoord = beg
+
+    def _addLinear(self, linear, beg, end, offset) :
+        """
+        set the offset of each unset 16kb linear index window overlapping [beg,end)
+
+        Because intervals are added in order of beg, all windows from beg up to
+        the current end of the linear index are already set.
+        """
+        lbeg = beg >> self.minShift
+        lend = (end - 1) >> self.minShift
+        size = len(linear)
+        if lend < size : return
+        if lbeg > size :
+            linear.extend([None] * (lbeg - size))
+            size = lbeg
+        linear.extend([offset] * (lend + 1 - size))
+
+    def finish(self, finalOffset, getVirtualOffset=None) :
+        """
+        complete the index, finalOffset is the offset at the end of the last record
+
+        If provided, getVirtualOffset translates all offsets given to the index
+        into BGZF virtual offsets, as required for the logical offsets of a BgzfWriter.
+        """
+        if self.isFinished : return
+        if self.saveTid is not None :
+            self.bins[self.saveTid].setdefault(self.saveBin, []).append([self.saveOff, finalOffset])
+            self.meta[self.saveTid] = ((self.offBeg, finalOffset), (self.mappedCount, self.unmappedCount))
+
+        if getVirtualOffset is not None :
+            self._translateOffsets(getVirtualOffset)
+
+        for tid in range(len(self.names)) :
+            if self.meta[tid] is None : continue
+            self._updateLinear(tid)
+            self._compressBins(self.bins[tid])
+        self.isFinished = True
+
+    def _translateOffsets(self, getVirtualOffset) :
+        for tid in range(len(self.names)) :
+            if self.meta[tid] is None : continue
+            for chunks in self.bins[tid].values() :
+                for chunk in chunks :
+                    chunk[0] = getVirtualOffset(chunk[0])
+                    chunk[1] = getVirtualOffset(chunk[1])
+
+            ((offBeg, offEnd), counts) = self.meta[tid]
+            self.meta[tid] = ((getVirtualOffset(offBeg), getVirtualOffset(offEnd)), counts)
+
+            linear = self.linear[tid]
+            for (index, windowOffset) in enumerate(linear) :
+                if windowOffset is not None :
+                    linear[index] = getVirtualOffset(windowOffset)
+
+    def _updateLinear(self, tid) :
+        """
+        fill in unset linear index windows
+        """
+        linear = self.linear[tid]
+        offset = self.meta[tid][0][0]
+        for (index, windowOffset) in enumerate(linear) :
+            if windowOffset is None :
+                linear[index] = offset
+            else :
+                offset = windowOffset
+
+    def _compressBins(self, bins) :
+        """
+        merge small bins into their parents, then merge adjacent chunks starting in the same BGZF block
+        """
+        for level in range(self.levelCount, 0, -1) :
+            levelStart = ((1 << (3*level)) - 1) / 7
+            for bin in sorted(bins.keys()) :
+                if bin < levelStart : continue
+                chunks = bins[bin]
+                if (level < self.levelCount) and (len(chunks) > 1) :
+                    chunks.sort(key = lambda x : x[0])
+                if (chunks[-1][1] >> 16) - (chunks[0][0] >> 16) < self.minMarkerDist :
+                    parent = (bin - 1) >> 3
+                    if parent not in bins : continue
+                    bins[parent].extend(chunks)
+                    del bins[bin]
+
+        if 0 in bins :
+            bins[0].sort(key = lambda x : x[0])
+
+        for bin in bins.keys() :
+            chunks = bins[bin]
+            merged = [chunks[0]]
+            for chunk in chunks[1:] :
+                last = merged[-1]
+                if (last[1] >> 16) >= (chunk[0] >> 16) :
+                    if last[1] < chunk[1] : last[1] = chunk[1]
+                else :
+                    merged.append(chunk)
+            bins[bin] = merged
+
+    def write(self, indexPath) :
+        """
+        write the index as a BGZF compressed .tbi file
+        """
+        if not self.isFinished :
+            raise Exception("Tabix index must be finished before it is written: '%s'" % (indexPath))
+
+        names = "".join([name + "\0" for name in self.names])
+
+        data = ["TBI\1", struct.pack("<i", len(self.names))]
+
+        # vcf preset: format, sequence, begin and end columns, meta char, lines skipped:
+        data.append(struct.pack("<7i", 2, 1, 2, 0, ord('#'), 0, len(names)))
+        data.append(names)
+
+        for tid in range(len(self.names)) :
+            bins = self.bins[tid]
+            data.append(struct.pack("<i", len(bins) + 1))
+            for bin in sorted(bins.keys()) :
+                chunks = bins[bin]
+                data.append(struct.pack("<Ii", bin, len(chunks)))
+                for (chunkBeg, chunkEnd) in chunks :
+                    data.append(struct.pack("<QQ", chunkBeg, chunkEnd))
+            data.append(struct.pack("<Ii", self.metaBin, 2))
+            for (metaVal1, metaVal2) in self.meta[tid] :
+                data.append(struct.pack("<QQ", metaVal1, metaVal2))
+
+            linear = self.linear[tid]
+            data.append(struct.pack("<i", len(linear)))
+            data.append(struct.pack("<%iQ" % (len(linear)), *linear))
+
+        # no unplaced records:
+        data.append(struct.pack("<Q", 0))
+
+        indexWriter = BgzfWriter(indexPath)
+        indexWriter.write("".join(data))
+        indexWriter.close()
+
+    def appendIndex(self, other, addressShift) :
+        """
+        append all chromosomes of another finished index, for a BGZF file which
+        has been concatenated to this index's file starting at compressed file
+        address addressShift
+        """
+        if not (self.isFinished and other.isFinished) :
+            raise Exception("Only finished tabix indexes can be combined")
+
+        offsetShift = addressShift << 16
+        for (otherTid, chrom) in enumerate(other.names) :
+            if chrom in self.tidMap :
+                raise Exception("Chromosome blocks are not continuous in concatenated vcf at chromosome: '%s'" % (chrom))
+            self.tidMap[chrom] = len(self.names)
+            self.names.append(chrom)
+
+            bins = {}
+            for (bin, chunks) in other.bins[otherTid].items() :
+                bins[bin] = [[chunkBeg + offsetShift, chunkEnd + offsetShift] for (chunkBeg, chunkEnd) in chunks]
+            self.bins.append(bins)
+
+            ((offBeg, offEnd), counts) = other.meta[otherTid]
+            self.meta.append(((offBeg + offsetShift, offEnd + offsetShift), counts))
+
+            self.linear.append([windowOffset + offsetShift for windowOffset in other.linear[otherTid]])
+
+
+
+def readTabixIndex(indexPath) :
+    """
+    read a vcf tabix index file into a finished TabixIndexBuilder
+    """
+    import gzip
+
+    indexfp = gzip.open(indexPath, "rb")
+    data = indexfp.read()
+    indexfp.close()
+
+    if data[:4] != "TBI\1" :
+        raise Exception("Unexpected tabix index format: '%s'" % (indexPath))
+
+    class State :
+        offset = 4
+
+    def unpack(fmt) :
+        val = struct.unpack_from(fmt, data, State.offset)
+        State.offset += struct.calcsize(fmt)
+        return val
+
+    (refCount,) = unpack("<i")
+    namesSize = unpack("<7i")[6]
+    names = data[State.offset:State.offset+namesSize].split("\0")[:refCount]
+    State.offset += namesSize
+
+    index = TabixIndexBuilder(0)
+    for (tid, chrom) in enumerate(names) :
+        index.tidMap[chrom] = tid
+        index.names.append(chrom)
+
+        bins = {}
+        meta = None
+        (binCount,) = unpack("<i")
+        for _ in range(binCount) :
+            (bin, chunkCount) = unpack("<Ii")
+            chunks = [list(unpack("<QQ")) for _ in range(chunkCount)]
+            if bin == TabixIndexBuilder.metaBin :
+                meta = (tuple(chunks[0]), tuple(chunks[1]))
+            else :
+                bins[bin] = chunks
+        if meta is None :
+            raise Exception("Tabix index has no meta bin for chromosome '%s': '%s'" % (chrom, indexPath))
+        index.bins.append(bins)
+        index.meta.append(meta)
+
+        (linearCount,) = unpack("<i")
+        index.linear.append(list(unpack("<%iQ" % (linearCount))))
+
+    index.isFinished = True
+    return index
+
+
+
+def concatenateIndexedVcfs(vcfPaths, outputPath) :
+    """
+    concatenate BGZF compressed vcf files with their tabix indexes, without recompression
+
+    Each input is copied without its EOF marker block, and the input indexes
+    are combined by shifting their virtual offsets to the start of each input in
+    the output. Only the first input should contain a vcf header, and the
+    chromosomes of each input must follow those of the input before.
+    """
+    import os
+
+    index = TabixIndexBuilder(0)
+    index.isFinished = True
+
+    eofSize = len(BgzfConstants.eofBlock)
+    copyChunkSize = 1024*1024
+
+    outfp = open(outputPath, "wb")
+    address = 0
+    for vcfPath in vcfPaths :
+        infp = open(vcfPath, "rb")
+        dataSize = os.path.getsize(vcfPath)
+        if dataSize >= eofSize :
+            infp.seek(dataSize - eofSize)
+            if infp.read() == BgzfConstants.eofBlock :
+                dataSize -= eofSize
+            infp.seek(0)
+
+        remaining = dataSize
+        while remaining > 0 :
+            chunk = infp.read(min(copyChunkSize, remaining))
+            if len(chunk) == 0 :
+                raise Exception("Unexpected end of file while copying: '%s'" % (vcfPath))
+            outfp.write(chunk)
+            remaining -= len(chunk)
+        infp.close()
+
+        index.appendIndex(readTabixIndex(vcfPath + ".tbi"), address)
+        address += dataSize
+
+    outfp.write(BgzfConstants.eofBlock)
+    outfp.close()
+
+    index.write(outputPath + ".tbi")
+
+
+
+class BgzfVcfWriter :
+    """
+    write a BGZF compressed vcf file and its tabix index
+
+    Each call to write() must provide one complete vcf line. Record lines must
+    be sorted and grouped by chromosome, and are indexed as they are written.
+    """
+
+    def __init__(self, vcfPath, compressLevel=BgzfConstants.defaultCompressLevel, threadCount=1) :
+        self.vcfPath = vcfPath
+        self.bgzf = BgzfWriter(vcfPath, compressLevel, threadCount)
+        self.index = None
+
+    def write(self, line) :
+        if line[0] == "#" :
+            self.bgzf.write(line)
+        else :
+            self.writeRecord(VcfRecord(line))
+
+    def writeRecord(self, rec) :
+        """
+        write a VcfRecord, skipping the need to parse the record line
+        """
+        if self.index is None :
+            self.index = TabixIndexBuilder(self.bgzf.tell())
+        self.bgzf.write(rec.line)
+        self.index.addInterval(rec.chrom, max(0, rec.pos-1), max(1, rec.endPos), self.bgzf.tell())
+
+    def close(self) :
+        """
+        close the vcf file and write its tabix index to vcfPath + '.tbi'
+        """
+        self.bgzf.flush()
+        if self.index is None :
+            self.index = TabixIndexBuilder(self.bgzf.tell())
+        finalOffset = self.bgzf.tell()
+        self.bgzf.close()
+        self.index.finish(finalOffset, self.bgzf.getVirtualOffset)
+        self.index.write(self.vcfPath + ".tbi")
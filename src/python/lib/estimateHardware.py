@@ -19,6 +19,10 @@
 
 """
 get cpu and memory capability info from linux and os x hosts
+
+In addition to the total capability of the host, the cpu and memory available
+to the current process can be estimated, accounting for the cpu affinity mask
+and the cgroup (v1 or v2) cpu quota and memory limit of the process on linux.
 """
 
 
@@ -172,3 +176,199 @@ def getNodeMemMb():
     return memMb
 
 
+
+
+
+def _readFirstLine(filename) :
+    """
+    return the first line of filename without surrounding whitespace, or None if it can't be read
+    """
+    try :
+        return open(filename).readline().strip()
+    except (IOError, OSError) :
+        return None
+
+
+
+def _getCgroupDirs(controller) :
+    """
+    get the cgroup directories of the current process for controller, from the process cgroup
+    directory to the root of the cgroup mount, checking the cgroup v1 mount for controller
+    and the cgroup v2 mount
+
+    return a list of (cgroupVersion, directory list) tuples
+    """
+    procCgroup="/proc/self/cgroup"
+    mountInfo="/proc/self/mountinfo"
+    if not (os.path.isfile(procCgroup) and os.path.isfile(mountInfo)) : return []
+
+    # map from cgroup version and controller to the process cgroup path:
+    cgroupPaths = {}
+    for line in open(procCgroup) :
+        w = line.strip().split(":", 2)
+        if len(w) != 3 : continue
+        if w[0] == "0" and w[1] == "" :
+            cgroupPaths[(2, None)] = w[2]
+        else :
+            for name in w[1].split(",") :
+                cgroupPaths[(1, name)] = w[2]
+
+    dirs = []
+    for line in open(mountInfo) :
+        w = line.strip().split()
+        if "-" not in w : continue
+        sep = w.index("-")
+        if len(w) < sep+4 : continue
+        (mountRoot, mountPoint) = (w[3], w[4])
+        fsType = w[sep+1]
+        superOptions = w[sep+3].split(",")
+
+        if fsType == "cgroup2" :
+            key = (2, None)
+        elif (fsType == "cgroup") and (controller in superOptions) :
+            key = (1, controller)
+        else :
+            continue
+
+        if key not in cgroupPaths : continue
+        cgroupPath = cgroupPaths[key]
+
+        # the mount root is a prefix of the process cgroup path when the mount is a cgroup subtree (eg. in containers):
+        if (mountRoot != "/") and ((cgroupPath == mountRoot) or cgroupPath.startswith(mountRoot+"/")) :
+            cgroupPath = cgroupPath[len(mountRoot):]
+
+        versionDirs = []
+        cgroupPath = cgroupPath.strip("/")
+        while True :
+            versionDirs.append(os.path.join(mountPoint, cgroupPath))
+            if cgroupPath == "" : break
+            cgroupPath = os.path.dirname(cgroupPath)
+        dirs.append((key[0], versionDirs))
+
+    return dirs
+
+
+
+def getCgroupCpuLimit() :
+    """
+    return the tightest cgroup cpu quota of the current process in cores, rounded up, as a tuple of
+    (cpuCount, label), or None if no quota applies
+    """
+    import math
+
+    limit = None
+    for (version, dirs) in _getCgroupDirs("cpu") :
+        for cgroupDir in dirs :
+            quota = None
+            if version == 2 :
+                line = _readFirstLine(os.path.join(cgroupDir, "cpu.max"))
+                if line is None : continue
+                w = line.split()
+                if (len(w) != 2) or (w[0] == "max") : continue
+                quota = (int(w[0]), int(w[1]))
+            else :
+                quotaLine = _readFirstLine(os.path.join(cgroupDir, "cpu.cfs_quota_us"))
+                periodLine = _readFirstLine(os.path.join(cgroupDir, "cpu.cfs_period_us"))
+                if (quotaLine is None) or (periodLine is None) : continue
+                quota = (int(quotaLine), int(periodLine))
+
+            (quotaUs, periodUs) = quota
+            if (quotaUs <= 0) or (periodUs <= 0) : continue
+            cpuCount = max(1, int(math.ceil(float(quotaUs) / periodUs)))
+            if (limit is None) or (cpuCount < limit[0]) :
+                limit = (cpuCount, "cgroup v%i cpu quota" % (version))
+
+    return limit
+
+
+
+def getCpuAffinityCount() :
+    """
+    return the number of cpus in the affinity mask of the current process, or None if this
+    can't be determined
+    """
+    status="/proc/self/status"
+    if not os.path.isfile(status) : return None
+
+    for line in open(status) :
+        if not line.startswith("Cpus_allowed_list:") : continue
+        cpuCount = 0
+        for cpuRange in line.split(":", 1)[1].strip().split(",") :
+            if cpuRange == "" : continue
+            w = cpuRange.split("-")
+            if len(w) == 1 :
+                cpuCount += 1
+            else :
+                cpuCount += int(w[1]) - int(w[0]) + 1
+        if cpuCount == 0 : return None
+        return cpuCount
+
+    return None
+
+
+
+def getProcessCoreCount() :
+    """
+    return the number of logical cores available to the current process, as a tuple of
+    (coreCount, label) where label describes the limit which applied
+
+    This is the host logical core count, further limited by the cpu affinity mask and
+    cgroup cpu quota of the process where these are present.
+    """
+
+    limit = (getNodeHyperthreadCoreCount(), "host logical core count")
+
+    affinityCount = getCpuAffinityCount()
+    if (affinityCount is not None) and (affinityCount < limit[0]) :
+        limit = (affinityCount, "cpu affinity")
+
+    cgroupLimit = getCgroupCpuLimit()
+    if (cgroupLimit is not None) and (cgroupLimit[0] < limit[0]) :
+        limit = cgroupLimit
+
+    return limit
+
+
+
+def getCgroupMemMb() :
+    """
+    return the tightest cgroup memory limit of the current process in Mbytes, as a tuple of
+    (memMb, label), or None if no limit applies
+    """
+
+    limit = None
+    for (version, dirs) in _getCgroupDirs("memory") :
+        for cgroupDir in dirs :
+            if version == 2 :
+                line = _readFirstLine(os.path.join(cgroupDir, "memory.max"))
+            else :
+                line = _readFirstLine(os.path.join(cgroupDir, "memory.limit_in_bytes"))
+            if (line is None) or (line == "max") : continue
+
+            # an unlimited cgroup v1 memory limit is reported as a very large value, which is
+            # ignored here by comparison to the host memory:
+            memMb = int(line) / (1024*1024)
+            if memMb <= 0 : continue
+            if (limit is None) or (memMb < limit[0]) :
+                limit = (memMb, "cgroup v%i memory limit" % (version))
+
+    return limit
+
+
+
+def getProcessMemMb() :
+    """
+    return the memory available to the current process in Mbytes, as a tuple of (memMb, label)
+    where label describes the limit which applied
+
+    This is the host total memory, further limited by the cgroup memory limit of the process
+    where this is present.
+    """
+
+    limit = (getNodeMemMb(), "host total memory")
+
+    cgroupLimit = getCgroupMemMb()
+    if (cgroupLimit is not None) and (cgroupLimit[0] < limit[0]) :
+        limit = cgroupLimit
+
+    return limit
@@ -135,7 +135,7 @@ def get_run_options(workflowClassName) :
 
     from configBuildTimeInfo import workflowVersion
     from configureUtil import EpilogOptionParser
-    from estimateHardware import EstException, getNodeHyperthreadCoreCount, getNodeMemMb
+    from estimateHardware import EstException, getProcessCoreCount, getProcessMemMb
 
     sgeDefaultCores=workflowClassName.runModeDefaultCores('sge')
 
@@ -151,9 +151,9 @@ results -- in this case the dry run will not cover the full 'live' run task set.
     parser.add_option("-q", "--queue", type="string",dest="queue",
                       help="specify scheduler queue name")
     parser.add_option("-j", "--jobs", type="string",dest="jobs",
-                  help="number of jobs, must be an integer or 'unlimited' (default: Estimate total cores on this node for local mode, %s for sge mode)" % (sgeDefaultCores))
+                  help="number of jobs, must be an integer or 'unlimited' (default: Estimate the cores available to this process for local mode, accounting for any cpu affinity and cgroup cpu quota, %s for sge mode)" % (sgeDefaultCores))
     parser.add_option("-g","--memGb", type="string",dest="memGb",
-                  help="gigabytes of memory available to run workflow -- only meaningful in local mode, must be an integer (default: Estimate the total memory for this node for local mode, 'unlimited' for sge mode)")
+                  help="gigabytes of memory available to run workflow -- only meaningful in local mode, must be an integer (default: Estimate the memory available to this process for local mode, accounting for any cgroup memory limit, 'unlimited' for sge mode)")
     parser.add_option("-d","--dryRun", dest="isDryRun",action="store_true",default=False,
                       help="dryRun workflow code without actually running command-tasks")
     parser.add_option("--quiet", dest="isQuiet",action="store_true",default=False,
@@ -205,9 +205,11 @@ results -- in this case the dry run will not cover the full 'live' run task set.
             options.jobs = sgeDefaultCores
         else :
             try :
-                options.jobs = getNodeHyperthreadCoreCount()
+                (options.jobs, jobsLimitLabel) = getProcessCoreCount()
             except EstException:
                 parser.error("Failed to estimate cores on this node. Please provide job count argument (-j).")
+            if not options.isQuiet :
+                sys.stderr.write("Estimated available cores: %i (limited by %s)\\n" % (options.jobs, jobsLimitLabel))
     if options.jobs != "unlimited" :
         options.jobs=int(options.jobs)
         if options.jobs <= 0 :
@@ -219,9 +221,11 @@ results -- in this case the dry run will not cover the full 'live' run task set.
             options.memMb = "unlimited"
         else :
             try :
-                options.memMb = getNodeMemMb()
+                (options.memMb, memLimitLabel) = getProcessMemMb()
             except EstException:
                 parser.error("Failed to estimate available memory on this node. Please provide available gigabyte argument (-g).")
+            if not options.isQuiet :
+                sys.stderr.write("Estimated available memory: %i Mb (limited by %s)\\n" % (options.memMb, memLimitLabel))
     elif options.memGb != "unlimited" :
         options.memGb=int(options.memGb)
         if options.memGb <= 0 :
@@ -58,6 +58,16 @@ class MantaWorkflowOptionsBase(ConfigureWorkflowOptions) :
         group.add_option("--scanSizeMb", type="int", metavar="INT",
                          help="Maximum sequence region size (in megabases) scanned by each task during "
                          "SV Locus graph generation. (default: %default)")
+        group.add_option("--readDensitySegmentation", dest="isReadDensitySegmentation", action="store_true",
+                         help="Divide SV Locus graph generation into tasks scanning similar numbers of mapped reads, "
+                         "as estimated from the BAM/CRAM indexes, instead of sequence regions of similar size. "
+                         "Tasks cover --scanSizeMb of sequence on average.")
+        group.add_option("--treeMergeLocusGraph", dest="isTreeMergeLocusGraph", action="store_true",
+                         help="Merge the SV Locus graphs of all graph generation tasks as a tree of parallel merge tasks, "
+                         "instead of in a single task.")
+        group.add_option("--locusIndexedGraph", dest="isLocusIndexedGraph", action="store_true",
+                         help="Also write the SV Locus graph in a locus-indexed format, which all candidate generation "
+                         "tasks memory map read-only, so that each task loads only the graph loci it processes.")
         group.add_option("--region", type="string",dest="regionStrList",metavar="REGION", action="append",
                          help="Limit the analysis to a region of the genome for debugging purposes. "
                               "If this argument is provided multiple times all specified regions will "
@@ -99,15 +109,15 @@ class MantaWorkflowOptionsBase(ConfigureWorkflowOptions) :
         mantaStatsSummaryBin=joinFile(libexecDir,exeFile("SummarizeAlignmentStats"))
 
         mergeChromDepth=joinFile(libexecDir,"mergeChromDepth.py")
-        mantaSortVcf=joinFile(libexecDir,"sortVcf.py")
-        mantaExtraSmallVcf=joinFile(libexecDir,"extractSmallIndelCandidates.py")
-        mantaPloidyFilter=joinFile(libexecDir,"ploidyFilter.py")
-        mantaSortEdgeLogs=joinFile(libexecDir,"sortEdgeLogs.py")
+        getChromDepthFromIndex=joinFile(libexecDir,"getChromDepthFromIndex.py")
+        mantaFinalizeVcf=joinFile(libexecDir,"finalizeVcf.py")
+        mantaPartitionVcf=joinFile(libexecDir,"partitionVcf.py")
+        mantaConcatVcfShards=joinFile(libexecDir,"concatVcfShards.py")
+        mantaAnalyzeEdgeLogs=joinFile(libexecDir,"analyzeEdgeRuntimeLogs.py")
+        mantaMakeEdgeWorkQueue=joinFile(libexecDir,"makeEdgeWorkQueue.py")
+        mantaCalibrateEdgeCostModel=joinFile(libexecDir,"calibrateEdgeCostModel.py")
         catScript=joinFile(libexecDir,"cat.py")
-        vcfCmdlineSwapper=joinFile(libexecDir,"vcfCmdlineSwapper.py")
-        mantaSortBam=joinFile(libexecDir,"sortBam.py")
-        mantaMergeBam=joinFile(libexecDir,"mergeBam.py")
-        mantaFilterBam=joinFile(libexecDir,"filterBam.py")
+        mantaConsolidateEvidenceBam=joinFile(libexecDir,"consolidateEvidenceBam.py")
 
         # default memory request per process-type
         #
@@ -124,7 +134,49 @@ class MantaWorkflowOptionsBase(ConfigureWorkflowOptions) :
         hyGenSGEMemMb=4*1024
         hyGenLocalMemMb=2*1024
 
+        # additional memory requested for each thread after the first in a multi-threaded candidate generation
+        # task (the SV locus graph is shared by all threads of a task):
+        hyGenThreadMemMb=1024
+
+        # memory limit of the remote mate read cache kept by each candidate generation thread, the cache
+        # is only used when remote reads are retrieved for assembly (germline-only runs), 0 disables it:
+        hyGenRemoteReadCacheMb=64
+
+        # per-edge assembly budget of candidate generation, bounding the time spent on pathological (e.g. extreme
+        # depth) edges, 0 leaves each budget unlimited. Reads collected for each assembly are deterministically
+        # downsampled to hyGenEdgeMaxAssemblyReads. Assembly is skipped for every candidate of an edge with more
+        # than hyGenEdgeMaxAssemblyCandidates candidates, and for the remaining candidates of an edge after
+        # hyGenEdgeMaxAssemblySeconds (this last budget makes output depend on run time):
+        hyGenEdgeMaxAssemblyReads=0
+        hyGenEdgeMaxAssemblyCandidates=0
+        hyGenEdgeMaxAssemblySeconds=0
+
+        vcfSortMemMb=2*1024
+
+        # number of BGZF compression threads used to write each final vcf:
+        vcfCompressThreads=4
+
+        # number of chromosome shards each final vcf is split into to be finalized in parallel,
+        # shards are not used when this is 1:
+        vcfFinalizeShardCount=8
+
+        # number of consecutive hygen bins pre-merged into sorted runs as soon as they complete:
+        vcfPremergeBinCount=16
+
+        # number of edge chunks in the candidate generation work queue, when the work queue is used:
+        hyGenWorkQueueChunkCount=4096
+
+        # only edges taking at least this long are written to the candidate generation edge runtime log,
+        # set to 0 to log all edges when collecting logs to calibrate an edge cost model:
+        edgeRuntimeLogMinSeconds=0.5
+
+        # number of SV locus graph files merged by each task when graph merging is run as a tree:
+        graphMergeGroupSize=4
+
         scanSizeMb = 12
+        isReadDensitySegmentation = False
+        isTreeMergeLocusGraph = False
+        isLocusIndexedGraph = False
 
         return cleanLocals(locals())
 
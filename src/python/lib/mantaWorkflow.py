@@ -34,17 +34,81 @@ pyflowDir=os.path.join(scriptDir,"pyflow")
 sys.path.append(os.path.abspath(pyflowDir))
 
 from configBuildTimeInfo import workflowVersion
-from pyflow import WorkflowRunner
+from pyflow import LogState, WorkflowRunner
 from sharedWorkflow import getMkdirCmd, getMvCmd, getRmCmd, getRmdirCmd, \
-                           runDepthFromAlignments
+                           runDepthFromAlignments, runDepthFromAlignmentIndex
 from workflowUtil import checkFile, ensureDir, preJoin, \
                           getGenomeSegmentGroups, getFastaChromOrderSize, cleanPyEnv
+from artifactCache import ArtifactCache
+from readDensityUtil import getAlignmentReadDensity
 
 
 __version__ = workflowVersion
 
 
 
+class cacheStoreWorkflow(WorkflowRunner) :
+    """
+    store a copy of a file in the artifact cache, failure to store is not an error
+    """
+
+    def __init__(self2, artifactCache, inFile, entryPath) :
+        self2.artifactCache = artifactCache
+        self2.inFile = inFile
+        self2.entryPath = entryPath
+
+    def workflow(self2) :
+        try :
+            self2.artifactCache.storeEntry(self2.inFile, self2.entryPath)
+        except (IOError, OSError), e :
+            self2.flowLog("Can't store '%s' in artifact cache: %s" % (self2.inFile, str(e)), logState=LogState.WARNING)
+
+
+
+class cachedArtifactWorkflow(WorkflowRunner) :
+    """
+    copy the result of a per alignment file task from the artifact cache, or if it isn't
+    cached, add the tasks from generateFunc to produce the result and then store it in the cache
+
+    generateFunc has the signature generateFunc(self, taskPrefix, dependencies, alignmentFile, outFile)
+    """
+
+    def __init__(self2, params, artifactCache, entryLabel, entryKeyItems, entryExt, alignmentFile, outFile, generateFunc) :
+        self2.params = params
+        self2.artifactCache = artifactCache
+        self2.entryLabel = entryLabel
+        self2.entryKeyItems = entryKeyItems
+        self2.entryExt = entryExt
+        self2.alignmentFile = alignmentFile
+        self2.outFile = outFile
+        self2.generateFunc = generateFunc
+
+    def workflow(self2) :
+        entryPath = self2.artifactCache.getEntryPath(self2.entryLabel, self2.alignmentFile, self2.entryKeyItems, self2.entryExt)
+        if self2.artifactCache.fetchEntry(entryPath, self2.outFile) :
+            self2.flowLog("Using cached %s for '%s'" % (self2.entryLabel, self2.alignmentFile))
+            return
+
+        generateTasks = self2.generateFunc(self2, "", None, self2.alignmentFile, self2.outFile)
+        self2.addWorkflowTask("storeCacheEntry", cacheStoreWorkflow(self2.artifactCache, self2.outFile, entryPath), dependencies=generateTasks)
+
+
+
+def getCachedArtifactFunc(entryLabel, entryKeyItems, entryExt, generateFunc) :
+    """
+    wrap the per alignment file task function generateFunc so that its result is taken from the artifact cache
+    when available
+    """
+
+    def cachedFunc(self, taskPrefix, dependencies, alignmentFile, outFile) :
+        wflow = cachedArtifactWorkflow(self.params, self.artifactCache, entryLabel, entryKeyItems, entryExt,
+                                       alignmentFile, outFile, generateFunc)
+        return self.addWorkflowTask(preJoin(taskPrefix,"cached_"+entryLabel), wflow, dependencies=dependencies)
+
+    return cachedFunc
+
+
+
 def runStats(self,taskPrefix="",dependencies=None) :
 
     statsPath=self.paths.getStatsPath()
@@ -58,15 +122,19 @@ def runStats(self,taskPrefix="",dependencies=None) :
     tmpStatsFiles = []
     statsTasks = set()
 
-    for (bamIndex,bamPath) in enumerate(self.params.normalBamList + self.params.tumorBamList) :
-        indexStr = str(bamIndex).zfill(3)
-        tmpStatsFiles.append(os.path.join(tmpStatsDir,statsFilename+"."+ indexStr +".xml"))
-
+    def statsFunc(self,taskPrefix,dependencies,bamPath,outFile) :
         cmd = [ self.params.mantaStatsBin ]
-        cmd.extend(["--output-file",tmpStatsFiles[-1]])
+        cmd.extend(["--output-file",outFile])
         cmd.extend(["--align-file",bamPath])
+        return self.addTask(preJoin(taskPrefix,"generateStats"),cmd,dependencies=dependencies)
 
-        statsTasks.add(self.addTask(preJoin(taskPrefix,"generateStats_"+indexStr),cmd,dependencies=dirTask))
+    if self.artifactCache is not None :
+        statsFunc = getCachedArtifactFunc("alignmentStats", [], ".xml", statsFunc)
+
+    for (bamIndex,bamPath) in enumerate(self.params.normalBamList + self.params.tumorBamList) :
+        indexStr = str(bamIndex).zfill(3)
+        tmpStatsFiles.append(os.path.join(tmpStatsDir,statsFilename+"."+ indexStr +".xml"))
+        statsTasks.add(statsFunc(self,preJoin(taskPrefix,"sample"+indexStr),dirTask,bamPath,tmpStatsFiles[-1]))
 
     cmd = [ self.params.mantaMergeStatsBin ]
     cmd.extend(["--output-file",statsPath])
@@ -102,7 +170,76 @@ def mantaRunDepthFromAlignments(self,taskPrefix="getChromDepth",dependencies=Non
         return set()
 
     outputPath=self.paths.getChromDepth()
-    return runDepthFromAlignments(self, bamList, outputPath, taskPrefix, dependencies)
+
+    wrapDepthFunc=None
+    if self.artifactCache is not None :
+        depthMode = "index" if self.params.isIndexChromDepth else "scan"
+        def wrapDepthFunc(depthFunc) :
+            return getCachedArtifactFunc("chromDepth", [depthMode] + self.params.chromOrder, ".txt", depthFunc)
+
+    if self.params.isIndexChromDepth :
+        return runDepthFromAlignmentIndex(self, bamList, outputPath, taskPrefix, dependencies, wrapDepthFunc)
+    return runDepthFromAlignments(self, bamList, outputPath, taskPrefix, dependencies, wrapDepthFunc)
+
+
+
+def getFinalGraphMergeArgs(self) :
+    """
+    arguments added to the final SV locus graph merge, to check the merged graph and write its global stats
+    without reloading the graph in separate tasks
+    """
+    mergeArgs = ["--check-state", "--stats-output-file", self.paths.getGraphStatsPath()]
+    if self.params.isLocusIndexedGraph :
+        mergeArgs.extend(["--locus-indexed-output-file", self.paths.getLocusIndexedGraphPath()])
+    return mergeArgs
+
+
+
+def mergeLocusGraphTree(self, taskPrefix, tmpGraphFiles, graphTasks, graphPath) :
+    """
+    merge the SV locus graph files in tmpGraphFiles as a tree, where groups of up to graphMergeGroupSize adjacent
+    graph files are merged in parallel, repeating for each level of the tree until one final merge produces graphPath
+
+    each graph file in tmpGraphFiles is produced by the task at the same index in graphTasks
+
+    return the final merge task
+    """
+
+    groupSize = max(2, self.params.graphMergeGroupSize)
+
+    def getMergeCmd(inputFiles, outputFile, isIntermediate) :
+        mergeCmd = [ self.params.mantaGraphMergeBin ]
+        mergeCmd.extend(["--output-file", outputFile])
+        for inputFile in inputFiles :
+            mergeCmd.extend(["--graph-file", inputFile])
+        if isIntermediate :
+            mergeCmd.append("--intermediate-output")
+        else :
+            mergeCmd.extend(getFinalGraphMergeArgs(self))
+        return mergeCmd
+
+    # graph segments are in genome order, so merging adjacent graphs keeps each merge mostly local:
+    levelInputs = zip(tmpGraphFiles, graphTasks)
+    level = 0
+    while len(levelInputs) > groupSize :
+        nextLevelInputs = []
+        for (groupIndex, groupStart) in enumerate(range(0, len(levelInputs), groupSize)) :
+            group = levelInputs[groupStart:groupStart+groupSize]
+            if len(group) == 1 :
+                nextLevelInputs.extend(group)
+                continue
+            mergeFile = self.paths.getTmpGraphMergeFile(level, groupIndex)
+            mergeCmd = getMergeCmd([inputFile for (inputFile, inputTask) in group], mergeFile, True)
+            mergeTaskLabel = preJoin(taskPrefix, "mergeLocusGraph_L%i_%s" % (level, str(groupIndex).zfill(4)))
+            mergeTask = self.addTask(mergeTaskLabel, mergeCmd, dependencies=set([inputTask for (inputFile, inputTask) in group]),
+                                     memMb=self.params.mergeMemMb)
+            nextLevelInputs.append((mergeFile, mergeTask))
+        levelInputs = nextLevelInputs
+        level += 1
+
+    mergeCmd = getMergeCmd([inputFile for (inputFile, inputTask) in levelInputs], graphPath, False)
+    return self.addTask(preJoin(taskPrefix,"mergeLocusGraph"), mergeCmd, dependencies=set([inputTask for (inputFile, inputTask) in levelInputs]),
+                        memMb=self.params.mergeMemMb)
 
 
 
@@ -113,7 +250,6 @@ def runLocusGraph(self,taskPrefix="",dependencies=None):
 
     statsPath=self.paths.getStatsPath()
     graphPath=self.paths.getGraphPath()
-    graphStatsPath=self.paths.getGraphStatsPath()
 
     graphFilename=os.path.basename(graphPath)
 
@@ -123,9 +259,14 @@ def runLocusGraph(self,taskPrefix="",dependencies=None):
     dirTask = self.addTask(preJoin(taskPrefix,"makeGraphTmpDir"), makeTmpGraphDirCmd, dependencies=dependencies, isForceLocal=True)
 
     tmpGraphFiles = []
-    graphTasks = set()
+    graphTasks = []
+
+    # optionally balance the number of reads scanned by each task, using read densities from the alignment indexes:
+    readDensity = None
+    if self.params.isReadDensitySegmentation :
+        readDensity = getAlignmentReadDensity(self.params.htsfileBin, self.params.normalBamList + self.params.tumorBamList)
 
-    for gsegGroup in getGenomeSegmentGroups(self.params) :
+    for gsegGroup in getGenomeSegmentGroups(self.params, readDensity=readDensity) :
         assert(len(gsegGroup) != 0)
         gid=gsegGroup[0].id
         if len(gsegGroup) > 1 :
@@ -153,39 +294,30 @@ def runLocusGraph(self,taskPrefix="",dependencies=None):
             graphCmd.append("--rna")
 
         graphTask=preJoin(taskPrefix,"makeLocusGraph_"+gid)
-        graphTasks.add(self.addTask(graphTask,graphCmd,dependencies=dirTask,memMb=self.params.estimateMemMb))
+        graphTasks.append(self.addTask(graphTask,graphCmd,dependencies=dirTask,memMb=self.params.estimateMemMb))
 
     if len(tmpGraphFiles) == 0 :
         raise Exception("No SV Locus graphs to create. Possible target region parse error.")
 
-    tmpGraphFileList = self.paths.getTmpGraphFileListPath()
-    tmpGraphFileListTask = preJoin(taskPrefix,"mergeLocusGraphInputList")
-    self.addWorkflowTask(tmpGraphFileListTask,listFileWorkflow(tmpGraphFileList,tmpGraphFiles),dependencies=graphTasks)
-
-    mergeCmd = [ self.params.mantaGraphMergeBin ]
-    mergeCmd.extend(["--output-file", graphPath])
-    mergeCmd.extend(["--graph-file-list",tmpGraphFileList])
-    mergeTask = self.addTask(preJoin(taskPrefix,"mergeLocusGraph"),mergeCmd,dependencies=tmpGraphFileListTask,memMb=self.params.mergeMemMb)
-
-    # Run a separate process to rigorously check that the final graph is valid, the sv candidate generators will check as well, but
-    # this makes the check much more clear:
+    if self.params.isTreeMergeLocusGraph :
+        mergeTask = mergeLocusGraphTree(self, taskPrefix, tmpGraphFiles, graphTasks, graphPath)
+    else :
+        tmpGraphFileList = self.paths.getTmpGraphFileListPath()
+        tmpGraphFileListTask = preJoin(taskPrefix,"mergeLocusGraphInputList")
+        self.addWorkflowTask(tmpGraphFileListTask,listFileWorkflow(tmpGraphFileList,tmpGraphFiles),dependencies=set(graphTasks))
 
-    checkCmd = [ self.params.mantaGraphCheckBin ]
-    checkCmd.extend(["--graph-file", graphPath])
-    checkTask = self.addTask(preJoin(taskPrefix,"checkLocusGraph"),checkCmd,dependencies=mergeTask,memMb=self.params.mergeMemMb)
+        mergeCmd = [ self.params.mantaGraphMergeBin ]
+        mergeCmd.extend(["--output-file", graphPath])
+        mergeCmd.extend(["--graph-file-list",tmpGraphFileList])
+        mergeCmd.extend(getFinalGraphMergeArgs(self))
+        mergeTask = self.addTask(preJoin(taskPrefix,"mergeLocusGraph"),mergeCmd,dependencies=tmpGraphFileListTask,memMb=self.params.mergeMemMb)
 
     if not self.params.isRetainTempFiles :
         rmGraphTmpCmd = getRmdirCmd() + [tmpGraphDir]
         rmTask=self.addTask(preJoin(taskPrefix,"rmTmpDir"),rmGraphTmpCmd,dependencies=mergeTask)
 
-    graphStatsCmd  = [self.params.mantaGraphStatsBin,"--global"]
-    graphStatsCmd.extend(["--graph-file",graphPath])
-    graphStatsCmd.extend(["--output-file",graphStatsPath])
-
-    graphStatsTask = self.addTask(preJoin(taskPrefix,"locusGraphStats"),graphStatsCmd,dependencies=mergeTask,memMb=self.params.mergeMemMb)
-
     nextStepWait = set()
-    nextStepWait.add(checkTask)
+    nextStepWait.add(mergeTask)
     return nextStepWait
 
 
@@ -206,81 +338,142 @@ class listFileWorkflow(WorkflowRunner) :
 
 
 
-def sortBams(self, sortBamTasks, taskPrefix="", binStr="", isNormal=True, bamIdx=0, dependencies=None):
-
-    if isNormal:
-        bamList = self.params.normalBamList
-    else:
-        bamList = self.params.tumorBamList
-
-    for bamPath in bamList:
-        supportBam = self.paths.getSupportBamPath(bamIdx, binStr)
-        sortedBam = os.path.splitext(self.paths.getSortedSupportBamPath(bamIdx, binStr))[0]
-        # first check the existence of the supporting bam
-        # then sort the bam only if it exists
-        sortBamCmd = [ sys.executable,"-E", self.params.mantaSortBam,
-                      self.params.samtoolsBin, supportBam, sortedBam ]
-
-        sortBamTask = preJoin(taskPrefix, "sortEvidenceBam_%s_%s" % (binStr, bamIdx))
-        sortBamTasks.add(self.addTask(sortBamTask, sortBamCmd, dependencies=dependencies))
-        bamIdx += 1
-
-    return bamIdx
-
+def sortAllVcfs(self, taskPrefix="", dependencies=None, binTasks=None) :
+    """
+    sort/prep final vcf outputs
 
-def sortAllVcfs(self, taskPrefix="", dependencies=None) :
-    """sort/prep final vcf outputs"""
+    binTasks optionally lists the task producing each bin's vcf files, in bin order, so that
+    bins can be merged as they complete, otherwise all merging waits on dependencies.
+    """
 
     nextStepWait = set()
 
-    def getVcfSortCmd(vcfListFile, outPath, isDiploid) :
-        cmd  = "\"%s\" -E \"%s\" -u " % (sys.executable, self.params.mantaSortVcf)
-        cmd += "-f \"%s\"" % (vcfListFile)
-
-        # apply the ploidy filter to diploid variants
-        if isDiploid:
-            tempVcf = self.paths.getTempDiploidPath()
-            cmd += " > \"%s\"" % (tempVcf)
-            cmd += " && \"%s\" -E \"%s\" \"%s\"" % (sys.executable, self.params.mantaPloidyFilter, tempVcf)
-
-        cmd += " | \"%s\" -c > \"%s\"" % (self.params.bgzipBin, outPath)
-
-        if isDiploid:
-            cmd += " && " + " ".join(getRmCmd()) + " \"%s\"" % (self.paths.getTempDiploidPath())
+    compressThreads = self.limitNCores(self.params.vcfCompressThreads)
+
+    def getVcfFinalizeCmd(inputArgs, outPath, isDiploid, smallIndelPath, threadCount, isHeader=True) :
+        cmd  = [sys.executable,"-E",self.params.mantaFinalizeVcf]
+        cmd.extend(inputArgs)
+        cmd.extend(["--output",outPath])
+        cmd.extend(["--cmdline"," ".join(self.params.configCommandLine)])
+        # limit the sort buffer to half of the task's memory reservation, leaving the
+        # remainder for python interpreter and merge overhead:
+        cmd.extend(["--tmpDir",self.paths.getHyGenDir()])
+        cmd.extend(["--maxMemMb",str(max(1,self.params.vcfSortMemMb/2))])
+        cmd.extend(["--threads",str(threadCount)])
+
+        if not isHeader :
+            cmd.append("--noHeader")
+
+        # apply the ploidy filter to diploid variants:
+        if isDiploid :
+            cmd.append("--ploidyFilter")
+
+        if smallIndelPath is not None :
+            maxSize = int(self.params.minScoredVariantSize) - 1
+            cmd.extend(["--smallIndelOutput",smallIndelPath])
+            cmd.extend(["--maxSmallIndelSize",str(maxSize)])
         return cmd
 
-    def getVcfTabixCmd(vcfPath) :
-        return [self.params.tabixBin,"-f","-p","vcf", vcfPath]
 
+    def sortVcfs(pathList, outPath, label, isDiploid=False, smallIndelPath=None) :
+        """
+        header update, sort, filtering, compression and indexing of each final vcf
 
-    def sortVcfs(pathList, outPath, label, isDiploid=False) :
+        Groups of bins are partitioned into sorted chromosome shard runs as soon as
+        all bins in the group are complete. Each shard is then finalized from the
+        merged runs of all groups, and finalized shards are concatenated in
+        chromosome order.
+        """
         if len(pathList) == 0 : return set()
 
-        # make header modifications to first vcf in list of files to be sorted:
-        headerFixTask=preJoin(taskPrefix,"fixVcfHeader_"+label)
-        def getHeaderFixCmd(fileName) :
-            tmpName=fileName+".reheader.tmp"
-            cmd  = "\"%s\" -E \"%s\"" % (sys.executable, self.params.vcfCmdlineSwapper)
-            cmd += ' "' + " ".join(self.params.configCommandLine) + '"'
-            cmd += " < \"%s\" > \"%s\"" % (fileName,tmpName)
-            cmd += " && " + " ".join(getMvCmd()) +  " \"%s\" \"%s\"" % (tmpName, fileName)
-            return cmd
-
-        self.addTask(headerFixTask, getHeaderFixCmd(pathList[0]), dependencies=dependencies, isForceLocal=True)
-
-        vcfListFile = self.paths.getVcfListPath(label)
-        inputVcfTask = self.addWorkflowTask(preJoin(taskPrefix,label+"InputList"),listFileWorkflow(vcfListFile,pathList),dependencies=headerFixTask)
-
-        sortCmd = getVcfSortCmd(vcfListFile, outPath, isDiploid)
-        sortTask=self.addTask(preJoin(taskPrefix,"sort_"+label),sortCmd,dependencies=inputVcfTask)
-
-        nextStepWait.add(self.addTask(preJoin(taskPrefix,"tabix_"+label),getVcfTabixCmd(outPath),dependencies=sortTask,isForceLocal=True))
-        return sortTask
-
-
-    candSortTask = sortVcfs(self.candidateVcfPaths,
-                            self.paths.getSortedCandidatePath(),
-                            "sortCandidateSV")
+        groupBinCount = self.params.vcfPremergeBinCount
+        shardCount = max(1,self.params.vcfFinalizeShardCount)
+
+        tmpPaths = []
+
+        # pre-merge each group of bins into a sorted run for each shard:
+        groupTasks = set()
+        groupCount = 0
+        for groupStart in range(0, len(pathList), groupBinCount) :
+            groupIndex = groupCount
+            groupCount += 1
+            groupBins = range(groupStart, min(groupStart+groupBinCount, len(pathList)))
+
+            # only the first bin writes a vcf header, so the chromosome order of every group is taken from it:
+            groupDependencies = dependencies
+            if binTasks is not None :
+                groupDependencies = set([binTasks[binIndex] for binIndex in [0] + groupBins])
+
+            premergeCmd  = [sys.executable,"-E",self.params.mantaPartitionVcf]
+            premergeCmd.extend(["--sort"])
+            premergeCmd.extend(["--headerVcf",pathList[0]])
+            premergeCmd.extend(["--tmpDir",self.paths.getHyGenDir()])
+            premergeCmd.extend(["--maxMemMb",str(max(1,self.params.vcfSortMemMb/2))])
+            premergeCmd.extend(["--shardCount",str(shardCount)])
+            premergeCmd.extend(["--shardPrefix",self.paths.getVcfGroupShardPrefix(label, groupIndex)])
+            premergeCmd.extend([pathList[binIndex] for binIndex in groupBins])
+            groupTasks.add(self.addTask(preJoin(taskPrefix,"premerge_%s_group%04i" % (label, groupIndex)),premergeCmd,
+                                        dependencies=groupDependencies,memMb=self.params.vcfSortMemMb))
+
+            for shardIndex in range(shardCount) :
+                tmpPaths.append(self.paths.getVcfGroupShardPath(label, groupIndex, shardIndex))
+
+        def getShardRunArgs(shardIndex) :
+            runPaths = [self.paths.getVcfGroupShardPath(label, groupIndex, shardIndex) for groupIndex in range(groupCount)]
+            return ["--presorted"] + runPaths
+
+        finalTasks = set()
+        if shardCount == 1 :
+            finalizeCmd = getVcfFinalizeCmd(getShardRunArgs(0), outPath, isDiploid, smallIndelPath, compressThreads)
+            finalTasks.add(self.addTask(preJoin(taskPrefix,"sort_"+label),finalizeCmd,dependencies=groupTasks,
+                                        nCores=compressThreads,memMb=self.params.vcfSortMemMb))
+        else :
+            # finalize each shard in parallel, then concatenate the compressed shards in chromosome order:
+            shardTasks = set()
+            shardPaths = []
+            smallShardPaths = []
+            for shardIndex in range(shardCount) :
+                shardOutPath = self.paths.getVcfShardPath(label, shardIndex) + ".gz"
+                shardPaths.append(shardOutPath)
+                tmpPaths.extend([shardOutPath, shardOutPath + ".tbi"])
+
+                shardSmallIndelPath = None
+                if smallIndelPath is not None :
+                    shardSmallIndelPath = self.paths.getVcfShardPath(label, shardIndex, "smallIndels") + ".gz"
+                    smallShardPaths.append(shardSmallIndelPath)
+                    tmpPaths.extend([shardSmallIndelPath, shardSmallIndelPath + ".tbi"])
+
+                shardCmd = getVcfFinalizeCmd(getShardRunArgs(shardIndex), shardOutPath, isDiploid, shardSmallIndelPath, 1, (shardIndex == 0))
+                shardTasks.add(self.addTask(preJoin(taskPrefix,"sort_%s_shard%04i" % (label, shardIndex)),shardCmd,
+                                            dependencies=groupTasks,memMb=self.params.vcfSortMemMb))
+
+            def addConcatTask(concatLabel, concatOutPath, concatShardPaths) :
+                concatCmd = [sys.executable,"-E",self.params.mantaConcatVcfShards]
+                concatCmd.extend(["--output",concatOutPath])
+                concatCmd.extend(concatShardPaths)
+                finalTasks.add(self.addTask(preJoin(taskPrefix,concatLabel),concatCmd,dependencies=shardTasks,isForceLocal=True))
+
+            addConcatTask("sort_"+label, outPath, shardPaths)
+            if smallIndelPath is not None :
+                addConcatTask("extractSmallIndels", smallIndelPath, smallShardPaths)
+
+        nextStepWait.update(finalTasks)
+
+        if not self.params.isRetainTempFiles :
+            rmTmpCmd = getRmCmd() + tmpPaths
+            self.addTask(preJoin(taskPrefix,"rmSortTmp_"+label),rmTmpCmd,dependencies=finalTasks,isForceLocal=True)
+
+        return finalTasks
+
+
+    smallIndelPath = None
+    if (int(self.params.minScoredVariantSize) - 1) >= 1 :
+        smallIndelPath = self.paths.getSortedCandidateSmallIndelsPath()
+
+    sortVcfs(self.candidateVcfPaths,
+             self.paths.getSortedCandidatePath(),
+             "sortCandidateSV",
+             smallIndelPath=smallIndelPath)
     sortVcfs(self.diploidVcfPaths,
              self.paths.getSortedDiploidPath(),
              "sortDiploidSV",
@@ -292,66 +485,36 @@ def sortAllVcfs(self, taskPrefix="", dependencies=None) :
              self.paths.getSortedTumorPath(),
              "sortTumorSV")
 
-    def getExtractSmallCmd(maxSize, inPath, outPath) :
-        cmd  = "\"%s\" -dc \"%s\"" % (self.params.bgzipBin, inPath)
-        cmd += " | \"%s\" -E \"%s\" --maxSize %i" % (sys.executable, self.params.mantaExtraSmallVcf, maxSize)
-        cmd += " | \"%s\" -c > \"%s\"" % (self.params.bgzipBin, outPath)
-        return cmd
+    return nextStepWait
 
-    def extractSmall(inPath, outPath) :
-        maxSize = int(self.params.minScoredVariantSize) - 1
-        if maxSize < 1 : return
-        smallCmd = getExtractSmallCmd(maxSize, inPath, outPath)
-        smallTask=self.addTask(preJoin(taskPrefix,"extractSmallIndels"), smallCmd, dependencies=candSortTask, isForceLocal=True)
-        nextStepWait.add(self.addTask(smallTask+"_tabix", getVcfTabixCmd(outPath), dependencies=smallTask, isForceLocal=True))
 
-    extractSmall(self.paths.getSortedCandidatePath(), self.paths.getSortedCandidateSmallIndelsPath())
+def consolidateSupportBams(self, taskPrefix="", dependencies=None) :
+    """
+    filter, sort and merge the per-bin evidence bams of each sample into one indexed bam
 
-    return nextStepWait
+    The candidate vcf must be sorted before this step, as it is used to filter the evidence reads.
+    """
 
+    compressThreads = self.limitNCores(self.params.vcfCompressThreads)
 
-def mergeSupportBams(self, mergeBamTasks, taskPrefix="", isNormal=True, bamIdx=0, dependencies=None) :
+    consolidateTasks = set()
+    for (bamIdx, bamPath) in enumerate(self.params.normalBamList + self.params.tumorBamList) :
+        supportBamPaths = [self.paths.getSupportBamPath(bamIdx, binStr) for binStr in self.binStrList]
 
-    if isNormal:
-        bamList = self.params.normalBamList
-    else:
-        bamList = self.params.tumorBamList
+        bamListFile = self.paths.getSupportBamListPath(bamIdx)
+        bamListTask = preJoin(taskPrefix,"consolidate_evidenceBamInputList_%s" % (bamIdx))
+        self.addWorkflowTask(bamListTask,listFileWorkflow(bamListFile,supportBamPaths),dependencies=dependencies)
 
-    for bamPath in bamList:
-        # merge support bams
-        mergedSamFile = self.paths.getMergedSupportSamPath(bamIdx)
-        mergeCmd = [ sys.executable,"-E", self.params.mantaMergeBam,
-                     self.params.samtoolsBin,
-                     self.paths.getSortedSupportBamMask(bamIdx),
-                     self.paths.getMergedSupportBamPath(bamIdx),
-                     mergedSamFile,
-                     self.paths.getSupportBamListPath(bamIdx) ]
-
-        mergeBamTask=self.addTask(preJoin(taskPrefix,"merge_evidenceBam_%s" % (bamIdx)),
-                                  mergeCmd, dependencies=dependencies)
-        mergeBamTasks.add(mergeBamTask)
-
-        # filter the merged sam
-        filteredBamFile = self.paths.getFinalSupportBamPath(bamPath)
-        filterCmd = [ sys.executable,"-E", self.params.mantaFilterBam,
-                     self.params.samtoolsBin,
-                     self.paths.getSortedCandidatePath(),
-                     mergedSamFile,
-                     self.paths.getfilteredSupportSamPath(bamIdx),
-                     filteredBamFile ]
-        filterBamTask = self.addTask(preJoin(taskPrefix,"filter_evidenceSam_%s" % (bamIdx)),
-                                     filterCmd, dependencies=mergeBamTask)
-        mergeBamTasks.add(filterBamTask)
-
-        # index the filtered bam
-        indexCmd = [ self.params.samtoolsBin, "index", filteredBamFile ]
-        indexBamTask = self.addTask(preJoin(taskPrefix,"index_evidenceBam_%s" % (bamIdx)),
-                                    indexCmd, dependencies=filterBamTask)
-        mergeBamTasks.add(indexBamTask)
-
-        bamIdx += 1
-
-    return bamIdx
+        consolidateCmd = [ sys.executable,"-E", self.params.mantaConsolidateEvidenceBam ]
+        consolidateCmd.extend(["--candidateVcf", self.paths.getSortedCandidatePath()])
+        consolidateCmd.extend(["-f", bamListFile])
+        consolidateCmd.extend(["--output", self.paths.getFinalSupportBamPath(bamPath)])
+        consolidateCmd.extend(["--tmpDir", self.paths.getHyGenDir()])
+        consolidateCmd.extend(["--threads", str(compressThreads)])
+        consolidateTask = preJoin(taskPrefix,"consolidate_evidenceBam_%s" % (bamIdx))
+        consolidateTasks.add(self.addTask(consolidateTask, consolidateCmd, dependencies=bamListTask, nCores=compressThreads))
+
+    return consolidateTasks
 
 
 def runHyGen(self, taskPrefix="", dependencies=None) :
@@ -363,6 +526,9 @@ def runHyGen(self, taskPrefix="", dependencies=None) :
 
     statsPath=self.paths.getStatsPath()
     graphPath=self.paths.getGraphPath()
+    if self.params.isLocusIndexedGraph :
+        # each candidate generation task maps this file and loads only the graph loci in its bin:
+        graphPath=self.paths.getLocusIndexedGraphPath()
     hygenDir=self.paths.getHyGenDir()
 
     makeHyGenDirCmd = getMkdirCmd() + [hygenDir]
@@ -375,10 +541,18 @@ def runHyGen(self, taskPrefix="", dependencies=None) :
     if self.getRunMode() == "sge" :
         hyGenMemMb = self.params.hyGenSGEMemMb
 
+    # each candidate generation task runs this many edge worker threads, so the total edge workload
+    # is divided into correspondingly fewer tasks:
+    hyGenThreadCount = self.limitNCores(self.params.hyGenThreadCount)
+    hyGenMemMb += (hyGenThreadCount-1) * self.params.hyGenThreadMemMb
+
+    def getHyGenBinCount(workerCount) :
+        return max(1, (workerCount + hyGenThreadCount - 1) // hyGenThreadCount)
+
     hygenTasks=set()
-    if self.params.isGenerateSupportBam :
-        sortBamVcfTasks = set()
+    hygenTaskList=[]
 
+    self.binStrList = []
     self.candidateVcfPaths = []
     self.diploidVcfPaths = []
     self.somaticVcfPaths = []
@@ -387,8 +561,21 @@ def runHyGen(self, taskPrefix="", dependencies=None) :
     edgeRuntimeLogPaths = []
     edgeStatsLogPaths = []
 
-    for binId in range(self.params.nonlocalWorkBins) :
+    # in work queue mode, one candidate generation worker is started per available core, and the workers
+    # claim edge chunks from a queue on the local filesystem, otherwise each task processes a fixed edge bin:
+    isWorkQueue = (self.params.isCandidateWorkQueue and (self.getRunMode() == "local"))
+    if isWorkQueue :
+        hygenBinCount = getHyGenBinCount(self.limitNCores(self.params.nonlocalWorkBins))
+        workQueueDir = self.paths.getHyGenWorkQueueDir()
+        makeQueueCmd = [sys.executable,"-E",self.params.mantaMakeEdgeWorkQueue]
+        makeQueueCmd.extend(["--chunkCount", str(self.params.hyGenWorkQueueChunkCount), workQueueDir])
+        dirTask = self.addTask(preJoin(taskPrefix,"makeHyGenWorkQueue"), makeQueueCmd, dependencies=dirTask, isForceLocal=True)
+    else :
+        hygenBinCount = getHyGenBinCount(self.params.nonlocalWorkBins)
+
+    for binId in range(hygenBinCount) :
         binStr = str(binId).zfill(4)
+        self.binStrList.append(binStr)
         self.candidateVcfPaths.append(self.paths.getHyGenCandidatePath(binStr))
         if isTumorOnly :
             self.tumorVcfPaths.append(self.paths.getHyGenTumorPath(binStr))
@@ -401,7 +588,23 @@ def runHyGen(self, taskPrefix="", dependencies=None) :
         hygenCmd.extend(["--align-stats",statsPath])
         hygenCmd.extend(["--graph-file",graphPath])
         hygenCmd.extend(["--bin-index", str(binId)])
-        hygenCmd.extend(["--bin-count", str(self.params.nonlocalWorkBins)])
+        hygenCmd.extend(["--bin-count", str(hygenBinCount)])
+        if hyGenThreadCount > 1 :
+            hygenCmd.extend(["--threads", str(hyGenThreadCount)])
+        if isWorkQueue :
+            hygenCmd.extend(["--work-queue-dir", workQueueDir])
+            hygenCmd.extend(["--work-chunk-count", str(self.params.hyGenWorkQueueChunkCount)])
+        elif self.params.candidateCostModel is not None :
+            hygenCmd.extend(["--bin-cost-model", self.params.candidateCostModel])
+        if self.params.isCandidateLocalityOrder and (not isWorkQueue) :
+            hygenCmd.append("--locality-edge-order")
+        hygenCmd.extend(["--remote-read-cache-mb", str(self.params.hyGenRemoteReadCacheMb)])
+        if int(self.params.hyGenEdgeMaxAssemblyReads) > 0 :
+            hygenCmd.extend(["--edge-max-assembly-reads", str(self.params.hyGenEdgeMaxAssemblyReads)])
+        if int(self.params.hyGenEdgeMaxAssemblyCandidates) > 0 :
+            hygenCmd.extend(["--edge-max-assembly-candidates", str(self.params.hyGenEdgeMaxAssemblyCandidates)])
+        if float(self.params.hyGenEdgeMaxAssemblySeconds) > 0 :
+            hygenCmd.extend(["--edge-max-assembly-seconds", str(self.params.hyGenEdgeMaxAssemblySeconds)])
         hygenCmd.extend(["--min-candidate-sv-size", self.params.minCandidateVariantSize])
         hygenCmd.extend(["--min-candidate-spanning-count", self.params.minCandidateSpanningCount])
         hygenCmd.extend(["--min-scored-sv-size", self.params.minScoredVariantSize])
@@ -430,6 +633,7 @@ def runHyGen(self, taskPrefix="", dependencies=None) :
 
         edgeRuntimeLogPaths.append(self.paths.getHyGenEdgeRuntimeLogPath(binStr))
         hygenCmd.extend(["--edge-runtime-log", edgeRuntimeLogPaths[-1]])
+        hygenCmd.extend(["--edge-runtime-log-min-seconds", str(self.params.edgeRuntimeLogMinSeconds)])
 
         edgeStatsLogPaths.append(self.paths.getHyGenEdgeStatsPath(binStr))
         hygenCmd.extend(["--edge-stats-log", edgeStatsLogPaths[-1]])
@@ -450,58 +654,31 @@ def runHyGen(self, taskPrefix="", dependencies=None) :
             hygenCmd.append("--unstranded")
 
         hygenTask = preJoin(taskPrefix,"generateCandidateSV_"+binStr)
-        hygenTasks.add(self.addTask(hygenTask,hygenCmd,dependencies=dirTask, memMb=hyGenMemMb))
+        hygenTaskList.append(self.addTask(hygenTask,hygenCmd,dependencies=dirTask, nCores=hyGenThreadCount, memMb=hyGenMemMb))
+        hygenTasks.add(hygenTaskList[-1])
 
-        # TODO: if the bam is large, for efficiency, consider
-        # 1) filtering the bin-specific bam first w.r.t. the final candidate vcf
-        # 2) then sort the bin-specific bam and merge them
-        # This would require moving the filter/sort bam jobs outside the hygen loop
-        if self.params.isGenerateSupportBam :
-            bamIndex = 0
-            # sort supporting bams extracted from normal samples
-            bamIndex  = sortBams(self, sortBamVcfTasks,
-                                 taskPrefix=taskPrefix, binStr=binStr,
-                                 isNormal=True, bamIdx=bamIndex,
-                                 dependencies=hygenTask)
-            # sort supporting bams extracted from tumor samples
-            bamIndex = sortBams(self, sortBamVcfTasks,
-                                taskPrefix=taskPrefix, binStr=binStr,
-                                isNormal=False, bamIdx=bamIndex,
-                                dependencies=hygenTask)
-
-    vcfTasks = sortAllVcfs(self,taskPrefix=taskPrefix,dependencies=hygenTasks)
+    vcfTasks = sortAllVcfs(self,taskPrefix=taskPrefix,dependencies=hygenTasks,binTasks=hygenTaskList)
     nextStepWait = copy.deepcopy(hygenTasks)
 
     if self.params.isGenerateSupportBam :
-        sortBamVcfTasks.union(vcfTasks)
-        mergeBamTasks = set()
-        bamCount = 0
-        # merge supporting bams for each normal sample
-        bamCount = mergeSupportBams(self, mergeBamTasks, taskPrefix=taskPrefix,
-                                    isNormal=True, bamIdx=bamCount,
-                                    dependencies=sortBamVcfTasks)
-
-        # merge supporting bams for each tumor sample
-        bamCount = mergeSupportBams(self, mergeBamTasks, taskPrefix=taskPrefix,
-                                    isNormal=False, bamIdx=bamCount,
-                                    dependencies=sortBamVcfTasks)
-
-        nextStepWait = nextStepWait.union(sortBamVcfTasks)
-        nextStepWait = nextStepWait.union(mergeBamTasks)
+        consolidateTasks = consolidateSupportBams(self, taskPrefix=taskPrefix, dependencies=vcfTasks)
+        nextStepWait = nextStepWait.union(consolidateTasks)
 
     #
-    # sort the edge runtime logs
+    # analyze the edge runtime logs
     #
     logListFile = self.paths.getEdgeRuntimeLogListPath()
-    logListTask = preJoin(taskPrefix,"sortEdgeRuntimeLogsInputList")
+    logListTask = preJoin(taskPrefix,"analyzeEdgeRuntimeLogsInputList")
     self.addWorkflowTask(logListTask,listFileWorkflow(logListFile,edgeRuntimeLogPaths),dependencies=hygenTasks)
 
-    def getEdgeLogSortCmd(logListFile, outPath) :
-        cmd  = [sys.executable,"-E",self.params.mantaSortEdgeLogs,"-f", logListFile,"-o",outPath]
+    def getEdgeLogAnalyzeCmd(logListFile, outPath) :
+        cmd  = [sys.executable,"-E",self.params.mantaAnalyzeEdgeLogs,"-f", logListFile,"-o",outPath]
+        cmd.extend(["--tsv",self.paths.getEdgeRuntimeProfilePath()])
+        cmd.extend(["--json",self.paths.getEdgeRuntimeProfileJsonPath()])
         return cmd
 
-    edgeSortCmd=getEdgeLogSortCmd(logListFile,self.paths.getSortedEdgeRuntimeLogPath())
-    self.addTask(preJoin(taskPrefix,"sortEdgeRuntimeLogs"), edgeSortCmd, dependencies=logListTask, isForceLocal=True)
+    edgeAnalyzeCmd=getEdgeLogAnalyzeCmd(logListFile,self.paths.getSortedEdgeRuntimeLogPath())
+    self.addTask(preJoin(taskPrefix,"analyzeEdgeRuntimeLogs"), edgeAnalyzeCmd, dependencies=logListTask, isForceLocal=True)
 
     #
     # merge all edge stats
@@ -547,12 +724,18 @@ class PathInfo:
     def getGraphPath(self) :
         return os.path.join(self.params.workDir,"svLocusGraph.bin")
 
+    def getLocusIndexedGraphPath(self) :
+        return os.path.join(self.params.workDir,"svLocusGraph.indexed.bin")
+
     def getTmpGraphDir(self) :
         return os.path.join(self.getGraphPath()+".tmpdir")
 
     def getTmpGraphFile(self, gid) :
         return os.path.join(self.getTmpGraphDir(),"svLocusGraph.%s.bin" % (gid))
 
+    def getTmpGraphMergeFile(self, level, groupIndex) :
+        return os.path.join(self.getTmpGraphDir(),"svLocusGraph.merge.L%i.%s.bin" % (level, str(groupIndex).zfill(4)))
+
     def getHyGenDir(self) :
         return os.path.join(self.params.workDir,"svHyGen")
 
@@ -568,9 +751,6 @@ class PathInfo:
     def getHyGenDiploidPath(self, binStr) :
         return os.path.join(self.getHyGenDir(),"diploidSV.%s.vcf" % (binStr))
 
-    def getTempDiploidPath(self) :
-        return os.path.join(self.getHyGenDir(),"diploidSV.vcf.temp")
-
     def getSortedDiploidPath(self) :
         return os.path.join(self.params.variantsDir,"diploidSV.vcf.gz")
 
@@ -586,6 +766,9 @@ class PathInfo:
     def getSortedTumorPath(self) :
         return os.path.join(self.params.variantsDir,"tumorSV.vcf.gz")
 
+    def getHyGenWorkQueueDir(self) :
+        return os.path.join(self.getHyGenDir(),"edgeWorkQueue")
+
     def getHyGenEdgeRuntimeLogPath(self, binStr) :
         return os.path.join(self.getHyGenDir(),"edgeRuntimeLog.%s.txt" % (binStr))
 
@@ -601,6 +784,12 @@ class PathInfo:
     def getFinalEdgeStatsReportPath(self) :
         return os.path.join(self.params.statsDir,"svCandidateGenerationStats.tsv")
 
+    def getEdgeRuntimeProfilePath(self) :
+        return os.path.join(self.params.statsDir,"svCandidateGenerationRuntimeProfile.tsv")
+
+    def getEdgeRuntimeProfileJsonPath(self) :
+        return os.path.join(self.params.statsDir,"svCandidateGenerationRuntimeProfile.json")
+
     def getGraphStatsPath(self) :
         return os.path.join(self.params.statsDir,"svLocusGraphStats.tsv")
 
@@ -613,26 +802,6 @@ class PathInfo:
         return os.path.join(self.getHyGenDir(),
                             "evidence_%s" % (binStr))
 
-    def getSortedSupportBamPath(self, bamIdx, binStr):
-        return os.path.join(self.getHyGenDir(),
-                            "evidence_%s.bam_%s.sorted.bam" % (binStr, bamIdx))
-
-    def getSortedSupportBamMask(self, bamIdx):
-        return os.path.join(self.getHyGenDir(),
-                            "evidence_*.bam_%s.sorted.bam" % (bamIdx))
-
-    def getMergedSupportBamPath(self, bamIdx):
-        return os.path.join(self.getHyGenDir(),
-                            "evidence.bam_%s.merged.bam" % (bamIdx))
-
-    def getMergedSupportSamPath(self, bamIdx):
-        return os.path.join(self.getHyGenDir(),
-                            "evidence.bam_%s.merged.sam" % (bamIdx))
-
-    def getfilteredSupportSamPath(self, bamIdx):
-        return os.path.join(self.getHyGenDir(),
-                            "evidence.bam_%s.filtered.sam" % (bamIdx))
-
     def getFinalSupportBamPath(self, bamPath):
         bamPrefix = os.path.splitext(os.path.basename(bamPath))[0]
         return os.path.join(self.params.evidenceDir,
@@ -645,8 +814,19 @@ class PathInfo:
     def getTmpGraphFileListPath(self) :
         return os.path.join(self.getTmpGraphDir(),"list.svLocusGraph.txt")
 
-    def getVcfListPath(self, label) :
-        return os.path.join(self.getHyGenDir(),"list.%s.txt" % (label))
+    def getVcfShardPath(self, label, shardIndex, subset=None) :
+        if subset is None :
+            return os.path.join(self.getHyGenDir(),"%s.shard.%04i.vcf" % (label, shardIndex))
+        return os.path.join(self.getHyGenDir(),"%s.shard.%04i.%s.vcf" % (label, shardIndex, subset))
+
+    def getVcfGroupShardPrefix(self, label, groupIndex) :
+        return os.path.join(self.getHyGenDir(),"%s.group.%04i.shard" % (label, groupIndex))
+
+    def getVcfGroupShardPath(self, label, groupIndex, shardIndex) :
+        """
+        group shard paths must match those written by partitionVcf.py for the group shard prefix
+        """
+        return "%s.%04i.vcf" % (self.getVcfGroupShardPrefix(label, groupIndex), shardIndex)
 
     def getEdgeRuntimeLogListPath(self) :
         return os.path.join(self.getHyGenDir(),"list.edgeRuntimeLog.txt")
@@ -708,6 +888,10 @@ class MantaWorkflow(WorkflowRunner) :
         self.params.isHighDepthFilter = (not (self.params.isExome or self.params.isRNA))
         self.params.isIgnoreAnomProperPair = (self.params.isRNA)
 
+        self.artifactCache = None
+        if self.params.artifactCacheDir is not None :
+            self.artifactCache = ArtifactCache(self.params.artifactCacheDir, self.params.htsfileBin, __version__)
+
 
 
     def getSuccessMessage(self) :
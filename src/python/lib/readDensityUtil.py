@@ -0,0 +1,251 @@
+#
+# Manta - Structural Variant and Indel Caller
+# Copyright (c) 2013-2016 Illumina, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+
+"""
+estimate the density of mapped reads along the genome from BAM/CRAM index files
+
+No alignment records are read. For a BAM index, the mapped read count of
+each chromosome is distributed over the linear index windows in proportion
+to the compressed data size of each window. A CRAM index does not record
+read counts, so the compressed size of each slice, spread evenly over the
+region covered by the slice, is used as the weight instead.
+
+Chromosome depth can also be estimated from the mapped read counts of a
+BAM index.
+"""
+
+import os
+
+
+
+class ReadDensity :
+    """
+    weight of each fixed-size window of each chromosome
+    """
+
+    # matches the BAM linear index window size:
+    windowSize = 16384
+
+    def __init__(self) :
+        self.chromWeights = {}
+
+    def addWeight(self, chrom, begin, end, weight) :
+        """
+        spread weight evenly over the 0-indexed half-open range [begin,end)
+        """
+        if end <= begin : end = begin+1
+        weights = self.chromWeights.setdefault(chrom, [])
+        firstWindow = begin / self.windowSize
+        lastWindow = (end-1) / self.windowSize
+        if len(weights) <= lastWindow :
+            weights.extend([0.] * (lastWindow+1-len(weights)))
+        size = float(end-begin)
+        for window in xrange(firstWindow, lastWindow+1) :
+            windowBegin = max(begin, window*self.windowSize)
+            windowEnd = min(end, (window+1)*self.windowSize)
+            weights[window] += weight * (windowEnd-windowBegin) / size
+
+    def getWeight(self, chrom, beginPos, endPos) :
+        """
+        get the weight of the 1-indexed closed range [beginPos,endPos], windows partially
+        overlapping the range contribute in proportion to the overlap
+        """
+        if chrom not in self.chromWeights : return 0.
+        weights = self.chromWeights[chrom]
+        begin = beginPos-1
+        weight = 0.
+        for window in xrange(begin / self.windowSize, min(len(weights), ((endPos-1) / self.windowSize)+1)) :
+            windowBegin = max(begin, window*self.windowSize)
+            windowEnd = min(endPos, (window+1)*self.windowSize)
+            weight += weights[window] * (windowEnd-windowBegin) / self.windowSize
+        return weight
+
+    def getTotalWeight(self, chromOrder) :
+        return sum([sum(self.chromWeights.get(chrom, [])) for chrom in chromOrder], 0.)
+
+
+
+def getAlignmentIndexPath(alignmentFile) :
+    """
+    return the BAM or CRAM index filename for an alignment file, or None if no supported index is found
+    """
+    for ext in (".bai", ".crai") :
+        indexFile = alignmentFile + ext
+        if os.path.isfile(indexFile) : return indexFile
+
+    if alignmentFile.endswith(".bam") :
+        indexFile = alignmentFile[:-len(".bam")] + ".bai"
+        if os.path.isfile(indexFile) : return indexFile
+
+    return None
+
+
+
+def addBamIndexReadDensity(readDensity, indexPath, refNames) :
+    """
+    add the estimated mapped read count of each linear index window in a BAM index to readDensity
+    """
+    from bamUtil import readBamIndexSummary
+
+    refs = readBamIndexSummary(indexPath)
+    if len(refs) != len(refNames) :
+        raise Exception("BAM index chromosome count does not match the BAM header: '%s'" % (indexPath))
+
+    for (tid, ref) in enumerate(refs) :
+        linearCount = len(ref.linear)
+        if linearCount == 0 : continue
+
+        # compressed file offset of each window, windows before the first read have no offset:
+        fileOffsets = [windowOffset >> 16 for windowOffset in ref.linear]
+        firstOffset = max(fileOffsets)
+        for fileOffset in fileOffsets :
+            if fileOffset != 0 :
+                firstOffset = fileOffset
+                break
+        fileOffsets = [max(fileOffset, firstOffset) for fileOffset in fileOffsets]
+        refEndOffset = 0
+        if ref.endOffset is not None : refEndOffset = ref.endOffset
+        fileOffsets.append(max(refEndOffset >> 16, fileOffsets[-1]))
+
+        windowSizes = [max(0, fileOffsets[i+1] - fileOffsets[i]) for i in range(linearCount)]
+        totalSize = sum(windowSizes)
+        if totalSize == 0 : continue
+
+        # scale from compressed bytes to reads when the index records the mapped read count:
+        scale = 1.
+        if ref.mappedCount is not None :
+            scale = float(ref.mappedCount) / totalSize
+
+        chrom = refNames[tid]
+        for (window, windowSize) in enumerate(windowSizes) :
+            if windowSize == 0 : continue
+            windowBegin = window * ReadDensity.windowSize
+            readDensity.addWeight(chrom, windowBegin, windowBegin + ReadDensity.windowSize, windowSize * scale)
+
+
+
+def addCramIndexReadDensity(readDensity, indexPath, refNames) :
+    """
+    add the compressed size of each slice in a CRAM index to readDensity
+    """
+    import gzip
+
+    for line in gzip.open(indexPath, "rb") :
+        word = line.strip().split("\t")
+        if len(word) < 6 :
+            raise Exception("Unexpected CRAM index format: '%s'" % (indexPath))
+
+        # slices with unmapped or multiple-reference reads have a negative reference index:
+        refIndex = int(word[0])
+        if refIndex < 0 : continue
+        if refIndex >= len(refNames) :
+            raise Exception("CRAM index reference index %i is not in the CRAM header: '%s'" % (refIndex, indexPath))
+
+        begin = max(0, int(word[1])-1)
+        span = int(word[2])
+        readDensity.addWeight(refNames[refIndex], begin, begin + span, float(word[5]))
+
+
+
+def getAlignmentReadDensity(htsfileBin, alignmentFiles) :
+    """
+    estimate the read density of all alignment files combined, from their index files
+
+    return a ReadDensity object, or None if any alignment file doesn't have a supported index
+    """
+    from checkChromSet import getBamChromInfo
+
+    readDensity = ReadDensity()
+    for alignmentFile in alignmentFiles :
+        indexPath = getAlignmentIndexPath(alignmentFile)
+        if indexPath is None : return None
+
+        chromInfo = getBamChromInfo(htsfileBin, alignmentFile)
+        refNames = [None] * len(chromInfo)
+        for (chrom, (size, chromIndex)) in chromInfo.items() :
+            refNames[chromIndex] = chrom
+
+        if indexPath.endswith(".crai") :
+            addCramIndexReadDensity(readDensity, indexPath, refNames)
+        else :
+            addBamIndexReadDensity(readDensity, indexPath, refNames)
+
+    return readDensity
+
+
+
+def isIndexChromDepthAvailable(alignmentFile) :
+    """
+    return True if chromosome depth can be estimated from the index of alignmentFile, which requires
+    a BAM index recording the mapped read count of every reference with reads
+    """
+    from bamUtil import readBamIndexSummary
+
+    indexPath = getAlignmentIndexPath(alignmentFile)
+    if (indexPath is None) or (not indexPath.endswith(".bai")) : return False
+
+    for ref in readBamIndexSummary(indexPath) :
+        if ref.isEmpty() : continue
+        if ref.mappedCount is None : return False
+    return True
+
+
+
+def getIndexChromDepth(alignmentFile, chromNames) :
+    """
+    estimate the depth of each chromosome from the mapped read counts in the BAM index of alignmentFile
+
+    Depth is the total length of mapped reads divided by the total size of the linear index windows overlapped
+    by reads, so that, like the alignment scan depth estimate, large regions without reads don't reduce the depth.
+    The mean read length is estimated from reads at the start of the BAM file.
+
+    return a list of depths for each chromosome in chromNames
+    """
+    from bamUtil import BamReader, BamIndexRefSummary, getBamMeanReadLength, readBamIndexSummary
+
+    reader = BamReader(alignmentFile)
+    refs = reader.header.refs
+    reader.close()
+
+    indexPath = getAlignmentIndexPath(alignmentFile)
+    indexRefs = readBamIndexSummary(indexPath)
+    if len(indexRefs) != len(refs) :
+        raise Exception("BAM index chromosome count does not match the BAM header: '%s'" % (indexPath))
+
+    refIndex = dict([(name, (tid, length)) for (tid, (name, length)) in enumerate(refs)])
+
+    readLength = getBamMeanReadLength(alignmentFile)
+
+    depths = []
+    for chrom in chromNames :
+        if chrom not in refIndex :
+            raise Exception("Can't find chromosome name '%s' in BAM file: '%s'" % (chrom, alignmentFile))
+        (tid, chromSize) = refIndex[chrom]
+        indexRef = indexRefs[tid]
+
+        if indexRef.isEmpty() or (readLength is None) :
+            depths.append(0.)
+            continue
+        if indexRef.mappedCount is None :
+            raise Exception("BAM index has no mapped read count for chromosome '%s': '%s'" % (chrom, indexPath))
+
+        coveredSize = min(chromSize, max(1, indexRef.getCoveredWindowCount()) * BamIndexRefSummary.windowSize)
+        depths.append((indexRef.mappedCount * readLength) / coveredSize)
+
+    return depths
@@ -93,11 +93,17 @@ def quoteStringList(strList):
 
 
 
-def _runDepthShared(self,taskPrefix, dependencies, bamList, outputPath, depthFunc) :
+def _runDepthShared(self,taskPrefix, dependencies, bamList, outputPath, depthFunc, wrapDepthFunc=None) :
     """
     estimate chrom depth using the specified depthFunc to compute per-sample depth
+
+    wrapDepthFunc is an optional function applied to depthFunc, which returns the
+    per-sample function to use instead, for instance to reuse cached results
     """
 
+    if wrapDepthFunc is not None :
+        depthFunc = wrapDepthFunc(depthFunc)
+
     outputFilename=os.path.basename(outputPath)
 
     tmpDir=outputPath+".tmpdir"
@@ -129,62 +135,88 @@ def _runDepthShared(self,taskPrefix, dependencies, bamList, outputPath, depthFun
     return nextStepWait
 
 
-def runDepthFromAlignments(self, bamList, outputPath, taskPrefix="",dependencies=None) :
+def _depthFromAlignmentsFunc(self,taskPrefix,dependencies,bamFile,outFile) :
+    """
+    estimate chrom depth of one BAM/CRAM file by scanning alignments from each chromosome
+    """
+    outputPath=outFile
+    outputFilename=os.path.basename(outputPath)
+
+    tmpDir=os.path.join(outputPath+".tmpdir")
+    makeTmpDirCmd = getMkdirCmd() + [tmpDir]
+    dirTask=self.addTask(preJoin(taskPrefix,"makeTmpDir"), makeTmpDirCmd, dependencies=dependencies, isForceLocal=True)
+
+    tmpFiles = []
+    scatterTasks = set()
+
+    def getChromosomeGroups(params) :
+        """
+        Iterate through chromosomes/contigs and group small contigs together. This functions as a generator yielding
+        successive contig groups.
+        """
+        minSize=200000
+        group = []
+        headSize = 0
+
+        chromCount = len(params.chromSizes)
+        assert(len(params.chromOrder) == chromCount)
+        for chromIndex in range(chromCount) :
+            chromLabel = params.chromOrder[chromIndex]
+            chromSize = params.chromSizes[chromLabel]
+            if headSize+chromSize <= minSize :
+                group.append((chromIndex,chromLabel))
+                headSize += chromSize
+            else :
+                if len(group) != 0 : yield(group)
+                group = [(chromIndex,chromLabel)]
+                headSize = chromSize
+        if len(group) != 0 : yield(group)
+
+    for chromGroup in getChromosomeGroups(self.params) :
+        assert(len(chromGroup) > 0)
+        cid = getRobustChromId(chromGroup[0][0], chromGroup[0][1])
+        if len(chromGroup) > 1 :
+            cid += "_to_"+getRobustChromId(chromGroup[-1][0], chromGroup[-1][1])
+        tmpFiles.append(os.path.join(tmpDir,outputFilename+"_"+cid))
+        cmd = [self.params.getChromDepthBin,"--align-file",bamFile,"--output",tmpFiles[-1]]
+        for (chromIndex,chromLabel) in chromGroup :
+            cmd.extend(["--chrom",chromLabel])
+        scatterTasks.add(self.addTask(preJoin(taskPrefix,"estimateChromDepth_"+cid),cmd,dependencies=dirTask))
+
+    catCmd = [self.params.catScript,"--output",outputPath]+tmpFiles
+    catTask = self.addTask(preJoin(taskPrefix,"catChromDepth"),catCmd,dependencies=scatterTasks, isForceLocal=True)
+
+    nextStepWait = set()
+    nextStepWait.add(catTask)
+
+    return nextStepWait
+
+
+
+def runDepthFromAlignments(self, bamList, outputPath, taskPrefix="",dependencies=None, wrapDepthFunc=None) :
     """
     estimate chrom depth directly from BAM/CRAM file
     """
 
+    return _runDepthShared(self, taskPrefix, dependencies, bamList, outputPath, _depthFromAlignmentsFunc, wrapDepthFunc)
+
+
+
+def runDepthFromAlignmentIndex(self, bamList, outputPath, taskPrefix="",dependencies=None, wrapDepthFunc=None) :
+    """
+    estimate chrom depth from the mapped read counts in BAM index files, for any
+    CRAM file or BAM index without mapped read counts, fall back to estimating
+    depth directly from alignments
+    """
+    from readDensityUtil import isIndexChromDepthAvailable
+
     def depthFunc(self,taskPrefix,dependencies,bamFile,outFile) :
-        outputPath=outFile
-        outputFilename=os.path.basename(outputPath)
-
-        tmpDir=os.path.join(outputPath+".tmpdir")
-        makeTmpDirCmd = getMkdirCmd() + [tmpDir]
-        dirTask=self.addTask(preJoin(taskPrefix,"makeTmpDir"), makeTmpDirCmd, dependencies=dependencies, isForceLocal=True)
-
-        tmpFiles = []
-        scatterTasks = set()
-
-        def getChromosomeGroups(params) :
-            """
-            Iterate through chromosomes/contigs and group small contigs together. This functions as a generator yielding
-            successive contig groups.
-            """
-            minSize=200000
-            group = []
-            headSize = 0
-
-            chromCount = len(params.chromSizes)
-            assert(len(params.chromOrder) == chromCount)
-            for chromIndex in range(chromCount) :
-                chromLabel = params.chromOrder[chromIndex]
-                chromSize = params.chromSizes[chromLabel]
-                if headSize+chromSize <= minSize :
-                    group.append((chromIndex,chromLabel))
-                    headSize += chromSize
-                else :
-                    if len(group) != 0 : yield(group)
-                    group = [(chromIndex,chromLabel)]
-                    headSize = chromSize
-            if len(group) != 0 : yield(group)
-
-        for chromGroup in getChromosomeGroups(self.params) :
-            assert(len(chromGroup) > 0)
-            cid = getRobustChromId(chromGroup[0][0], chromGroup[0][1])
-            if len(chromGroup) > 1 :
-                cid += "_to_"+getRobustChromId(chromGroup[-1][0], chromGroup[-1][1])
-            tmpFiles.append(os.path.join(tmpDir,outputFilename+"_"+cid))
-            cmd = [self.params.getChromDepthBin,"--align-file",bamFile,"--output",tmpFiles[-1]]
-            for (chromIndex,chromLabel) in chromGroup :
-                cmd.extend(["--chrom",chromLabel])
-            scatterTasks.add(self.addTask(preJoin(taskPrefix,"estimateChromDepth_"+cid),cmd,dependencies=dirTask))
-
-        catCmd = [self.params.catScript,"--output",outputPath]+tmpFiles
-        catTask = self.addTask(preJoin(taskPrefix,"catChromDepth"),catCmd,dependencies=scatterTasks, isForceLocal=True)
-
-        nextStepWait = set()
-        nextStepWait.add(catTask)
-
-        return nextStepWait
-
-    return _runDepthShared(self, taskPrefix, dependencies, bamList, outputPath, depthFunc)
+        if not isIndexChromDepthAvailable(bamFile) :
+            return _depthFromAlignmentsFunc(self,taskPrefix,dependencies,bamFile,outFile)
+
+        cmd = [sys.executable,"-E",self.params.getChromDepthFromIndex,"--align-file",bamFile,"--output",outFile]
+        for chromLabel in self.params.chromOrder :
+            cmd.extend(["--chrom",chromLabel])
+        return self.addTask(preJoin(taskPrefix,"estimateChromDepthFromIndex"),cmd,dependencies=dependencies,isForceLocal=True)
+
+    return _runDepthShared(self, taskPrefix, dependencies, bamList, outputPath, depthFunc, wrapDepthFunc)
@@ -0,0 +1,204 @@
+#
+# Manta - Structural Variant and Indel Caller
+# Copyright (c) 2013-2016 Illumina, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+
+"""
+single pass sweep-line filter for overlapping diploid calls which can't be resolved to two haplotypes
+"""
+
+from collections import deque
+
+from vcfUtil import VcfRecord
+
+
+ploidyFilterHeadline = "##FILTER=<ID=Ploidy,Description=\"For DEL & DUP variants, the genotypes of overlapping variants (with similar size) are inconsistent with diploid expectation\">\n"
+
+
+class PloidyRecord(VcfRecord) :
+    """
+    vcf record extended with the SV size, per-sample genotype ploidy and
+    the record's state in the ploidy filter window
+    """
+
+    __slots__ = ("svLen", "gtType", "isResolved")
+
+    def __init__(self, line) :
+        VcfRecord.__init__(self, line)
+
+        self.svLen = -1
+        val = self.getInfo("SVLEN")
+        if val is not None :
+            self.svLen = abs(int(val))
+
+        (fmt, samples) = self.getFormatAndSamples()
+        gtIx = fmt.split(':').index("GT")
+
+        self.gtType = []
+        for sample in samples :
+            gt = sample.split(':')[gtIx]
+            t = gt.split('/')
+            self.gtType.append(int(t[0]) + int(t[1]))
+
+        self.isResolved = False
+
+
+def isPloidyCandidate(record) :
+    """
+    only PASS DEL & DUP records are considered by the filter
+    """
+    if not record.isPass : return False
+    svType = record.svType
+    return ((svType == "DEL") or (svType == "DUP"))
+
+
+class PloidyFilter :
+    """
+    single pass sweep-line ploidy filter
+
+    The window holds all candidate records which have not yet been resolved,
+    in input order. A target record is resolved once every record starting
+    before its end has been read. At that point the target is grouped with all
+    later unresolved records in the window which start before the target's end
+    and have a similar size. The whole group is resolved, and marked as
+    filtered if the summed genotype ploidy of any sample exceeds two.
+
+    The window is not ordered by record end: a record resolved as part of an
+    earlier target's group can't start a group of its own, so resolving targets
+    in end order would group sites differently from the original two pass filter.
+    """
+
+    def __init__(self, vcfOut) :
+        self.vcfOut = vcfOut
+        self.window = deque()
+        self.pending = deque()
+        self.chrom = None
+        self.lastPos = None
+        self.filteredKeys = set()
+
+        self.recordCount = 0
+        self.filteredCount = 0
+
+    def _resolveTargets(self, nextPos) :
+        """
+        resolve all targets ending at or before nextPos, or all targets if nextPos is None
+        """
+        window = self.window
+        while window :
+            target = window[0]
+            if target.isResolved :
+                window.popleft()
+                continue
+
+            targetEnd = target.endPos
+            if (nextPos is not None) and (targetEnd > nextPos) : break
+            window.popleft()
+
+            targetLen = target.svLen
+            ploidySum = list(target.gtType)
+            overlaps = [target]
+
+            for record in window :
+                if record.pos >= targetEnd : break
+                if record.isResolved : continue
+
+                # collecting stacked sites with similar size
+                svLen = record.svLen
+                if (svLen < 2*targetLen) and (svLen > 0.5*targetLen) :
+                    for (sampleIndex, gtPloidy) in enumerate(record.gtType) :
+                        ploidySum[sampleIndex] += gtPloidy
+                    overlaps.append(record)
+
+            isAnomPloidy = False
+            for psum in ploidySum :
+                if psum > 2 :
+                    isAnomPloidy = True
+
+            for record in overlaps :
+                record.isResolved = True
+                if isAnomPloidy :
+                    self.filteredKeys.add((record.pos, record.endPos))
+
+    def _writePending(self, isFlush) :
+        """
+        write out all pending records which can no longer be filtered
+
+        A record's filter state is final once all candidate records starting at
+        or before it have been resolved.
+        """
+        frontier = None
+        if not isFlush :
+            frontier = self.lastPos
+            for record in self.window :
+                if not record.isResolved :
+                    frontier = min(frontier, record.pos)
+                    break
+
+        pending = self.pending
+        while pending :
+            (record, isCandidate) = pending[0]
+            if (frontier is not None) and (record.pos >= frontier) : break
+            pending.popleft()
+
+            line = record.line
+            if isCandidate and ((record.pos, record.endPos) in self.filteredKeys) :
+                # add the "Ploidy" filter
+                line = record.getLineWithFilter("Ploidy")
+            self.vcfOut.write(line)
+
+        if isFlush :
+            self.filteredCount += len(self.filteredKeys)
+            self.filteredKeys = set()
+
+    def addRecord(self, record) :
+        """
+        add the next VcfRecord from a sorted vcf record stream
+        """
+        self.recordCount += 1
+
+        if record.chrom != self.chrom :
+            self.finish()
+            self.chrom = record.chrom
+        else :
+            self._resolveTargets(record.pos)
+
+        isCandidate = isPloidyCandidate(record)
+        if isCandidate :
+            record = PloidyRecord(record.line)
+            self.window.append(record)
+
+        self.pending.append((record, isCandidate))
+        self.lastPos = record.pos
+        self._writePending(False)
+
+    def finish(self) :
+        self._resolveTargets(None)
+        self._writePending(True)
+
+
+def addPloidyFilterHeader(header) :
+    """
+    return a copy of the vcf header with the ploidy FILTER description added before the first FILTER line
+    """
+    newHeader = []
+    isHeaderAdded = False
+    for line in header :
+        if not(isHeaderAdded) and (line[:8] == "##FILTER"):
+            newHeader.append(ploidyFilterHeadline)
+            isHeaderAdded = True
+        newHeader.append(line)
+    return newHeader
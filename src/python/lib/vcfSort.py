@@ -0,0 +1,309 @@
+#
+# Manta - Structural Variant and Indel Caller
+# Copyright (c) 2013-2016 Illumina, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+
+"""
+merge, sort and duplicate removal for vcf record streams
+"""
+
+import os, sys
+
+from vcfUtil import VcfRecord, getContigName
+
+
+
+def processHeader(vcfFile, chromOrder, header) :
+    """
+    read only the header of a vcf file
+    """
+
+    for line in open(vcfFile) :
+        if line[0] != "#" : break
+        header.append(line)
+        contig = getContigName(line)
+        if contig is not None :
+            chromOrder.append(contig)
+
+
+
+def vcfFileRecords(vcfFile) :
+    """
+    iterate through all records of a vcf file, skipping the header
+    """
+
+    for line in open(vcfFile) :
+        if line[0] == "#" : continue
+        yield VcfRecord(line)
+
+
+
+def resolveRec(recEqualSet) :
+    """
+    determine which of a set of 'equal' vcf records is the best
+
+    right now best is a record with PASS in the filter field, and
+    secondarily having the highest quality
+    """
+
+    bestIndex=0
+    bestQual=0.
+    bestIsPass=False
+    bestIsAssembled=False
+    for (index,rec) in enumerate(recEqualSet) :
+        try:
+            qual = float(rec.qual)
+        except ValueError:
+            qual = 0.
+
+        assert qual >= 0.
+
+        isPass = rec.isPass
+        isAssembled = (rec.alt[0] != '<')
+
+        isNewPass=((not bestIsPass) and isPass)
+        isHighQual=((bestIsPass == isPass) and (qual > bestQual))
+        isNewAssembled=((not bestIsAssembled) and isAssembled)
+        if (isNewPass or isHighQual or isNewAssembled) :
+            bestIndex = index
+            bestQual = qual
+            bestIsPass = isPass
+            bestIsAssembled = isAssembled
+
+    return recEqualSet[bestIndex]
+
+
+
+def isEqualRec(rec1,rec2) :
+    if (rec1 is None) or (rec2 is None) : return False
+
+    if rec1[0] != rec2[0]: return False # chrom
+    if rec1[1] != rec2[1]: return False # pos
+    if rec1[2] != rec2[2]: return False # ref
+    if rec1[4] != rec2[4]: return False # endPos
+    if rec1[5] != rec2[5]: return False # invState
+
+    # special handling to find duplications when alt is the only difference:
+    if rec1[3] != rec2[3]:
+        if rec1[3] != "<INS>" and rec2[3] != "<INS>":
+            return False
+
+        def matchTest(rec) :
+            if rec[0] == "<" : return False
+            if len(rec) < 80 : return False
+            return True
+
+        if rec1[3] == "<INS>" :
+            return matchTest(rec2[3])
+        if rec2[3] == "<INS>" :
+            return matchTest(rec1[3])
+
+    return True
+
+
+
+def getInvState(vcfrec) :
+    inv3 = vcfrec.isInfoFlag("INV3")
+    inv5 = vcfrec.isInfoFlag("INV5")
+    assert(not (inv3 and inv5))
+    if inv3: return "INV3"
+    if inv5: return "INV5"
+    return None
+
+
+
+def uniqueRecords(sortedRecs) :
+    """
+    filter a sorted vcf record stream down to one record from each set of 'equal' records
+    """
+
+    recEqualSet = []
+    lastRec = None
+    for vcfrec in sortedRecs :
+        rec = (vcfrec.chrom, vcfrec.pos, vcfrec.ref, vcfrec.alt, vcfrec.endPos, getInvState(vcfrec))
+        if not isEqualRec(rec,lastRec) :
+            if recEqualSet : yield resolveRec(recEqualSet)
+            recEqualSet = []
+        recEqualSet.append(vcfrec)
+        lastRec = rec
+    if recEqualSet : yield resolveRec(recEqualSet)
+
+
+
+def mergeSortedRecords(sortedRecIters, vcfRecSortKey) :
+    """
+    k-way merge of sorted vcf record streams
+
+    Ties are broken by input order, so the output matches a stable sort of
+    all input records concatenated in the same order.
+    """
+
+    import heapq
+
+    heap = []
+    for (iterIndex,recIter) in enumerate(sortedRecIters) :
+        for rec in recIter :
+            heap.append((vcfRecSortKey(rec), iterIndex, rec, recIter))
+            break
+    heapq.heapify(heap)
+
+    while heap :
+        (key, iterIndex, rec, recIter) = heap[0]
+        yield rec
+        for nextRec in recIter :
+            heapq.heapreplace(heap, (vcfRecSortKey(nextRec), iterIndex, nextRec, recIter))
+            break
+        else :
+            heapq.heappop(heap)
+
+
+
+def checkedSortedRecords(vcfFile, recIter, vcfRecSortKey) :
+    """
+    pass through a vcf record stream, raising an exception if it is found to be unsorted
+    """
+
+    lastKey = None
+    for rec in recIter :
+        key = vcfRecSortKey(rec)
+        if (lastKey is not None) and (key < lastKey) :
+            raise Exception("Input vcf file is not sorted: '%s' record: '%s'" % (vcfFile, rec.line.strip()))
+        lastKey = key
+        yield rec
+
+
+
+class ExternalRecordSorter :
+    """
+    sort a vcf record stream of any size within an approximate memory budget
+
+    Records are buffered until the budget is reached, at which point the buffer
+    is sorted and spilled to a compressed run file in tmpDir. The sorted output
+    is produced by merging all runs with the records remaining in the buffer.
+    """
+
+    # approximate per-record memory use in addition to the vcf line itself:
+    recordOverheadBytes = 512
+
+    # merge all existing runs into one once this many have been spilled:
+    maxRunCount = 64
+
+    def __init__(self, vcfRecSortKey, tmpDir, maxMemMb) :
+        self.vcfRecSortKey = vcfRecSortKey
+        self.tmpDir = tmpDir
+        self.maxBufferBytes = maxMemMb*1024*1024
+
+        self.buffer = []
+        self.bufferBytes = 0
+        self.runFiles = []
+
+        self.spillCount = 0
+        self.spillRecordCount = 0
+        self.spillBytes = 0
+
+    def add(self, rec) :
+        self.buffer.append(rec)
+        self.bufferBytes += len(rec.line) + self.recordOverheadBytes
+        if self.bufferBytes >= self.maxBufferBytes :
+            self._spill()
+
+    def _writeRun(self, recIter) :
+        import gzip
+        import tempfile
+
+        (tmpfd, runFile) = tempfile.mkstemp(dir=self.tmpDir, prefix="sortVcf.run.", suffix=".gz")
+        os.close(tmpfd)
+        runfp = gzip.open(runFile, "wb", 1)
+        for rec in recIter :
+            runfp.write(rec.line)
+            self.spillRecordCount += 1
+        runfp.close()
+
+        self.spillCount += 1
+        self.spillBytes += os.path.getsize(runFile)
+        return runFile
+
+    def _runRecords(self, runFile) :
+        import gzip
+
+        for line in gzip.open(runFile, "rb") :
+            yield VcfRecord(line)
+
+    def _spill(self) :
+        if len(self.buffer) == 0 : return
+        self.buffer.sort(key = self.vcfRecSortKey)
+        self.runFiles.append(self._writeRun(self.buffer))
+        self.buffer = []
+        self.bufferBytes = 0
+
+        if len(self.runFiles) >= self.maxRunCount :
+            runIters = [self._runRecords(runFile) for runFile in self.runFiles]
+            compactRun = self._writeRun(mergeSortedRecords(runIters, self.vcfRecSortKey))
+            for runFile in self.runFiles :
+                os.remove(runFile)
+            self.runFiles = [compactRun]
+
+    def sortedRecords(self) :
+        """
+        iterate through all added records in sorted order
+        """
+        self.buffer.sort(key = self.vcfRecSortKey)
+        if len(self.runFiles) == 0 : return iter(self.buffer)
+
+        sortedRecIters = [self._runRecords(runFile) for runFile in self.runFiles]
+        sortedRecIters.append(iter(self.buffer))
+        return mergeSortedRecords(sortedRecIters, self.vcfRecSortKey)
+
+    def getReport(self) :
+        return "Spilled %i sorted runs to disk, holding %i records in %i bytes\n" % \
+            (self.spillCount, self.spillRecordCount, self.spillBytes)
+
+
+
+def sortedVcfFileRecords(vcfFiles, vcfRecSortKey, isPresorted=False, tmpDir=None, maxMemMb=1024, reportfp=sys.stderr) :
+    """
+    iterate through all records of the input vcf files in sorted order
+
+    Presorted input is merged directly. Otherwise all records are passed through
+    an external sort which keeps sorted runs in a private directory under tmpDir,
+    which is removed once iteration completes.
+    """
+
+    import shutil
+    import tempfile
+
+    if isPresorted :
+        sortedRecIters = []
+        for vcfFile in vcfFiles :
+            sortedRecIters.append(checkedSortedRecords(vcfFile, vcfFileRecords(vcfFile), vcfRecSortKey))
+        for rec in mergeSortedRecords(sortedRecIters, vcfRecSortKey) :
+            yield rec
+        return
+
+    sortTmpDir = tempfile.mkdtemp(dir=tmpDir, prefix="sortVcf.", suffix=".tmpdir")
+    try :
+        sorter = ExternalRecordSorter(vcfRecSortKey, sortTmpDir, maxMemMb)
+        for vcfFile in vcfFiles :
+            for rec in vcfFileRecords(vcfFile) :
+                sorter.add(rec)
+        recIter = sorter.sortedRecords()
+        reportfp.write(sorter.getReport())
+
+        for rec in recIter :
+            yield rec
+    finally :
+        shutil.rmtree(sortTmpDir, ignore_errors=True)
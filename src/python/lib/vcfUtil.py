@@ -0,0 +1,356 @@
+#
+# Manta - Structural Variant and Indel Caller
+# Copyright (c) 2013-2016 Illumina, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+
+"""
+vcf record parsing shared by the vcf post-processing scripts
+"""
+
+import re
+
+
+
+class VCFID :
+    CHROM = 0
+    POS = 1
+    ID = 2
+    REF = 3
+    ALT = 4
+    QUAL = 5
+    FILTER = 6
+    INFO = 7
+    FORMAT = 8
+    SAMPLE = 9
+
+
+
+class Constants :
+
+    contigpat = re.compile("^##contig=<ID=([^,>]*)[,>]")
+
+    # compiled INFO key/value and flag patterns, indexed on key:
+    keyValPatterns = {}
+    flagPatterns = {}
+
+
+
+def getKeyValPattern(key) :
+    pattern = Constants.keyValPatterns.get(key)
+    if pattern is None :
+        pattern = re.compile("(?:^|;)%s=([^;\t]*)" % (re.escape(key)))
+        Constants.keyValPatterns[key] = pattern
+    return pattern
+
+
+
+def getFlagPattern(key) :
+    pattern = Constants.flagPatterns.get(key)
+    if pattern is None :
+        pattern = re.compile("(?:^|;)%s(?:;|$)" % (re.escape(key)))
+        Constants.flagPatterns[key] = pattern
+    return pattern
+
+
+
+def getKeyVal(infoString,key) :
+    """
+    return the value of key in a vcf INFO string, or None if key is not found
+    """
+    match = getKeyValPattern(key).search(infoString)
+    if match is None : return None
+    return match.group(1)
+
+
+
+def isInfoFlag(infoString,key) :
+    return (getFlagPattern(key).search(infoString) is not None)
+
+
+
+def parseInfo(infoString) :
+    """
+    parse a vcf INFO string into a dictionary, flags are given the value True
+    """
+    info = {}
+    if infoString == "." : return info
+    for word in infoString.split(";") :
+        (key,sep,val) = word.partition("=")
+        if sep :
+            info[key] = val
+        else :
+            info[key] = True
+    return info
+
+
+
+def getContigName(headerLine) :
+    """
+    return the contig ID from a vcf header line, or None for any other header line
+    """
+    match = Constants.contigpat.match(headerLine)
+    if match is None : return None
+    return match.group(1)
+
+
+
+class VcfRecord(object) :
+    """
+    lightweight vcf record
+
+    Only the raw line, the offsets of the fixed field separators and the record
+    position are stored, all other fields are extracted from the line on demand.
+    The variant end position is cached after it is first computed.
+
+    Individual INFO keys are found with cached compiled patterns, and the full
+    INFO field is only parsed into a dictionary when it is requested, after
+    which all INFO lookups use the dictionary.
+    """
+
+    __slots__ = ("line", "chrom", "pos", "_tabs", "_info", "_endPos")
+
+    def __init__(self, line) :
+        self.line = line
+
+        tabs = []
+        index = -1
+        for _ in range(VCFID.FORMAT) :
+            index = line.find("\t", index+1)
+            if index == -1 : break
+            tabs.append(index)
+        if len(tabs) < VCFID.INFO :
+            raise Exception("Unexpected vcf record format: '%s'" % (line.strip()))
+
+        self.chrom = line[:tabs[0]]
+        self.pos = int(line[tabs[0]+1:tabs[1]])
+        self._tabs = tabs
+        self._info = None
+        self._endPos = None
+
+    def getField(self, fieldIndex) :
+        """
+        return any fixed field up to and including INFO
+        """
+        tabs = self._tabs
+        if fieldIndex == 0 :
+            start = 0
+        else :
+            start = tabs[fieldIndex-1]+1
+        if fieldIndex < len(tabs) :
+            return self.line[start:tabs[fieldIndex]]
+        return self.line[start:].rstrip("\r\n")
+
+    @property
+    def id(self) :
+        tabs = self._tabs
+        return self.line[tabs[VCFID.ID-1]+1:tabs[VCFID.ID]]
+
+    @property
+    def ref(self) :
+        tabs = self._tabs
+        return self.line[tabs[VCFID.REF-1]+1:tabs[VCFID.REF]]
+
+    @property
+    def alt(self) :
+        tabs = self._tabs
+        return self.line[tabs[VCFID.ALT-1]+1:tabs[VCFID.ALT]]
+
+    @property
+    def qual(self) :
+        tabs = self._tabs
+        return self.line[tabs[VCFID.QUAL-1]+1:tabs[VCFID.QUAL]]
+
+    @property
+    def filter(self) :
+        tabs = self._tabs
+        return self.line[tabs[VCFID.FILTER-1]+1:tabs[VCFID.FILTER]]
+
+    @property
+    def infoString(self) :
+        return self.getField(VCFID.INFO)
+
+    @property
+    def isPass(self) :
+        return (self.filter == "PASS")
+
+    def getInfoDict(self) :
+        """
+        return the INFO field parsed into a dictionary, flags are given the value True
+        """
+        if self._info is None :
+            self._info = parseInfo(self.infoString)
+        return self._info
+
+    def getInfo(self, key) :
+        """
+        return the value of INFO key, True for a flag, or None if key is not present
+        """
+        if self._info is not None :
+            return self._info.get(key)
+        infoString = self.infoString
+        match = getKeyValPattern(key).search(infoString)
+        if match is not None : return match.group(1)
+        if getFlagPattern(key).search(infoString) is not None : return True
+        return None
+
+    def isInfoFlag(self, key) :
+        if self._info is not None :
+            return (self._info.get(key) is True)
+        return (getFlagPattern(key).search(self.infoString) is not None)
+
+    @property
+    def endPos(self) :
+        if self._endPos is None :
+            if self._info is not None :
+                val = self._info.get("END")
+            else :
+                val = getKeyVal(self.infoString,"END")
+            if val is not None :
+                self._endPos = int(val)
+            else :
+                self._endPos = self.pos+len(self.ref)-1
+        return self._endPos
+
+    @property
+    def svType(self) :
+        return self.getInfo("SVTYPE")
+
+    def getFixedFieldString(self) :
+        """
+        return the tab-delimited fixed fields from CHROM through INFO
+        """
+        tabs = self._tabs
+        if len(tabs) > VCFID.INFO :
+            return self.line[:tabs[VCFID.INFO]]
+        return self.line.rstrip("\r\n")
+
+    def getFormatAndSamples(self) :
+        """
+        return (FORMAT,[SAMPLE1,SAMPLE2...]), or (None,[]) if the record has no sample columns
+        """
+        tabs = self._tabs
+        if len(tabs) <= VCFID.INFO : return (None,[])
+        w = self.line[tabs[VCFID.INFO]+1:].rstrip("\r\n").split("\t")
+        return (w[0],w[1:])
+
+    def getLineWithFilter(self, filterString) :
+        """
+        return a copy of the vcf line with the FILTER field replaced
+        """
+        tabs = self._tabs
+        return self.line[:tabs[VCFID.FILTER-1]+1] + filterString + self.line[tabs[VCFID.FILTER]:]
+
+
+
+def isSmallIndelCandidate(rec, maxSize) :
+    """
+    test if a candidate VcfRecord is a simple insert/delete combination with both
+    alleles no longer than maxSize+1, such that it can be fed into a small variant caller
+    """
+
+    alt = rec.alt
+
+    # remove symbolic alleles:
+    if alt.find("<") != -1 : return False
+
+    # remove translocations
+    if alt.find("[") != -1 : return False
+    if alt.find("]") != -1 : return False
+    if alt.find(":") != -1 : return False
+
+    # we're assume there are no multiple alts in the candidate records
+    assert( alt.find(",") == -1 )
+
+    if len(rec.ref) > (maxSize+1) : return False
+    if len(alt) > (maxSize+1) : return False
+
+    return True
+
+
+
+def replaceCmdlineHeader(header, cmdline) :
+    """
+    return a copy of the vcf header lines with the cmdline field replaced, or added
+    after the meta-information lines if not present
+    """
+
+    prefix = "##cmdline="
+    cmdlineLine = prefix + cmdline + "\n"
+
+    newHeader = []
+    isNewCLWritten = False
+    for line in header :
+        if line.startswith("##") :
+            if line.startswith(prefix) :
+                newHeader.append(cmdlineLine)
+                isNewCLWritten = True
+                continue
+        elif not isNewCLWritten :
+            newHeader.append(cmdlineLine)
+            isNewCLWritten = True
+        newHeader.append(line)
+    return newHeader
+
+
+
+def getChromIndexMap(chromOrder) :
+    """
+    return a dictionary of chromosome names to their index in chromOrder
+    """
+    return dict((chrom,index) for (index,chrom) in enumerate(chromOrder))
+
+
+
+def getVcfRecSortKey(chromOrder) :
+    """
+    return the key function used to sort vcf records for final output
+    """
+
+    chromIndex = getChromIndexMap(chromOrder)
+    chromCount = len(chromOrder)
+
+    def vcfRecSortKey(x) :
+        """
+        sort vcf records for final output
+
+        Fancy chromosome sort rules:
+        if contig records are found in the vcf header, then sort chroms in that order
+        for any chrom names not found in the header, sort them in lex order after the
+        found chrom names
+        """
+
+        headerOrder = chromIndex.get(x.chrom, chromCount)
+
+        return (headerOrder, x.chrom, x.pos, x.endPos)
+
+    return vcfRecSortKey
+
+
+
+def processVcfStream(vcfFp, chromOrder, header, recList, recordType=VcfRecord) :
+    """
+    read in a vcf stream
+    """
+
+    for line in vcfFp :
+        if line[0] == "#" :
+            header.append(line)
+            contig = getContigName(line)
+            if contig is not None :
+                chromOrder.append(contig)
+        else :
+            recList.append(recordType(line))
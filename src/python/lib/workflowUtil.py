@@ -25,6 +25,7 @@ __author__ = "Chris Saunders"
 
 
 
+import math
 import os
 import re
 
@@ -220,6 +221,67 @@ def getChromIntervals(chromOrder,chromSizes,segmentSize, genomeRegion = None) :
             start=end+1
 
 
+
+def getChromWeightedIntervals(chromOrder,chromSizes,readDensity,segmentWeight, genomeRegion = None) :
+    """
+    generate chromosome intervals with approximately equal read density weight
+
+    readDensity - a ReadDensity object providing the weight of each chromosome window
+    segmentWeight - maximum weight of each interval, unless a single density window exceeds this weight
+
+    Each chromosome is divided into the minimum number of intervals with weight no greater than
+    segmentWeight, where intervals are cut at density window boundaries to balance their weights.
+
+    return values follow getChromIntervals
+    """
+
+    windowSize=readDensity.windowSize
+
+    for (chromIndex, chromLabel) in enumerate(chromOrder) :
+        chromStart=1
+        chromEnd=chromSizes[chromLabel]
+
+        # adjust for the custom genome subsegment case:
+        if genomeRegion is not None :
+            if genomeRegion["chrom"] is not None :
+                if genomeRegion["chrom"] != chromLabel : continue
+                if genomeRegion["start"] is not None :
+                    chromStart=genomeRegion["start"]
+                if genomeRegion["end"] is not None :
+                    chromEnd=genomeRegion["end"]
+
+        # 1-indexed closed ranges of all density windows overlapping the chromosome region:
+        windows=[]
+        pos=chromStart
+        while pos <= chromEnd :
+            windowEnd=min((((pos-1)/windowSize)+1)*windowSize,chromEnd)
+            windows.append((pos,windowEnd,readDensity.getWeight(chromLabel,pos,windowEnd)))
+            pos=windowEnd+1
+
+        chromWeight=sum([w[2] for w in windows], 0.)
+        chromSegments=1
+        if segmentWeight > 0. :
+            chromSegments=max(1,int(math.ceil(chromWeight/segmentWeight)))
+
+        def isCutPassed(cutIndex) :
+            return ((cutIndex < chromSegments) and (headWeight >= (chromWeight*cutIndex)/chromSegments))
+
+        start=chromStart
+        headWeight=0.
+        segmentIndex=0
+        cutIndex=1
+        for (windowStart,windowEnd,weight) in windows :
+            headWeight += weight
+            isLastWindow = (windowEnd == chromEnd)
+            if isLastWindow or isCutPassed(cutIndex) :
+                yield (chromIndex,chromLabel,start,windowEnd,segmentIndex,genomeRegion)
+                segmentIndex += 1
+                start=windowEnd+1
+
+                # a single high density window can pass several cuts:
+                while isCutPassed(cutIndex) : cutIndex += 1
+
+
 class PathDigger(object) :
     """
     Digs into a well-defined directory structure with prefixed
@@ -314,46 +376,88 @@ class GenomeSegment(object) :
         return (self.endPos-self.beginPos)+1
 
 
-def getNextGenomeSegment(params) :
+def getReadDensitySegmentWeight(params, readDensity) :
+    """
+    get the read density weight of each genome segment, such that the genome is divided into about as many
+    segments as there would be segments of scanSizeMb
+    """
+    MEGABASE = 1000000
+    scanSize = params.scanSizeMb * MEGABASE
+
+    genomeSize = sum([params.chromSizes[chrom] for chrom in params.chromOrder])
+    return (readDensity.getTotalWeight(params.chromOrder) * scanSize) / genomeSize
+
+
+
+def getNextGenomeSegment(params, readDensity = None) :
     """
     generator which iterates through all genomic segments and
     returns a segmentValues object for each one.
+
+    if readDensity is provided, segments are chosen to have similar read density weights
+    instead of similar sizes
     """
     MEGABASE = 1000000
     scanSize = params.scanSizeMb * MEGABASE
 
+    if readDensity is not None :
+        segmentWeight = getReadDensitySegmentWeight(params, readDensity)
+
+    def getIntervals(genomeRegion = None) :
+        if readDensity is None :
+            return getChromIntervals(params.chromOrder,params.chromSizes, scanSize, genomeRegion)
+        else :
+            return getChromWeightedIntervals(params.chromOrder,params.chromSizes, readDensity, segmentWeight, genomeRegion)
+
     if params.genomeRegionList is None :
-        for segval in getChromIntervals(params.chromOrder,params.chromSizes, scanSize) :
+        for segval in getIntervals() :
             yield GenomeSegment(*segval)
     else :
         for genomeRegion in params.genomeRegionList :
-            for segval in getChromIntervals(params.chromOrder,params.chromSizes, scanSize, genomeRegion) :
+            for segval in getIntervals(genomeRegion) :
                 yield GenomeSegment(*segval)
 
 
 
-def getGenomeSegmentGroups(params, excludedContigs = None) :
+def getGenomeSegmentGroups(params, excludedContigs = None, readDensity = None) :
     """
     Iterate segment groups and 'clump' small contigs together
+
+    if readDensity is provided and has any weight, segments are chosen to have similar
+    read density weights, and consecutive segments are clumped together as long as their
+    total weight is no more than a single segment's weight, so that contigs with few
+    reads don't each require a separate group
     """
 
     def isGroupEligible(gseg) :
         if excludedContigs is None : return True
         return (gseg.chromLabel not in excludedContigs)
 
-    minSegmentGroupSize=200000
+    if (readDensity is not None) and (readDensity.getTotalWeight(params.chromOrder) <= 0.) :
+        readDensity = None
+
+    if readDensity is None :
+        minSegmentGroupSize=200000
+        def getSegmentSize(gseg) :
+            return gseg.size()
+    else :
+        minSegmentGroupSize=getReadDensitySegmentWeight(params, readDensity)
+        def getSegmentSize(gseg) :
+            return readDensity.getWeight(gseg.chromLabel, gseg.beginPos, gseg.endPos)
+
     group = []
     headSize = 0
     isLastSegmentGroupEligible = True
-    for gseg in getNextGenomeSegment(params) :
+    for gseg in getNextGenomeSegment(params, readDensity) :
         isSegmentGroupEligible = isGroupEligible(gseg)
-        if (isSegmentGroupEligible and isLastSegmentGroupEligible) and (headSize+gseg.size() <= minSegmentGroupSize) :
+        segmentSize = getSegmentSize(gseg)
+        if (isSegmentGroupEligible and isLastSegmentGroupEligible) and (headSize+segmentSize <= minSegmentGroupSize) :
             group.append(gseg)
-            headSize += gseg.size()
+            headSize += segmentSize
         else :
             if len(group) != 0 : yield(group)
             group = [gseg]
-            headSize = gseg.size()
+            headSize = segmentSize
         isLastSegmentGroupEligible = isSegmentGroupEligible
     if len(group) != 0 : yield(group)
 
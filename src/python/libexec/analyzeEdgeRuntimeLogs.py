@@ -0,0 +1,387 @@
+#!/usr/bin/env python
+#
+# Manta - Structural Variant and Indel Caller
+# Copyright (c) 2013-2016 Illumina, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+
+"""
+analyze manta edge runtime logs
+
+The per-bin edge runtime logs written by GenerateSVCandidates are streamed
+to produce:
+
+1. the slowest edges, in the sorted edge runtime log format
+2. a summary of the run's runtime hot spots, as TSV and JSON, including
+per-phase time totals and percentiles, a histogram of total time by locus,
+the slowest loci and genomic windows, and the total time of each bin
+
+Each log line holds the edge (locus:node1:node2), the total edge time, the
+candidate, complex candidate, assembled candidate and assembled complex
+candidate counts, the candidate, assembly, remote read and scoring times,
+and optionally the regions of both edge nodes, the edge observation
+count and the decompressed BAM bytes read for the edge. Remote read
+retrieval is part of assembly.
+"""
+
+import os, sys
+import heapq
+from array import array
+
+scriptDir=os.path.abspath(os.path.dirname(__file__))
+pythonLibDir=os.path.abspath(os.path.join(scriptDir,"@THIS_RELATIVE_PYTHON_LIBDIR@"))
+sys.path.append(pythonLibDir)
+
+from workflowUtil import ensureDir
+
+
+phaseNames = ("total", "candidate", "assembly", "remoteRead", "scoring", "other")
+countNames = ("candidates", "complexCandidates", "assembledCandidates", "assembledComplexCandidates")
+percentiles = (50, 90, 99)
+
+
+
+def listInputLogs(logListFile,args) :
+    for arg in args :
+        yield arg
+    if logListFile is None : return
+    for logFile in open(logListFile) :
+        yield logFile.strip()
+
+
+
+def getOptions() :
+
+    from optparse import OptionParser
+
+    usage = "usage: %prog [options] -o output_log [input_log [input_log...]]"
+    parser = OptionParser(usage=usage)
+
+    parser.add_option("-o", dest="outFile",
+                      help="sorted output filename for the slowest edges (required)")
+    parser.add_option("-f", dest="logListFile",
+                      help="File listing input log files, one file per line. These will be used in addition to any provided directly on the command-line")
+    parser.add_option("--tsv", dest="tsvFile",
+                      help="Write the runtime summary as tab-separated text to this file")
+    parser.add_option("--json", dest="jsonFile",
+                      help="Write the runtime summary as JSON to this file")
+    parser.add_option("--maxEdges", dest="maxEdges", type="int", default=10000,
+                      help="Number of slowest edges written to the sorted output (default: %default)")
+    parser.add_option("--maxReportRows", dest="maxReportRows", type="int", default=20,
+                      help="Number of slowest edges, loci and windows listed in the summary (default: %default)")
+    parser.add_option("--windowSize", dest="windowSize", type="int", default=1000000,
+                      help="Genomic window size used to find the slowest regions (default: %default)")
+
+    (options,args) = parser.parse_args()
+
+    if len(args) == 0 and not options.logListFile:
+        parser.print_help()
+        sys.exit(2)
+
+    if options.outFile is None :
+        parser.print_help()
+        sys.exit(2)
+
+    # validate input:
+    for outFile in (options.outFile, options.tsvFile, options.jsonFile) :
+        if outFile is None : continue
+        ensureDir(os.path.dirname(os.path.abspath(outFile)))
+
+    if options.logListFile is not None :
+        if not os.path.exists(options.logListFile) :
+            raise Exception("Can't find log list file: " + options.logListFile)
+
+    for logFile in listInputLogs(options.logListFile,args) :
+        if not os.path.isfile(logFile) :
+            raise Exception("Can't find input log file: " +logFile)
+
+    for (optName, optVal) in (("maxEdges", options.maxEdges), ("maxReportRows", options.maxReportRows), ("windowSize", options.windowSize)) :
+        if optVal < 1 :
+            raise Exception("Invalid %s value: %i" % (optName, optVal))
+
+    return (options,args)
+
+
+
+def parseRegion(region) :
+    """
+    parse a 1-indexed 'chrom:begin-end' region string, return (chrom,begin,end)
+    """
+    (chrom, posRange) = region.rsplit(":", 1)
+    (begin, end) = posRange.split("-")
+    return (chrom, int(begin), int(end))
+
+
+
+def getEdgePhaseTimes(word) :
+    """
+    return the edge time of each phase in phaseNames from the fields of an edge runtime log line
+    """
+    total = float(word[1])
+    (candTime, assmTime, remoteTime, scoreTime) = [float(w) for w in word[6:10]]
+    otherTime = max(0., total - (candTime + assmTime + scoreTime))
+    return (total, candTime, assmTime, remoteTime, scoreTime, otherTime)
+
+
+
+class TopItems :
+    """
+    keep the maxCount largest items added, using a bounded heap
+    """
+
+    def __init__(self, maxCount) :
+        self.maxCount = maxCount
+        self.heap = []
+
+    def add(self, item) :
+        if len(self.heap) < self.maxCount :
+            heapq.heappush(self.heap, item)
+        elif item > self.heap[0] :
+            heapq.heapreplace(self.heap, item)
+
+    def getSorted(self) :
+        """
+        return items from largest to smallest
+        """
+        return sorted(self.heap, reverse=True)
+
+
+
+def getPercentile(sortedVals, percentile) :
+    """
+    nearest-rank percentile of a sorted sequence
+    """
+    if len(sortedVals) == 0 : return 0.
+    rank = (percentile * len(sortedVals) + 99) / 100
+    return sortedVals[max(rank,1)-1]
+
+
+
+class EdgeRuntimeSummary :
+    """
+    accumulate runtime summary statistics from edge runtime log lines
+    """
+
+    def __init__(self, maxEdges, maxReportRows, windowSize) :
+        self.maxReportRows = maxReportRows
+        self.windowSize = windowSize
+
+        self.topEdges = TopItems(maxEdges)
+        self.edgeCount = 0
+        self.phaseTimes = dict([(phase, array("d")) for phase in phaseNames])
+        self.counts = dict([(countName, 0) for countName in countNames])
+
+        # total time and edge count per locus and per genomic window:
+        self.locusTimes = {}
+        self.windowTimes = {}
+        self.unlocatedEdgeCount = 0
+
+        self.bins = []
+
+    def addLog(self, logFile) :
+        binInfo = { "log" : os.path.basename(logFile), "edges" : 0, "decompressedBytes" : 0 }
+        binInfo.update([(phase, 0.) for phase in phaseNames])
+
+        for line in open(logFile) :
+            word = line.strip().split("\t")
+            if len(word) < 10 :
+                raise Exception("Unexpected edge runtime log line format in file '%s': '%s'" % (logFile, line.strip()))
+
+            edgePhaseTimes = getEdgePhaseTimes(word)
+            total = edgePhaseTimes[0]
+            self.topEdges.add((total, line))
+            self.edgeCount += 1
+
+            for (phase, phaseTime) in zip(phaseNames, edgePhaseTimes) :
+                self.phaseTimes[phase].append(phaseTime)
+                binInfo[phase] += phaseTime
+            binInfo["edges"] += 1
+
+            for (countName, count) in zip(countNames, word[2:6]) :
+                self.counts[countName] += int(count)
+
+            if len(word) >= 14 :
+                binInfo["decompressedBytes"] += int(word[13])
+
+            locusIndex = int(word[0].split(":")[0])
+            locusInfo = self.locusTimes.setdefault(locusIndex, [0., 0])
+            locusInfo[0] += total
+            locusInfo[1] += 1
+
+            if len(word) >= 12 :
+                self._addWindowTime(word[10:12], total)
+            else :
+                self.unlocatedEdgeCount += 1
+
+        self.bins.append(binInfo)
+
+    def _addWindowTime(self, regions, total) :
+        """
+        split edge time evenly between the genomic windows containing the start of each edge node
+        """
+        windows = set()
+        for region in regions :
+            (chrom, begin, end) = parseRegion(region)
+            windows.add((chrom, (begin-1) / self.windowSize))
+
+        for window in windows :
+            windowInfo = self.windowTimes.setdefault(window, [0., 0])
+            windowInfo[0] += total / len(windows)
+            windowInfo[1] += 1
+
+    def getPhaseSummary(self) :
+        totalTime = sum(self.phaseTimes["total"])
+        phaseSummary = []
+        for phase in phaseNames :
+            vals = sorted(self.phaseTimes[phase])
+            phaseTime = sum(vals, 0.)
+            phaseInfo = { "phase" : phase, "seconds" : phaseTime }
+            phaseInfo["fraction"] = (phaseTime / totalTime) if totalTime > 0. else 0.
+            for percentile in percentiles :
+                phaseInfo["p%i" % (percentile)] = getPercentile(vals, percentile)
+            phaseInfo["max"] = vals[-1] if len(vals) else 0.
+            phaseSummary.append(phaseInfo)
+        return phaseSummary
+
+    def getLocusHistogram(self) :
+        """
+        histogram of total locus time in power of two second intervals
+        """
+        histo = {}
+        for (locusTime, locusEdgeCount) in self.locusTimes.values() :
+            binIndex = 0
+            while (1 << (binIndex+1)) <= locusTime : binIndex += 1
+            binInfo = histo.setdefault(binIndex, [0, 0.])
+            binInfo[0] += 1
+            binInfo[1] += locusTime
+
+        locusHisto = []
+        for binIndex in sorted(histo.keys()) :
+            (locusCount, locusTime) = histo[binIndex]
+            minTime = (1 << binIndex) if binIndex > 0 else 0
+            locusHisto.append({ "minSeconds" : minTime, "maxSeconds" : (1 << (binIndex+1)),
+                                "loci" : locusCount, "seconds" : locusTime })
+        return locusHisto
+
+    def getTopLoci(self) :
+        topLoci = TopItems(self.maxReportRows)
+        for (locusIndex, (locusTime, locusEdgeCount)) in self.locusTimes.items() :
+            topLoci.add((locusTime, locusEdgeCount, locusIndex))
+        return [{ "locus" : locusIndex, "edges" : locusEdgeCount, "seconds" : locusTime }
+                for (locusTime, locusEdgeCount, locusIndex) in topLoci.getSorted()]
+
+    def getTopWindows(self) :
+        topWindows = TopItems(self.maxReportRows)
+        for ((chrom, windowIndex), (windowTime, windowEdgeCount)) in self.windowTimes.items() :
+            topWindows.add((windowTime, windowEdgeCount, chrom, windowIndex))
+        return [{ "chrom" : chrom, "begin" : (windowIndex * self.windowSize) + 1,
+                  "end" : (windowIndex + 1) * self.windowSize, "edges" : windowEdgeCount, "seconds" : windowTime }
+                for (windowTime, windowEdgeCount, chrom, windowIndex) in topWindows.getSorted()]
+
+    def getTopEdges(self) :
+        topEdges = []
+        for (total, line) in self.topEdges.getSorted()[:self.maxReportRows] :
+            word = line.strip().split("\t")
+            edgeInfo = { "edge" : word[0] }
+            edgeInfo.update(zip(phaseNames, getEdgePhaseTimes(word)))
+            edgeInfo.update(zip(countNames, [int(w) for w in word[2:6]]))
+            if len(word) >= 12 :
+                edgeInfo["node1Region"] = word[10]
+                edgeInfo["node2Region"] = word[11]
+            if len(word) >= 14 :
+                edgeInfo["decompressedBytes"] = int(word[13])
+            topEdges.append(edgeInfo)
+        return topEdges
+
+    def getSummary(self) :
+        return {
+            "edges" : self.edgeCount,
+            "edgesWithoutRegions" : self.unlocatedEdgeCount,
+            "candidateCounts" : self.counts,
+            "phases" : self.getPhaseSummary(),
+            "locusHistogram" : self.getLocusHistogram(),
+            "slowestLoci" : self.getTopLoci(),
+            "slowestWindows" : self.getTopWindows(),
+            "windowSize" : self.windowSize,
+            "slowestEdges" : self.getTopEdges(),
+            "bins" : self.bins }
+
+
+
+def writeTsvSummary(summary, tsvFile) :
+
+    ofp = open(tsvFile, "w")
+
+    def writeTable(title, columns, rows) :
+        ofp.write("# %s\n" % (title))
+        ofp.write("\t".join(columns) + "\n")
+        for row in rows :
+            vals = []
+            for column in columns :
+                val = row.get(column, "")
+                if isinstance(val, float) :
+                    val = "%.3f" % (val)
+                vals.append(str(val))
+            ofp.write("\t".join(vals) + "\n")
+        ofp.write("\n")
+
+    writeTable("Logged edges", ["edges", "edgesWithoutRegions"] + list(countNames),
+               [dict(summary["candidateCounts"], edges=summary["edges"], edgesWithoutRegions=summary["edgesWithoutRegions"])])
+    writeTable("Edge time by phase (seconds), remoteRead time is part of assembly time",
+               ["phase", "seconds", "fraction"] + ["p%i" % (percentile) for percentile in percentiles] + ["max"],
+               summary["phases"])
+    writeTable("Loci by total locus time (seconds)", ["minSeconds", "maxSeconds", "loci", "seconds"], summary["locusHistogram"])
+    writeTable("Slowest loci", ["locus", "edges", "seconds"], summary["slowestLoci"])
+    writeTable("Slowest %i base genomic windows, edge time is split between the windows of each edge node" % (summary["windowSize"]),
+               ["chrom", "begin", "end", "edges", "seconds"], summary["slowestWindows"])
+    writeTable("Slowest edges", ["edge"] + list(phaseNames) + list(countNames) + ["node1Region", "node2Region", "decompressedBytes"],
+               summary["slowestEdges"])
+    writeTable("Time by bin (seconds)", ["log", "edges"] + list(phaseNames) + ["decompressedBytes"], summary["bins"])
+
+    ofp.close()
+
+
+
+def main() :
+
+    import json
+
+    (options,args) = getOptions()
+
+    runtimeSummary = EdgeRuntimeSummary(options.maxEdges, options.maxReportRows, options.windowSize)
+    for logFile in listInputLogs(options.logListFile,args) :
+        runtimeSummary.addLog(logFile)
+
+    ofp = open(options.outFile,"w")
+    for (total,line) in runtimeSummary.topEdges.getSorted() :
+        ofp.write(line)
+    ofp.close()
+
+    if (options.tsvFile is None) and (options.jsonFile is None) : return
+
+    summary = runtimeSummary.getSummary()
+
+    if options.tsvFile is not None :
+        writeTsvSummary(summary, options.tsvFile)
+
+    if options.jsonFile is not None :
+        jsonfp = open(options.jsonFile, "w")
+        json.dump(summary, jsonfp, indent=2, sort_keys=True)
+        jsonfp.write("\n")
+        jsonfp.close()
+
+
+main()
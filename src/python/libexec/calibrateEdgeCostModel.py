@@ -0,0 +1,264 @@
+#!/usr/bin/env python
+#
+# Manta - Structural Variant and Indel Caller
+# Copyright (c) 2013-2016 Illumina, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+
+"""
+fit the coefficients of the SV candidate generation edge cost model to edge runtime logs
+
+The edge cost model estimates the time taken to process each SV locus graph
+edge as a linear function of edge features, and can be used to balance
+candidate generation bins (see configManta.py --candidateCostModel).
+Features are computed from each log line as they are by EdgeCostModel in
+GenerateSVCandidates:
+
+intercept        : 1
+observationCount : total edge observation count in both directions
+regionSize       : total size of the edge node regions (counted once for a self-edge)
+regionDepthSize  : total size of the edge node regions, each multiplied by the depth of its chromosome
+selfEdge         : 1 if both edge nodes are the same node
+
+The model is fit to the total time of each logged edge by least squares,
+with coefficients constrained to be non-negative. The edge runtime log only
+includes edges taking more than a minimum time to process, which should be
+lowered to zero for the runs used to calibrate the model, for instance by
+setting edgeRuntimeLogMinSeconds to 0 in the workflow configuration.
+"""
+
+import os, sys
+
+
+featureLabels = ("intercept", "observationCount", "regionSize", "regionDepthSize", "selfEdge")
+
+
+
+def getOptions() :
+
+    from optparse import OptionParser
+
+    usage = "usage: %prog [options] -o output_model [input_log [input_log...]]"
+    parser = OptionParser(usage=usage)
+
+    parser.add_option("-o", dest="outFile",
+                      help="Output cost model filename (required)")
+    parser.add_option("-f", dest="logListFile",
+                      help="File listing input log files, one file per line. These will be used in addition to any provided directly on the command-line")
+    parser.add_option("--chromDepth", dest="chromDepthFile",
+                      help="Chromosome depth file of the runs which produced the input logs. The regionDepthSize feature is only fit if this is provided.")
+
+    (options,args) = parser.parse_args()
+
+    if len(args) == 0 and not options.logListFile:
+        parser.print_help()
+        sys.exit(2)
+
+    if options.outFile is None :
+        parser.print_help()
+        sys.exit(2)
+
+    # validate input:
+    if options.logListFile is not None :
+        if not os.path.exists(options.logListFile) :
+            raise Exception("Can't find log list file: " + options.logListFile)
+
+    if options.chromDepthFile is not None :
+        if not os.path.isfile(options.chromDepthFile) :
+            raise Exception("Can't find chromosome depth file: " + options.chromDepthFile)
+
+    return (options,args)
+
+
+
+def readChromDepth(chromDepthFile) :
+    chromDepth = {}
+    for line in open(chromDepthFile) :
+        word = line.strip().split("\t")
+        if len(word) < 2 : continue
+        chromDepth[word[0]] = float(word[1])
+    return chromDepth
+
+
+
+def getRegionSize(region) :
+    """
+    return (chrom, size) of a 1-indexed 'chrom:begin-end' region string
+    """
+    (chrom, posRange) = region.rsplit(":", 1)
+    (begin, end) = posRange.split("-")
+    return (chrom, int(end) - int(begin) + 1)
+
+
+
+def getEdgeFeatures(word, chromDepth) :
+    """
+    get the cost model features of one edge from the fields of an edge runtime log line
+    """
+    (locusIndex, nodeIndex1, nodeIndex2) = word[0].split(":")
+    isSelfEdge = (nodeIndex1 == nodeIndex2)
+
+    regionSize = 0.
+    regionDepthSize = 0.
+    for region in word[10:11] if isSelfEdge else word[10:12] :
+        (chrom, size) = getRegionSize(region)
+        regionSize += size
+        if chromDepth is not None :
+            if chrom not in chromDepth :
+                raise Exception("Can't find chromosome '%s' in chromosome depth file" % (chrom))
+            regionDepthSize += size * chromDepth[chrom]
+
+    return (1., float(word[12]), regionSize, regionDepthSize, (1. if isSelfEdge else 0.))
+
+
+
+def solveLinear(A, b) :
+    """
+    solve A x = b by Gaussian elimination with partial pivoting, return None if A is singular
+    """
+    n = len(b)
+    M = [list(A[i]) + [b[i]] for i in range(n)]
+    for col in range(n) :
+        pivot = max(range(col, n), key=lambda row: abs(M[row][col]))
+        if abs(M[pivot][col]) < 1e-12 : return None
+        (M[col], M[pivot]) = (M[pivot], M[col])
+        for row in range(col+1, n) :
+            factor = M[row][col] / M[col][col]
+            for k in range(col, n+1) :
+                M[row][k] -= factor * M[col][k]
+
+    x = [0.] * n
+    for row in reversed(range(n)) :
+        x[row] = (M[row][n] - sum([M[row][k]*x[k] for k in range(row+1, n)])) / M[row][row]
+    return x
+
+
+
+class LeastSquaresAccumulator :
+    """
+    accumulate the normal equations of a least squares fit, so that input can be streamed
+    """
+
+    def __init__(self, featureCount) :
+        self.featureCount = featureCount
+        self.XtX = [[0.] * featureCount for _ in range(featureCount)]
+        self.Xty = [0.] * featureCount
+        self.yty = 0.
+        self.ySum = 0.
+        self.count = 0
+
+    def add(self, features, y) :
+        for i in range(self.featureCount) :
+            fi = features[i]
+            if fi == 0. : continue
+            self.Xty[i] += fi * y
+            row = self.XtX[i]
+            for j in range(self.featureCount) :
+                row[j] += fi * features[j]
+        self.yty += y * y
+        self.ySum += y
+        self.count += 1
+
+    def fitNonNegative(self, activeFeatures) :
+        """
+        fit coefficients for the active features, constrained to be non-negative
+
+        The most negative coefficient is removed from the active set and the remaining
+        coefficients are refit until all are non-negative.
+
+        return the list of coefficients for all features
+        """
+        active = [i for i in activeFeatures if self.XtX[i][i] > 0.]
+        while True :
+            coef = [0.] * self.featureCount
+            if len(active) == 0 : return coef
+
+            A = [[self.XtX[i][j] for j in active] for i in active]
+            b = [self.Xty[i] for i in active]
+            x = solveLinear(A, b)
+            if x is None :
+                # remove a linearly dependent feature, starting from the last:
+                active = active[:-1]
+                continue
+
+            minIndex = min(range(len(active)), key=lambda k: x[k])
+            if x[minIndex] < 0. :
+                del active[minIndex]
+                continue
+
+            for (k, i) in enumerate(active) :
+                coef[i] = x[k]
+            return coef
+
+    def getRSquared(self, coef) :
+        """
+        coefficient of determination of the fit
+        """
+        rss = self.yty - 2.*sum([coef[i]*self.Xty[i] for i in range(self.featureCount)])
+        rss += sum([coef[i]*coef[j]*self.XtX[i][j] for i in range(self.featureCount) for j in range(self.featureCount)])
+        tss = self.yty - (self.ySum*self.ySum / self.count)
+        if tss <= 0. : return 0.
+        return 1. - (rss / tss)
+
+
+
+def main() :
+
+    (options,args) = getOptions()
+
+    logFiles = list(args)
+    if options.logListFile is not None :
+        logFiles.extend([logFile.strip() for logFile in open(options.logListFile)])
+
+    for logFile in logFiles :
+        if not os.path.isfile(logFile) :
+            raise Exception("Can't find input log file: " +logFile)
+
+    chromDepth = None
+    if options.chromDepthFile is not None :
+        chromDepth = readChromDepth(options.chromDepthFile)
+
+    fit = LeastSquaresAccumulator(len(featureLabels))
+    skipCount = 0
+    for logFile in logFiles :
+        for line in open(logFile) :
+            word = line.strip().split("\t")
+            # older logs don't include the node regions and observation count of each edge:
+            if len(word) < 13 :
+                skipCount += 1
+                continue
+            fit.add(getEdgeFeatures(word, chromDepth), float(word[1]))
+
+    if fit.count == 0 :
+        raise Exception("No edge runtime log lines include the features required to fit the cost model")
+
+    activeFeatures = range(len(featureLabels))
+    if chromDepth is None :
+        activeFeatures.remove(featureLabels.index("regionDepthSize"))
+    coef = fit.fitNonNegative(activeFeatures)
+
+    ofp = open(options.outFile, "w")
+    ofp.write("# SV candidate generation edge cost model\n")
+    ofp.write("# fit to %i edges from %i edge runtime logs, r^2: %.4f\n" % (fit.count, len(logFiles), fit.getRSquared(coef)))
+    if skipCount > 0 :
+        ofp.write("# %i log lines without edge features were skipped\n" % (skipCount))
+    for (label, value) in zip(featureLabels, coef) :
+        ofp.write("%s\t%.6g\n" % (label, value))
+    ofp.close()
+
+
+
+main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+#
+# Manta - Structural Variant and Indel Caller
+# Copyright (c) 2013-2016 Illumina, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+
+"""
+concatenate finalized vcf shards into a single indexed vcf
+
+Shards are BGZF compressed vcf files with tabix indexes, given in chromosome
+order, where only the first shard contains the vcf header. The compressed
+shard data is copied without recompression, and the output tabix index is
+built from the shard indexes.
+"""
+
+import os, sys
+
+scriptDir=os.path.abspath(os.path.dirname(__file__))
+pythonLibDir=os.path.abspath(os.path.join(scriptDir,"@THIS_RELATIVE_PYTHON_LIBDIR@"))
+sys.path.append(pythonLibDir)
+
+from bgzfUtil import concatenateIndexedVcfs
+
+
+
+def getOptions() :
+
+    from optparse import OptionParser
+
+    usage = "usage: %prog [options] --output output.vcf.gz shard.vcf.gz [shard.vcf.gz..]"
+    parser = OptionParser(usage=usage)
+
+    parser.add_option("--output", dest="outputPath",
+                      help="Output BGZF compressed vcf file, the index is written to this path + '.tbi' (required)")
+
+    (options,args) = parser.parse_args()
+
+    if (options.outputPath is None) or (len(args) == 0) :
+        parser.print_help()
+        sys.exit(2)
+
+    # validate input:
+    for shardPath in args :
+        if not os.path.isfile(shardPath) :
+            raise Exception("Can't find input vcf shard: " + shardPath)
+        if not os.path.isfile(shardPath + ".tbi") :
+            raise Exception("Can't find input vcf shard index: " + shardPath + ".tbi")
+
+    return (options,args)
+
+
+
+def main() :
+
+    (options,args) = getOptions()
+
+    concatenateIndexedVcfs(args, options.outputPath)
+
+
+
+main()
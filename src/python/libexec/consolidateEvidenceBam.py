@@ -0,0 +1,188 @@
+#!/usr/bin/env python
+#
+# Manta - Structural Variant and Indel Caller
+# Copyright (c) 2013-2016 Illumina, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+
+"""
+consolidate the per-bin evidence bam files of one sample into a single indexed bam
+
+Each bin's evidence bam is filtered to reads supporting SVs in the candidate
+vcf and sorted in memory, then written as a sorted run. All runs are merged
+into a single coordinate sorted bam, which is indexed as it is written.
+Reads with equal sort keys are written in bin order.
+"""
+
+import os, sys
+import gzip
+import heapq
+import shutil
+import struct
+import tempfile
+
+scriptDir=os.path.abspath(os.path.dirname(__file__))
+pythonLibDir=os.path.abspath(os.path.join(scriptDir,"@THIS_RELATIVE_PYTHON_LIBDIR@"))
+sys.path.append(pythonLibDir)
+
+from bamUtil import BamReader, BamWriter, filterEvidenceRecord, getRecordSortKey
+
+
+
+def getOptions() :
+
+    from optparse import OptionParser
+
+    usage = "usage: %prog [options] --candidateVcf candidateSV.vcf.gz --output output.bam [input_bam [input_bam..]]"
+    parser = OptionParser(usage=usage)
+
+    parser.add_option("-f", dest="bamListFile",
+                      help="File listing input evidence bam files, one file per line. These will be used in addition to any provided directly on the command-line")
+    parser.add_option("--candidateVcf", dest="candidateVcf",
+                      help="Bgzip compressed candidate vcf, only reads supporting the SVs in this file are kept (required)")
+    parser.add_option("--output", dest="outputPath",
+                      help="Output bam file, the index is written to this path + '.bai' (required)")
+    parser.add_option("--tmpDir", dest="tmpDir",
+                      help="Directory used to store sorted runs (default: system temp directory)")
+    parser.add_option("--threads", dest="threadCount",type="int",default=1,
+                      help="Number of threads used for BGZF compression (default: %default)")
+
+    (options,args) = parser.parse_args()
+
+    if (options.candidateVcf is None) or (options.outputPath is None) :
+        parser.print_help()
+        sys.exit(2)
+
+    if (len(args) == 0) and (options.bamListFile is None) :
+        parser.print_help()
+        sys.exit(2)
+
+    # validate input:
+    if not os.path.isfile(options.candidateVcf) :
+        raise Exception("Can't find candidate vcf file: " + options.candidateVcf)
+
+    if options.bamListFile is not None :
+        if not os.path.exists(options.bamListFile) :
+            raise Exception("Can't find bam list file: " + options.bamListFile)
+
+    if options.tmpDir is not None :
+        if not os.path.isdir(options.tmpDir) :
+            raise Exception("Can't find temporary directory: " + options.tmpDir)
+
+    if options.threadCount < 1 :
+        raise Exception("Invalid threads value: %i" % (options.threadCount))
+
+    return (options,args)
+
+
+
+def getVcfIdSet(vcfPath) :
+    """
+    return the set of record IDs in a bgzip compressed vcf file
+    """
+    idSet = set()
+    vcfFp = gzip.open(vcfPath, "rb")
+    for line in vcfFp :
+        if line[0] == "#" : continue
+        idSet.add(line.split("\t",3)[2])
+    vcfFp.close()
+    return idSet
+
+
+
+def writeSortedRun(bamPath, svIdSet, runPath) :
+    """
+    filter and sort the records of one evidence bam into a run file of length-prefixed binary records
+
+    return the bam header
+    """
+    bamIn = BamReader(bamPath)
+    records = []
+    for record in bamIn :
+        record = filterEvidenceRecord(record, svIdSet)
+        if record is not None :
+            records.append(record)
+    bamIn.close()
+
+    # sort is stable, so reads with equal keys keep their input order:
+    records.sort(key=getRecordSortKey)
+
+    runFp = open(runPath, "wb")
+    for record in records :
+        runFp.write(struct.pack("<i", len(record)))
+        runFp.write(record)
+    runFp.close()
+
+    return bamIn.header
+
+
+
+def runRecords(runPath, runIndex) :
+    """
+    iterate through the (sort key, run index, record) of each record in a run file
+    """
+    runFp = open(runPath, "rb")
+    while True :
+        sizeData = runFp.read(4)
+        if len(sizeData) == 0 : break
+        record = runFp.read(struct.unpack("<i", sizeData)[0])
+        yield (getRecordSortKey(record), runIndex, record)
+    runFp.close()
+
+
+
+def consolidateEvidenceBams(options, bamFiles) :
+
+    svIdSet = getVcfIdSet(options.candidateVcf)
+
+    tmpDir = tempfile.mkdtemp(prefix="consolidateEvidenceBam.", dir=options.tmpDir)
+    try :
+        header = None
+        runPaths = []
+        for bamFile in bamFiles :
+            runPath = os.path.join(tmpDir, "run.%i" % (len(runPaths)))
+            bamHeader = writeSortedRun(bamFile, svIdSet, runPath)
+            if header is None : header = bamHeader
+            runPaths.append(runPath)
+
+        bamOut = BamWriter(options.outputPath, header, threadCount=options.threadCount, isIndex=True)
+        runIters = [runRecords(runPath, runIndex) for (runIndex, runPath) in enumerate(runPaths)]
+        for (key, runIndex, record) in heapq.merge(*runIters) :
+            bamOut.writeRecord(record)
+        bamOut.close()
+    finally :
+        shutil.rmtree(tmpDir)
+
+
+
+def main() :
+
+    (options,args) = getOptions()
+
+    bamFiles = list(args)
+    if options.bamListFile is not None :
+        bamFiles.extend([bamFile.strip() for bamFile in open(options.bamListFile)])
+
+    # bins without any evidence may not have written an evidence bam:
+    bamFiles = [bamFile for bamFile in bamFiles if os.path.isfile(bamFile)]
+    if len(bamFiles) == 0 :
+        raise Exception("Can't find any input evidence bam file")
+
+    consolidateEvidenceBams(options, bamFiles)
+
+
+
+main()
@@ -19,10 +19,16 @@
 #
 
 
-import sys
+import os, sys
 from os import path
 from os.path import exists, abspath, dirname, basename, splitext, join
 
+scriptDir=os.path.abspath(os.path.dirname(__file__))
+pythonLibDir=os.path.abspath(os.path.join(scriptDir,"@THIS_RELATIVE_PYTHON_LIBDIR@"))
+sys.path.append(pythonLibDir)
+
+from vcfUtil import VCFID, VcfRecord
+
 
 def check_genotype(probandGT, fatherGT, motherGT):
     isConsistent = False
@@ -41,12 +47,12 @@ def check_genotype(probandGT, fatherGT, motherGT):
     return isConsistent
 
 
-def add_dq(tokens, probandIx, dq):
-    for ix in xrange(9, len(tokens)):
-        if (ix == probandIx):
-            tokens[ix] += ":%s" % dq
+def add_dq(samples, probandSampleIx, dq):
+    for ix in xrange(len(samples)):
+        if (ix == probandSampleIx):
+            samples[ix] += ":%s" % dq
         else:
-            tokens[ix] += ":."
+            samples[ix] += ":."
 
 
 def process_vcf(vcfFile, probandID,
@@ -107,8 +113,8 @@ def process_vcf(vcfFile, probandID,
                 sys.stderr.write(errMsg + '\nProgram exits.')
                 sys.exit(1)
 
-        tokens = line.split()
-        format = tokens[8]
+        rec = VcfRecord(line)
+        (format, samples) = rec.getFormatAndSamples()
 
         items = format.split(':')
         GTix = -1
@@ -116,13 +122,15 @@ def process_vcf(vcfFile, probandID,
             if items[ix] == "GT":
                 GTix = ix
 
-        items = tokens[probandIx].split(':')
+        probandSampleIx = probandIx - VCFID.SAMPLE
+
+        items = samples[probandSampleIx].split(':')
         probandGT = items[GTix]
 
-        items = tokens[fatherIx].split(':')
+        items = samples[fatherIx - VCFID.SAMPLE].split(':')
         fatherGT = items[GTix]
 
-        items = tokens[motherIx].split(':')
+        items = samples[motherIx - VCFID.SAMPLE].split(':')
         motherGT = items[GTix]
 
         # add DQ to the format string
@@ -130,10 +138,10 @@ def process_vcf(vcfFile, probandID,
         isConsistent = check_genotype(probandGT, fatherGT, motherGT)
         if not(isConsistent):
             # DQ set to 60
-            add_dq(tokens, probandIx, "60")
+            add_dq(samples, probandSampleIx, "60")
 
             # stats
-            filter = tokens[6]
+            filter = rec.filter
             if filter.upper() == "PASS":
                 countPassed += 1
             else:
@@ -145,14 +153,11 @@ def process_vcf(vcfFile, probandID,
             consistencyDict[GTstring] += 1
         else:
             # DQ set to 0
-            add_dq(tokens, probandIx, "0")
-
-        newLine = ""
-        for i in xrange(8):
-            newLine += tokens[i] + "\t"
-        newLine += format
-        for i in xrange(9, len(tokens)):
-            newLine += "\t" + tokens[i]
+            add_dq(samples, probandSampleIx, "0")
+
+        newLine = rec.getFixedFieldString() + "\t" + format
+        for sample in samples:
+            newLine += "\t" + sample
         fpOut.write(newLine+"\n")
 
     fpVcf.close()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+#
+# Manta - Structural Variant and Indel Caller
+# Copyright (c) 2013-2016 Illumina, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+
+"""
+produce a final indexed vcf from a set of per-bin vcf files
+
+In a single streaming pass over the input records this replaces the header
+cmdline, sorts, removes duplicate records, optionally applies the ploidy
+filter and splits off the small indel candidate subset, and writes all
+outputs as BGZF compressed vcf files, building each tabix index as the file
+is written.
+"""
+
+import os, sys
+
+scriptDir=os.path.abspath(os.path.dirname(__file__))
+pythonLibDir=os.path.abspath(os.path.join(scriptDir,"@THIS_RELATIVE_PYTHON_LIBDIR@"))
+sys.path.append(pythonLibDir)
+
+from vcfUtil import getVcfRecSortKey, isSmallIndelCandidate, replaceCmdlineHeader
+from vcfSort import processHeader, sortedVcfFileRecords, uniqueRecords
+from vcfPloidyFilter import PloidyFilter, addPloidyFilterHeader
+from bgzfUtil import BgzfVcfWriter
+
+
+
+def getOptions() :
+
+    from optparse import OptionParser
+
+    usage = "usage: %prog [options] --output output.vcf.gz [input_vcf [input_vcf..]]"
+    parser = OptionParser(usage=usage)
+
+    parser.add_option("-f", dest="vcfListFile",
+                      help="File listing input vcf files, one file per line. These will be used in addition to any provided directly on the command-line")
+    parser.add_option("--output", dest="outputPath",
+                      help="Output bgzip compressed vcf file (required)")
+    parser.add_option("--cmdline", dest="cmdline",
+                      help="Replace or add the vcf header cmdline field with this value")
+    parser.add_option("--ploidyFilter", dest="isPloidyFilter",action="store_true",default=False,
+                      help="Apply the diploid ploidy filter to the sorted records")
+    parser.add_option("--smallIndelOutput", dest="smallIndelPath",
+                      help="Also write the small indel candidate subset to this bgzip compressed vcf file")
+    parser.add_option("--maxSmallIndelSize", dest="maxSmallIndelSize", type="int",
+                      help="Maximum indel size in the small indel output, required with --smallIndelOutput")
+    parser.add_option("--noHeader", dest="isNoHeader",action="store_true",default=False,
+                      help="Don't write the vcf header to any output, as used for all but the first of a set of vcf shards")
+    parser.add_option("--presorted", dest="isPresorted",action="store_true",default=False,
+                      help="Trust that each input vcf file is already sorted, and merge without sorting any input")
+    parser.add_option("--tmpDir", dest="tmpDir",
+                      help="Directory used to store sorted runs (default: system temp directory)")
+    parser.add_option("--maxMemMb", dest="maxMemMb",type="int",default=1024,
+                      help="Approximate memory budget in megabytes for buffered records (default: %default)")
+    parser.add_option("--threads", dest="threadCount",type="int",default=1,
+                      help="Number of threads used for BGZF compression (default: %default)")
+
+    (options,args) = parser.parse_args()
+
+    if ((len(args) == 0) and (options.vcfListFile is None)) or (options.outputPath is None) :
+        parser.print_help()
+        sys.exit(2)
+
+    # validate input:
+    if options.vcfListFile is not None :
+        if not os.path.exists(options.vcfListFile) :
+            raise Exception("Can't find vcf list file: " + options.vcfListFile)
+
+    if options.smallIndelPath is not None :
+        if options.maxSmallIndelSize is None :
+            raise Exception("--maxSmallIndelSize is required with --smallIndelOutput")
+        if options.maxSmallIndelSize < 1 :
+            raise Exception("Invalid maxSmallIndelSize value: %i" % (options.maxSmallIndelSize))
+        if options.isPloidyFilter :
+            raise Exception("--smallIndelOutput can't be combined with --ploidyFilter")
+
+    if options.tmpDir is not None :
+        if not os.path.isdir(options.tmpDir) :
+            raise Exception("Can't find temporary directory: " + options.tmpDir)
+
+    if options.maxMemMb < 1 :
+        raise Exception("Invalid maxMemMb value: %i" % (options.maxMemMb))
+
+    if options.threadCount < 1 :
+        raise Exception("Invalid threads value: %i" % (options.threadCount))
+
+    return (options,args)
+
+
+
+def finalizeVcfs(options, vcfFiles) :
+
+    header=[]
+    chromOrder=[]
+    if len(vcfFiles) != 0 :
+        processHeader(vcfFiles[0], chromOrder, header)
+
+    if options.cmdline is not None :
+        header = replaceCmdlineHeader(header, options.cmdline)
+
+    recIter = sortedVcfFileRecords(vcfFiles, getVcfRecSortKey(chromOrder), options.isPresorted,
+                                   options.tmpDir, options.maxMemMb)
+    recIter = uniqueRecords(recIter)
+
+    vcfOut = BgzfVcfWriter(options.outputPath, threadCount=options.threadCount)
+    smallOut = None
+    if options.smallIndelPath is not None :
+        smallOut = BgzfVcfWriter(options.smallIndelPath, threadCount=options.threadCount)
+
+    if not options.isNoHeader :
+        if options.isPloidyFilter :
+            outHeader = addPloidyFilterHeader(header)
+        else :
+            outHeader = header
+
+        for line in outHeader :
+            vcfOut.write(line)
+
+        if smallOut is not None :
+            # the small indel subset has the header of the unfiltered vcf:
+            for line in header :
+                smallOut.write(line)
+
+    if options.isPloidyFilter :
+        ploidyFilter = PloidyFilter(vcfOut)
+        for rec in recIter :
+            ploidyFilter.addRecord(rec)
+        ploidyFilter.finish()
+
+        sys.stderr.write("Processed %s sites in the vcf.\n" % ploidyFilter.recordCount)
+        sys.stderr.write("Filtered %s sites due to ploidy.\n" % ploidyFilter.filteredCount)
+    elif smallOut is not None :
+        for rec in recIter :
+            vcfOut.writeRecord(rec)
+            if isSmallIndelCandidate(rec, options.maxSmallIndelSize) :
+                smallOut.writeRecord(rec)
+    else :
+        for rec in recIter :
+            vcfOut.writeRecord(rec)
+
+    vcfOut.close()
+    if smallOut is not None :
+        smallOut.close()
+
+
+
+def main() :
+
+    (options,args) = getOptions()
+
+    vcfFiles = list(args)
+    if options.vcfListFile is not None :
+        vcfFiles.extend([vcfFile.strip() for vcfFile in open(options.vcfListFile)])
+
+    for vcfFile in vcfFiles :
+        if not os.path.isfile(vcfFile) :
+            raise Exception("Can't find input vcf file: " +vcfFile)
+
+    finalizeVcfs(options, vcfFiles)
+
+
+
+main()
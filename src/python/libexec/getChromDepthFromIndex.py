@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+#
+# Manta - Structural Variant and Indel Caller
+# Copyright (c) 2013-2016 Illumina, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+
+"""
+Estimate chromosome depth from the mapped read counts recorded in a BAM index
+
+Output follows the format of GetChromDepth
+"""
+
+import os,sys
+
+scriptDir=os.path.abspath(os.path.dirname(__file__))
+pythonLibDir=os.path.abspath(os.path.join(scriptDir,"@THIS_RELATIVE_PYTHON_LIBDIR@"))
+sys.path.append(pythonLibDir)
+
+from readDensityUtil import getIndexChromDepth, isIndexChromDepthAvailable
+from workflowUtil import checkFile
+
+
+
+def getOptions() :
+
+    from optparse import OptionParser
+
+    usage = "usage: %prog [options]"
+    parser = OptionParser(usage=usage)
+
+    parser.add_option("--align-file", type="string",dest="alignFile",metavar="FILE",
+                      help="indexed BAM file (required)")
+    parser.add_option("--chrom", type="string",dest="chromNames",metavar="CHROM", action="append",
+                      help="chromosome name, argument may be provided more than once to estimate depth for multiple chromosomes (required)")
+    parser.add_option("--output", type="string",dest="outFile",metavar="FILE",
+                      help="output depth filename (required)")
+
+    (options,args) = parser.parse_args()
+
+    if len(args) != 0 :
+        parser.print_help()
+        sys.exit(2)
+
+    if (options.alignFile is None) or (options.chromNames is None) or (options.outFile is None) :
+        parser.print_help()
+        sys.exit(2)
+
+    checkFile(options.alignFile,"input BAM")
+
+    if not isIndexChromDepthAvailable(options.alignFile) :
+        raise Exception("Can't find a BAM index with mapped read counts for BAM file: '%s'" % (options.alignFile))
+
+    return (options,args)
+
+
+
+def main() :
+
+    (options,args) = getOptions()
+
+    depths = getIndexChromDepth(options.alignFile, options.chromNames)
+
+    ofp = open(options.outFile,"w")
+    for (chrom, depth) in zip(options.chromNames, depths) :
+        ofp.write("%s\t%.2f\n" % (chrom, depth))
+    ofp.close()
+
+
+main()
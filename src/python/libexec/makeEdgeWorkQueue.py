@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+#
+# Manta - Structural Variant and Indel Caller
+# Copyright (c) 2013-2016 Illumina, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+
+"""
+create the edge work queue shared by SV candidate generation workers
+
+The queue directory holds one empty token file for each edge chunk, which
+workers claim by renaming. Any existing queue directory is replaced, so that
+all chunks are unclaimed.
+"""
+
+import os, sys
+import shutil
+
+
+
+def getOptions() :
+
+    from optparse import OptionParser
+
+    usage = "usage: %prog [options] --chunkCount N queue_dir"
+    parser = OptionParser(usage=usage)
+
+    parser.add_option("--chunkCount", dest="chunkCount", type="int",
+                      help="Number of edge chunks in the work queue (required)")
+
+    (options,args) = parser.parse_args()
+
+    if (options.chunkCount is None) or (len(args) != 1) :
+        parser.print_help()
+        sys.exit(2)
+
+    # validate input:
+    if options.chunkCount < 1 :
+        raise Exception("Invalid chunkCount value: %i" % (options.chunkCount))
+
+    return (options,args)
+
+
+
+def main() :
+
+    (options,args) = getOptions()
+
+    queueDir = args[0]
+    if os.path.exists(queueDir) :
+        shutil.rmtree(queueDir)
+    os.makedirs(queueDir)
+
+    for chunkIndex in range(options.chunkCount) :
+        open(os.path.join(queueDir, "chunk.%06i" % (chunkIndex)), "w").close()
+
+
+
+main()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python
+#
+# Manta - Structural Variant and Indel Caller
+# Copyright (c) 2013-2016 Illumina, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+
+"""
+partition the records of a set of vcf files into chromosome shards
+
+Chromosomes are assigned to shards as contiguous ranges of the header contig
+order, balanced by contig length, so that finalized shards can be concatenated
+in shard order to produce a sorted vcf. Records on chromosomes not found in
+the header are assigned to the last shard. Each shard file starts with the
+header of the first input vcf, or of the header vcf if one is provided.
+
+Records can optionally be sorted as they are partitioned, so that each shard
+is a sorted run which can be merged with the corresponding shards of other
+partitioned input sets.
+"""
+
+import os, sys
+import re
+
+scriptDir=os.path.abspath(os.path.dirname(__file__))
+pythonLibDir=os.path.abspath(os.path.join(scriptDir,"@THIS_RELATIVE_PYTHON_LIBDIR@"))
+sys.path.append(pythonLibDir)
+
+from vcfUtil import getContigName, getVcfRecSortKey
+from vcfSort import processHeader, sortedVcfFileRecords
+
+
+
+def getOptions() :
+
+    from optparse import OptionParser
+
+    usage = "usage: %prog [options] --shardCount N --shardPrefix prefix [input_vcf [input_vcf..]]"
+    parser = OptionParser(usage=usage)
+
+    parser.add_option("-f", dest="vcfListFile",
+                      help="File listing input vcf files, one file per line. These will be used in addition to any provided directly on the command-line")
+    parser.add_option("--shardCount", dest="shardCount", type="int",
+                      help="Number of shards to write (required)")
+    parser.add_option("--shardPrefix", dest="shardPrefix",
+                      help="Shard files are written to this prefix followed by '.NNNN.vcf' (required)")
+    parser.add_option("--headerVcf", dest="headerVcf",
+                      help="Take the vcf header and chromosome order from this file instead of the first input vcf")
+    parser.add_option("--sort", dest="isSort",action="store_true",default=False,
+                      help="Sort the records written to each shard")
+    parser.add_option("--tmpDir", dest="tmpDir",
+                      help="Directory used to store sorted runs when sorting (default: system temp directory)")
+    parser.add_option("--maxMemMb", dest="maxMemMb",type="int",default=1024,
+                      help="Approximate memory budget in megabytes for records buffered when sorting (default: %default)")
+
+    (options,args) = parser.parse_args()
+
+    if (options.shardCount is None) or (options.shardPrefix is None) :
+        parser.print_help()
+        sys.exit(2)
+
+    if (len(args) == 0) and (options.vcfListFile is None) :
+        parser.print_help()
+        sys.exit(2)
+
+    # validate input:
+    if options.shardCount < 1 :
+        raise Exception("Invalid shardCount value: %i" % (options.shardCount))
+
+    if options.vcfListFile is not None :
+        if not os.path.exists(options.vcfListFile) :
+            raise Exception("Can't find vcf list file: " + options.vcfListFile)
+
+    if options.headerVcf is not None :
+        if not os.path.isfile(options.headerVcf) :
+            raise Exception("Can't find header vcf file: " + options.headerVcf)
+
+    if options.tmpDir is not None :
+        if not os.path.isdir(options.tmpDir) :
+            raise Exception("Can't find temporary directory: " + options.tmpDir)
+
+    if options.maxMemMb < 1 :
+        raise Exception("Invalid maxMemMb value: %i" % (options.maxMemMb))
+
+    return (options,args)
+
+
+
+def getShardPath(shardPrefix, shardIndex) :
+    return "%s.%04i.vcf" % (shardPrefix, shardIndex)
+
+
+
+def getContigLengths(header) :
+    """
+    return a dictionary of contig lengths from the vcf header, for all contigs with a length
+    """
+    lengthPattern = re.compile("[<,]length=([0-9]+)[,>]")
+
+    contigLengths = {}
+    for line in header :
+        contig = getContigName(line)
+        if contig is None : continue
+        match = lengthPattern.search(line)
+        if match is not None :
+            contigLengths[contig] = int(match.group(1))
+    return contigLengths
+
+
+
+def getContigShards(chromOrder, contigLengths, shardCount) :
+    """
+    assign contigs to shards as contiguous ranges of chromOrder with similar total length
+
+    If any contig length is unknown, contigs are balanced by count instead.
+
+    return a dictionary of contig names to shard index
+    """
+
+    if all([(contig in contigLengths) for contig in chromOrder]) :
+        weights = [contigLengths[contig] for contig in chromOrder]
+    else :
+        weights = [1 for contig in chromOrder]
+
+    totalWeight = sum(weights)
+
+    contigShards = {}
+    shardIndex = 0
+    cumulativeWeight = 0
+    for (contig, weight) in zip(chromOrder, weights) :
+        # start a new shard once the previous contigs fill the current shard's share of the total:
+        while (shardIndex+1 < shardCount) and (cumulativeWeight*shardCount >= totalWeight*(shardIndex+1)) :
+            shardIndex += 1
+        contigShards[contig] = shardIndex
+        cumulativeWeight += weight
+    return contigShards
+
+
+
+def vcfFileLines(vcfFiles) :
+    """
+    iterate through the (chrom, line) of all records in a set of vcf files, in input order
+    """
+    for vcfFile in vcfFiles :
+        for line in open(vcfFile) :
+            if line[0] == "#" : continue
+            yield (line[:line.find("\t")], line)
+
+
+
+def sortedVcfFileLines(vcfFiles, chromOrder, tmpDir, maxMemMb) :
+    """
+    iterate through the (chrom, line) of all records in a set of vcf files, in sorted order
+    """
+    for rec in sortedVcfFileRecords(vcfFiles, getVcfRecSortKey(chromOrder), False, tmpDir, maxMemMb) :
+        yield (rec.chrom, rec.line)
+
+
+
+def partitionVcfs(options, vcfFiles) :
+
+    header=[]
+    chromOrder=[]
+    if options.headerVcf is not None :
+        processHeader(options.headerVcf, chromOrder, header)
+    elif len(vcfFiles) != 0 :
+        processHeader(vcfFiles[0], chromOrder, header)
+
+    shardCount = options.shardCount
+    contigShards = getContigShards(chromOrder, getContigLengths(header), shardCount)
+    lastShard = shardCount-1
+
+    if options.isSort :
+        recIter = sortedVcfFileLines(vcfFiles, chromOrder, options.tmpDir, options.maxMemMb)
+    else :
+        recIter = vcfFileLines(vcfFiles)
+
+    shardfps = []
+    for shardIndex in range(shardCount) :
+        shardfp = open(getShardPath(options.shardPrefix, shardIndex), "w")
+        for line in header :
+            shardfp.write(line)
+        shardfps.append(shardfp)
+
+    lastChrom = None
+    lastShardfp = None
+    for (chrom, line) in recIter :
+        if chrom != lastChrom :
+            lastChrom = chrom
+            lastShardfp = shardfps[contigShards.get(chrom, lastShard)]
+        lastShardfp.write(line)
+
+    for shardfp in shardfps :
+        shardfp.close()
+
+
+
+def main() :
+
+    (options,args) = getOptions()
+
+    vcfFiles = list(args)
+    if options.vcfListFile is not None :
+        vcfFiles.extend([vcfFile.strip() for vcfFile in open(options.vcfListFile)])
+
+    for vcfFile in vcfFiles :
+        if not os.path.isfile(vcfFile) :
+            raise Exception("Can't find input vcf file: " +vcfFile)
+
+    partitionVcfs(options, vcfFiles)
+
+
+
+main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+#
+# Manta - Structural Variant and Indel Caller
+# Copyright (c) 2013-2016 Illumina, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+
+"""
+Limit the size of an artifact cache directory (see configManta.py --artifactCacheDir)
+by removing the least recently used cache entries
+
+This is safe to run while workflows using the cache are running.
+"""
+
+import os,sys
+
+scriptDir=os.path.abspath(os.path.dirname(__file__))
+pythonLibDir=os.path.abspath(os.path.join(scriptDir,"@THIS_RELATIVE_PYTHON_LIBDIR@"))
+sys.path.append(pythonLibDir)
+
+from artifactCache import pruneArtifactCache
+
+
+
+def getOptions() :
+
+    from optparse import OptionParser
+
+    usage = "usage: %prog [options] cache_dir"
+    parser = OptionParser(usage=usage)
+
+    parser.add_option("--max-size-mb", type="int",dest="maxSizeMb",metavar="MB",
+                      help="maximum total size of all cache entries in megabytes (required)")
+    parser.add_option("--dry-run", dest="isDryRun", action="store_true", default=False,
+                      help="report the entries which would be removed without removing them")
+
+    (options,args) = parser.parse_args()
+
+    if (len(args) != 1) or (options.maxSizeMb is None) :
+        parser.print_help()
+        sys.exit(2)
+
+    if options.maxSizeMb < 0 :
+        raise Exception("Invalid maximum cache size: %i" % (options.maxSizeMb))
+
+    if not os.path.isdir(args[0]) :
+        raise Exception("Can't find cache directory: '%s'" % (args[0]))
+
+    return (options,args)
+
+
+
+def main() :
+
+    (options,args) = getOptions()
+
+    megabyte = 1024*1024
+    (removedCount, removedBytes, remainingCount, remainingBytes) = \
+        pruneArtifactCache(args[0], options.maxSizeMb*megabyte, options.isDryRun)
+
+    action = "Would remove" if options.isDryRun else "Removed"
+    sys.stdout.write("%s %i cache entries (%.1f Mb)\n" % (action, removedCount, float(removedBytes)/megabyte))
+    sys.stdout.write("Remaining: %i cache entries (%.1f Mb)\n" % (remainingCount, float(remainingBytes)/megabyte))
+
+
+main()
@@ -20,81 +20,38 @@
 
 """
 sort input vcf
+
+By default all records are read into memory and sorted together. In merge
+mode, records are sorted with an external sort which spills sorted runs to
+disk under a fixed memory budget, and the runs are then streamed through a
+k-way merge, so that memory use no longer grows with the total callset size.
 """
 
 import os, sys
-import re
-
-
-def isInfoKey(string,key) :
-    match=re.search("(^|;)%s(;|$)" % (key) ,string)
-    return match is not None
-
-
-def getKeyVal(string,key) :
-    match=re.search("%s=([^;]*);?" % (key) ,string)
-    if match is None : return None
-    return match.group(1);
-
-
-VCF_CHROM = 0
-VCF_POS = 1
-VCF_REF = 3
-VCF_ALT = 4
-VCF_QUAL = 5
-VCF_FILTER = 6
-VCF_INFO = 7
-
-
-
-class VcfRecord :
-    def __init__(self, line, isUnique) :
-        self.line = line
-        w=line.strip().split('\t')
-        self.chrom=w[VCF_CHROM]
-        self.pos=int(w[VCF_POS])
-        if isUnique :
-            self.ref=w[VCF_REF]
-            self.alt=w[VCF_ALT]
-            self.qual=w[VCF_QUAL]
-            self.isPass=(w[VCF_FILTER] == "PASS")
-
-            self.invState=None
-            inv3 = isInfoKey(w[VCF_INFO],"INV3")
-            inv5 = isInfoKey(w[VCF_INFO],"INV5")
-            assert(not (inv3 and inv5))
-            if inv3: self.invState = "INV3"
-            if inv5: self.invState = "INV5"
 
-        self.endPos=self.pos+len(w[VCF_REF])-1
-        val = getKeyVal(w[VCF_INFO],"END")
-        if val is not None :
-            self.endPos = int(val)
+scriptDir=os.path.abspath(os.path.dirname(__file__))
+pythonLibDir=os.path.abspath(os.path.join(scriptDir,"@THIS_RELATIVE_PYTHON_LIBDIR@"))
+sys.path.append(pythonLibDir)
 
+from vcfUtil import VcfRecord, getContigName, getVcfRecSortKey
+from vcfSort import processHeader, sortedVcfFileRecords, uniqueRecords
 
-class Constants :
 
-    import re
 
-    contigpat = re.compile("^##contig=<ID=([^,>]*)[,>]")
-
-
-def processFile(isUnique, vcfFile, isFirst, chromOrder, header, recList) :
+def processFile(vcfFile, isFirst, chromOrder, header, recList) :
     """
     read in a vcf file
     """
 
-    import re
-
     for line in open(vcfFile) :
         if line[0] == "#" :
             if not isFirst : continue
             header.append(line)
-            match = re.match(Constants.contigpat,line)
-            if match is not None :
-                chromOrder.append(match.group(1))
+            contig = getContigName(line)
+            if contig is not None :
+                chromOrder.append(contig)
         else :
-            recList.append(VcfRecord(line, isUnique))
+            recList.append(VcfRecord(line))
 
 
 
@@ -117,6 +74,16 @@ def getOptions() :
                       help="filter all but one record with the same {CHR,POS,REF,ALT,(INV3|INV5|)}")
     parser.add_option("-f", dest="vcfListFile",
                       help="File listing input vcf files, one file per line. These will be used in addition to any provided directly on the command-line")
+    parser.add_option("--merge", dest="isMerge",action="store_true",default=False,
+                      help="Sort all input with an external sort, spilling sorted runs to disk whenever the memory "
+                           "budget is reached, then stream the runs through a k-way merge.")
+    parser.add_option("--presorted", dest="isPresorted",action="store_true",default=False,
+                      help="Trust that each input vcf file is already sorted, and merge without sorting any input. "
+                           "Implies --merge, peak memory no longer depends on input size.")
+    parser.add_option("--tmpDir", dest="tmpDir",
+                      help="Directory used to store sorted runs in merge mode (default: system temp directory)")
+    parser.add_option("--maxMemMb", dest="maxMemMb",type="int",default=1024,
+                      help="Approximate memory budget in megabytes for records buffered in merge mode (default: %default)")
 
     (options,args) = parser.parse_args()
 
@@ -124,6 +91,9 @@ def getOptions() :
         parser.print_help()
         sys.exit(2)
 
+    if options.isPresorted :
+        options.isMerge = True
+
     # validate input:
     if options.vcfListFile is not None :
         if not os.path.exists(options.vcfListFile) :
@@ -133,126 +103,85 @@ def getOptions() :
         if not os.path.isfile(vcfFile) :
             raise Exception("Can't find input vcf file: " +vcfFile)
 
+    if options.tmpDir is not None :
+        if not os.path.isdir(options.tmpDir) :
+            raise Exception("Can't find temporary directory: " + options.tmpDir)
+
+    if options.maxMemMb < 1 :
+        raise Exception("Invalid maxMemMb value: %i" % (options.maxMemMb))
+
     return (options,args)
 
 
 
-def resolveRec(recEqualSet, recList) :
+def mergeVcfs(options, vcfFiles, outfp) :
     """
-    determine which of a set of 'equal' vcf records is the best
+    stream all input vcf files through a k-way merge
 
-    right now best is a record with PASS in the filter field, and
-    secondarily having the highest quality
+    Unless the input is marked presorted, all input records are first passed
+    through an external sort, so memory use stays within the requested budget.
     """
 
-    if not recEqualSet: return
+    if len(vcfFiles) == 0 : return
 
-    bestIndex=0
-    bestQual=0.
-    bestIsPass=False
-    bestIsAssembled=False
-    for (index,rec) in enumerate(recEqualSet) :
-        try:
-            rec.qual = float(rec.qual)
-        except ValueError:
-            rec.qual = 0.
-
-        assert rec.qual >= 0.
+    header=[]
+    chromOrder=[]
+    processHeader(vcfFiles[0], chromOrder, header)
 
-        isNewPass=((not bestIsPass) and rec.isPass)
-        isHighQual=((bestIsPass == rec.isPass) and (rec.qual > bestQual))
-        isNewAssembled=((not bestIsAssembled) and (rec.alt[0] != '<'))
-        if (isNewPass or isHighQual or isNewAssembled) :
-            bestIndex = index
-            bestQual = rec.qual
-            bestIsPass = rec.isPass
-            bestIsAssembled = (rec.alt[0] != '<')
+    recIter = sortedVcfFileRecords(vcfFiles, getVcfRecSortKey(chromOrder), options.isPresorted,
+                                   options.tmpDir, options.maxMemMb)
 
-    recList.append(recEqualSet[bestIndex])
+    for line in header :
+        outfp.write(line)
 
+    if options.isUnique :
+        recIter = uniqueRecords(recIter)
 
+    for vcfrec in recIter :
+        outfp.write(vcfrec.line)
 
-def main() :
 
-    outfp = sys.stdout
 
-    (options,args) = getOptions()
+def sortVcfs(options, vcfFiles, outfp) :
+    """
+    read all input vcf records into memory and sort them together
+    """
 
     header=[]
     recList=[]
     chromOrder=[]
 
     isFirst=True
-    for vcfFile in listInputVcfs(options.vcfListFile,args) :
-        processFile(options.isUnique, vcfFile, isFirst, chromOrder, header, recList)
+    for vcfFile in vcfFiles :
+        processFile(vcfFile, isFirst, chromOrder, header, recList)
         isFirst = False
 
-    def vcfRecSortKey(x) :
-        """
-        sort vcf records for final output
-
-        Fancy chromosome sort rules:
-        if contig records are found in the vcf header, then sort chroms in that order
-        for any chrom names not found in the header, sort them in lex order after the
-        found chrom names
-        """
-
-        try :
-            headerOrder = chromOrder.index(x.chrom)
-        except ValueError :
-            headerOrder = size(chromOrder)
-
-        return (headerOrder, x.chrom, x.pos, x.endPos)
-
-    recList.sort(key = vcfRecSortKey)
+    recList.sort(key = getVcfRecSortKey(chromOrder))
 
     for line in header :
         outfp.write(line)
 
-    def isEqualRec(rec1,rec2) :
-        if (rec1 is None) or (rec2 is None) : return False
+    recIter = recList
+    if options.isUnique :
+        recIter = uniqueRecords(recIter)
 
-        if rec1[0] != rec2[0]: return False # chrom
-        if rec1[1] != rec2[1]: return False # pos
-        if rec1[2] != rec2[2]: return False # ref
-        if rec1[4] != rec2[4]: return False # endPos
-        if rec1[5] != rec2[5]: return False # invState
+    for vcfrec in recIter :
+        outfp.write(vcfrec.line)
 
-        # special handling to find duplications when alt is the only difference:
-        if rec1[3] != rec2[3]:
-            if rec1[3] != "<INS>" and rec2[3] != "<INS>":
-                return False
 
-            def matchTest(rec) :
-                if rec[0] == "<" : return False
-                if len(rec) < 80 : return False
-                return True
 
-            if rec1[3] == "<INS>" :
-                return matchTest(rec2[3])
-            if rec2[3] == "<INS>" :
-                return matchTest(rec1[3])
+def main() :
+
+    outfp = sys.stdout
 
-        return True
+    (options,args) = getOptions()
 
+    vcfFiles = list(listInputVcfs(options.vcfListFile,args))
 
-    if options.isUnique :
-        recList2 = []
-        recEqualSet = []
-        lastRec = None
-        for vcfrec in recList :
-            rec = (vcfrec.chrom, vcfrec.pos, vcfrec.ref, vcfrec.alt, vcfrec.endPos, vcfrec.invState)
-            if not isEqualRec(rec,lastRec) :
-                resolveRec(recEqualSet,recList2)
-                recEqualSet = []
-            recEqualSet.append(vcfrec)
-            lastRec = rec
-        resolveRec(recEqualSet,recList2)
-        recList = recList2
-
-    for vcfrec in recList :
-        outfp.write(vcfrec.line)
+    if options.isMerge :
+        mergeVcfs(options, vcfFiles, outfp)
+    else :
+        sortVcfs(options, vcfFiles, outfp)
 
 
 main()
-